@@ -79,22 +79,23 @@ class RankingBatchAdmin(admin.ModelAdmin):
     ]
     list_filter = ['status', 'started_at', 'completed_at']
     search_fields = [
-        'batch_id', 'job_description__title', 'job_description__company',
+        'batch_id', 'run_id', 'job_description__title', 'job_description__company',
         'created_by__email'
     ]
     readonly_fields = [
-        'batch_id', 'total_candidates', 'ranked_candidates', 'failed_rankings',
+        'batch_id', 'run_id', 'total_candidates', 'ranked_candidates', 'failed_rankings',
         'success_rate', 'processing_time_seconds', 'started_at', 'completed_at',
-        'error_message'
+        'error_message', 'candidate_ids', 'attempts', 'worker_id', 'locked_at'
     ]
     fieldsets = (
         ('Batch Information', {
-            'fields': ('batch_id', 'job_description', 'created_by')
+            'fields': ('batch_id', 'run_id', 'job_description', 'criteria', 'created_by')
         }),
         ('Processing Details', {
             'fields': (
                 'status', 'total_candidates', 'ranked_candidates', 'failed_rankings',
-                'success_rate', 'processing_time_seconds'
+                'success_rate', 'processing_time_seconds', 'cancel_requested',
+                'attempts', 'worker_id', 'locked_at'
             )
         }),
         ('Timestamps', {
@@ -4,6 +4,8 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 from django.conf import settings
 
+from resume_checker.skill_matcher import skill_matcher, TECHNICAL_CATEGORIES
+
 # Try to import Gemini
 try:
     import google.generativeai as genai
@@ -235,28 +237,8 @@ IMPORTANT: Return ONLY valid JSON. Do not include any other text.
         }
     
     def _extract_skills_from_text(self, text: str) -> List[str]:
-        """Extract skills from text using basic keyword matching"""
-        # Common technical skills
-        common_skills = {
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'docker',
-            'kubernetes', 'git', 'agile', 'scrum', 'machine learning', 'ai',
-            'data science', 'html', 'css', 'php', 'c++', 'c#', '.net', 'spring',
-            'django', 'flask', 'express', 'typescript', 'redux', 'vuex',
-            'tensorflow', 'pytorch', 'pandas', 'numpy', 'scikit-learn',
-            'jenkins', 'travis', 'circleci', 'github actions', 'terraform',
-            'ansible', 'chef', 'puppet', 'elasticsearch', 'redis', 'kafka',
-            'rabbitmq', 'nginx', 'apache', 'linux', 'unix', 'bash', 'shell'
-        }
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        """Extract canonical skill IDs from text with the shared skill matcher"""
+        return skill_matcher.extract(text or '', categories=TECHNICAL_CATEGORIES)
     
     def enhance_ranking_with_ai(
         self, 
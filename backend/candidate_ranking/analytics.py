@@ -0,0 +1,170 @@
+"""
+Ranking Analytics
+=================
+
+Score statistics, distributions, HR status counts, experience bands and
+histograms of a job's active rankings, for ``get_ranking_analytics`` and
+the HR dashboard.
+
+The whole payload comes from one conditional aggregation query: every
+count is a ``COUNT(...) FILTER (WHERE ...)`` column of the same SELECT.
+The "top candidate" cutoff (top 10% of the job's active rankings,
+``CandidateRanking.objects.job_total``, as in ``is_top_candidate``) is a
+scalar subquery inside it.
+
+Results are cached per job in the Django cache for
+``settings.RANKING_ANALYTICS_CACHE_SECONDS``. The cache entry is dropped
+when the job's rankings change:
+- by ``rank_candidates_for_job`` once it has replaced the job's rankings;
+- by the ``post_save`` receiver in ``signals.py`` when a ranking is saved
+  (incremental ranking, HR shortlist/reject/notes);
+- by the ``pre_delete`` receivers in ``signals.py`` when a job, candidate
+  or application is deleted with its rankings.
+Writes that bypass all of these (``QuerySet.update()`` elsewhere) show up once the
+entry expires.
+
+Usage:
+    from .analytics import ranking_analytics
+
+    payload = ranking_analytics.for_job(job)     # cached
+    ranking_analytics.invalidate(job.pk)
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Avg, Count, Max, Min, Q, Value
+from django.db.models.functions import Greatest
+
+from resume_checker.models import JobDescription
+
+from .models import CandidateRanking
+
+logger = logging.getLogger(__name__)
+
+CACHE_KEY = 'candidate_ranking:analytics:{job_id}'
+
+# Score fields with a histogram, and the width of its buckets (scores are 0-100)
+HISTOGRAM_FIELDS = ('overall_score', 'skill_match_score', 'experience_match_score')
+HISTOGRAM_BUCKET_WIDTH = 10
+
+# Named score and experience bands: key -> condition
+SCORE_BANDS = {
+    'high_matches': Q(overall_score__gte=80),
+    'medium_matches': Q(overall_score__gte=60, overall_score__lt=80),
+    'low_matches': Q(overall_score__lt=60),
+}
+EXPERIENCE_BANDS = {
+    'overqualified': Q(experience_gap__gte=2),
+    'well_matched': Q(experience_gap__gte=-1, experience_gap__lt=2),
+    'underqualified': Q(experience_gap__lt=-1),
+}
+
+
+def _percentage(count: int, total: int) -> float:
+    return round(count / total * 100, 2) if total > 0 else 0
+
+
+def _histogram_buckets() -> List[tuple]:
+    """(lower bound, upper bound) of each bucket; the last one includes 100."""
+    return [(low, low + HISTOGRAM_BUCKET_WIDTH) for low in range(0, 100, HISTOGRAM_BUCKET_WIDTH)]
+
+
+class RankingAnalytics:
+    """
+    Computes and caches the ranking analytics of jobs.
+    """
+
+    def __init__(self, timeout: Optional[int] = None):
+        self.timeout = timeout if timeout is not None else getattr(settings, 'RANKING_ANALYTICS_CACHE_SECONDS', 300)
+
+    def _aggregates(self, job: JobDescription) -> Dict[str, Any]:
+        """All counts and statistics of the job's active rankings, in one query."""
+        job_rankings = CandidateRanking.objects.filter(job_description=job, status='active')
+        top_cutoff = Greatest(Value(1), CandidateRanking.objects.job_total(job) / Value(10))
+
+        columns = {
+            'total': Count('pk'),
+            'average_score': Avg('overall_score'),
+            'max_score': Max('overall_score'),
+            'min_score': Min('overall_score'),
+            'top_candidates': Count('pk', filter=Q(rank_position__lte=top_cutoff)),
+            'shortlisted': Count('pk', filter=Q(is_shortlisted=True)),
+            'rejected': Count('pk', filter=Q(is_rejected=True)),
+        }
+        for key, condition in {**SCORE_BANDS, **EXPERIENCE_BANDS}.items():
+            columns[key] = Count('pk', filter=condition)
+        for field in HISTOGRAM_FIELDS:
+            for index, (low, high) in enumerate(_histogram_buckets()):
+                condition = Q(**{f'{field}__gte': low})
+                if high < 100:
+                    condition &= Q(**{f'{field}__lt': high})
+                columns[f'{field}_{index}'] = Count('pk', filter=condition)
+
+        return job_rankings.aggregate(**columns)
+
+    def compute(self, job: JobDescription) -> Dict[str, Any]:
+        """The analytics payload of a job, from the database."""
+        row = self._aggregates(job)
+        total = row['total']
+        max_score = float(row['max_score'] or 0)
+        min_score = float(row['min_score'] or 0)
+        return {
+            'total_candidates': total,
+            'score_stats': {
+                'average_score': round(float(row['average_score'] or 0), 2),
+                'max_score': round(max_score, 2),
+                'min_score': round(min_score, 2),
+                'score_range': round(max_score - min_score, 2),
+            },
+            'score_distribution': {
+                'high_matches': row['high_matches'],
+                'medium_matches': row['medium_matches'],
+                'low_matches': row['low_matches'],
+                'high_match_percentage': _percentage(row['high_matches'], total),
+                'medium_match_percentage': _percentage(row['medium_matches'], total),
+                'low_match_percentage': _percentage(row['low_matches'], total),
+            },
+            'candidate_status': {
+                'top_candidates': row['top_candidates'],
+                'shortlisted': row['shortlisted'],
+                'rejected': row['rejected'],
+                'pending_review': total - row['shortlisted'] - row['rejected'],
+            },
+            'experience_analysis': {
+                'overqualified': row['overqualified'],
+                'well_matched': row['well_matched'],
+                'underqualified': row['underqualified'],
+                'overqualified_percentage': _percentage(row['overqualified'], total),
+                'well_matched_percentage': _percentage(row['well_matched'], total),
+                'underqualified_percentage': _percentage(row['underqualified'], total),
+            },
+            'histograms': {
+                field: [
+                    {'min': low, 'max': high, 'count': row[f'{field}_{index}']}
+                    for index, (low, high) in enumerate(_histogram_buckets())
+                ]
+                for field in HISTOGRAM_FIELDS
+            },
+        }
+
+    def for_job(self, job: JobDescription) -> Dict[str, Any]:
+        """The analytics payload of a job, from the cache when fresh."""
+        key = CACHE_KEY.format(job_id=job.pk)
+        payload = cache.get(key)
+        if payload is None:
+            payload = self.compute(job)
+            cache.set(key, payload, self.timeout)
+            logger.debug(f"Computed ranking analytics for job {job.job_id}")
+        return payload
+
+    def invalidate(self, job_id: int) -> None:
+        """Drop the cached analytics of a job once the current transaction commits."""
+        transaction.on_commit(lambda: cache.delete(CACHE_KEY.format(job_id=job_id)))
+
+
+# Global instance
+ranking_analytics = RankingAnalytics()
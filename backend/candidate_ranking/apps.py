@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class CandidateRankingConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "candidate_ranking"
+
+    def ready(self):
+        """Import signals when the app is ready"""
+        import candidate_ranking.signals  # noqa: F401
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+import os
+import signal
+import socket
+import time
+
+from candidate_ranking.models import RankingBatch
+from candidate_ranking.ranking_queue import RankingWorkerPool, requeue_stale_batches
+
+
+class Command(BaseCommand):
+    help = 'Run background workers that rank queued candidate ranking batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Number of worker threads (default: 1)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds between queue polls when idle (default: 2.0)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Rank everything currently queued and exit'
+        )
+
+    def handle(self, *args, **options):
+        queued = RankingBatch.objects.filter(status='queued').count()
+        self.stdout.write(self.style.SUCCESS(f'🚀 Ranking workers starting ({queued} queued)'))
+
+        requeued = requeue_stale_batches()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'⚠️ Requeued {requeued} stale batches'))
+
+        pool = RankingWorkerPool(size=options['workers'], poll_interval=options['poll_interval'])
+
+        if options['once']:
+            start_time = time.perf_counter()
+            processed = pool.drain(f'{socket.gethostname()}:{os.getpid()}:once')
+            elapsed = time.perf_counter() - start_time
+            self.stdout.write(self.style.SUCCESS(f'🎉 Ranked {processed} batches in {elapsed:.2f}s'))
+            return
+
+        pool.start()
+        self.stdout.write(f'👷 {options["workers"]} workers running. Press Ctrl+C to stop.')
+
+        def shutdown(signum, frame):
+            pool.stop()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        try:
+            while pool.is_running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pool.stop()
+
+        self.stdout.write(self.style.SUCCESS('👋 Ranking workers stopped'))
@@ -0,0 +1,98 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from candidate_ranking.models import RankingCriteria
+from candidate_ranking.rerank import rerank_engine
+
+
+class Command(BaseCommand):
+    help = 'Re-rank the applicants of many jobs in parallel, checkpointed in RankingBatch rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', metavar='DATETIME',
+                            help='Only jobs changed since then (job, new applications or applicant profiles), '
+                                 'e.g. 2024-05-01 or 2024-05-01T02:00')
+        parser.add_argument('--jobs', nargs='+', type=int, metavar='ID',
+                            help='Only these jobs (database IDs)')
+        parser.add_argument('--status', nargs='+', metavar='STATUS',
+                            help='Only jobs in these statuses, e.g. active')
+        parser.add_argument('--missing-only', action='store_true',
+                            help='Only jobs that have applications but no rankings yet')
+        parser.add_argument('--criteria', type=int, metavar='ID',
+                            help='Rank with this RankingCriteria (default: the default criteria); '
+                                 'a resumed run keeps the criteria it was started with')
+        parser.add_argument('--workers', type=int,
+                            help='Worker processes (default: 1 on SQLite, otherwise the number of CPUs)')
+        parser.add_argument('--jobs-per-task', type=int, default=rerank_engine.jobs_per_task,
+                            help='Jobs a worker ranks per task')
+        parser.add_argument('--resume', nargs='?', const='latest', metavar='RUN_ID',
+                            help='Continue an interrupted run (default: the latest run); filters are ignored')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Only list the number of jobs that would be re-ranked')
+
+    def _parse_since(self, value):
+        since = parse_datetime(value)
+        if since is None:
+            day = parse_date(value)
+            if day is None:
+                raise CommandError(f'Invalid --since value: {value}')
+            since = timezone.datetime.combine(day, timezone.datetime.min.time())
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def handle(self, *args, **options):
+        criteria = None
+        if options['criteria']:
+            try:
+                criteria = RankingCriteria.objects.get(pk=options['criteria'], is_active=True)
+            except RankingCriteria.DoesNotExist:
+                raise CommandError(f"No active ranking criteria with ID {options['criteria']}")
+
+        workers = options['workers'] or (1 if connection.vendor == 'sqlite' else os.cpu_count() or 1)
+        rerank_engine.jobs_per_task = max(1, options['jobs_per_task'])
+
+        def progress(outcome, done, total):
+            if outcome.status == 'failed':
+                self.stdout.write(self.style.WARNING(f'⚠️ Job {outcome.job_id} failed: {outcome.error}'))
+            elif done % 100 == 0 or done == total:
+                self.stdout.write(f'   {done}/{total} jobs')
+
+        if options['resume']:
+            if criteria:
+                raise CommandError('--criteria cannot be combined with --resume: a run keeps the criteria it was started with')
+            run_id = options['resume']
+            if run_id == 'latest':
+                run_id = rerank_engine.latest_run_id()
+                if run_id is None:
+                    raise CommandError('There is no re-ranking run to resume')
+            self.stdout.write(self.style.SUCCESS(f'🚀 Resuming re-ranking run {run_id} with {workers} workers'))
+            if options['dry_run']:
+                return
+            result = rerank_engine.resume(run_id, workers=workers, progress=progress)
+        else:
+            since = self._parse_since(options['since']) if options['since'] else None
+            job_ids = rerank_engine.select_jobs(
+                since=since,
+                job_ids=options['jobs'],
+                statuses=options['status'],
+                missing_only=options['missing_only'],
+                criteria=criteria,
+            )
+            self.stdout.write(self.style.SUCCESS(f'🚀 Re-ranking {len(job_ids)} jobs with {workers} workers'))
+            if options['dry_run'] or not job_ids:
+                return
+            result = rerank_engine.start(job_ids, criteria, workers=workers, progress=progress)
+
+        message = (f'{result.completed}/{result.total_jobs} jobs ranked ({result.ranked_candidates} candidates) '
+                   f'in {result.seconds:.1f}s, run {result.run_id}')
+        if result.failed:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ {message}; {result.failed} failed. Resume with: rerank_jobs --resume {result.run_id}'
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'✅ {message}'))
@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
 from django.conf import settings
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
@@ -16,6 +17,38 @@ def generate_batch_id():
     return f"BATCH-{uuid.uuid4().hex[:8].upper()}"
 
 
+def generate_run_id():
+    """Generate a re-ranking run ID in format: RUN-XXXXXXXXXXXX"""
+    return f"RUN-{uuid.uuid4().hex[:12].upper()}"
+
+
+class CandidateRankingQuerySet(models.QuerySet):
+    def job_total(self, job):
+        """
+        Subquery counting the active rankings of ``job`` (a job, its ID or an
+        ``OuterRef``): the total the "top candidate" cutoff is a tenth of, here
+        and in the ranking analytics.
+        """
+        totals = (
+            self.model._default_manager.filter(job_description=job, status='active')
+            .order_by()
+            .values('job_description')
+            .annotate(total=Count('pk'))
+            .values('total')
+        )
+        return Subquery(totals, output_field=models.PositiveIntegerField())
+
+    def with_totals(self):
+        """
+        Annotate ``ranked_total``: the job's current number of active rankings.
+
+        Incremental ranking (``rank_candidate_incrementally``) only writes the
+        rows whose position changes, so the stored ``total_candidates`` of the
+        other rows keeps the count from when they were ranked.
+        """
+        return self.annotate(ranked_total=self.job_total(OuterRef('job_description')))
+
+
 class CandidateRanking(models.Model):
     """
     Model to store candidate ranking results for job positions.
@@ -70,6 +103,7 @@ class CandidateRanking(models.Model):
     
     # Match Analysis
     matched_skills = models.JSONField(default=list, blank=True, help_text="Skills that matched the job requirements")
+    matched_skill_ids = models.JSONField(default=list, blank=True, editable=False, help_text="Canonical Skill IDs of matched_skills, sorted (kept in sync on save)")
     missing_skills = models.JSONField(default=list, blank=True, help_text="Skills that are missing from candidate")
     skill_gap_percentage = models.DecimalField(
         max_digits=5, 
@@ -104,6 +138,8 @@ class CandidateRanking(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     last_ranked_at = models.DateTimeField(auto_now_add=True)
     
+    objects = CandidateRankingQuerySet.as_manager()
+    
     class Meta:
         unique_together = ('job_description', 'candidate')
         ordering = ['rank_position', '-overall_score']
@@ -123,10 +159,19 @@ class CandidateRanking(models.Model):
         """Return score as percentage string"""
         return f"{self.overall_score}%"
     
+    @property
+    def current_total_candidates(self):
+        """Current number of active rankings of the job (use ``with_totals()`` to avoid a query per row)"""
+        total = getattr(self, 'ranked_total', None)
+        if total is None:
+            total = CandidateRanking.objects.filter(job_description_id=self.job_description_id, status='active').count()
+            self.ranked_total = total
+        return total
+    
     @property
     def is_top_candidate(self):
         """Check if candidate is in top 10%"""
-        return self.rank_position <= max(1, self.total_candidates // 10)
+        return self.rank_position <= max(1, self.current_total_candidates // 10)
     
     @property
     def is_high_match(self):
@@ -162,6 +207,13 @@ class RankingBatch(models.Model):
     
     batch_id = models.CharField(max_length=20, unique=True, default=generate_batch_id, editable=False)
     job_description = models.ForeignKey(JobDescription, on_delete=models.CASCADE, related_name='ranking_batches')
+    run_id = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        db_index=True,
+        help_text="Multi-job re-ranking run (rerank_jobs) this batch belongs to"
+    )
     
     # Batch Details
     total_candidates = models.PositiveIntegerField(default=0)
@@ -173,14 +225,31 @@ class RankingBatch(models.Model):
         max_length=20,
         choices=[
             ('pending', 'Pending'),
+            ('queued', 'Queued'),
             ('processing', 'Processing'),
             ('completed', 'Completed'),
             ('failed', 'Failed'),
             ('partial', 'Partially Completed'),
+            ('cancelled', 'Cancelled'),
         ],
         default='pending'
     )
     
+    # Background Ranking Request (see ranking_queue.py)
+    criteria = models.ForeignKey(
+        'RankingCriteria',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='ranking_batches',
+        help_text="Criteria to rank with (default criteria if empty)"
+    )
+    candidate_ids = models.JSONField(default=list, blank=True, help_text="Database IDs of the candidates to rank, in order")
+    cancel_requested = models.BooleanField(default=False)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    worker_id = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(blank=True, null=True, help_text="Last progress report of the worker ranking the batch")
+    
     # Processing Details
     started_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(blank=True, null=True)
@@ -199,6 +268,9 @@ class RankingBatch(models.Model):
     
     class Meta:
         ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['status', 'started_at']),
+        ]
         verbose_name = "Ranking Batch"
         verbose_name_plural = "Ranking Batches"
     
@@ -216,6 +288,11 @@ class RankingBatch(models.Model):
     def is_completed(self):
         """Check if batch is completed"""
         return self.status in ['completed', 'partial']
+    
+    @property
+    def is_finished(self):
+        """Check if batch will not change any more"""
+        return self.status in ['completed', 'partial', 'failed', 'cancelled']
 
 
 class RankingCriteria(models.Model):
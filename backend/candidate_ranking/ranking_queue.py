@@ -0,0 +1,330 @@
+"""
+Background Ranking
+==================
+
+Ranking requests from the API run in the background, so a large job's
+ranking never holds an HTTP request open.
+
+``enqueue_ranking`` stores the request as a ``RankingBatch`` with
+``status='queued'`` (its criteria and candidate IDs) and returns at once.
+Queued batches are the queue, as with resume processing: workers claim
+them with an atomic conditional UPDATE. A worker scores the candidates and
+reports the progress counters every ``progress_interval`` candidates.
+Each report also refreshes the worker's heartbeat and checks for
+cancellation.
+
+``cancel_batch`` cancels a queued batch at once, or asks the worker to stop
+at its next report. A cancelled ranking leaves the job's rankings unchanged.
+``get_batch_progress`` reports the progress, throughput, ETA and phase
+(scoring, then saving the rankings) for the polling endpoint. A batch
+whose worker stopped reporting is requeued once its heartbeat goes stale.
+Reports only count while the reporting worker still owns the batch, so a
+worker that was merely slow stops at its next report and writes nothing.
+
+Workers run either:
+- inside the web process: ``settings.RANKING_WORKERS`` threads, started on
+  the first request (set to 0 to disable), or
+- in a dedicated process: ``python manage.py process_rankings``.
+
+Usage:
+    from .ranking_queue import enqueue_ranking, get_batch_progress, cancel_batch
+
+    batch = enqueue_ranking(job, candidate_ids, criteria, created_by=request.user)
+    get_batch_progress(batch)   # {'status': 'processing', 'percent': 40.0, 'eta_seconds': 12.5, ...}
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from resume_checker.models import Candidate, JobDescription
+
+from .models import RankingBatch, RankingCriteria
+from .services import APPLICANT_FIELDS, CandidateRankingService, RankingBatchLost, RankingCancelled
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 2.0
+# A processing batch without a progress report for this long is assumed abandoned (worker died)
+STALE_BATCH_SECONDS = 300
+STALE_CHECK_INTERVAL_SECONDS = 60
+MAX_ATTEMPTS = 2
+
+# Candidates loaded per query
+CANDIDATE_CHUNK_SIZE = 1000
+
+
+# ----------------------------------------------------------------------
+# Queue
+# ----------------------------------------------------------------------
+
+def enqueue_ranking(
+    job_description: JobDescription,
+    candidate_ids: List[int],
+    criteria: Optional[RankingCriteria] = None,
+    created_by=None,
+) -> RankingBatch:
+    """
+    Queue the ranking of candidates (database IDs, in tie-breaking order) for a job.
+    Embedded workers are woken once the surrounding transaction commits.
+    """
+    batch = RankingBatch.objects.create(
+        job_description=job_description,
+        criteria=criteria,
+        candidate_ids=list(candidate_ids),
+        total_candidates=len(candidate_ids),
+        created_by=created_by,
+        status='queued',
+    )
+    transaction.on_commit(ranking_worker_pool.notify)
+    return batch
+
+
+def claim_next_batch(worker_id: str) -> Optional[RankingBatch]:
+    """
+    Atomically claim the oldest queued batch.
+
+    Returns:
+        The claimed batch, or None if the queue is empty.
+    """
+    while True:
+        batch_pk = (
+            RankingBatch.objects.filter(status='queued')
+            .order_by('pk')
+            .values_list('pk', flat=True)
+            .first()
+        )
+        if batch_pk is None:
+            return None
+
+        # Only one worker can move the row out of 'queued'
+        claimed = RankingBatch.objects.filter(pk=batch_pk, status='queued').update(
+            status='processing',
+            worker_id=worker_id,
+            locked_at=timezone.now(),
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return RankingBatch.objects.select_related('job_description', 'criteria', 'created_by').get(pk=batch_pk)
+        # Lost the race to another worker; try the next batch
+
+
+def requeue_stale_batches() -> int:
+    """Requeue processing batches whose worker stopped reporting progress."""
+    cutoff = timezone.now() - timedelta(seconds=STALE_BATCH_SECONDS)
+    stale = RankingBatch.objects.filter(status='processing', locked_at__lt=cutoff)
+    requeued = stale.filter(attempts__lt=MAX_ATTEMPTS, cancel_requested=False).update(
+        status='queued', worker_id='', locked_at=None
+    )
+    stale.update(
+        status='failed',
+        error_message='Worker stopped while ranking the batch',
+        completed_at=timezone.now(),
+    )
+    if requeued:
+        logger.warning(f"Requeued {requeued} stale ranking batches")
+    return requeued
+
+
+def cancel_batch(batch: RankingBatch) -> RankingBatch:
+    """
+    Cancel a queued batch, or ask the worker ranking it to stop. Finished batches are left as they are.
+
+    Returns:
+        The batch, refreshed
+    """
+    if not RankingBatch.objects.filter(pk=batch.pk, status='queued').update(
+        status='cancelled', cancel_requested=True, completed_at=timezone.now()
+    ):
+        RankingBatch.objects.filter(pk=batch.pk, status='processing').update(cancel_requested=True)
+    batch.refresh_from_db()
+    return batch
+
+
+def load_candidates(candidate_ids: List[int]) -> List[Candidate]:
+    """The candidates the ranking algorithm needs, in ``candidate_ids`` order, loaded in chunks."""
+    found = {}
+    for start in range(0, len(candidate_ids), CANDIDATE_CHUNK_SIZE):
+        chunk = candidate_ids[start:start + CANDIDATE_CHUNK_SIZE]
+        found.update((candidate.pk, candidate) for candidate in Candidate.objects.filter(pk__in=chunk).only(*APPLICANT_FIELDS))
+    # Candidates deleted since the request are skipped
+    return [found[candidate_id] for candidate_id in candidate_ids if candidate_id in found]
+
+
+def run_batch(batch: RankingBatch) -> bool:
+    """
+    Rank a claimed batch and record the outcome.
+
+    Returns:
+        True if the ranking completed.
+    """
+    def report(batch):
+        # One query reports the counters, refreshes the heartbeat and checks for cancellation,
+        # as long as this worker still owns the batch (a stale batch is requeued to another)
+        owned = RankingBatch.objects.filter(pk=batch.pk, status='processing', worker_id=batch.worker_id)
+        if not owned.filter(cancel_requested=False).update(
+            total_candidates=batch.total_candidates,
+            ranked_candidates=batch.ranked_candidates,
+            failed_rankings=batch.failed_rankings,
+            locked_at=timezone.now(),
+        ):
+            if owned.exists():
+                raise RankingCancelled()
+            raise RankingBatchLost()
+
+    try:
+        service = CandidateRankingService(batch.criteria)
+        candidates = load_candidates(batch.candidate_ids)
+        service.rank_candidates_for_job(
+            batch.job_description, candidates, created_by=batch.created_by, batch=batch, progress=report
+        )
+    except (RankingCancelled, RankingBatchLost):
+        return False
+    except Exception as e:
+        logger.exception(f"Error ranking batch {batch.batch_id}")
+        if batch.status != 'failed':
+            # Failed before rank_candidates_for_job recorded it
+            RankingBatch.objects.filter(pk=batch.pk).update(
+                status='failed', error_message=str(e), completed_at=timezone.now()
+            )
+        return False
+
+    logger.info(f"Ranked batch {batch.batch_id}: {batch.ranked_candidates} candidates "
+                f"in {batch.processing_time_seconds}s")
+    return True
+
+
+def get_batch_progress(batch: RankingBatch) -> Dict[str, Any]:
+    """Progress, throughput and ETA of a batch for status endpoints."""
+    processed = batch.ranked_candidates + batch.failed_rankings
+    total = batch.total_candidates
+    data = {
+        'batch_id': batch.batch_id,
+        'job_id': batch.job_description.job_id,
+        'status': batch.status,
+        'total_candidates': total,
+        'ranked_candidates': batch.ranked_candidates,
+        'failed_rankings': batch.failed_rankings,
+        'percent': round(processed / total * 100, 1) if total else (100.0 if batch.is_finished else 0.0),
+        'cancel_requested': batch.cancel_requested,
+        'elapsed_seconds': None,
+        'candidates_per_second': None,
+        'eta_seconds': None,
+        'started_at': batch.started_at.isoformat(),
+        'completed_at': batch.completed_at.isoformat() if batch.completed_at else None,
+        'processing_time_seconds': batch.processing_time_seconds,
+        'error_message': batch.error_message,
+    }
+    if batch.status == 'queued':
+        data['queue_position'] = RankingBatch.objects.filter(status='queued', pk__lt=batch.pk).count() + 1
+    elif batch.status != 'pending':
+        elapsed = ((batch.completed_at or timezone.now()) - batch.started_at).total_seconds()
+        data['elapsed_seconds'] = round(elapsed, 1)
+        if elapsed > 0 and processed:
+            throughput = processed / elapsed
+            data['candidates_per_second'] = round(throughput, 1)
+            if batch.status == 'processing':
+                # Scoring only; the rankings are written once every candidate is scored
+                data['eta_seconds'] = round(max(0, total - processed) / throughput, 1)
+    if batch.status == 'processing':
+        data['phase'] = 'saving' if processed >= total else 'scoring'
+    return data
+
+
+# ----------------------------------------------------------------------
+# Worker pool
+# ----------------------------------------------------------------------
+
+class RankingWorkerPool:
+    """
+    Threads that drain the ranking queue.
+
+    Idle workers poll the queue every ``poll_interval`` seconds and are woken
+    immediately by ``notify`` when a request in this process enqueues a batch.
+    """
+
+    def __init__(self, size: int = 1, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._last_stale_check = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running or self.size <= 0:
+                return
+            self._stop.clear()
+            prefix = f"{socket.gethostname()}:{os.getpid()}"
+            self._threads = [
+                threading.Thread(
+                    target=self._run, args=(f"{prefix}:{index}",),
+                    name=f"ranking-worker-{index}", daemon=True
+                )
+                for index in range(self.size)
+            ]
+            for thread in self._threads:
+                thread.start()
+            logger.info(f"Started {self.size} ranking workers")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake idle workers, starting the embedded pool on first use."""
+        if not self.is_running and getattr(settings, 'RANKING_WORKERS', 0) > 0:
+            self.size = settings.RANKING_WORKERS
+            self.start()
+        self._wakeup.set()
+
+    def drain(self, worker_id: str) -> int:
+        """Rank batches in the calling thread until the queue is empty."""
+        processed = 0
+        while not self._stop.is_set():
+            batch = claim_next_batch(worker_id)
+            if batch is None:
+                break
+            run_batch(batch)
+            processed += 1
+        return processed
+
+    def _maybe_requeue_stale(self) -> None:
+        now = time.monotonic()
+        if now - self._last_stale_check >= STALE_CHECK_INTERVAL_SECONDS:
+            self._last_stale_check = now
+            requeue_stale_batches()
+
+    def _run(self, worker_id: str) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    close_old_connections()
+                    self._maybe_requeue_stale()
+                    self.drain(worker_id)
+                except Exception:
+                    logger.exception(f"Ranking worker {worker_id} error")
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+        finally:
+            connection.close()
+
+
+ranking_worker_pool = RankingWorkerPool(size=getattr(settings, 'RANKING_WORKERS', 1))
@@ -0,0 +1,224 @@
+"""
+Multi-Job Re-ranking
+====================
+
+Re-ranks many jobs at once, for backfills and nightly re-ranks
+(``python manage.py rerank_jobs``).
+
+A run gets a run ID and one pending ``RankingBatch`` per selected job, all
+created up front with the run's criteria. The batches are the run's
+checkpoint. Jobs are
+partitioned into tasks of ``jobs_per_task`` jobs, largest first, and ranked
+across a process pool. Each job's applicants are loaded with one
+projection-only query (``CandidateRankingService.applicant_candidates``).
+Its rankings are replaced in one transaction, and its batch is marked
+completed or failed.
+
+An interrupted run is resumed by its run ID, with the criteria it was
+started with. Its completed batches are skipped. Batches left in
+``processing`` by a crashed worker are ranked again.
+
+Usage:
+    from .rerank import rerank_engine
+
+    job_ids = rerank_engine.select_jobs(since=yesterday)
+    result = rerank_engine.start(job_ids, workers=4)
+    result = rerank_engine.resume(result.run_id, workers=4)
+"""
+
+import logging
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from django.db import connections
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+
+from resume_checker.models import Application, JobDescription
+
+from .models import CandidateRanking, RankingBatch, RankingCriteria, generate_run_id
+from .services import CandidateRankingService
+
+logger = logging.getLogger(__name__)
+
+
+class JobOutcome(NamedTuple):
+    batch_id: str
+    job_id: int
+    status: str          # 'completed' or 'failed'
+    ranked: int
+    error: str = ''
+
+
+class RerankResult(NamedTuple):
+    run_id: str
+    total_jobs: int
+    completed: int       # Including jobs completed before a resume
+    failed: int
+    ranked_candidates: int
+    seconds: float
+
+
+def _init_worker() -> None:
+    """Process pool initializer: set Django up in processes that were not forked from a configured one."""
+    from django.apps import apps
+
+    if not apps.ready:
+        import django
+        django.setup()
+
+
+def rank_batches(batch_ids: List[int]) -> List[JobOutcome]:
+    """
+    Rank the jobs of pending batches (by batch primary key), each with its batch's
+    criteria. Runs in pool workers, so it only takes and returns picklable values.
+    """
+    services: Dict[Optional[int], CandidateRankingService] = {}
+    outcomes = []
+    batches = (
+        RankingBatch.objects.filter(pk__in=batch_ids).exclude(status='completed')
+        .select_related('job_description', 'criteria')
+    )
+    for batch in batches:
+        job = batch.job_description
+        try:
+            if batch.criteria_id not in services:
+                services[batch.criteria_id] = CandidateRankingService(batch.criteria)
+            service = services[batch.criteria_id]
+            candidates = list(service.applicant_candidates(job))
+            service.rank_candidates_for_job(job, candidates, batch=batch)
+            outcomes.append(JobOutcome(batch.batch_id, job.pk, batch.status, batch.ranked_candidates))
+        except Exception as e:
+            logger.error(f"Re-ranking job {job.job_id} failed: {e}")
+            if batch.status != 'failed':
+                # Failed before rank_candidates_for_job recorded it
+                RankingBatch.objects.filter(pk=batch.pk).update(
+                    status='failed', error_message=str(e), completed_at=timezone.now()
+                )
+            outcomes.append(JobOutcome(batch.batch_id, job.pk, 'failed', 0, str(e)))
+    return outcomes
+
+
+class RerankEngine:
+    """
+    Selects jobs to re-rank and ranks them in checkpointed, parallel runs.
+    """
+
+    def __init__(self, jobs_per_task: int = 10):
+        self.jobs_per_task = jobs_per_task
+
+    def select_jobs(
+        self,
+        since: Optional[datetime] = None,
+        job_ids: Optional[List[int]] = None,
+        statuses: Optional[List[str]] = None,
+        missing_only: bool = False,
+        criteria: Optional[RankingCriteria] = None,
+    ) -> List[int]:
+        """
+        IDs of the jobs to re-rank: jobs with applications, narrowed by the filters.
+
+        Args:
+            since: Only jobs that changed since then: the job itself, a new
+                application or an applicant's profile. Ignored when ``criteria``
+                was changed since then, as its weights affect every job.
+            job_ids: Only these jobs
+            statuses: Only jobs in these statuses (e.g. ['active'])
+            missing_only: Only jobs that have no rankings yet
+            criteria: Criteria the run will rank with
+        """
+        jobs = JobDescription.objects.filter(Exists(Application.objects.filter(job_description=OuterRef('pk'))))
+        if job_ids:
+            jobs = jobs.filter(pk__in=job_ids)
+        if statuses:
+            jobs = jobs.filter(status__in=statuses)
+        if missing_only:
+            jobs = jobs.exclude(Exists(CandidateRanking.objects.filter(job_description=OuterRef('pk'))))
+        if since is not None and not (criteria and criteria.updated_at >= since):
+            changed_applications = Application.objects.filter(job_description=OuterRef('pk')).filter(
+                Q(applied_at__gte=since) | Q(candidate__updated_at__gte=since)
+            )
+            jobs = jobs.filter(Q(updated_at__gte=since) | Exists(changed_applications))
+        return list(jobs.order_by('pk').values_list('pk', flat=True))
+
+    def start(
+        self,
+        job_ids: List[int],
+        criteria: Optional[RankingCriteria] = None,
+        workers: int = 1,
+        created_by=None,
+        progress: Optional[Callable[[JobOutcome, int, int], None]] = None,
+    ) -> RerankResult:
+        """Create a run with a pending batch per job, ranked with ``criteria`` (default criteria if None), and rank them."""
+        run_id = generate_run_id()
+        CandidateRankingService(criteria).create_pending_batches(job_ids, run_id=run_id, created_by=created_by)
+        logger.info(f"Created re-ranking run {run_id} for {len(job_ids)} jobs")
+        return self.resume(run_id, workers, progress)
+
+    def resume(
+        self,
+        run_id: str,
+        workers: int = 1,
+        progress: Optional[Callable[[JobOutcome, int, int], None]] = None,
+    ) -> RerankResult:
+        """
+        Rank the batches of ``run_id`` that are not completed, with the criteria the run was started with.
+
+        Args:
+            run_id: Run to (continue to) rank
+            workers: Worker processes; 1 ranks in this process
+            progress: Called with each job's outcome, the number of jobs done and the run's total
+        """
+        started = time.monotonic()
+        run = RankingBatch.objects.filter(run_id=run_id)
+        total = run.count()
+        done = run.filter(status='completed').count()
+
+        # Largest jobs first, so the last tasks to finish are short ones
+        pending = list(
+            run.exclude(status='completed')
+            .annotate(applicants=Count('job_description__applications'))
+            .order_by('-applicants', 'pk')
+            .values_list('pk', flat=True)
+        )
+        tasks = [pending[i:i + self.jobs_per_task] for i in range(0, len(pending), self.jobs_per_task)]
+        logger.info(f"Re-ranking run {run_id}: {len(pending)} of {total} jobs to rank, {workers} workers")
+
+        failed = ranked = 0
+
+        def record(outcomes):
+            nonlocal done, failed, ranked
+            for outcome in outcomes:
+                if outcome.status == 'failed':
+                    failed += 1
+                else:
+                    done += 1
+                    ranked += outcome.ranked
+                if progress:
+                    progress(outcome, done + failed, total)
+
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                record(rank_batches(task))
+        else:
+            # Forked workers must not share the parent's database connections
+            connections.close_all()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+                futures = [executor.submit(rank_batches, task) for task in tasks]
+                for future in as_completed(futures):
+                    record(future.result())
+
+        return RerankResult(run_id, total, done, failed, ranked, time.monotonic() - started)
+
+    def latest_run_id(self) -> Optional[str]:
+        """The most recently started run, if any."""
+        return (
+            RankingBatch.objects.exclude(run_id='').order_by('-pk')
+            .values_list('run_id', flat=True).first()
+        )
+
+
+# Global instance
+rerank_engine = RerankEngine()
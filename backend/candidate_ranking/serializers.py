@@ -24,6 +24,7 @@ class CandidateRankingSerializer(serializers.ModelSerializer):
     job_company = serializers.CharField(source='job_description.company', read_only=True)
     candidate_name = serializers.CharField(source='candidate.full_name', read_only=True)
     candidate_email = serializers.CharField(source='candidate.email', read_only=True)
+    total_candidates = serializers.IntegerField(source='current_total_candidates', read_only=True)
     
     # AI Analysis fields (if available)
     ai_analysis_available = serializers.SerializerMethodField()
@@ -1,14 +1,39 @@
 from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from django.core.exceptions import ValidationError
-from typing import List, Dict, Tuple, Optional
+from typing import Callable, List, Dict, Set, Tuple, Optional
 import logging
 
-from .models import CandidateRanking, RankingBatch, RankingCriteria
+from .analytics import ranking_analytics
+from .models import CandidateRanking, RankingBatch, RankingCriteria, generate_batch_id, generate_ranking_id
 from resume_checker.models import JobDescription, Candidate, Application
+from resume_checker.skill_matcher import skill_matcher, TECHNICAL_CATEGORIES
+from resume_checker.skill_index import skill_index
+from resume_checker.skill_vocabulary import skill_vocabulary
 
 logger = logging.getLogger(__name__)
 
+# Candidate columns the ranking algorithm reads
+APPLICANT_FIELDS = (
+    'id', 'candidate_id', 'skills', 'skill_ids', 'total_experience_years',
+    'highest_education', 'city', 'state', 'updated_at',
+)
+
+# Batch fields a ranking run writes (saved by name, so a concurrent cancel request is not overwritten)
+BATCH_PROGRESS_FIELDS = [
+    'status', 'total_candidates', 'ranked_candidates', 'failed_rankings', 'started_at',
+    'completed_at', 'processing_time_seconds', 'error_message',
+]
+
+
+class RankingCancelled(Exception):
+    """A progress callback stopped the ranking (the batch was cancelled)."""
+
+
+class RankingBatchLost(Exception):
+    """A progress callback found the batch taken over by another worker; nothing more may be written to it."""
+
 
 class CandidateRankingService:
     """
@@ -16,6 +41,12 @@ class CandidateRankingService:
     Implements a simple skill-based matching algorithm.
     """
     
+    # Ranking rows written per INSERT
+    bulk_batch_size = 1000
+    
+    # Candidates scored between progress reports
+    progress_interval = 500
+    
     def __init__(self, criteria: Optional[RankingCriteria] = None):
         """
         Initialize the ranking service with optional custom criteria.
@@ -43,7 +74,9 @@ class CandidateRankingService:
         self, 
         job_description: JobDescription, 
         candidates: List[Candidate],
-        created_by=None
+        created_by=None,
+        batch: Optional[RankingBatch] = None,
+        progress: Optional[Callable[[RankingBatch], None]] = None
     ) -> RankingBatch:
         """
         Rank candidates for a specific job.
@@ -52,104 +85,283 @@ class CandidateRankingService:
             job_description: The job to rank candidates for
             candidates: List of candidates to rank
             created_by: User who initiated the ranking
+            batch: Pending batch to record the ranking in (a new one is created if None)
+            progress: Called with the batch every ``progress_interval`` scored candidates,
+                once all are scored, and once more inside the transaction that writes
+                the rankings. It may raise RankingCancelled or RankingBatchLost to stop;
+                the job's rankings are then left unchanged.
             
         Returns:
             RankingBatch: The batch containing all ranking results
+        
+        Raises:
+            RankingCancelled: If ``progress`` cancelled the ranking (the batch is marked cancelled)
+            RankingBatchLost: If ``progress`` found the batch owned by another worker (the batch is not written)
         """
         logger.info(f"Starting ranking for job {job_description.job_id} with {len(candidates)} candidates")
         
-        # Create ranking batch
-        batch = RankingBatch.objects.create(
-            job_description=job_description,
-            total_candidates=len(candidates),
-            created_by=created_by,
-            status='processing'
-        )
+        if batch is None:
+            # Create ranking batch
+            batch = RankingBatch.objects.create(
+                job_description=job_description,
+                total_candidates=len(candidates),
+                created_by=created_by,
+                status='processing'
+            )
+        else:
+            batch.total_candidates = len(candidates)
+            batch.ranked_candidates = batch.failed_rankings = 0
+            batch.status = 'processing'
+            batch.started_at = timezone.now()
+            batch.error_message = None
+            batch.save(update_fields=BATCH_PROGRESS_FIELDS)
         
         try:
-            # Clear existing rankings for this job
-            CandidateRanking.objects.filter(job_description=job_description).delete()
-            
-            # Calculate scores for all candidates
+            # Calculate scores for all candidates; the skills every candidate shares
+            # with the job come from the skill index in one go
+            job_skills = self._job_skill_ids(job_description)
+            matched_skills = skill_index.matched_skill_ids(candidates, job_skills)
             ranking_results = []
-            for candidate in candidates:
+            for index, (candidate, matched) in enumerate(zip(candidates, matched_skills), 1):
                 try:
-                    score_data = self._calculate_candidate_score(job_description, candidate)
+                    score_data = self._calculate_candidate_score(job_description, candidate, (job_skills, matched))
                     ranking_results.append((candidate, score_data))
                     batch.ranked_candidates += 1
                 except Exception as e:
                     logger.error(f"Failed to rank candidate {candidate.candidate_id}: {str(e)}")
                     batch.failed_rankings += 1
+                if progress and index % self.progress_interval == 0:
+                    progress(batch)
+            if progress:
+                progress(batch)
             
             # Sort by overall score (descending)
             ranking_results.sort(key=lambda x: x[1]['overall_score'], reverse=True)
             
-            # Create ranking records
-            with transaction.atomic():
-                for rank_position, (candidate, score_data) in enumerate(ranking_results, 1):
-                    # Get or create application
-                    application = None
-                    try:
-                        application = Application.objects.get(
-                            job_description=job_description,
-                            candidate=candidate
-                        )
-                    except Application.DoesNotExist:
-                        pass
-                    
-                    # Create ranking record
-                    CandidateRanking.objects.create(
-                        job_description=job_description,
-                        candidate=candidate,
-                        application=application,
-                        overall_score=score_data['overall_score'],
-                        skill_match_score=score_data['skill_match_score'],
-                        experience_match_score=score_data['experience_match_score'],
-                        education_match_score=score_data['education_match_score'],
-                        location_match_score=score_data['location_match_score'],
-                        rank_position=rank_position,
-                        total_candidates=len(candidates),
-                        matched_skills=score_data['matched_skills'],
-                        missing_skills=score_data['missing_skills'],
-                        skill_gap_percentage=score_data['skill_gap_percentage'],
-                        experience_years=candidate.total_experience_years,
-                        required_experience_years=job_description.min_experience_years,
-                        experience_gap=candidate.total_experience_years - job_description.min_experience_years,
-                        last_ranked_at=timezone.now()
-                    )
+            # Applications of the job, looked up in one query
+            applications = {
+                application.candidate_id: application
+                for application in Application.objects.filter(job_description=job_description)
+            }
             
-            # Update batch status
-            batch.status = 'completed'
-            batch.completed_at = timezone.now()
-            batch.processing_time_seconds = int((batch.completed_at - batch.started_at).total_seconds())
-            batch.save()
+            # Build ranking records in memory and write them in chunks (bulk_create skips
+            # save() and signals, so matched_skill_ids comes from _ranking_fields)
+            rankings = [
+                CandidateRanking(
+                    job_description=job_description,
+                    candidate=candidate,
+                    application=applications.get(candidate.pk),
+                    rank_position=rank_position,
+                    total_candidates=len(candidates),
+                    **self._ranking_fields(job_description, candidate, score_data)
+                )
+                for rank_position, (candidate, score_data) in enumerate(ranking_results, 1)
+            ]
+            with transaction.atomic():
+                if progress:
+                    # Checked in the write transaction, so a batch cancelled or taken over
+                    # since the last report cannot have its rankings written
+                    progress(batch)
+                # Replace the job's existing rankings
+                CandidateRanking.objects.filter(job_description=job_description).delete()
+                self.assign_unique_ids(rankings, 'ranking_id', generate_ranking_id)
+                CandidateRanking.objects.bulk_create(rankings, batch_size=self.bulk_batch_size)
+                ranking_analytics.invalidate(job_description.pk)
+                
+                # Update batch status
+                batch.status = 'completed'
+                batch.completed_at = timezone.now()
+                batch.processing_time_seconds = int((batch.completed_at - batch.started_at).total_seconds())
+                batch.save(update_fields=BATCH_PROGRESS_FIELDS)
             
             logger.info(f"Completed ranking for job {job_description.job_id}. "
                        f"Ranked: {batch.ranked_candidates}, Failed: {batch.failed_rankings}")
             
             return batch
             
+        except RankingCancelled:
+            logger.info(f"Ranking batch {batch.batch_id} cancelled")
+            batch.status = 'cancelled'
+            batch.completed_at = timezone.now()
+            batch.processing_time_seconds = int((batch.completed_at - batch.started_at).total_seconds())
+            batch.save(update_fields=BATCH_PROGRESS_FIELDS)
+            raise
+        except RankingBatchLost:
+            logger.warning(f"Ranking batch {batch.batch_id} was taken over by another worker; stopping")
+            raise
         except Exception as e:
             logger.error(f"Failed to complete ranking batch {batch.batch_id}: {str(e)}")
             batch.status = 'failed'
             batch.error_message = str(e)
             batch.completed_at = timezone.now()
-            batch.save()
+            batch.save(update_fields=BATCH_PROGRESS_FIELDS)
             raise
     
-    def _calculate_candidate_score(self, job: JobDescription, candidate: Candidate) -> Dict:
+    def rank_candidate_incrementally(
+        self,
+        job_description: JobDescription,
+        candidate: Candidate,
+        application: Optional[Application] = None
+    ) -> CandidateRanking:
+        """
+        Score one new or changed candidate and insert it into the job's existing ranking.
+        
+        Only this candidate is scored. It goes ahead of every candidate with a
+        lower score and behind those with a higher one; among equal scores the
+        most recently ranked comes first, as with the newest-first application
+        order a full ranking uses. The rows after it shift in one bulk UPDATE.
+        A changed candidate keeps its ranking row (and HR notes), moved to its
+        new position. Other rows' ``total_candidates`` are not rewritten; read
+        the current total with ``CandidateRanking.objects.with_totals()``.
+        
+        If the stored ranking does not cover the job's other applicants (never
+        ranked, or candidates missing), the job is ranked in full instead.
+        
+        Args:
+            job_description: The job to rank the candidate for
+            candidate: New or changed candidate
+            application: The candidate's application for the job, if any
+            
+        Returns:
+            CandidateRanking: The candidate's ranking
+        """
+        score_data = self._calculate_candidate_score(job_description, candidate)
+        score = score_data['overall_score']
+        
+        with transaction.atomic():
+            # Serialize ranking updates of the job, so concurrent applications do not interleave position shifts
+            list(JobDescription.objects.select_for_update().filter(pk=job_description.pk).values_list('pk'))
+            
+            rankings = CandidateRanking.objects.filter(job_description=job_description)
+            others = rankings.exclude(candidate=candidate)
+            other_applicants = Application.objects.filter(job_description=job_description).exclude(candidate=candidate)
+            if others.count() != other_applicants.count():
+                logger.info(f"Ranking for job {job_description.job_id} is incomplete; ranking all applicants")
+                applicants = list(self.applicant_candidates(job_description))
+                if candidate.pk not in {applicant.pk for applicant in applicants}:
+                    applicants.append(candidate)
+                self.rank_candidates_for_job(job_description, applicants)
+                return rankings.get(candidate=candidate)
+            
+            ranking = rankings.filter(candidate=candidate).first()
+            if ranking:
+                # Close the gap at the old position
+                others.filter(rank_position__gt=ranking.rank_position).update(rank_position=F('rank_position') - 1)
+            
+            rank_position = others.filter(overall_score__gt=score).count() + 1
+            others.filter(rank_position__gte=rank_position).update(rank_position=F('rank_position') + 1)
+            
+            fields = self._ranking_fields(job_description, candidate, score_data)
+            fields.update(rank_position=rank_position, total_candidates=others.count() + 1)
+            if application is None:
+                application = Application.objects.filter(job_description=job_description, candidate=candidate).first()
+            if ranking:
+                for field, value in fields.items():
+                    setattr(ranking, field, value)
+                ranking.application = application or ranking.application
+                ranking.save()
+            else:
+                ranking = CandidateRanking.objects.create(
+                    job_description=job_description,
+                    candidate=candidate,
+                    application=application,
+                    **fields
+                )
+        
+        logger.info(f"Ranked candidate {candidate.candidate_id} #{rank_position} of "
+                    f"{fields['total_candidates']} for job {job_description.job_id}")
+        return ranking
+    
+    def applicant_candidates(self, job_description: JobDescription):
+        """
+        Candidates who applied to the job, newest application first, loading
+        only the columns the ranking algorithm reads.
+        """
+        return (
+            Candidate.objects.filter(applications__job_description=job_description)
+            .only(*APPLICANT_FIELDS)
+            .order_by('-applications__applied_at')
+        )
+    
+    def create_pending_batches(self, job_ids: List[int], run_id: str = '', created_by=None) -> List[RankingBatch]:
+        """
+        Create one pending batch per job, to be ranked later with ``rank_candidates_for_job(batch=...)``.
+        Each batch records this service's criteria, so it is ranked with them whenever it runs.
+        """
+        batches = [
+            RankingBatch(
+                job_description_id=job_id, criteria=self.criteria, run_id=run_id,
+                created_by=created_by, status='pending'
+            )
+            for job_id in job_ids
+        ]
+        with transaction.atomic():
+            self.assign_unique_ids(batches, 'batch_id', generate_batch_id)
+            return RankingBatch.objects.bulk_create(batches, batch_size=self.bulk_batch_size)
+    
+    def assign_unique_ids(self, records: List, field: str, generate) -> None:
+        """
+        Make the ``field`` value of every record unique among ``records`` and the
+        stored rows, regenerating clashes with ``generate``. Short random IDs
+        collide in large batches, and one clash would fail the whole bulk insert.
+        """
+        if not records:
+            return
+        model = type(records[0])
+        used = set()
+        pending = records
+        while pending:
+            values = [getattr(record, field) for record in pending]
+            stored = set()
+            for start in range(0, len(values), self.bulk_batch_size):
+                stored.update(
+                    model.objects.filter(**{f'{field}__in': values[start:start + self.bulk_batch_size]})
+                    .values_list(field, flat=True)
+                )
+            clashes = []
+            for record in pending:
+                if getattr(record, field) in stored or getattr(record, field) in used:
+                    setattr(record, field, generate())
+                    clashes.append(record)
+                else:
+                    used.add(getattr(record, field))
+            # Regenerated IDs are checked again
+            pending = clashes
+    
+    def _ranking_fields(self, job: JobDescription, candidate: Candidate, score_data: Dict) -> Dict:
+        """CandidateRanking score and analysis fields from ``_calculate_candidate_score`` output."""
+        return {
+            'overall_score': score_data['overall_score'],
+            'skill_match_score': score_data['skill_match_score'],
+            'experience_match_score': score_data['experience_match_score'],
+            'education_match_score': score_data['education_match_score'],
+            'location_match_score': score_data['location_match_score'],
+            'matched_skills': score_data['matched_skills'],
+            'matched_skill_ids': score_data['matched_skill_ids'],
+            'missing_skills': score_data['missing_skills'],
+            'skill_gap_percentage': score_data['skill_gap_percentage'],
+            'experience_years': candidate.total_experience_years,
+            'required_experience_years': job.min_experience_years,
+            'experience_gap': candidate.total_experience_years - job.min_experience_years,
+            'last_ranked_at': timezone.now(),
+        }
+    
+    def _calculate_candidate_score(
+        self, job: JobDescription, candidate: Candidate, skill_match: Optional[Tuple[Set[int], List[int]]] = None
+    ) -> Dict:
         """
         Calculate comprehensive score for a candidate against a job.
         
         Args:
             job: Job description
             candidate: Candidate to score
+            skill_match: The job's skill IDs and those the candidate shares (worked out here if None)
             
         Returns:
             Dict containing all score components and analysis
         """
         # Calculate individual scores
-        skill_score = self._calculate_skill_score(job, candidate)
+        skill_score = self._calculate_skill_score(job, candidate, skill_match)
         experience_score = self._calculate_experience_score(job, candidate)
         education_score = self._calculate_education_score(job, candidate)
         location_score = self._calculate_location_score(job, candidate)
@@ -169,41 +381,43 @@ class CandidateRankingService:
             'education_match_score': education_score,
             'location_match_score': location_score,
             'matched_skills': skill_score['matched_skills'],
+            'matched_skill_ids': skill_score['matched_skill_ids'],
             'missing_skills': skill_score['missing_skills'],
             'skill_gap_percentage': skill_score['gap_percentage']
         }
     
-    def _calculate_skill_score(self, job: JobDescription, candidate: Candidate) -> Dict:
+    def _job_skill_ids(self, job: JobDescription) -> Set[int]:
+        """
+        The job's skill IDs (from extracted_skills or parse description). Rows saved
+        without IDs are looked up read-only: skills not in the vocabulary are left out.
+        """
+        if job.extracted_skills and isinstance(job.extracted_skills, list):
+            return set(job.skill_ids or skill_vocabulary.ids(job.extracted_skills, create=False))
+        # Simple skill extraction from description
+        return set(skill_vocabulary.ids(self._extract_skills_from_text(job.description), create=False))
+    
+    def _calculate_skill_score(
+        self, job: JobDescription, candidate: Candidate, skill_match: Optional[Tuple[Set[int], List[int]]] = None
+    ) -> Dict:
         """
         Calculate skill matching score using traditional logic.
         
         Args:
             job: Job description
             candidate: Candidate to evaluate
+            skill_match: The job's skill IDs and those the candidate shares (worked out here if None)
             
         Returns:
             Dict with score and skill analysis
         """
-        # Get job skills (from extracted_skills or parse description)
-        job_skills = set()
-        if job.extracted_skills:
-            if isinstance(job.extracted_skills, list):
-                job_skills = set(skill.lower().strip() for skill in job.extracted_skills)
-            else:
-                # Handle case where extracted_skills might be a string or other format
-                job_skills = self._extract_skills_from_text(job.description)
+        if skill_match is None:
+            job_skills = self._job_skill_ids(job)
+            candidate_skills = set(candidate.skill_ids or skill_vocabulary.ids(candidate.skills, create=False))
+            matched_skills = job_skills.intersection(candidate_skills)
         else:
-            # Simple skill extraction from description
-            job_skills = self._extract_skills_from_text(job.description)
-        
-        # Get candidate skills
-        candidate_skills = set()
-        if candidate.skills:
-            candidate_skills = set(skill.lower().strip() for skill in candidate.skills)
-        
-        # Calculate matches
-        matched_skills = job_skills.intersection(candidate_skills)
-        missing_skills = job_skills - candidate_skills
+            job_skills, matched = skill_match
+            matched_skills = set(matched)
+        missing_skills = job_skills - matched_skills
         
         # Calculate score
         if not job_skills:
@@ -219,8 +433,9 @@ class CandidateRankingService:
         
         return {
             'score': round(score, 2),
-            'matched_skills': list(matched_skills),
-            'missing_skills': list(missing_skills),
+            'matched_skills': skill_vocabulary.names(sorted(matched_skills)),
+            'matched_skill_ids': sorted(matched_skills),
+            'missing_skills': skill_vocabulary.names(sorted(missing_skills)),
             'gap_percentage': round(gap_percentage, 2)
         }
     
@@ -325,32 +540,15 @@ class CandidateRankingService:
     
     def _extract_skills_from_text(self, text: str) -> set:
         """
-        Simple skill extraction from text.
-        This is a basic implementation - can be enhanced with NLP.
+        Extract skills from text with the shared skill matcher.
         
         Args:
             text: Text to extract skills from
             
         Returns:
-            Set of extracted skills
-        """
-        # Common technical skills
-        common_skills = {
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'node.js',
-            'sql', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'docker',
-            'kubernetes', 'git', 'agile', 'scrum', 'machine learning', 'ai',
-            'data science', 'html', 'css', 'php', 'c++', 'c#', '.net', 'spring',
-            'django', 'flask', 'express', 'typescript', 'redux', 'vuex'
-        }
-        
-        text_lower = text.lower()
-        found_skills = set()
-        
-        for skill in common_skills:
-            if skill in text_lower:
-                found_skills.add(skill)
-        
-        return found_skills
+            Set of canonical (lowercase) skill IDs
+        """
+        return set(skill_matcher.extract(text or '', categories=TECHNICAL_CATEGORIES))
     
     def get_top_candidates(self, job_description: JobDescription, limit: int = 10) -> List[CandidateRanking]:
         """
@@ -366,7 +564,7 @@ class CandidateRankingService:
         return CandidateRanking.objects.filter(
             job_description=job_description,
             status='active'
-        ).order_by('rank_position')[:limit]
+        ).with_totals().order_by('rank_position')[:limit]
     
     def get_candidate_rankings(self, candidate: Candidate) -> List[CandidateRanking]:
         """
@@ -381,7 +579,7 @@ class CandidateRankingService:
         return CandidateRanking.objects.filter(
             candidate=candidate,
             status='active'
-        ).order_by('-overall_score')
+        ).with_totals().order_by('-overall_score')
     
     def update_ranking_status(
         self, 
@@ -0,0 +1,38 @@
+"""
+Keep cached ranking analytics in step with ranking changes.
+"""
+
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from resume_checker.models import Application, Candidate, JobDescription
+
+from .analytics import ranking_analytics
+from .models import CandidateRanking
+
+
+@receiver(post_save, sender=CandidateRanking)
+def invalidate_ranking_analytics(sender, instance, **kwargs):
+    # No post_delete receiver: it would make Django fetch every row of a bulk
+    # ranking delete; the service invalidates after replacing a job's rankings
+    ranking_analytics.invalidate(instance.job_description_id)
+
+
+# Rankings also go away with their job, candidate or application (CASCADE).
+# These models cascade to other rows anyway, so the receivers cost no fast delete.
+
+@receiver(pre_delete, sender=JobDescription)
+def invalidate_deleted_job_analytics(sender, instance, **kwargs):
+    ranking_analytics.invalidate(instance.pk)
+
+
+@receiver(pre_delete, sender=Candidate)
+def invalidate_candidate_job_analytics(sender, instance, **kwargs):
+    job_ids = CandidateRanking.objects.filter(candidate=instance).values_list('job_description_id', flat=True)
+    for job_id in set(job_ids):
+        ranking_analytics.invalidate(job_id)
+
+
+@receiver(pre_delete, sender=Application)
+def invalidate_application_job_analytics(sender, instance, **kwargs):
+    ranking_analytics.invalidate(instance.job_description_id)
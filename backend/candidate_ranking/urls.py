@@ -12,6 +12,8 @@ urlpatterns = [
     
     # Batch and criteria management
     path('candidate-ranking/batches/', views.get_ranking_batches, name='get_ranking_batches'),
+    path('candidate-ranking/batches/<str:batch_id>/', views.get_ranking_batch, name='get_ranking_batch'),
+    path('candidate-ranking/batches/<str:batch_id>/cancel/', views.cancel_ranking_batch, name='cancel_ranking_batch'),
     path('candidate-ranking/criteria/', views.get_ranking_criteria, name='get_ranking_criteria'),
     
     # Analytics
@@ -1,16 +1,17 @@
 from django.shortcuts import get_object_or_404
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.contrib.auth.decorators import login_required
 from django.core.paginator import Paginator
-from django.db.models import Q, Avg, Max, Min
-from django.db import models
 import json
 import logging
 
 from .models import CandidateRanking, RankingBatch, RankingCriteria
+from .analytics import ranking_analytics
+from .ranking_queue import cancel_batch, enqueue_ranking, get_batch_progress
 from .services import CandidateRankingService
+from resume_checker.job_search import job_search_index
 from resume_checker.models import JobDescription, Candidate
 from user_management.models import User
 
@@ -22,7 +23,7 @@ logger = logging.getLogger(__name__)
 @login_required
 def rank_candidates_for_job(request):
     """
-    Rank candidates for a specific job.
+    Queue the ranking of candidates for a specific job.
     
     POST /api/candidate-ranking/rank/
     {
@@ -30,6 +31,9 @@ def rank_candidates_for_job(request):
         "candidate_ids": ["CAN-XXXXXX", "CAN-YYYYYY"],
         "criteria_id": "optional-criteria-id"
     }
+    
+    Returns 202 with the batch_id at once; poll
+    GET /api/candidate-ranking/batches/{batch_id}/ for progress and the top candidates.
     """
     try:
         data = json.loads(request.body)
@@ -65,47 +69,22 @@ def rank_candidates_for_job(request):
                     'error': 'Invalid criteria_id'
                 }, status=400)
         
-        # Initialize ranking service
-        ranking_service = CandidateRankingService(criteria)
-        
-        # Perform ranking
-        batch = ranking_service.rank_candidates_for_job(
-            job_description=job_description,
-            candidates=list(candidates),
+        # Queue the ranking; workers report progress on the batch
+        batch = enqueue_ranking(
+            job_description,
+            list(candidates.values_list('pk', flat=True)),
+            criteria,
             created_by=request.user
         )
         
-        # Get top candidates for response
-        top_candidates = ranking_service.get_top_candidates(job_description, limit=10)
-        
         return JsonResponse({
             'success': True,
             'batch_id': batch.batch_id,
             'job_id': job_id,
+            'status': batch.status,
             'total_candidates': batch.total_candidates,
-            'ranked_candidates': batch.ranked_candidates,
-            'failed_rankings': batch.failed_rankings,
-            'processing_time_seconds': batch.processing_time_seconds,
-            'top_candidates': [
-                {
-                    'ranking_id': ranking.ranking_id,
-                    'candidate_id': ranking.candidate.candidate_id,
-                    'candidate_name': ranking.candidate.full_name,
-                    'rank_position': ranking.rank_position,
-                    'overall_score': float(ranking.overall_score),
-                    'skill_match_score': float(ranking.skill_match_score),
-                    'experience_match_score': float(ranking.experience_match_score),
-                    'education_match_score': float(ranking.education_match_score),
-                    'location_match_score': float(ranking.location_match_score),
-                    'matched_skills': ranking.matched_skills,
-                    'missing_skills': ranking.missing_skills,
-                    'experience_gap': ranking.experience_gap,
-                    'is_shortlisted': ranking.is_shortlisted,
-                    'is_rejected': ranking.is_rejected
-                }
-                for ranking in top_candidates
-            ]
-        })
+            'status_url': f'/api/candidate-ranking/batches/{batch.batch_id}/'
+        }, status=202)
         
     except json.JSONDecodeError:
         return JsonResponse({
@@ -144,7 +123,7 @@ def get_job_rankings(request, job_id):
         queryset = CandidateRanking.objects.filter(
             job_description=job_description,
             status=status
-        ).select_related('candidate', 'application')
+        ).select_related('candidate', 'application').with_totals()
         
         # Apply score filters
         if min_score:
@@ -174,7 +153,7 @@ def get_job_rankings(request, job_id):
                     'candidate_email': ranking.candidate.email,
                     'candidate_location': f"{ranking.candidate.city}, {ranking.candidate.state}" if ranking.candidate.city else None,
                     'rank_position': ranking.rank_position,
-                    'total_candidates': ranking.total_candidates,
+                    'total_candidates': ranking.current_total_candidates,
                     'overall_score': float(ranking.overall_score),
                     'skill_match_score': float(ranking.skill_match_score),
                     'experience_match_score': float(ranking.experience_match_score),
@@ -235,7 +214,7 @@ def get_candidate_rankings(request, candidate_id):
         queryset = CandidateRanking.objects.filter(
             candidate=candidate,
             status=status
-        ).select_related('job_description', 'application')
+        ).select_related('job_description', 'application').with_totals()
         
         # Order by overall score (descending)
         queryset = queryset.order_by('-overall_score')
@@ -260,7 +239,7 @@ def get_candidate_rankings(request, candidate_id):
                     'department': ranking.job_description.department,
                     'location': ranking.job_description.location,
                     'rank_position': ranking.rank_position,
-                    'total_candidates': ranking.total_candidates,
+                    'total_candidates': ranking.current_total_candidates,
                     'overall_score': float(ranking.overall_score),
                     'skill_match_score': float(ranking.skill_match_score),
                     'experience_match_score': float(ranking.experience_match_score),
@@ -416,6 +395,88 @@ def get_ranking_batches(request):
         }, status=500)
 
 
+def _top_candidates_payload(rankings):
+    return [
+        {
+            'ranking_id': ranking.ranking_id,
+            'candidate_id': ranking.candidate.candidate_id,
+            'candidate_name': ranking.candidate.full_name,
+            'rank_position': ranking.rank_position,
+            'overall_score': float(ranking.overall_score),
+            'skill_match_score': float(ranking.skill_match_score),
+            'experience_match_score': float(ranking.experience_match_score),
+            'education_match_score': float(ranking.education_match_score),
+            'location_match_score': float(ranking.location_match_score),
+            'matched_skills': ranking.matched_skills,
+            'missing_skills': ranking.missing_skills,
+            'experience_gap': ranking.experience_gap,
+            'is_shortlisted': ranking.is_shortlisted,
+            'is_rejected': ranking.is_rejected
+        }
+        for ranking in rankings
+    ]
+
+
+@require_http_methods(["GET"])
+@login_required
+def get_ranking_batch(request, batch_id):
+    """
+    Progress of a ranking batch, for polling after POST /rank/.
+    
+    GET /api/candidate-ranking/batches/{batch_id}/
+    Returns status, counters, percent, candidates_per_second and eta_seconds;
+    once completed, also the top 10 candidates.
+    """
+    try:
+        batch = get_object_or_404(RankingBatch.objects.select_related('job_description'), batch_id=batch_id)
+        data = get_batch_progress(batch)
+        if batch.status == 'completed':
+            top_candidates = CandidateRanking.objects.filter(
+                job_description=batch.job_description,
+                status='active'
+            ).select_related('candidate').order_by('rank_position')[:10]
+            data['top_candidates'] = _top_candidates_payload(top_candidates)
+        return JsonResponse({'success': True, **data})
+        
+    except Http404:
+        raise
+    except Exception as e:
+        logger.error(f"Error in get_ranking_batch: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Internal server error'
+        }, status=500)
+
+
+@csrf_exempt
+@require_http_methods(["POST"])
+@login_required
+def cancel_ranking_batch(request, batch_id):
+    """
+    Cancel a queued or running ranking batch. The job's rankings are left unchanged.
+    
+    POST /api/candidate-ranking/batches/{batch_id}/cancel/
+    """
+    try:
+        batch = get_object_or_404(RankingBatch.objects.select_related('job_description'), batch_id=batch_id)
+        if batch.is_finished:
+            return JsonResponse({
+                'success': False,
+                'error': f'Batch is already {batch.status}'
+            }, status=409)
+        batch = cancel_batch(batch)
+        return JsonResponse({'success': True, **get_batch_progress(batch)})
+        
+    except Http404:
+        raise
+    except Exception as e:
+        logger.error(f"Error in cancel_ranking_batch: {str(e)}")
+        return JsonResponse({
+            'success': False,
+            'error': 'Internal server error'
+        }, status=500)
+
+
 @require_http_methods(["GET"])
 @login_required
 def get_ranking_criteria(request):
@@ -458,7 +519,8 @@ def get_ranking_criteria(request):
 @login_required
 def get_ranking_analytics(request, job_id):
     """
-    Get analytics for job rankings.
+    Get analytics for job rankings: score stats and bands, HR status counts,
+    experience bands and score histograms (10-point buckets).
     
     GET /api/candidate-ranking/analytics/{job_id}/
     """
@@ -466,76 +528,16 @@ def get_ranking_analytics(request, job_id):
         # Get job description
         job_description = get_object_or_404(JobDescription, job_id=job_id)
         
-        # Get all rankings for this job
-        rankings = CandidateRanking.objects.filter(
-            job_description=job_description,
-            status='active'
-        )
-        
-        if not rankings.exists():
-            return JsonResponse({
-                'success': True,
-                'job_id': job_id,
-                'total_candidates': 0,
-                'analytics': {}
-            })
-        
-        # Calculate analytics
-        total_candidates = rankings.count()
-        avg_score = rankings.aggregate(avg_score=models.Avg('overall_score'))['avg_score'] or 0
-        max_score = rankings.aggregate(max_score=models.Max('overall_score'))['max_score'] or 0
-        min_score = rankings.aggregate(min_score=models.Min('overall_score'))['min_score'] or 0
-        
-        # Score distribution
-        high_matches = rankings.filter(overall_score__gte=80).count()
-        medium_matches = rankings.filter(overall_score__gte=60, overall_score__lt=80).count()
-        low_matches = rankings.filter(overall_score__lt=60).count()
-        
-        # Top candidates
-        top_candidates = rankings.filter(is_top_candidate=True).count()
-        shortlisted = rankings.filter(is_shortlisted=True).count()
-        rejected = rankings.filter(is_rejected=True).count()
-        
-        # Experience analysis
-        overqualified = rankings.filter(experience_gap__gte=2).count()
-        well_matched_exp = rankings.filter(experience_gap__gte=-1, experience_gap__lt=2).count()
-        underqualified = rankings.filter(experience_gap__lt=-1).count()
+        # One aggregate query, cached until the job's rankings change
+        analytics = dict(ranking_analytics.for_job(job_description))
+        total_candidates = analytics.pop('total_candidates')
         
         return JsonResponse({
             'success': True,
             'job_id': job_id,
             'job_title': job_description.title,
             'total_candidates': total_candidates,
-            'analytics': {
-                'score_stats': {
-                    'average_score': round(float(avg_score), 2),
-                    'max_score': round(float(max_score), 2),
-                    'min_score': round(float(min_score), 2),
-                    'score_range': round(float(max_score - min_score), 2)
-                },
-                'score_distribution': {
-                    'high_matches': high_matches,
-                    'medium_matches': medium_matches,
-                    'low_matches': low_matches,
-                    'high_match_percentage': round((high_matches / total_candidates) * 100, 2) if total_candidates > 0 else 0,
-                    'medium_match_percentage': round((medium_matches / total_candidates) * 100, 2) if total_candidates > 0 else 0,
-                    'low_match_percentage': round((low_matches / total_candidates) * 100, 2) if total_candidates > 0 else 0
-                },
-                'candidate_status': {
-                    'top_candidates': top_candidates,
-                    'shortlisted': shortlisted,
-                    'rejected': rejected,
-                    'pending_review': total_candidates - shortlisted - rejected
-                },
-                'experience_analysis': {
-                    'overqualified': overqualified,
-                    'well_matched': well_matched_exp,
-                    'underqualified': underqualified,
-                    'overqualified_percentage': round((overqualified / total_candidates) * 100, 2) if total_candidates > 0 else 0,
-                    'well_matched_percentage': round((well_matched_exp / total_candidates) * 100, 2) if total_candidates > 0 else 0,
-                    'underqualified_percentage': round((underqualified / total_candidates) * 100, 2) if total_candidates > 0 else 0
-                }
-            }
+            'analytics': analytics
         })
         
     except Exception as e:
@@ -552,11 +554,16 @@ def get_active_jobs(request):
     """
     Get active jobs for ranking.
     
-    GET /api/jobs/active/
+    GET /api/jobs/active/?search=<text>
     """
     try:
         # Get active job descriptions (status = 'active' or 'open')
-        active_jobs = JobDescription.objects.filter(status__in=['active', 'open']).order_by('-created_at')
+        active_jobs = JobDescription.objects.filter(status__in=['active', 'open'])
+        search = request.GET.get('search', '').strip()
+        if search:
+            active_jobs = job_search_index.filter(active_jobs, search).order_by('-search_rank', '-created_at')
+        else:
+            active_jobs = active_jobs.order_by('-created_at')
         
         jobs_data = []
         for job in active_jobs:
@@ -22,6 +22,7 @@ from .serializers import (
     LLMQuestionPromptSerializer, LLMQuestionGenerationSerializer, QuestionEmbeddingSerializer
 )
 from .llm_service import LLMQuestionService
+from resume_checker.skill_matcher import skill_matcher
 
 
 class CompetencyFrameworkViewSet(viewsets.ModelViewSet):
@@ -438,34 +439,11 @@ class QuestionBankViewSet(viewsets.ModelViewSet):
             return list(QuestionBank.objects.filter(is_active=True).order_by('-usage_count')[:10])
     
     def extract_skills_from_text(self, text):
-        """Extract skills from text using keyword matching"""
+        """Extract technical and soft skills from text with the shared skill matcher"""
         if not text:
             return []
         
-        # Common technical skills
-        technical_skills = [
-            'python', 'java', 'javascript', 'react', 'node.js', 'django', 'flask',
-            'sql', 'mongodb', 'aws', 'docker', 'kubernetes', 'git', 'agile',
-            'machine learning', 'data science', 'ai', 'nlp', 'computer vision',
-            'devops', 'ci/cd', 'microservices', 'api', 'rest', 'graphql'
-        ]
-        
-        # Common soft skills
-        soft_skills = [
-            'communication', 'leadership', 'teamwork', 'problem solving',
-            'critical thinking', 'adaptability', 'time management', 'collaboration',
-            'mentoring', 'project management', 'stakeholder management'
-        ]
-        
-        all_skills = technical_skills + soft_skills
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in all_skills:
-            if skill in text_lower:
-                found_skills.append(skill)
-        
-        return found_skills
+        return skill_matcher.extract(text)
     
     def determine_candidate_level(self, jd, resume):
         """Determine candidate level based on job description and resume"""
@@ -2,6 +2,9 @@
 """
 Script to generate missing candidate rankings for all existing applications
 This restores the automatic ranking feature that was working before
+
+For large databases use `python manage.py rerank_jobs --missing-only`, which
+ranks the jobs in parallel and can resume an interrupted run.
 """
 
 import os
@@ -31,13 +34,13 @@ def generate_missing_rankings():
     print(f"📋 Found {jobs_with_applications.count()} jobs with applications")
     
     total_rankings_generated = 0
+    ranking_service = CandidateRankingService()
     
     for job in jobs_with_applications:
         print(f"\n💼 Processing job: {job.title} at {job.company}")
         
         # Get all candidates who applied to this job
-        applications = Application.objects.filter(job_description=job)
-        candidates = [app.candidate for app in applications]
+        candidates = list(ranking_service.applicant_candidates(job))
         
         print(f"   📝 Found {len(candidates)} applications")
         
@@ -50,8 +53,6 @@ def generate_missing_rankings():
         
         # Generate rankings for this job
         try:
-            ranking_service = CandidateRankingService()
-            
             with transaction.atomic():
                 # Generate rankings
                 batch = ranking_service.rank_candidates_for_job(
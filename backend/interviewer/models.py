@@ -14,6 +14,7 @@ class Interviewer(models.Model):
     
     # Interviewer specialization
     technical_skills = models.JSONField(default=list, blank=True, help_text="Technical skills for technical interviews")
+    technical_skill_ids = models.JSONField(default=list, blank=True, editable=False, help_text="Canonical Skill IDs of technical_skills, sorted (kept in sync on save)")
     interview_types = models.JSONField(default=list, blank=True, help_text="Types of interviews they can conduct")
     experience_years = models.PositiveIntegerField(default=0, help_text="Years of interviewing experience")
     
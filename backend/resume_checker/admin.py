@@ -1,6 +1,6 @@
 # hiring_app/admin.py
 from django.contrib import admin
-from .models import JobDescription, Candidate, Resume, Match, Application
+from .models import JobDescription, Candidate, Resume, ResumeProcessingTask, ResumeParseCache, Match, Application, Skill, SkillAlias
 
 # Register your models here with custom admin classes for better management.
 
@@ -40,6 +40,44 @@ class ResumeAdmin(admin.ModelAdmin):
     readonly_fields = ['uploaded_at', 'processed_at']
     ordering = ['-uploaded_at']
 
+@admin.register(ResumeProcessingTask)
+class ResumeProcessingTaskAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the background resume processing queue.
+    """
+    list_display = ['id', 'resume', 'status', 'attempts', 'worker_id', 'created_at', 'updated_at']
+    list_filter = ['status', 'update_profile']
+    search_fields = ['resume__candidate__email', 'resume__file_name']
+    readonly_fields = ['created_at', 'updated_at', 'locked_at']
+    ordering = ['-created_at']
+
+@admin.register(ResumeParseCache)
+class ResumeParseCacheAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for cached resume parses (keyed by file content hash).
+    """
+    list_display = ['id', 'content_hash', 'parser_version', 'hit_count', 'created_at', 'last_used_at']
+    list_filter = ['parser_version']
+    search_fields = ['content_hash']
+    readonly_fields = ['created_at', 'last_used_at']
+    ordering = ['-last_used_at']
+
+class SkillAliasInline(admin.TabularInline):
+    model = SkillAlias
+    extra = 0
+
+@admin.register(Skill)
+class SkillAdmin(admin.ModelAdmin):
+    """
+    Admin configuration for the canonical skill vocabulary.
+    IDs are referenced by the skill_ids fields, so skills should be renamed, not deleted.
+    """
+    list_display = ['id', 'name', 'display_name', 'category', 'created_at']
+    list_filter = ['category']
+    search_fields = ['name', 'display_name', 'aliases__alias']
+    readonly_fields = ['created_at']
+    inlines = [SkillAliasInline]
+
 @admin.register(Match)
 class MatchAdmin(admin.ModelAdmin):
     """
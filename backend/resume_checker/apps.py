@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ResumeCheckerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "resume_checker"
+
+    def ready(self):
+        """Import signals when the app is ready"""
+        import resume_checker.signals  # noqa: F401
@@ -0,0 +1,485 @@
+"""
+Benchmark Suite
+===============
+
+Repeatable benchmarks for the resume parsing and matching hot paths, run with
+``python manage.py run_benchmarks``.
+
+Inputs come from ``sample_resumes/``, ``testJD/`` and deterministic synthetic
+corpora built from them: resumes made from the sample texts with randomised
+names, skills and experience, and candidate profiles drawn from the skill
+dictionary. Scaled benchmarks run at 1k, 10k and 100k items.
+
+Every case (benchmark at one scale) runs in a freshly spawned process, so its
+peak RSS is its own high-water mark and one case's warm caches or lazily loaded
+models do not flatter the next. Database fixtures are created in a
+transaction that is rolled back.
+
+Results and baselines are JSON keyed by ``<benchmark>@<scale>``. A run is
+compared with the stored baseline and regresses when throughput drops, or p99
+latency or peak RSS grows, by more than the threshold.
+"""
+
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from itertools import cycle, islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000}
+
+# Metric -> which direction is better; used for regression checks
+COMPARED_METRICS = {'ops_per_sec': 'higher', 'p99_ms': 'lower', 'peak_rss_mb': 'lower'}
+
+JD_FILE_NAME = 'jd_1.txt'
+
+BENCHMARKS: Dict[str, Dict[str, Any]] = {}
+
+
+def benchmark(name: str, scaled: bool = True, warmup: int = 3):
+    """
+    Register a benchmark.
+
+    The decorated function is a context manager taking a BenchmarkContext and
+    yielding ``(op, inputs)``: ``op(item)`` is timed once per input item.
+    """
+    def register(fn):
+        BENCHMARKS[name] = {'setup': contextmanager(fn), 'scaled': scaled, 'warmup': warmup}
+        return fn
+    return register
+
+
+class SyntheticCorpus:
+    """Deterministic synthetic resumes and candidate profiles built from the sample resumes."""
+
+    LOCATIONS = ['Remote', 'Bangalore', 'Mumbai', 'Hyderabad', 'Pune', 'New York', 'London', 'San Francisco']
+    EDUCATION_LEVELS = ['high_school', 'associate', 'bachelor', 'master', 'phd']
+    FIRST_NAMES = ['Asha', 'Ben', 'Carlos', 'Deepa', 'Elena', 'Farhan', 'Grace', 'Hiro', 'Isha', 'Jonas']
+    LAST_NAMES = ['Kumar', 'Lopez', 'Meyer', 'Nair', 'Okafor', 'Patel', 'Quinn', 'Rossi', 'Singh', 'Tanaka']
+
+    def __init__(self, templates: List[str], seed: int = 42):
+        from .skill_matcher import SKILL_CATEGORIES
+
+        if not templates:
+            raise ValueError("Synthetic corpus needs at least one sample resume text")
+        self.templates = templates
+        self.seed = seed
+        self.skills = sorted(term for terms in SKILL_CATEGORIES.values() for term in terms)
+
+    def resumes(self, count: int) -> Iterator[str]:
+        """Yield ``count`` resume texts, generated lazily to keep memory flat at 100k."""
+        rng = random.Random(self.seed)
+        for index in range(count):
+            lines = rng.choice(self.templates).splitlines()
+            name = f"{rng.choice(self.FIRST_NAMES)} {rng.choice(self.LAST_NAMES)}"
+            skills = rng.sample(self.skills, rng.randint(8, 25))
+            yield '\n'.join([
+                name,
+                f"Email: candidate{index}@example.com | {rng.choice(self.LOCATIONS)}",
+                f"{rng.randint(0, 20)} years of experience",
+                f"Skills: {', '.join(skills)}",
+                *lines[1:],
+            ])
+
+    def profiles(self, count: int) -> Iterator[Dict[str, Any]]:
+        """Yield ``count`` candidate profiles (skills, experience, education, location)."""
+        rng = random.Random(self.seed + 1)
+        for index in range(count):
+            yield {
+                'index': index,
+                'skills': [skill.title() for skill in rng.sample(self.skills, rng.randint(5, 30))],
+                'experience': rng.randint(0, 20),
+                'education': rng.choice(self.EDUCATION_LEVELS),
+                'location': rng.choice(self.LOCATIONS),
+            }
+
+
+class BenchmarkContext:
+    """Inputs shared by all benchmarks of a run."""
+
+    def __init__(self, samples_dir: Path, jd_dir: Path, scale: Optional[int], max_seconds: float):
+        self.samples_dir = Path(samples_dir)
+        self.jd_dir = Path(jd_dir)
+        self.scale = scale
+        self.max_seconds = max_seconds
+
+    @property
+    def sample_files(self) -> List[Path]:
+        return sorted(
+            path for path in self.samples_dir.iterdir()
+            if path.suffix.lower() in ('.pdf', '.docx', '.txt')
+        )
+
+    @property
+    def jd_text(self) -> str:
+        return (self.jd_dir / JD_FILE_NAME).read_text(encoding='utf-8')
+
+    @property
+    def corpus(self) -> SyntheticCorpus:
+        templates = [
+            path.read_text(encoding='utf-8', errors='ignore')
+            for path in self.sample_files if path.suffix.lower() == '.txt'
+        ]
+        return SyntheticCorpus(templates)
+
+    def job_data(self) -> Dict[str, Any]:
+        """The test JD in the dict shape used by the portal's match scoring."""
+        from .nlp_utils import extract_skills_from_text
+
+        return {
+            'title': self.jd_text.splitlines()[0].strip(),
+            'description': self.jd_text,
+            'extracted_skills': extract_skills_from_text(self.jd_text),
+            'min_experience_years': 3,
+            'experience_level': 'mid',
+            'location': 'Remote',
+        }
+
+
+def with_skill_ids(profiles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Profiles with the 'skill_ids' the models would store for their skills."""
+    from .skill_vocabulary import skill_vocabulary
+
+    skill_vocabulary.seed()
+    profiles = list(profiles)
+    found = skill_vocabulary.ids_many([profile['skills'] for profile in profiles], create=False)
+    for profile, skill_ids in zip(profiles, found):
+        profile['skill_ids'] = skill_ids
+    return profiles
+
+
+# --- Benchmarks ---
+
+@benchmark('extract_text_from_file', scaled=False)
+def _extract_text_from_file(context: BenchmarkContext):
+    from .nlp_utils import extract_text_from_file
+
+    files = [str(path) for path in context.sample_files]
+    yield extract_text_from_file, islice(cycle(files), len(files) * 50)
+
+
+@benchmark('preprocess_text')
+def _preprocess_text(context: BenchmarkContext):
+    from .nlp_utils import preprocess_text
+
+    yield preprocess_text, context.corpus.resumes(context.scale)
+
+
+@benchmark('extract_skills_from_text')
+def _extract_skills_from_text(context: BenchmarkContext):
+    from .nlp_utils import extract_skills_from_text
+
+    yield extract_skills_from_text, context.corpus.resumes(context.scale)
+
+
+@benchmark('parser_construction', scaled=False)
+def _parser_construction(context: BenchmarkContext):
+    """Building a LightweightResumeParser, i.e. compiling its pattern tables."""
+    import re
+    from .lightweight_parser import LightweightResumeParser
+
+    def op(_):
+        # Empty the re module cache so every construction really compiles
+        re.purge()
+        return LightweightResumeParser()
+
+    yield op, range(200)
+
+
+@benchmark('parse_resume')
+def _parse_resume(context: BenchmarkContext):
+    """Per-parse cost with the shared parser; construction is measured by parser_construction."""
+    from .lightweight_parser import resume_parser
+
+    yield resume_parser.parse_resume, context.corpus.resumes(context.scale)
+
+
+@benchmark('calculate_ats_similarity')
+def _calculate_ats_similarity(context: BenchmarkContext):
+    from .nlp_utils import calculate_ats_similarity
+
+    jd_text = context.jd_text
+    yield (lambda resume_text: calculate_ats_similarity(jd_text, resume_text)), context.corpus.resumes(context.scale)
+
+
+@benchmark('calculate_detailed_match_score')
+def _calculate_detailed_match_score(context: BenchmarkContext):
+    from .scoring_utils import calculate_detailed_match_score
+    from .skill_vocabulary import skill_vocabulary
+
+    profiles = with_skill_ids(context.corpus.profiles(context.scale))
+    job_data = context.job_data()
+    job_data['skill_ids'] = skill_vocabulary.ids(job_data['extracted_skills'], create=False)
+
+    def op(profile):
+        return calculate_detailed_match_score(
+            job_data, profile['skills'], profile['experience'], profile['education'], profile['location'],
+            candidate_skill_ids=profile['skill_ids'],
+        )
+
+    yield op, profiles
+
+
+@benchmark('score_jobs')
+def _score_jobs(context: BenchmarkContext):
+    """One op scores a candidate against every job of the scale with the batch kernel."""
+    from .scoring_utils import build_job_features, score_jobs
+
+    features = build_job_features(
+        {
+            'id': profile['index'],
+            'extracted_skills': profile['skills'],
+            'skill_ids': profile['skill_ids'],
+            'min_experience_years': profile['experience'],
+            'experience_level': 'mid',
+            'location': profile['location'],
+        }
+        for profile in with_skill_ids(context.corpus.profiles(context.scale))
+    )
+    queries = with_skill_ids(SyntheticCorpus(context.corpus.templates, seed=7).profiles(100))
+
+    def op(profile):
+        return score_jobs(features, profile['skill_ids'], profile['experience'], profile['education'])
+
+    yield op, islice(cycle(queries), 1000)
+
+
+@benchmark('rank_candidates_for_job', warmup=0)
+def _rank_candidates_for_job(context: BenchmarkContext):
+    """One op ranks every candidate of the scale against the test JD."""
+    from django.db import transaction
+    from candidate_ranking.services import CandidateRankingService
+    from .models import Candidate, JobDescription
+
+    job_data = context.job_data()
+    with transaction.atomic():
+        job = JobDescription.objects.create(
+            title=job_data['title'],
+            company='Benchmark Corp',
+            department='Engineering',
+            location=job_data['location'],
+            description=job_data['description'],
+            min_experience_years=job_data['min_experience_years'],
+            extracted_skills=job_data['extracted_skills'],
+        )
+        candidates = Candidate.objects.bulk_create(
+            Candidate(
+                candidate_id=f"BEN-{profile['index']:06d}",
+                first_name='Bench',
+                last_name=str(profile['index']),
+                email=f"bench{profile['index']}@benchmark.invalid",
+                city=profile['location'],
+                total_experience_years=profile['experience'],
+                highest_education=profile['education'],
+                skills=profile['skills'],
+                skill_ids=profile['skill_ids'],
+            )
+            for profile in with_skill_ids(context.corpus.profiles(context.scale))
+        )
+        service = CandidateRankingService()
+        yield (lambda _: service.rank_candidates_for_job(job, candidates)), range(3)
+        transaction.set_rollback(True)
+
+
+@benchmark('match_all_resumes_to_jd', warmup=0)
+def _match_all_resumes_to_jd(context: BenchmarkContext):
+    """
+    One op matches every resume of the scale against the test JD. The first op
+    inserts the Match rows, later ones find them unchanged.
+    """
+    from django.db import transaction
+    from .models import Candidate, JobDescription, Resume
+    from .nlp_utils import preprocess_text
+    from .resume_matching import ResumeMatcher
+    from .tfidf_index import CorpusTfidfIndex
+
+    job_data = context.job_data()
+    with transaction.atomic():
+        job = JobDescription.objects.create(
+            title=job_data['title'],
+            company='Benchmark Corp',
+            department='Engineering',
+            location=job_data['location'],
+            description=job_data['description'],
+            processed_text=preprocess_text(job_data['description']),
+            min_experience_years=job_data['min_experience_years'],
+            extracted_skills=job_data['extracted_skills'],
+        )
+        # Every other candidate has no skills, so both the skill and the text scoring paths run
+        candidates = Candidate.objects.bulk_create(
+            Candidate(
+                candidate_id=f"BEN-{profile['index']:06d}",
+                first_name='Bench',
+                last_name=str(profile['index']),
+                email=f"bench{profile['index']}@benchmark.invalid",
+                skills=profile['skills'] if profile['index'] % 2 else [],
+            )
+            for profile in context.corpus.profiles(context.scale)
+        )
+        texts = [preprocess_text(text) for text in islice(context.corpus.resumes(100), 100)]
+        Resume.objects.bulk_create(
+            Resume(candidate=candidate, file='benchmark.txt', processed_text=text)
+            for candidate, text in zip(candidates, cycle(texts))
+        )
+        # In-memory TF-IDF index, so the stored corpus index is left alone
+        matcher = ResumeMatcher(text_index=CorpusTfidfIndex(index_dir=''))
+        yield (lambda _: matcher.match_all(job)), range(3)
+        transaction.set_rollback(True)
+
+
+# --- Measurement ---
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(op: Callable, inputs: Iterable, warmup: int = 3, max_seconds: float = 10.0) -> Dict[str, float]:
+    """
+    Time ``op(item)`` for each input until the inputs run out or ``max_seconds`` pass.
+
+    The first ``warmup`` items are run untimed (lazy model loading, caches).
+    """
+    inputs = iter(inputs)
+    for item in islice(inputs, warmup):
+        op(item)
+
+    latencies = []
+    started = time.perf_counter()
+    for item in inputs:
+        op_started = time.perf_counter_ns()
+        op(item)
+        latencies.append(time.perf_counter_ns() - op_started)
+        if time.perf_counter() - started >= max_seconds:
+            break
+
+    if not latencies:
+        raise ValueError("Benchmark produced no timed operations")
+    latencies_ms = np.array(latencies, dtype=np.float64) / 1e6
+    total_seconds = latencies_ms.sum() / 1000
+    return {
+        'ops': len(latencies),
+        'total_seconds': round(total_seconds, 4),
+        'ops_per_sec': round(len(latencies) / total_seconds, 2),
+        'mean_ms': round(float(latencies_ms.mean()), 4),
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 4),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 4),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+
+
+def case_key(name: str, scale_label: Optional[str]) -> str:
+    return f"{name}@{scale_label or 'samples'}"
+
+
+def run_case(name: str, scale_label: Optional[str], samples_dir: str, jd_dir: str,
+             max_seconds: float) -> Dict[str, float]:
+    """Run one benchmark case in the current process."""
+    from .document_extraction import extraction_pool
+
+    spec = BENCHMARKS[name]
+    context = BenchmarkContext(samples_dir, jd_dir, SCALES.get(scale_label), max_seconds)
+    try:
+        with spec['setup'](context) as (op, inputs):
+            return measure(op, inputs, warmup=spec['warmup'], max_seconds=max_seconds)
+    finally:
+        # An isolated case runs in a pool worker, which cannot exit while
+        # extraction workers it started are still alive
+        extraction_pool.shutdown()
+
+
+def run_suite(names: Iterable[str], scale_labels: Iterable[str], samples_dir: str, jd_dir: str,
+              max_seconds: float = 10.0, isolate: bool = True,
+              on_result: Optional[Callable[[str, Dict[str, float]], None]] = None) -> Dict[str, Dict[str, float]]:
+    """
+    Run the selected benchmarks at the selected scales.
+
+    Unscaled benchmarks run once over the sample files. With ``isolate``,
+    every case runs in its own spawned process.
+
+    Returns:
+        dict: case key -> metrics
+    """
+    import django
+
+    results = {}
+    for name in names:
+        for scale_label in (scale_labels if BENCHMARKS[name]['scaled'] else [None]):
+            args = (name, scale_label, str(samples_dir), str(jd_dir), max_seconds)
+            if isolate:
+                with ProcessPoolExecutor(
+                    max_workers=1, mp_context=multiprocessing.get_context('spawn'), initializer=django.setup
+                ) as executor:
+                    result = executor.submit(run_case, *args).result()
+            else:
+                result = run_case(*args)
+            key = case_key(name, scale_label)
+            results[key] = result
+            if on_result:
+                on_result(key, result)
+    return results
+
+
+# --- Baselines ---
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    path = Path(path)
+    if not path.exists():
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, results: Dict[str, Dict[str, float]]) -> Dict[str, Any]:
+    """Store results as the baseline, keeping baseline entries for cases not in this run."""
+    path = Path(path)
+    baseline = load_baseline(path)
+    baseline.setdefault('results', {}).update(results)
+    baseline.update({
+        'updated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': f"{platform.system()} {platform.machine()}",
+    })
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+    return baseline
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, float]], baseline: Dict[str, Any],
+                        threshold: float) -> List[str]:
+    """
+    Compare a run with a baseline.
+
+    Returns:
+        list: One description per metric that regressed by more than ``threshold``
+        (a fraction, e.g. 0.2 for 20%)
+    """
+    regressions = []
+    baseline_results = baseline.get('results', {})
+    for key, result in results.items():
+        previous = baseline_results.get(key)
+        if not previous:
+            continue
+        for metric, better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if (better == 'higher' and change < -threshold) or (better == 'lower' and change > threshold):
+                regressions.append(f"{key} {metric}: {old:g} -> {new:g} ({change:+.0%})")
+    return regressions
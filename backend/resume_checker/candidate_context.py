@@ -0,0 +1,148 @@
+"""
+Candidate Context
+=================
+
+Per-request view of the candidate using the candidate portal, shared by
+``browse_jobs``, ``job_details``, ``detailed_match_analysis`` and
+``my_applications``.
+
+The candidate is looked up once per request. Scoring inputs (skills,
+experience, education, location) are read once. The candidate's
+applications are loaded with a single query into a map keyed by job id,
+so the number of queries per request does not depend on the number of jobs.
+
+Usage:
+    context = CandidateContext.for_request(request, request.query_params.get('candidate_id'))
+    if context:
+        context.application_fields(job.pk)   # has_applied, application_status, ...
+        context.match_score(job)             # overall score only
+        context.match_analysis(job)          # calculate_detailed_match_score breakdown
+"""
+
+from typing import Any, Dict, List, Optional
+
+from .match_scores import candidate_location, candidate_skill_ids
+from .models import Application, Candidate, Resume
+from .scoring_utils import build_job_features, calculate_detailed_match_score, score_jobs
+
+# Attribute holding the contexts already built for a request
+REQUEST_CACHE_ATTR = '_candidate_contexts'
+
+
+def find_candidate(request, candidate_id=None) -> Optional[Candidate]:
+    """
+    The candidate with ``candidate_id`` if it exists, otherwise the logged-in
+    user's candidate profile (matched by email), otherwise None.
+    """
+    if candidate_id:
+        try:
+            return Candidate.objects.get(id=candidate_id)
+        except (Candidate.DoesNotExist, ValueError):
+            # The frontend may send a stale or hardcoded ID; fall back to the logged-in user
+            pass
+    user = getattr(request, 'user', None)
+    if user and user.is_authenticated:
+        try:
+            return Candidate.objects.get(email=user.email)
+        except Candidate.DoesNotExist:
+            pass
+    return None
+
+
+class CandidateContext:
+    """
+    A candidate plus the data the portal endpoints derive from it.
+    Applications and the latest resume are loaded lazily, once.
+    """
+
+    def __init__(self, candidate: Candidate):
+        self.candidate = candidate
+        self.skills: List[str] = list(candidate.skills or [])
+        self.skill_ids: List[int] = candidate_skill_ids(candidate)
+        self.experience = candidate.total_experience_years or 0
+        self.education = candidate.highest_education or ''
+        self.location = candidate_location(candidate)
+        self._applications: Optional[List[Application]] = None
+        self._applications_by_job: Optional[Dict[int, Application]] = None
+        self._latest_resume: Any = None
+        self._latest_resume_loaded = False
+
+    @classmethod
+    def for_request(cls, request, candidate_id=None) -> Optional['CandidateContext']:
+        """Context for the request's candidate (see find_candidate), built once per request."""
+        contexts = getattr(request, REQUEST_CACHE_ATTR, None)
+        if contexts is None:
+            contexts = {}
+            setattr(request, REQUEST_CACHE_ATTR, contexts)
+        if candidate_id not in contexts:
+            candidate = find_candidate(request, candidate_id)
+            contexts[candidate_id] = cls(candidate) if candidate else None
+        return contexts[candidate_id]
+
+    @property
+    def applications(self) -> List[Application]:
+        """The candidate's applications with their jobs, newest first (one query)."""
+        if self._applications is None:
+            self._applications = list(
+                Application.objects.filter(candidate=self.candidate)
+                .select_related('job_description')
+                .order_by('-applied_at')
+            )
+        return self._applications
+
+    @property
+    def applications_by_job(self) -> Dict[int, Application]:
+        if self._applications_by_job is None:
+            self._applications_by_job = {
+                application.job_description_id: application for application in self.applications
+            }
+        return self._applications_by_job
+
+    def application_fields(self, job_id) -> Dict[str, Any]:
+        """Application status fields shown on a job card."""
+        application = self.applications_by_job.get(job_id)
+        return {
+            'has_applied': application is not None,
+            'application_status': application.status if application else None,
+            'application_id': application.application_id if application else None,
+            'applied_at': application.applied_at if application else None,
+        }
+
+    @property
+    def latest_resume(self) -> Optional[Resume]:
+        if not self._latest_resume_loaded:
+            self._latest_resume = self.candidate.resumes.order_by('-uploaded_at').first()
+            self._latest_resume_loaded = True
+        return self._latest_resume
+
+    @staticmethod
+    def _job_data(job) -> Dict[str, Any]:
+        return {
+            'id': job.pk,
+            'extracted_skills': job.extracted_skills or [],
+            'skill_ids': job.skill_ids or [],
+            'min_experience_years': job.min_experience_years or 0,
+            'experience_level': job.experience_level or '',
+            'location': job.location,
+        }
+
+    def match_score(self, job) -> float:
+        """Overall match score against a JobDescription, without building the explanation."""
+        scores = score_jobs(build_job_features([self._job_data(job)]), self.skill_ids, self.experience, self.education)
+        return float(scores.overall[0])
+
+    def match_analysis(self, job) -> Dict[str, Any]:
+        """Detailed match breakdown (calculate_detailed_match_score) against a JobDescription."""
+        return calculate_detailed_match_score(
+            self._job_data(job), self.skills, self.experience, self.education, self.location,
+            candidate_skill_ids=self.skill_ids,
+        )
+
+    def as_candidate_data(self) -> Dict[str, Any]:
+        """Candidate fields in the shape ai_utils expects."""
+        return {
+            'skills': self.skills,
+            'experience_years': self.experience,
+            'education': self.education,
+            'location': self.location,
+        }
@@ -0,0 +1,415 @@
+"""
+Document Extraction Pool
+========================
+
+PDF/DOCX text extraction runs in a pool of worker processes, so a slow,
+huge or malformed upload cannot hang or exhaust the process that serves
+requests.
+
+Every document gets:
+- a hard wall-clock limit: workers arm an interval timer and return the pages
+  finished so far when it fires. If a worker stops responding altogether, the
+  pool is torn down and replaced.
+- a memory limit: workers run under ``RLIMIT_AS``, so a runaway document fails
+  with ``MemoryError`` instead of pushing the host into swap.
+- page-level isolation: a page that fails to extract is skipped and the text of
+  the remaining pages is still returned.
+
+Long PDFs are split into page ranges that are extracted in parallel. Workers
+are replaced after ``max_jobs_per_worker`` documents to contain leaks in the
+PDF libraries.
+
+The pool serves the upload path (``nlp_utils.extract_text_from_pdf`` /
+``extract_text_from_docx``) and bulk imports through the global
+``extraction_pool`` instance. With ``DOCUMENT_EXTRACTION_WORKERS = 0``,
+extraction runs in-process as before.
+
+Worker processes are spawned fresh and import only this module, so it must
+not import Django at module level. As with any spawned pool, entry-point
+scripts that extract documents need an ``if __name__ == '__main__':`` guard
+(``manage.py`` and the WSGI/ASGI servers already have one).
+"""
+
+import io
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 2
+DEFAULT_TIMEOUT_SECONDS = 30
+DEFAULT_MEMORY_LIMIT_MB = 1024
+DEFAULT_MAX_JOBS_PER_WORKER = 50
+DEFAULT_PAGES_PER_CHUNK = 20
+
+# Extra time the parent waits past a document's deadline before it treats the
+# worker as hung (the in-worker timer normally fires first).
+KILL_GRACE_SECONDS = 5
+
+
+class ExtractionTimeout(BaseException):
+    """
+    Raised inside a worker when its time limit expires.
+
+    Derives from BaseException so that broad ``except Exception`` blocks in
+    the PDF libraries cannot swallow it.
+    """
+
+
+# --- Worker side ---
+
+def _raise_timeout(signum, frame):
+    raise ExtractionTimeout()
+
+
+def apply_memory_limit(memory_limit_mb: int):
+    """Process initializer: cap this process's address space at ``memory_limit_mb``."""
+    if memory_limit_mb and resource is not None:
+        limit = memory_limit_mb * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not set extraction worker memory limit: {e}")
+
+
+@contextmanager
+def _deadline(deadline: Optional[float]):
+    """
+    Raise ExtractionTimeout in the block once the wall-clock ``deadline``
+    (a ``time.time()`` value) passes.
+
+    Signals can only be armed from the main thread; elsewhere (in-process
+    extraction from a request thread) the block runs unbounded.
+    """
+    if (deadline is None or not hasattr(signal, 'setitimer')
+            or threading.current_thread() is not threading.main_thread()):
+        yield
+        return
+
+    remaining = deadline - time.time()
+    if remaining <= 0:
+        raise ExtractionTimeout()
+
+    previous_handler = signal.signal(signal.SIGALRM, _raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, remaining)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous_handler)
+
+
+def _pdfplumber_pages(data: bytes, start: int, stop: Optional[int],
+                      pages: Dict[int, str], errors: List[str]) -> int:
+    """Extract pages [start, stop) with pdfplumber into ``pages``; returns the page count."""
+    import pdfplumber
+
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        page_count = len(pdf.pages)
+        stop = page_count if stop is None else min(stop, page_count)
+        for index in range(start, stop):
+            try:
+                page_text = pdf.pages[index].extract_text()
+            except Exception as e:
+                errors.append(f"pdfplumber page {index + 1}: {e}")
+                continue
+            if page_text:
+                pages[index] = page_text
+    return page_count
+
+
+def extract_pdf_pages(data: bytes, start: int = 0, stop: Optional[int] = None,
+                      deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Extract text from pages [start, stop) of a PDF.
+
+    PyPDF2 is tried first. If it yields no text for the range (e.g. it cannot
+    read the document), pdfplumber is used as a fallback. Pages that fail are
+    skipped. If the deadline passes, the pages finished so far are returned.
+
+    Returns:
+        dict: ``pages`` (page index -> text), ``page_count``, ``errors``, ``timed_out``
+    """
+    from PyPDF2 import PdfReader
+
+    pages: Dict[int, str] = {}
+    errors: List[str] = []
+    page_count = 0
+    timed_out = False
+
+    try:
+        with _deadline(deadline):
+            try:
+                reader = PdfReader(io.BytesIO(data))
+                page_count = len(reader.pages)
+            except Exception as e:
+                reader = None
+                errors.append(f"PyPDF2 failed: {e}")
+
+            if reader is not None:
+                for index in range(start, page_count if stop is None else min(stop, page_count)):
+                    try:
+                        page_text = reader.pages[index].extract_text()
+                    except Exception as e:
+                        errors.append(f"PyPDF2 page {index + 1}: {e}")
+                        continue
+                    if page_text:
+                        pages[index] = page_text
+
+            if not any(text.strip() for text in pages.values()):
+                try:
+                    page_count = _pdfplumber_pages(data, start, stop, pages, errors) or page_count
+                except Exception as e:
+                    errors.append(f"pdfplumber failed: {e}")
+    except ExtractionTimeout:
+        timed_out = True
+        errors.append(f"Timed out after {len(pages)} pages")
+
+    return {'pages': pages, 'page_count': page_count, 'errors': errors, 'timed_out': timed_out}
+
+
+def extract_docx_text(data: bytes, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Extract paragraph text from a DOCX document.
+
+    Returns:
+        dict: ``text`` (None if the document could not be read), ``errors``, ``timed_out``
+    """
+    from docx import Document
+
+    paragraphs: List[str] = []
+    errors: List[str] = []
+    timed_out = False
+    text = None
+
+    try:
+        with _deadline(deadline):
+            document = Document(io.BytesIO(data))
+            for paragraph in document.paragraphs:
+                paragraphs.append(paragraph.text + "\n")
+        text = ''.join(paragraphs)
+    except ExtractionTimeout:
+        timed_out = True
+        errors.append(f"Timed out after {len(paragraphs)} paragraphs")
+        text = ''.join(paragraphs) or None
+    except Exception as e:
+        errors.append(f"Error reading DOCX file: {e}")
+
+    return {'text': text, 'errors': errors, 'timed_out': timed_out}
+
+
+# --- Parent side ---
+
+class DocumentExtractionPool:
+    """
+    Process pool for document text extraction with per-document limits.
+
+    Settings are read from Django settings on first use unless passed
+    explicitly: ``DOCUMENT_EXTRACTION_WORKERS``,
+    ``DOCUMENT_EXTRACTION_TIMEOUT_SECONDS``,
+    ``DOCUMENT_EXTRACTION_MEMORY_LIMIT_MB``,
+    ``DOCUMENT_EXTRACTION_MAX_JOBS_PER_WORKER`` and
+    ``DOCUMENT_EXTRACTION_PAGES_PER_CHUNK``.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, workers: Optional[int] = None, timeout: Optional[float] = None,
+                 memory_limit_mb: Optional[int] = None, max_jobs_per_worker: Optional[int] = None,
+                 pages_per_chunk: Optional[int] = None):
+        self._options = {
+            'workers': workers,
+            'timeout': timeout,
+            'memory_limit_mb': memory_limit_mb,
+            'max_jobs_per_worker': max_jobs_per_worker,
+            'pages_per_chunk': pages_per_chunk,
+        }
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def configure(self, **options):
+        """
+        Override settings-based options (``workers``, ``timeout``, ...).
+        Running workers are stopped so the next job uses the new options.
+        """
+        unknown = set(options) - set(self._options)
+        if unknown:
+            raise ValueError(f"Unknown extraction pool options: {', '.join(sorted(unknown))}")
+        self._options.update(options)
+        self.shutdown()
+
+    def _option(self, name: str, setting: str, default):
+        value = self._options[name]
+        if value is None:
+            from django.conf import settings
+            value = getattr(settings, setting, default) if settings.configured else default
+        return value
+
+    @property
+    def workers(self) -> int:
+        return int(self._option('workers', 'DOCUMENT_EXTRACTION_WORKERS', DEFAULT_WORKERS))
+
+    @property
+    def timeout(self) -> float:
+        return float(self._option('timeout', 'DOCUMENT_EXTRACTION_TIMEOUT_SECONDS', DEFAULT_TIMEOUT_SECONDS))
+
+    @property
+    def memory_limit_mb(self) -> int:
+        return int(self._option('memory_limit_mb', 'DOCUMENT_EXTRACTION_MEMORY_LIMIT_MB', DEFAULT_MEMORY_LIMIT_MB))
+
+    @property
+    def max_jobs_per_worker(self) -> int:
+        return int(self._option('max_jobs_per_worker', 'DOCUMENT_EXTRACTION_MAX_JOBS_PER_WORKER',
+                                DEFAULT_MAX_JOBS_PER_WORKER))
+
+    @property
+    def pages_per_chunk(self) -> int:
+        return max(1, int(self._option('pages_per_chunk', 'DOCUMENT_EXTRACTION_PAGES_PER_CHUNK',
+                                       DEFAULT_PAGES_PER_CHUNK)))
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # 'spawn' gives workers a clean interpreter (no inherited DB
+                # connections or threads) and is required by max_tasks_per_child
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=apply_memory_limit,
+                    initargs=(self.memory_limit_mb,),
+                    max_tasks_per_child=self.max_jobs_per_worker or None,
+                )
+                logger.info(f"Started document extraction pool with {self.workers} workers")
+            return self._executor
+
+    def _discard_executor(self, executor: ProcessPoolExecutor):
+        """Kill every worker of a hung or broken pool; the next job starts a new one."""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        # ProcessPoolExecutor has no public way to stop a running task
+        for process in list((executor._processes or {}).values()):
+            if process.is_alive():
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run_many(self, fn: Callable, jobs: List[tuple], deadline: float) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run ``fn(*args, deadline=deadline)`` for each job in the pool.
+
+        Returns one result per job, or None for jobs whose worker hung or died.
+        A job lost to a pool that broke underneath it (for example because
+        another document's worker was killed) is retried once on a fresh pool.
+        """
+        if self.workers <= 0:
+            return [fn(*args, deadline=deadline) for args in jobs]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(jobs)
+        pending = list(range(len(jobs)))
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                futures = {executor.submit(fn, *jobs[i], deadline=deadline): i for i in pending}
+            except BrokenProcessPool:
+                self._discard_executor(executor)
+                continue
+
+            done, not_done = wait(futures, timeout=max(0, deadline - time.time()) + KILL_GRACE_SECONDS)
+            if not_done:
+                logger.warning("Document extraction worker stopped responding; restarting the pool")
+                self._discard_executor(executor)
+
+            retry = []
+            for future in done:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except BrokenProcessPool:
+                    retry.append(index)
+                except Exception as e:
+                    logger.warning(f"Document extraction job failed: {e!r}")
+            if retry:
+                self._discard_executor(executor)
+            pending = retry
+            if not pending or time.time() >= deadline:
+                break
+        return results
+
+    def extract_pdf(self, data: bytes) -> Dict[str, Any]:
+        """
+        Extract text from a PDF within the configured time and memory limits.
+
+        The first chunk of pages also reports the page count; any remaining
+        chunks are then extracted in parallel.
+
+        Returns:
+            dict: ``text``, ``page_count``, ``pages_extracted``, ``errors`` and
+            ``timed_out``. ``text`` holds whatever could be extracted, which may
+            be partial when ``errors`` is non-empty.
+        """
+        deadline = time.time() + self.timeout
+        # Splitting only pays off when chunks can run side by side
+        chunk = self.pages_per_chunk if self.workers > 1 else None
+        pages: Dict[int, str] = {}
+        errors: List[str] = []
+        timed_out = False
+
+        first = self._run_many(extract_pdf_pages, [(data, 0, chunk)], deadline)[0]
+        results = [first]
+        page_count = first['page_count'] if first else 0
+        if chunk and first and not first['timed_out'] and page_count > chunk:
+            jobs = [(data, start, start + chunk) for start in range(chunk, page_count, chunk)]
+            results += self._run_many(extract_pdf_pages, jobs, deadline)
+
+        for result in results:
+            if result is None:
+                timed_out = True
+                errors.append("Extraction worker was terminated")
+                continue
+            pages.update(result['pages'])
+            errors.extend(result['errors'])
+            timed_out = timed_out or result['timed_out']
+
+        text = ''.join(pages[index] + "\n" for index in sorted(pages))
+        return {
+            'text': text.strip(),
+            'page_count': page_count,
+            'pages_extracted': len(pages),
+            'errors': errors,
+            'timed_out': timed_out,
+        }
+
+    def extract_docx(self, data: bytes) -> Dict[str, Any]:
+        """
+        Extract text from a DOCX within the configured time and memory limits.
+
+        Returns:
+            dict: ``text`` (None if unreadable), ``errors`` and ``timed_out``
+        """
+        result = self._run_many(extract_docx_text, [(data,)], time.time() + self.timeout)[0]
+        if result is None:
+            return {'text': None, 'errors': ["Extraction worker was terminated"], 'timed_out': True}
+        return result
+
+    def shutdown(self):
+        """Stop the worker processes (a later job starts a new pool)."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Global instance
+extraction_pool = DocumentExtractionPool()
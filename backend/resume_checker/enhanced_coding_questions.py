@@ -10,15 +10,16 @@ import time
 from typing import Dict, List, Optional, Tuple
 from collections import Counter
 from datetime import datetime
+import importlib.util
 import numpy as np
 from django.conf import settings
 
-# Import semantic matching libraries
-try:
-    from sentence_transformers import SentenceTransformer, util
-    SEMANTIC_AVAILABLE = True
-except ImportError:
-    SEMANTIC_AVAILABLE = False
+from .nlp_models import model_registry
+
+# Semantic matching libraries are only probed here; the sentence-transformer
+# model itself is loaded lazily through the NLP model registry.
+SEMANTIC_AVAILABLE = importlib.util.find_spec('sentence_transformers') is not None
+if not SEMANTIC_AVAILABLE:
     print("Warning: sentence-transformers not available. Using fallback matching.")
 
 # Try to import Gemini
@@ -45,14 +46,10 @@ class EnhancedCodingQuestionsManager:
     def _ensure_semantic_model_loaded(self):
         """Lazy load semantic model only when needed"""
         if not self._semantic_model_loaded and SEMANTIC_AVAILABLE:
-            try:
-                print("🔄 Loading semantic model...")
-                self.semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
-                self._semantic_model_loaded = True
-                print("✅ Semantic model loaded successfully")
-            except Exception as e:
-                print(f"❌ Error loading semantic model: {e}")
-                self.semantic_model = None
+            self.semantic_model = model_registry.get('sentence_transformer')
+            self._semantic_model_loaded = True
+            if self.semantic_model is None:
+                print("❌ Semantic model unavailable - using fallback matching")
         elif not SEMANTIC_AVAILABLE:
             print("⚠️ Semantic matching disabled - install sentence-transformers")
     
@@ -164,7 +161,10 @@ class EnhancedCodingQuestionsManager:
             question_embeddings = self.semantic_model.encode(question_texts)
             
             # Calculate cosine similarity
-            scores = util.cos_sim(jd_embedding, question_embeddings)[0]
+            jd_norm = np.linalg.norm(jd_embedding) or 1.0
+            question_norms = np.linalg.norm(question_embeddings, axis=1)
+            question_norms[question_norms == 0] = 1.0
+            scores = (question_embeddings @ jd_embedding) / (question_norms * jd_norm)
             
             # Return questions with similarity scores
             return [(questions[i], float(scores[i])) for i in range(len(questions))]
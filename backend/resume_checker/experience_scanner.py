@@ -0,0 +1,168 @@
+"""
+Experience Scanner
+==================
+
+Finds every years-of-experience phrase ("5+ years of experience", "minimum
+3 years") and every employment date range ("2019 - 2022", "Jan 2020 –
+Present") in one pass of a single precompiled regex, and summarizes them:
+
+- ``explicit_years``: the largest stated number of years
+- ``computed_years``: total length of the date ranges after merging overlaps,
+  so concurrent jobs are not counted twice
+- ``confidence``: how much evidence backs the estimate (0.0 - 1.0)
+
+Shared by the lightweight parser (total experience), the ATS scorer (JD
+requirement vs. resume) and the candidate profile auto-fill.
+
+Usage:
+    from .experience_scanner import scan_experience
+
+    scan = scan_experience(resume_text)
+    scan.years          # explicit years, else years from dated roles
+    scan.as_dict()      # JSON-serializable, stored with the parse
+"""
+
+import re
+from datetime import date
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+MONTHS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+
+_MONTH = (
+    r'\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b\.?'
+)
+_YEAR = r'\b(?:19|20)\d{2}'
+
+EXPERIENCE_SCAN_RE = re.compile(
+    # Every match starts a word with a digit or one of these letters; checking
+    # that first skips most positions without trying the alternatives
+    r'\b(?=[\dadefjmnos])(?:'
+    # Employment date range: "2019 - 2022", "Jan 2020 – Dec 2023", "March 2021 to Present"
+    rf'(?P<start_month>{_MONTH})?\s*(?P<start_year>{_YEAR})\s*(?:[-–—]|to)\s*'
+    rf'(?:(?P<end_month>{_MONTH})?\s*(?P<end_year>{_YEAR})\b|(?P<ongoing>present|current|now|date)\b)'
+    # Years phrase: "5+ years", "experience of 3 years", "at least 2 yrs of experience"
+    rf'|(?P<lead>experience\s*of\s*|minimum\s*(?:of\s*)?|at\s*least\s*)?(?P<years>\d+)\+?\s*(?:years?|yrs?)\b'
+    rf'(?P<context>\s*(?:of\s*)?(?:experience|expertise|working|in\s*the\s*field))?'
+    r')',
+    re.IGNORECASE,
+)
+
+# Date ranges on lines like these are studies, not employment
+EDUCATION_LINE_RE = re.compile(
+    r'\b(?:university|college|school|institute|academy|bachelor|master|degree|diploma|phd|b\.?tech|m\.?tech|mba)\b',
+    re.IGNORECASE,
+)
+
+# Stated years beyond this are dates or typos ("2019 years"), not experience
+MAX_EXPLICIT_YEARS = 60
+EARLIEST_EMPLOYMENT_YEAR = 1950
+
+
+class ExperienceScan(NamedTuple):
+    """Experience evidence found in a text."""
+    explicit_years: int
+    computed_years: float
+    confidence: float
+    date_ranges: List[Tuple[str, str]]
+
+    @property
+    def years(self) -> int:
+        """Best estimate: the stated years, else the length of the dated roles."""
+        return self.explicit_years or int(self.computed_years)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'years': self.years,
+            'explicit_years': self.explicit_years,
+            'computed_years': self.computed_years,
+            'confidence': self.confidence,
+            'date_ranges': [list(date_range) for date_range in self.date_ranges],
+        }
+
+
+def _month_index(month: Optional[str]) -> int:
+    return MONTHS.index(month[:3].lower()) if month else 0
+
+
+def _month_label(month: int) -> str:
+    return f"{month // 12:04d}-{month % 12 + 1:02d}"
+
+
+def _line_at(text: str, start: int, end: int) -> str:
+    """The full line(s) around text[start:end]."""
+    line_end = text.find('\n', end)
+    return text[text.rfind('\n', 0, start) + 1:line_end if line_end != -1 else len(text)]
+
+
+def _merged_months(intervals: List[Tuple[int, int]]) -> int:
+    """Total months covered by half-open [start, end) month intervals, overlaps counted once."""
+    total = 0
+    current_start = current_end = None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def scan_experience(text: str, today: Optional[date] = None) -> ExperienceScan:
+    """
+    Scan text once for years-of-experience phrases and employment date ranges.
+
+    Args:
+        text: Resume or job description text
+        today: Date used for open-ended ranges ("2020 - Present"); defaults to today
+    Returns:
+        ExperienceScan with explicit years, years from merged date ranges and a confidence
+    """
+    today = today or date.today()
+    now = today.year * 12 + today.month - 1
+
+    explicit_years = 0
+    contextual = False
+    intervals = []
+    date_ranges = []
+
+    for match in EXPERIENCE_SCAN_RE.finditer(text or ''):
+        if match.group('years') is not None:
+            years = int(match.group('years'))
+            if 0 < years <= MAX_EXPLICIT_YEARS:
+                explicit_years = max(explicit_years, years)
+                contextual = contextual or bool(match.group('lead') or match.group('context'))
+            continue
+
+        start_year = int(match.group('start_year'))
+        start = start_year * 12 + _month_index(match.group('start_month'))
+        if match.group('ongoing'):
+            end = now + 1
+        else:
+            end_month = match.group('end_month')
+            # "Jan 2020 - Dec 2023" includes December; "2020 - 2023" counts whole years
+            end = int(match.group('end_year')) * 12 + (_month_index(end_month) + 1 if end_month else 0)
+        if start_year < EARLIEST_EMPLOYMENT_YEAR or start > now or end <= start:
+            continue
+        if EDUCATION_LINE_RE.search(_line_at(text, match.start(), match.end())):
+            continue
+        intervals.append((start, min(end, now + 1)))
+        date_ranges.append((_month_label(start), 'present' if match.group('ongoing') else _month_label(end - 1)))
+
+    computed_years = round(_merged_months(intervals) / 12, 1)
+
+    if contextual and computed_years and abs(explicit_years - computed_years) <= 1:
+        confidence = 1.0    # Stated and dated experience agree
+    elif contextual:
+        confidence = 0.9    # "5 years of experience"
+    elif computed_years:
+        confidence = 0.8 if len(intervals) > 1 else 0.6
+    elif explicit_years:
+        confidence = 0.4    # Bare "5 years", may not be about experience
+    else:
+        confidence = 0.0
+
+    return ExperienceScan(explicit_years, computed_years, confidence, date_ranges)
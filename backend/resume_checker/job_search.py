@@ -0,0 +1,340 @@
+"""
+Job Search Index
+================
+
+Full-text index over job title, company, department, description and
+requirements, used by ``browse_jobs`` and the recruiter job lists instead of
+``icontains`` scans.
+
+The index is a side table, created and filled after ``migrate`` (the
+``post_migrate`` receiver in ``signals.py``) or by ``rebuild_job_search``,
+never while serving a request:
+
+- SQLite: an FTS5 virtual table (rowid = job id), ranked with bm25;
+- PostgreSQL: a ``tsvector`` column with a GIN index, ranked with ts_rank.
+
+Both tokenize without stemming, so a query means the same on either backend.
+Every word of the query must match. The last word also matches as a prefix
+("pyth" finds "python"), for search-as-you-type. On other databases, or
+while the side table does not exist, searches fall back to ``icontains``
+and writes to the index are skipped.
+
+Matches are ranked by field: a hit in the title counts more than one in the
+company, then the department, then the description or requirements.
+
+The index is kept up to date by the JobDescription save/delete signals.
+``deferred()`` batches the signal updates of a bulk upload into one write.
+Rows changed with ``QuerySet.update()`` bypass the signals;
+``python manage.py rebuild_job_search`` reindexes every job.
+
+Usage:
+    from .job_search import job_search_index
+
+    jobs = job_search_index.filter(JobDescription.objects.filter(status='active'), 'senior pyth')
+    jobs.order_by('-search_rank')
+
+    with job_search_index.deferred():
+        for row in rows:
+            JobDescription.objects.create(**row)
+"""
+
+import logging
+import re
+import threading
+from contextlib import contextmanager
+from typing import Iterable, List, Optional
+
+from django.db import DatabaseError, connection, transaction
+from django.db.models import FloatField, Q, QuerySet, Value
+
+from .models import JobDescription
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = 'resume_checker_job_search'
+SEARCH_FIELDS = ('title', 'company', 'department', 'description', 'requirements')
+
+# Relative weight of a hit in each field (bm25 column weights on SQLite)
+FIELD_WEIGHTS = {'title': 10.0, 'company': 5.0, 'department': 3.0, 'description': 1.0, 'requirements': 1.0}
+
+# Field -> tsvector weight class on PostgreSQL (A ranks highest)
+POSTGRES_FIELD_CLASSES = {'title': 'A', 'company': 'B', 'department': 'C', 'description': 'D', 'requirements': 'D'}
+
+# Letters and digits; punctuation and underscores separate terms, as in both tokenizers
+TERM_RE = re.compile(r'[^\W_]+')
+MAX_QUERY_TERMS = 16
+WRITE_CHUNK_SIZE = 500
+
+
+def query_terms(text: Optional[str]) -> List[str]:
+    """Lowercased search terms of ``text``."""
+    return TERM_RE.findall((text or '').lower())[:MAX_QUERY_TERMS]
+
+
+class JobSearchIndex:
+    """
+    Full-text index of JobDescription rows. All public methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ready_for = None           # Database the side table was checked on
+        self._available = False
+        self._deferred = threading.local()
+
+    # ------------------------------------------------------------------
+    # Schema
+    # ------------------------------------------------------------------
+
+    @property
+    def vendor(self) -> str:
+        return connection.vendor
+
+    def _create_sql(self) -> List[str]:
+        table = connection.ops.quote_name(SEARCH_TABLE)
+        if self.vendor == 'sqlite':
+            return [
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {table} USING fts5("
+                f"{', '.join(SEARCH_FIELDS)}, tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+            ]
+        job_table = connection.ops.quote_name(JobDescription._meta.db_table)
+        return [
+            f"CREATE TABLE IF NOT EXISTS {table} ("
+            f"job_id integer PRIMARY KEY REFERENCES {job_table} (id) ON DELETE CASCADE, "
+            f"document tsvector NOT NULL)",
+            f"CREATE INDEX IF NOT EXISTS {SEARCH_TABLE}_document ON {table} USING GIN (document)",
+        ]
+
+    def create_index(self, populate: bool = True) -> bool:
+        """
+        Create the side table if it does not exist yet.
+
+        Runs after migrations and from ``rebuild_job_search``, outside any
+        request transaction, so the table cannot vanish with a rollback.
+
+        Args:
+            populate: Index every job if the table was just created
+
+        Returns:
+            bool: Whether full-text search is available on this database
+        """
+        if self.vendor not in ('sqlite', 'postgresql'):
+            return False
+        with self._lock:
+            self._ready_for = None
+            try:
+                tables = connection.introspection.table_names()
+                if JobDescription._meta.db_table not in tables:
+                    return False
+                created = SEARCH_TABLE not in tables
+                if created:
+                    with transaction.atomic(), connection.cursor() as cursor:
+                        for sql in self._create_sql():
+                            cursor.execute(sql)
+            except DatabaseError as e:
+                logger.warning(f"Could not create the job search index: {e}")
+                return False
+        if created and populate:
+            logger.info(f"Created job search index with {self.rebuild()} jobs")
+        return True
+
+    def ensure_index(self) -> bool:
+        """
+        Whether the side table exists, checked once per database.
+
+        Returns:
+            bool: Whether full-text search is available on this database
+        """
+        database = (connection.alias, connection.settings_dict.get('NAME'))
+        if self._ready_for == database:
+            return self._available
+        with self._lock:
+            if self._ready_for == database:
+                return self._available
+            available = False
+            if self.vendor in ('sqlite', 'postgresql'):
+                try:
+                    available = SEARCH_TABLE in connection.introspection.table_names()
+                except DatabaseError as e:
+                    logger.warning(f"Could not check for the job search index: {e}")
+                if not available:
+                    logger.warning("Job search index missing (run migrate or rebuild_job_search); using icontains")
+            self._ready_for, self._available = database, available
+        return available
+
+    def _index_failed(self, error: DatabaseError) -> None:
+        """
+        Log a failed index write from a job save or delete, which must not fail
+        because of it, and check for the table again on next use.
+        """
+        logger.warning(f"Job search index write failed: {error}")
+        self._ready_for = None
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _write(self, rows: List[tuple]) -> None:
+        """Replace the index rows of ``rows`` ((job id, *SEARCH_FIELDS) tuples)."""
+        table = connection.ops.quote_name(SEARCH_TABLE)
+        rows = [(job_id, *(value or '' for value in values)) for job_id, *values in rows]
+        # One transaction, so executemany does not commit every row on its own
+        with transaction.atomic(), connection.cursor() as cursor:
+            for start in range(0, len(rows), WRITE_CHUNK_SIZE):
+                chunk = rows[start:start + WRITE_CHUNK_SIZE]
+                if self.vendor == 'sqlite':
+                    placeholders = ', '.join(['%s'] * len(chunk))
+                    cursor.execute(f"DELETE FROM {table} WHERE rowid IN ({placeholders})", [row[0] for row in chunk])
+                    cursor.executemany(
+                        f"INSERT INTO {table} (rowid, {', '.join(SEARCH_FIELDS)}) VALUES (%s, %s, %s, %s, %s, %s)",
+                        chunk,
+                    )
+                else:
+                    document = ' || '.join(
+                        f"setweight(to_tsvector('simple', %s), '{POSTGRES_FIELD_CLASSES[field]}')"
+                        for field in SEARCH_FIELDS
+                    )
+                    cursor.executemany(
+                        f"INSERT INTO {table} (job_id, document) VALUES (%s, {document}) "
+                        f"ON CONFLICT (job_id) DO UPDATE SET document = EXCLUDED.document",
+                        chunk,
+                    )
+
+    def update_jobs(self, jobs: Iterable[JobDescription]) -> None:
+        """(Re)index saved JobDescription instances."""
+        pending = getattr(self._deferred, 'job_ids', None)
+        if pending is not None:
+            pending.update(job.pk for job in jobs)
+            return
+        if not self.ensure_index():
+            return
+        try:
+            self._write([(job.pk, *(getattr(job, field) for field in SEARCH_FIELDS)) for job in jobs])
+        except DatabaseError as e:
+            self._index_failed(e)
+
+    def update_job_ids(self, job_ids: Iterable[int]) -> int:
+        """(Re)index jobs by id, reading their text from the database."""
+        job_ids = list(job_ids)
+        if not job_ids or not self.ensure_index():
+            return 0
+        rows = list(JobDescription.objects.filter(pk__in=job_ids).values_list('pk', *SEARCH_FIELDS))
+        try:
+            self._write(rows)
+        except DatabaseError as e:
+            self._index_failed(e)
+            return 0
+        return len(rows)
+
+    def remove_jobs(self, job_ids: Iterable[int]) -> None:
+        job_ids = list(job_ids)
+        pending = getattr(self._deferred, 'job_ids', None)
+        if pending is not None:
+            pending.difference_update(job_ids)
+        if not job_ids or not self.ensure_index():
+            return
+        table = connection.ops.quote_name(SEARCH_TABLE)
+        key = 'rowid' if self.vendor == 'sqlite' else 'job_id'
+        try:
+            with transaction.atomic(), connection.cursor() as cursor:
+                for start in range(0, len(job_ids), WRITE_CHUNK_SIZE):
+                    chunk = job_ids[start:start + WRITE_CHUNK_SIZE]
+                    cursor.execute(f"DELETE FROM {table} WHERE {key} IN ({', '.join(['%s'] * len(chunk))})", chunk)
+        except DatabaseError as e:
+            self._index_failed(e)
+
+    def rebuild(self) -> int:
+        """Reindex every job. Returns the number of jobs indexed."""
+        if not self.ensure_index():
+            return 0
+        with self._lock, transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(f"DELETE FROM {connection.ops.quote_name(SEARCH_TABLE)}")
+            indexed = 0
+            rows = []
+            for row in JobDescription.objects.order_by('pk').values_list('pk', *SEARCH_FIELDS).iterator(chunk_size=WRITE_CHUNK_SIZE):
+                rows.append(row)
+                if len(rows) >= WRITE_CHUNK_SIZE:
+                    self._write(rows)
+                    indexed += len(rows)
+                    rows = []
+            self._write(rows)
+            return indexed + len(rows)
+
+    @contextmanager
+    def deferred(self):
+        """Collect the jobs saved in the block (on this thread) and index them in one batch at the end."""
+        if getattr(self._deferred, 'job_ids', None) is not None:
+            yield
+            return
+        self._deferred.job_ids = set()
+        try:
+            yield
+        finally:
+            job_ids, self._deferred.job_ids = self._deferred.job_ids, None
+            self.update_job_ids(job_ids)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def match_expression(self, text: Optional[str], prefix: bool = True) -> Optional[str]:
+        """
+        Backend query for ``text``: every term must match, the last one as a prefix
+        when ``prefix``. None when ``text`` has no searchable terms.
+        """
+        terms = query_terms(text)
+        if not terms:
+            return None
+        if self.vendor == 'sqlite':
+            parts = [f'"{term}"' for term in terms]
+            if prefix:
+                parts[-1] += '*'
+            return ' '.join(parts)
+        parts = list(terms)
+        if prefix:
+            parts[-1] += ':*'
+        return ' & '.join(parts)
+
+    def _fallback_filter(self, queryset: QuerySet, text: str) -> QuerySet:
+        condition = Q()
+        for field in SEARCH_FIELDS:
+            condition |= Q(**{f'{field}__icontains': text})
+        return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    def filter(self, queryset: QuerySet, text: Optional[str], prefix: bool = True) -> QuerySet:
+        """
+        Jobs of ``queryset`` matching ``text``, annotated with ``search_rank``
+        (higher is more relevant). Text without searchable terms filters nothing.
+        """
+        text = (text or '').strip()
+        if not text:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+        if not self.ensure_index():
+            return self._fallback_filter(queryset, text)
+        expression = self.match_expression(text, prefix)
+        if expression is None:
+            return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        table = connection.ops.quote_name(SEARCH_TABLE)
+        job_pk = f"{connection.ops.quote_name(queryset.model._meta.db_table)}.{connection.ops.quote_name(queryset.model._meta.pk.column)}"
+        # Joined rather than a correlated subquery, so the full-text match runs once per query
+        if self.vendor == 'sqlite':
+            weights = ', '.join(str(FIELD_WEIGHTS[field]) for field in SEARCH_FIELDS)
+            # bm25 is lower for better matches
+            rank = f"-bm25({table}, {weights})"
+            where = [f"{table} MATCH %s", f"{table}.rowid = {job_pk}"]
+        else:
+            rank = f"ts_rank({table}.document, to_tsquery('simple', %s))"
+            where = [f"{table}.document @@ to_tsquery('simple', %s)", f"{table}.job_id = {job_pk}"]
+        return queryset.extra(
+            select={'search_rank': rank},
+            select_params=[] if self.vendor == 'sqlite' else [expression],
+            tables=[SEARCH_TABLE],
+            where=where,
+            params=[expression],
+        )
+
+
+# Global instance
+job_search_index = JobSearchIndex()
@@ -14,8 +14,11 @@ Features:
 
 import re
 import json
-from typing import Dict, List, Optional, Any
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
 import logging
+
+from .experience_scanner import scan_experience
+from .text_normalization import clean_skill_token
 # Import file processing functions from nlp_utils
 # Note: This import is removed to avoid circular import
 # File processing will be handled in nlp_utils
@@ -23,83 +26,160 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-class LightweightResumeParser:
-    """
-    Fast and efficient resume parser using optimized patterns and templates.
-    """
-    
-    def __init__(self):
-        # Compile regex patterns for better performance
-        self._compile_patterns()
-        
-        # Resume section headers - IMPROVED
-        self.section_headers = {
-            'contact': ['contact', 'personal', 'profile'],
-            'experience': ['experience', 'work history', 'employment', 'career'],
-            'education': ['education', 'academic', 'qualifications'],
-            'skills': ['skills', 'technical skills', 'competencies', 'expertise', 'technologies', 'development tools', 'tools & scripting languages', 'web technologies'],
-            'summary': ['summary', 'objective', 'profile', 'about', 'professional summary'],
-            'projects': ['projects', 'portfolio', 'achievements'],
-            'certifications': ['certifications', 'certificates', 'accreditations'],
-            'languages': ['languages', 'language skills']
-        }
-    
-    def _compile_patterns(self):
-        """Compile regex patterns for better performance"""
-        
+# Resume section headers - IMPROVED
+SECTION_HEADERS = (
+    ('contact', ('contact', 'personal', 'profile')),
+    ('experience', ('experience', 'work history', 'employment', 'career')),
+    ('education', ('education', 'academic', 'qualifications')),
+    ('skills', ('skills', 'technical skills', 'competencies', 'expertise', 'technologies', 'development tools', 'tools & scripting languages', 'web technologies')),
+    ('summary', ('summary', 'objective', 'profile', 'about', 'professional summary')),
+    ('projects', ('projects', 'portfolio', 'achievements')),
+    ('certifications', ('certifications', 'certificates', 'accreditations')),
+    ('languages', ('languages', 'language skills')),
+)
+
+
+class ParserPatterns(NamedTuple):
+    """Compiled regex tables used by LightweightResumeParser (read-only, thread-safe)."""
+    email: Pattern
+    phone: Tuple[Pattern, ...]
+    dates: Tuple[Pattern, ...]
+    job_title: Tuple[Pattern, ...]
+    company: Tuple[Pattern, ...]
+    name: Tuple[Pattern, ...]
+    contact_location: Tuple[Pattern, ...]
+    entry_location: Tuple[Pattern, ...]
+    linkedin: Pattern
+    github: Pattern
+    whitespace: Pattern
+    experience_split: Tuple[Pattern, ...]
+    education_split: Pattern
+    project_split: Pattern
+    degree: Pattern
+    field: Tuple[Pattern, ...]
+    institution: Tuple[Pattern, ...]
+    gpa: Pattern
+    skill_separator: Pattern
+    list_separator: Pattern
+
+
+def compile_parser_patterns() -> ParserPatterns:
+    """Compile every regex the parser uses. Called once per parser instance."""
+    return ParserPatterns(
         # Email pattern
-        self.email_pattern = re.compile(
+        email=re.compile(
             r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        )
+        ),
         
         # Phone patterns (international and local) - IMPROVED
-        self.phone_patterns = [
+        phone=(
             re.compile(r'Phone:\s*([+\d\s\-\(\)\.]+)', re.IGNORECASE),  # Phone: prefix (FIRST)
             re.compile(r'Tel[ephone]*:\s*([+\d\s\-\(\)\.]+)', re.IGNORECASE),  # Tel: prefix (SECOND)
             re.compile(r'\+?[0-9]{1,4}[\s.-]?[0-9]{3,4}[\s.-]?[0-9]{3,4}[\s.-]?[0-9]{3,4}'),  # International with separators
             re.compile(r'\+?1?\s*\(?[0-9]{3}\)?[\s.-]?[0-9]{3}[\s.-]?[0-9]{4}'),  # US/Canada
             re.compile(r'\+?[0-9]{1,4}[\s.-]?[0-9]{5,15}'),  # International (fixed range)
             re.compile(r'[0-9]{10,15}'),  # Simple numeric
-        ]
+        ),
         
         # Date patterns
-        self.date_patterns = [
+        dates=(
             re.compile(r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}'),
             re.compile(r'\d{1,2}/\d{1,2}/\d{4}'),
             re.compile(r'\d{4}-\d{1,2}'),
             re.compile(r'\d{4}\s*-\s*\d{4}'),  # Year ranges
             re.compile(r'\d{4}\s*-\s*Present'),
-            re.compile(r'\d{4}\s*-\s*Current')
-        ]
-        
-        # Experience patterns - IMPROVED
-        self.experience_patterns = [
-            re.compile(r'(\d+)\+?\s*years?\s*experience', re.IGNORECASE),
-            re.compile(r'experience\s*of\s*(\d+)\+?\s*years?', re.IGNORECASE),
-            re.compile(r'(\d+)\+?\s*years?\s*in', re.IGNORECASE),
-            re.compile(r'(\d+)\+?\s*years?\s*working', re.IGNORECASE),
-            re.compile(r'minimum\s*(\d+)\+?\s*years?', re.IGNORECASE),
-            re.compile(r'at\s*least\s*(\d+)\+?\s*years?', re.IGNORECASE),
-            re.compile(r'(\d+)\+?\s*years?', re.IGNORECASE),  # Simple years pattern
-            re.compile(r'(\d+)\+?\s*years?\s*of', re.IGNORECASE),  # years of
-            re.compile(r'(\d+)\+?\s*years?\s*expertise', re.IGNORECASE),  # years expertise
-            re.compile(r'(\d+)\+?\s*years?\s*in\s*the\s*field', re.IGNORECASE),  # years in the field
-        ]
+            re.compile(r'\d{4}\s*-\s*Current'),
+        ),
         
         # Job title patterns
-        self.job_title_patterns = [
-            re.compile(r'(Senior|Junior|Lead|Principal|Staff|Associate)?\s*(Software|Full.?Stack|Front.?end|Back.?end|DevOps|Data|ML|AI|Mobile|Web|UI/UX|QA|Test|System|Network|Security|Cloud|Database|Business|Product|Project|Scrum|Agile|Technical|Solution|Enterprise|Application|Platform|Infrastructure|Site|Site Reliability|Release|Build|Automation|Performance|Quality|Compliance|Governance|Architecture|Design|Development|Engineering|Programmer|Coder|Developer|Engineer|Analyst|Consultant|Manager|Director|Head|VP|CTO|CEO|Founder|Co.?founder|Owner|Freelancer|Contractor|Consultant|Specialist|Expert|Guru|Ninja|Rockstar|Wizard|Hacker|Coder|Programmer)\s*(Developer|Engineer|Architect|Analyst|Consultant|Manager|Director|Lead|Specialist|Expert|Guru|Ninja|Rockstar|Wizard|Hacker|Coder|Programmer)?', re.IGNORECASE)
-        ]
+        job_title=(
+            re.compile(r'(Senior|Junior|Lead|Principal|Staff|Associate)?\s*(Software|Full.?Stack|Front.?end|Back.?end|DevOps|Data|ML|AI|Mobile|Web|UI/UX|QA|Test|System|Network|Security|Cloud|Database|Business|Product|Project|Scrum|Agile|Technical|Solution|Enterprise|Application|Platform|Infrastructure|Site|Site Reliability|Release|Build|Automation|Performance|Quality|Compliance|Governance|Architecture|Design|Development|Engineering|Programmer|Coder|Developer|Engineer|Analyst|Consultant|Manager|Director|Head|VP|CTO|CEO|Founder|Co.?founder|Owner|Freelancer|Contractor|Consultant|Specialist|Expert|Guru|Ninja|Rockstar|Wizard|Hacker|Coder|Programmer)\s*(Developer|Engineer|Architect|Analyst|Consultant|Manager|Director|Lead|Specialist|Expert|Guru|Ninja|Rockstar|Wizard|Hacker|Coder|Programmer)?', re.IGNORECASE),
+        ),
         
         # Company patterns
-        self.company_patterns = [
+        company=(
             re.compile(r'at\s+([A-Z][A-Za-z0-9\s&.,]+?)(?:\s*[-–—]\s*|$)'),
             re.compile(r'([A-Z][A-Za-z0-9\s&.,]+?)\s*[-–—]\s*[A-Z]'),
             re.compile(r'([A-Z][A-Za-z0-9\s&.,]+?)\s*Inc\.?'),
             re.compile(r'([A-Z][A-Za-z0-9\s&.,]+?)\s*Corp\.?'),
             re.compile(r'([A-Z][A-Za-z0-9\s&.,]+?)\s*LLC'),
-            re.compile(r'([A-Z][A-Za-z0-9\s&.,]+?)\s*Ltd\.?')
-        ]
+            re.compile(r'([A-Z][A-Za-z0-9\s&.,]+?)\s*Ltd\.?'),
+        ),
+        
+        # Name patterns - IMPROVED to handle ALL CAPS and Title Case
+        name=(
+            re.compile(r'^[A-Z][a-z]+\s+[A-Z][a-z]+$'),  # First Last (Title Case)
+            re.compile(r'^[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+$'),  # First Middle Last (Title Case)
+            re.compile(r'^[A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+$'),  # First M. Last (Title Case)
+            re.compile(r'^[A-Z]+\s+[A-Z]+$'),  # FIRST LAST (ALL CAPS)
+            re.compile(r'^[A-Z]+\s+[A-Z]+\s+[A-Z]+$'),  # FIRST MIDDLE LAST (ALL CAPS)
+            re.compile(r'^[A-Z][a-z]+\s+[A-Z]+$'),  # First LAST (Mixed)
+            re.compile(r'^[A-Z]+\s+[A-Z][a-z]+$'),  # FIRST Last (Mixed)
+        ),
+        
+        # Contact location, used when spaCy NER is not available
+        contact_location=(
+            re.compile(r'Location:\s*([A-Z][a-z]+,\s*[A-Z][a-z]+)'),  # Location: City, Country
+            re.compile(r'Location:\s*([A-Z][a-z]+,\s*[A-Z]{2})'),  # Location: City, State
+            re.compile(r'([A-Z][a-z]+,\s*[A-Z]{2})'),  # City, State
+            re.compile(r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'),  # City, Country
+            re.compile(r'([A-Z][a-z]+\s*[-–—]\s*[A-Z][a-z]+)'),  # City - Country
+        ),
+        
+        # Location of a single job entry
+        entry_location=(
+            re.compile(r'([A-Z][a-z]+,\s*[A-Z]{2})'),  # City, State
+            re.compile(r'([A-Z][a-z]+,\s*[A-Z][a-z]+)'),  # City, Country
+        ),
+        
+        linkedin=re.compile(r'linkedin\.com/in/[a-zA-Z0-9-]+'),
+        github=re.compile(r'github\.com/[a-zA-Z0-9-]+'),
+        whitespace=re.compile(r'\s+'),
+        
+        # Common patterns that indicate new job entries
+        experience_split=(
+            re.compile(r'\n(?=[A-Z][a-z]+\s+[-–—]\s*[A-Z])'),  # Title - Company
+            re.compile(r'\n(?=[A-Z][a-z]+\s+at\s+[A-Z])'),  # Title at Company
+            re.compile(r'\n(?=\d{4}\s*[-–—]\s*\d{4})'),  # Date ranges
+            re.compile(r'\n(?=Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'),  # Month names
+        ),
+        education_split=re.compile(r'\n(?=[A-Z][a-z]+\s+[-–—]|Bachelor|Master|PhD|B\.|M\.|Ph\.)'),
+        project_split=re.compile(r'\n(?=[A-Z][a-z]+\s+[-–—]|Project|Portfolio)'),
+        
+        # Education entry fields
+        degree=re.compile(r'\b(Bachelor|Master|PhD|B\.|M\.|Ph\.|Associate|Diploma|Certificate)\b', re.IGNORECASE),
+        field=(
+            re.compile(r'in\s+([A-Za-z\s]+?)(?:\s*[-–—]|$)'),
+            re.compile(r'([A-Za-z\s]+?)\s*[-–—]'),
+        ),
+        institution=(
+            re.compile(r'[-–—]\s*([A-Z][A-Za-z\s&.,]+?)(?:\s*[-–—]|$)'),
+            re.compile(r'at\s+([A-Z][A-Za-z\s&.,]+?)(?:\s*[-–—]|$)'),
+        ),
+        gpa=re.compile(r'GPA[:\s]*([0-9]\.[0-9]{1,2})', re.IGNORECASE),
+        
+        # Skill, certification and language list delimiters
+        skill_separator=re.compile(r'[,•\s]+'),
+        list_separator=re.compile(r'[,•\n\r\t]'),
+    )
+
+
+class LightweightResumeParser:
+    """
+    Fast and efficient resume parser using optimized patterns and templates.
+    
+    Instances are immutable and keep no per-parse state, so the process-wide
+    ``resume_parser`` is shared by every caller and thread instead of
+    recompiling the pattern tables for each resume.
+    """
+    
+    __slots__ = ('patterns',)
+    
+    def __init__(self, patterns: Optional[ParserPatterns] = None):
+        object.__setattr__(self, 'patterns', patterns or compile_parser_patterns())
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
     
     def parse_resume(self, text: str) -> Dict[str, Any]:
         """
@@ -111,16 +191,49 @@ class LightweightResumeParser:
         Returns:
             Dictionary with structured resume data
         """
-        try:
-            # Clean and normalize text
-            cleaned_text = self._clean_text(text)
+        return self._parse_cleaned(text, self._clean_text(text))
+    
+    def parse_many(self, texts: Iterable[str], n_process: int = 1, batch_size: int = 64) -> List[Dict[str, Any]]:
+        """
+        Parse a batch of resumes; same results as parse_resume for each text.
+        
+        Setup shared by the batch is done once: contact locations for all
+        resumes go through a single spaCy ``nlp.pipe`` call.
+        
+        Args:
+            texts: Raw resume texts
+            n_process: spaCy worker processes for location extraction
+            batch_size: Documents per spaCy batch
             
+        Returns:
+            List of structured resume data, in input order
+        """
+        texts = list(texts)
+        cleaned_texts = [self._clean_text(text) for text in texts]
+        try:
+            from .nlp_utils import extract_locations_batch
+            locations = extract_locations_batch(cleaned_texts, n_process=n_process, batch_size=batch_size)
+        except Exception as e:
+            logger.error(f"Batch location extraction failed, extracting per resume: {e}")
+            locations = [None] * len(texts)
+        
+        return [
+            self._parse_cleaned(text, cleaned_text, location)
+            for text, cleaned_text, location in zip(texts, cleaned_texts, locations)
+        ]
+    
+    def _parse_cleaned(self, text: str, cleaned_text: str, location: Optional[str] = None) -> Dict[str, Any]:
+        """Parse cleaned resume text; ``location`` is the contact location when already extracted."""
+        try:
             # Extract sections
             sections = self._extract_sections(cleaned_text)
             
+            # Stated years and dated roles, scanned once over the full text
+            experience_scan = scan_experience(cleaned_text)
+            
             # Parse each section
             parsed_data = {
-                'contact': self._parse_contact(cleaned_text),  # Use full text for contact extraction
+                'contact': self._parse_contact(cleaned_text, location),  # Use full text for contact extraction
                 'experience': self._parse_experience(sections.get('experience', '')),
                 'education': self._parse_education(sections.get('education', '')),
                 'skills': self._parse_skills(sections.get('skills', '')),
@@ -128,7 +241,8 @@ class LightweightResumeParser:
                 'projects': self._parse_projects(sections.get('projects', '')),
                 'certifications': self._parse_certifications(sections.get('certifications', '')),
                 'languages': self._parse_languages(sections.get('languages', '')),
-                'total_experience_years': self._calculate_total_experience(cleaned_text),  # Use full text for experience calculation
+                'total_experience_years': experience_scan.years,
+                'experience_scan': experience_scan.as_dict(),
                 'extracted_text': cleaned_text
             }
             
@@ -147,15 +261,14 @@ class LightweightResumeParser:
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         # Normalize line breaks first
-        text = re.sub(r'\r\n', '\n', text)
-        text = re.sub(r'\r', '\n', text)
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
         
         # Remove extra whitespace but preserve line breaks
         lines = text.split('\n')
         cleaned_lines = []
         for line in lines:
             # Clean each line but preserve structure
-            cleaned_line = re.sub(r'\s+', ' ', line.strip())
+            cleaned_line = self.patterns.whitespace.sub(' ', line.strip())
             if cleaned_line:
                 cleaned_lines.append(cleaned_line)
         
@@ -200,24 +313,24 @@ class LightweightResumeParser:
         line_lower = line.lower()
         
         # Check for section headers
-        for section, keywords in self.section_headers.items():
+        for section, keywords in SECTION_HEADERS:
             for keyword in keywords:
                 if keyword in line_lower and len(line.split()) <= 3:
                     return section
         
         return 'unknown'
         
-    def _parse_contact(self, text: str) -> Dict[str, str]:
-        """Parse contact information"""
+    def _parse_contact(self, text: str, location: Optional[str] = None) -> Dict[str, str]:
+        """Parse contact information; ``location`` is used when already extracted (see parse_many)"""
         contact = {}
         
         # Extract email
-        email_match = self.email_pattern.search(text)
+        email_match = self.patterns.email.search(text)
         if email_match:
             contact['email'] = email_match.group()
         
         # Extract phone - IMPROVED
-        for pattern in self.phone_patterns:
+        for pattern in self.patterns.phone:
             phone_match = pattern.search(text)
             if phone_match:
                 # Handle patterns with groups (like Phone: prefix)
@@ -237,35 +350,26 @@ class LightweightResumeParser:
         
         # Extract location - USING SPA CY NER
         try:
-            from .nlp_utils import extract_location_with_spacy
-            location = extract_location_with_spacy(text)
+            if location is None:
+                from .nlp_utils import extract_location_with_spacy
+                location = extract_location_with_spacy(text)
             if location:
                 contact['location'] = location
         except ImportError:
             # Fallback to regex if spaCy is not available
-            location_patterns = [
-                r'Location:\s*([A-Z][a-z]+,\s*[A-Z][a-z]+)',  # Location: City, Country
-                r'Location:\s*([A-Z][a-z]+,\s*[A-Z]{2})',  # Location: City, State
-                r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, State
-                r'([A-Z][a-z]+,\s*[A-Z][a-z]+)',  # City, Country
-                r'([A-Z][a-z]+\s*[-–—]\s*[A-Z][a-z]+)',  # City - Country
-            ]
-            
-            for pattern in location_patterns:
-                location_match = re.search(pattern, text)
+            for pattern in self.patterns.contact_location:
+                location_match = pattern.search(text)
                 if location_match:
                     contact['location'] = location_match.group(1)
                     break
         
         # Extract LinkedIn
-        linkedin_pattern = re.compile(r'linkedin\.com/in/[a-zA-Z0-9-]+')
-        linkedin_match = linkedin_pattern.search(text)
+        linkedin_match = self.patterns.linkedin.search(text)
         if linkedin_match:
             contact['linkedin'] = linkedin_match.group()
         
         # Extract GitHub
-        github_pattern = re.compile(r'github\.com/[a-zA-Z0-9-]+')
-        github_match = github_pattern.search(text)
+        github_match = self.patterns.github.search(text)
         if github_match:
             contact['github'] = github_match.group()
         
@@ -276,19 +380,8 @@ class LightweightResumeParser:
         if not text or len(text.split()) > 4:
             return False
         
-        # Check for name patterns - IMPROVED to handle ALL CAPS and Title Case
-        name_patterns = [
-            r'^[A-Z][a-z]+\s+[A-Z][a-z]+$',  # First Last (Title Case)
-            r'^[A-Z][a-z]+\s+[A-Z][a-z]+\s+[A-Z][a-z]+$',  # First Middle Last (Title Case)
-            r'^[A-Z][a-z]+\s+[A-Z]\.\s*[A-Z][a-z]+$',  # First M. Last (Title Case)
-            r'^[A-Z]+\s+[A-Z]+$',  # FIRST LAST (ALL CAPS)
-            r'^[A-Z]+\s+[A-Z]+\s+[A-Z]+$',  # FIRST MIDDLE LAST (ALL CAPS)
-            r'^[A-Z][a-z]+\s+[A-Z]+$',  # First LAST (Mixed)
-            r'^[A-Z]+\s+[A-Z][a-z]+$',  # FIRST Last (Mixed)
-        ]
-        
-        for pattern in name_patterns:
-            if re.match(pattern, text):
+        for pattern in self.patterns.name:
+            if pattern.match(text):
                 return True
         
         return False
@@ -312,19 +405,11 @@ class LightweightResumeParser:
 
     def _split_experience_entries(self, text: str) -> List[str]:
         """Split experience section into individual job entries"""
-        # Common patterns that indicate new job entries
-        split_patterns = [
-            r'\n(?=[A-Z][a-z]+\s+[-–—]\s*[A-Z])',  # Title - Company
-            r'\n(?=[A-Z][a-z]+\s+at\s+[A-Z])',  # Title at Company
-            r'\n(?=\d{4}\s*[-–—]\s*\d{4})',  # Date ranges
-            r'\n(?=Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',  # Month names
-        ]
-        
         entries = [text]
-        for pattern in split_patterns:
+        for pattern in self.patterns.experience_split:
             new_entries = []
             for entry in entries:
-                split_parts = re.split(pattern, entry)
+                split_parts = pattern.split(entry)
                 new_entries.extend(split_parts)
             entries = new_entries
         
@@ -338,7 +423,7 @@ class LightweightResumeParser:
         
         # Extract job title
         for line in lines:
-            for pattern in self.job_title_patterns:
+            for pattern in self.patterns.job_title:
                 match = pattern.search(line)
                 if match:
                     experience['title'] = match.group().strip()
@@ -348,7 +433,7 @@ class LightweightResumeParser:
         
         # Extract company name
         for line in lines:
-            for pattern in self.company_patterns:
+            for pattern in self.patterns.company:
                 match = pattern.search(line)
                 if match:
                     experience['company'] = match.group(1).strip()
@@ -365,22 +450,18 @@ class LightweightResumeParser:
             experience['start_date'] = dates[0]
         
         # Extract location
-        location_patterns = [
-            r'([A-Z][a-z]+,\s*[A-Z]{2})',  # City, State
-            r'([A-Z][a-z]+,\s*[A-Z][a-z]+)',  # City, Country
-        ]
-        
-        for pattern in location_patterns:
-            match = re.search(pattern, text)
+        for pattern in self.patterns.entry_location:
+            match = pattern.search(text)
             if match:
                 experience['location'] = match.group(1)
                 break
         
         # Extract description
         description_lines = []
+        title_and_company_patterns = self.patterns.job_title + self.patterns.company
         for line in lines:
             line = line.strip()
-            if line and not any(pattern.search(line) for pattern in self.job_title_patterns + self.company_patterns):
+            if line and not any(pattern.search(line) for pattern in title_and_company_patterns):
                 description_lines.append(line)
         
         if description_lines:
@@ -392,7 +473,7 @@ class LightweightResumeParser:
         """Extract dates from text"""
         dates = []
         
-        for pattern in self.date_patterns:
+        for pattern in self.patterns.dates:
             matches = pattern.findall(text)
             dates.extend(matches)
         
@@ -403,7 +484,7 @@ class LightweightResumeParser:
         educations = []
         
         # Split by potential education entries
-        edu_entries = re.split(r'\n(?=[A-Z][a-z]+\s+[-–—]|Bachelor|Master|PhD|B\.|M\.|Ph\.)', text)
+        edu_entries = self.patterns.education_split.split(text)
         
         for entry in edu_entries:
             if not entry.strip():
@@ -420,36 +501,20 @@ class LightweightResumeParser:
         education = {}
         
         # Extract degree
-        degree_patterns = [
-            r'\b(Bachelor|Master|PhD|B\.|M\.|Ph\.|Associate|Diploma|Certificate)\b',
-        ]
-        
-        for pattern in degree_patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                education['degree'] = match.group()
-                break
+        match = self.patterns.degree.search(text)
+        if match:
+            education['degree'] = match.group()
         
         # Extract field of study
-        field_patterns = [
-            r'in\s+([A-Za-z\s]+?)(?:\s*[-–—]|$)',
-            r'([A-Za-z\s]+?)\s*[-–—]',
-        ]
-        
-        for pattern in field_patterns:
-            match = re.search(pattern, text)
+        for pattern in self.patterns.field:
+            match = pattern.search(text)
             if match:
                 education['field'] = match.group(1).strip()
                 break
         
         # Extract institution
-        institution_patterns = [
-            r'[-–—]\s*([A-Z][A-Za-z\s&.,]+?)(?:\s*[-–—]|$)',
-            r'at\s+([A-Z][A-Za-z\s&.,]+?)(?:\s*[-–—]|$)',
-        ]
-        
-        for pattern in institution_patterns:
-            match = re.search(pattern, text)
+        for pattern in self.patterns.institution:
+            match = pattern.search(text)
             if match:
                 education['institution'] = match.group(1).strip()
                 break
@@ -463,7 +528,7 @@ class LightweightResumeParser:
             education['start_date'] = dates[0]
         
         # Extract GPA
-        gpa_match = re.search(r'GPA[:\s]*([0-9]\.[0-9]{1,2})', text, re.IGNORECASE)
+        gpa_match = self.patterns.gpa.search(text)
         if gpa_match:
             education['gpa'] = gpa_match.group(1)
         
@@ -487,21 +552,21 @@ class LightweightResumeParser:
                 if len(parts) == 2:
                     skill_list = parts[1].strip()
                     # Split by commas and clean
-                    for skill in re.split(r'[,•\s]+', skill_list):
+                    for skill in self.patterns.skill_separator.split(skill_list):
                         skill = skill.strip()
                         if skill and len(skill) > 1:
                             # Clean the skill
-                            clean_skill = re.sub(r'[^\w\s-]', '', skill).strip()
+                            clean_skill = clean_skill_token(skill)
                             if clean_skill and len(clean_skill) > 1:
                                 skills.append(clean_skill)
             else:
                 # Handle regular skill format
-                skill_entries = re.split(r'[,•\n\r\t]', line)
+                skill_entries = self.patterns.list_separator.split(line)
                 for entry in skill_entries:
                     entry = entry.strip()
                     if entry and len(entry) > 1:
                         # Clean the skill
-                        skill = re.sub(r'[^\w\s-]', '', entry).strip()
+                        skill = clean_skill_token(entry)
                         if skill and len(skill) > 1:
                             skills.append(skill)
         
@@ -516,7 +581,7 @@ class LightweightResumeParser:
         projects = []
         
         # Split by project entries
-        project_entries = re.split(r'\n(?=[A-Z][a-z]+\s+[-–—]|Project|Portfolio)', text)
+        project_entries = self.patterns.project_split.split(text)
         
         for entry in project_entries:
             if not entry.strip():
@@ -555,7 +620,7 @@ class LightweightResumeParser:
         certifications = []
         
         # Split by common delimiters
-        cert_entries = re.split(r'[,•\n\r\t]', text)
+        cert_entries = self.patterns.list_separator.split(text)
         
         for entry in cert_entries:
             entry = entry.strip()
@@ -569,7 +634,7 @@ class LightweightResumeParser:
         languages = []
         
         # Split by common delimiters
-        lang_entries = re.split(r'[,•\n\r\t]', text)
+        lang_entries = self.patterns.list_separator.split(text)
         
         for entry in lang_entries:
             entry = entry.strip()
@@ -578,108 +643,6 @@ class LightweightResumeParser:
         
         return languages
         
-    def _calculate_total_experience(self, experience_text: str) -> int:
-        """Calculate total years of experience - IMPROVED"""
-        max_years = 0
-        
-        # Method 1: Pattern-based extraction
-        for pattern in self.experience_patterns:
-            matches = pattern.findall(experience_text)
-            for match in matches:
-                try:
-                    years = int(match)
-                    max_years = max(max_years, years)
-                except ValueError:
-                    continue
-        
-        # Method 2: Date-based calculation (if pattern method fails)
-        if max_years == 0:
-            max_years = self._calculate_experience_from_dates(experience_text)
-        
-        # Method 3: Summary-based extraction (if both above fail)
-        if max_years == 0:
-            max_years = self._extract_experience_from_summary(experience_text)
-        
-        return max_years
-    
-    def _calculate_experience_from_dates(self, text: str) -> int:
-        """Calculate experience from job dates"""
-        try:
-            # Extract all date patterns
-            date_patterns = [
-                r'(\d{4})\s*[-–—]\s*(\d{4})',  # 2020-2023
-                r'(\d{4})\s*[-–—]\s*Present',  # 2020-Present
-                r'(\d{4})\s*[-–—]\s*Current',  # 2020-Current
-                r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})\s*[-–—]\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})',  # Jan 2020 - Dec 2023
-            ]
-            
-            start_years = []
-            end_years = []
-            
-            for pattern in date_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    if len(match) == 2:  # Year-Year format
-                        try:
-                            start_years.append(int(match[0]))
-                            end_years.append(int(match[1]))
-                        except ValueError:
-                            continue
-                    elif len(match) == 4:  # Month Year - Month Year format
-                        try:
-                            start_years.append(int(match[1]))
-                            end_years.append(int(match[3]))
-                        except ValueError:
-                            continue
-            
-            # Calculate total experience
-            if start_years and end_years:
-                total_years = 0
-                for start, end in zip(start_years, end_years):
-                    if end > start:
-                        total_years += (end - start)
-                
-                # Add current year if there's a "Present" or "Current" entry
-                from datetime import datetime
-                current_year = datetime.now().year
-                for start in start_years:
-                    if start > 0 and start <= current_year:
-                        total_years = max(total_years, current_year - start)
-                
-                return total_years
-            
-        except Exception as e:
-            print(f"Error in date-based calculation: {e}")
-        
-        return 0
-    
-    def _extract_experience_from_summary(self, text: str) -> int:
-        """Extract experience from summary text"""
-        try:
-            # Look for experience mentions in summary
-            summary_patterns = [
-                r'(\d+)\+?\s*years?\s*experience',
-                r'experience\s*of\s*(\d+)\+?\s*years?',
-                r'(\d+)\+?\s*years?\s*expertise',
-                r'(\d+)\+?\s*years?\s*in\s*the\s*field',
-                r'(\d+)\+?\s*years?\s*working',
-                r'(\d+)\+?\s*years?\s*of\s*experience',
-            ]
-            
-            for pattern in summary_patterns:
-                matches = re.findall(pattern, text, re.IGNORECASE)
-                for match in matches:
-                    try:
-                        years = int(match)
-                        return years
-                    except ValueError:
-                        continue
-        
-        except Exception as e:
-            print(f"Error in summary-based extraction: {e}")
-        
-        return 0
-
     def _validate_and_clean(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Validate and clean extracted data"""
         
@@ -699,16 +662,20 @@ class LightweightResumeParser:
 
     def _is_valid_email(self, email: str) -> bool:
         """Validate email format"""
-        return bool(self.email_pattern.match(email))
+        return bool(self.patterns.email.match(email))
 
     def _is_valid_phone(self, phone: str) -> bool:
         """Validate phone format"""
-        for pattern in self.phone_patterns:
+        for pattern in self.patterns.phone:
             if pattern.match(phone):
                 return True
         return False
 
 
+# Global instance, shared process-wide
+resume_parser = LightweightResumeParser()
+
+
 # Convenience function for easy usage
 def parse_resume_lightweight(text: str) -> Dict[str, Any]:
     """
@@ -720,8 +687,7 @@ def parse_resume_lightweight(text: str) -> Dict[str, Any]:
     Returns:
         Dictionary with structured resume data
     """
-    parser = LightweightResumeParser()
-    return parser.parse_resume(text)
+    return resume_parser.parse_resume(text)
 
 
 def parse_resume_file(file_path: str) -> Dict[str, Any]:
@@ -766,7 +732,7 @@ def benchmark_parser(text: str, iterations: int = 100) -> Dict[str, float]:
     """
     import time
     
-    parser = LightweightResumeParser()
+    parser = resume_parser
     
     # Warm up
     for _ in range(10):
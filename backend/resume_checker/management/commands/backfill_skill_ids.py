@@ -0,0 +1,53 @@
+import time
+
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from resume_checker.skill_vocabulary import SKILL_ID_FIELDS, skill_vocabulary
+
+
+class Command(BaseCommand):
+    help = 'Seed the canonical skill vocabulary and fill the skill ID arrays of existing rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--models', nargs='+', choices=sorted(SKILL_ID_FIELDS), metavar='LABEL',
+                            help='Only backfill these models (default: all skill-bearing models)')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Rows loaded and saved per database round trip')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        seeded = skill_vocabulary.seed()
+        self.stdout.write(self.style.SUCCESS(f'🚀 Skill vocabulary seeded with {seeded} dictionary skills'))
+
+        chunk_size = max(1, options['chunk_size'])
+        for label in options['models'] or SKILL_ID_FIELDS:
+            model = apps.get_model(label)
+            skills_field, ids_field = SKILL_ID_FIELDS[label]
+            rows = model._base_manager.order_by('pk').values_list('pk', skills_field, ids_field)
+
+            processed = updated = 0
+            last_pk = None
+            while True:
+                # Keyset pagination (primary keys may be UUIDs)
+                chunk_rows = rows if last_pk is None else rows.filter(pk__gt=last_pk)
+                chunk = list(chunk_rows[:chunk_size])
+                if not chunk:
+                    break
+                last_pk = chunk[-1][0]
+
+                changed = []
+                for pk, skills, skill_ids in chunk:
+                    new_ids = skill_vocabulary.ids(skills)
+                    if new_ids != skill_ids:
+                        changed.append(model(pk=pk, **{ids_field: new_ids}))
+                if changed:
+                    # bulk_update sends no signals and leaves auto_now timestamps alone
+                    model._base_manager.bulk_update(changed, [ids_field])
+                processed += len(chunk)
+                updated += len(changed)
+
+            self.stdout.write(f'   {label}.{ids_field}: {updated} of {processed} rows updated')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(f'✅ Skill IDs backfilled in {elapsed:.1f}s'))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+import time
+
+from resume_checker.models import JobDescription, Resume
+from resume_checker.tfidf_index import tfidf_index, job_key, resume_key
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the corpus TF-IDF index from all resumes and job descriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Only index new or changed documents instead of rebuilding from scratch'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🚀 Building corpus TF-IDF index...'))
+        start_time = time.perf_counter()
+
+        resumes = Resume.objects.exclude(processed_text__isnull=True).exclude(processed_text='')
+        jobs = JobDescription.objects.exclude(processed_text__isnull=True).exclude(processed_text='')
+        documents = [
+            (resume_key(resume_id), text)
+            for resume_id, text in resumes.values_list('id', 'processed_text').iterator()
+        ] + [
+            (job_key(job_id), text)
+            for job_id, text in jobs.values_list('id', 'processed_text').iterator()
+        ]
+        self.stdout.write(f'📄 Found {len(documents)} documents with processed text')
+
+        if options['incremental']:
+            changed = tfidf_index.sync(documents)
+            self.stdout.write(f'🔄 Updated {changed} documents')
+        else:
+            indexed = tfidf_index.rebuild(documents)
+            self.stdout.write(f'📚 Indexed {indexed} documents')
+
+        elapsed = time.perf_counter() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f'🎉 TF-IDF index ready in {elapsed:.2f}s ({tfidf_index.index_dir})')
+        )
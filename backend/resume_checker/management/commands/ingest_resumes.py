@@ -0,0 +1,376 @@
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+import hashlib
+import multiprocessing
+import os
+import re
+import time
+import zipfile
+
+from resume_checker.models import Candidate, Resume, ResumeParseCache, generate_candidate_id
+from resume_checker.resume_ingest import init_worker, iter_resume_sources, parse_resume_file
+from resume_checker.resume_processing import get_parser_version, merge_resume_skills, update_candidate_profile
+from resume_checker.skill_vocabulary import skill_vocabulary
+from resume_checker.tfidf_index import tfidf_index, resume_key
+
+# Candidates whose resume has no email address get a stable placeholder derived
+# from the file content, so re-running an import never duplicates them
+PLACEHOLDER_EMAIL_DOMAIN = 'imported.invalid'
+
+# Seconds between checks for parses that exceeded --parse-timeout
+STUCK_CHECK_INTERVAL_SECONDS = 5
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import resumes (PDF/DOCX/TXT) from a directory or ZIP archive'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Directory or .zip archive of resume files')
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=os.cpu_count() or 2,
+            help='Number of parser processes (default: CPU count)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Resumes written per bulk insert (default: 500)'
+        )
+        parser.add_argument(
+            '--memory-limit-mb',
+            type=int,
+            default=settings.DOCUMENT_EXTRACTION_MEMORY_LIMIT_MB,
+            help='Address-space limit per parser process, 0 to disable (default: DOCUMENT_EXTRACTION_MEMORY_LIMIT_MB)'
+        )
+        parser.add_argument(
+            '--parse-timeout',
+            type=float,
+            default=settings.DOCUMENT_EXTRACTION_TIMEOUT_SECONDS * 4,
+            help='Seconds a single file may spend in a parser process before it is abandoned '
+                 '(default: 4 x DOCUMENT_EXTRACTION_TIMEOUT_SECONDS)'
+        )
+        parser.add_argument(
+            '--skip-index',
+            action='store_true',
+            help='Do not add the imported resumes to the TF-IDF index'
+        )
+        parser.add_argument(
+            '--failures-file',
+            help='Write every failed file and its error to this path (tab-separated)'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.isdir(path) and not zipfile.is_zipfile(path):
+            raise CommandError(f'{path} is not a directory or ZIP archive')
+
+        self.stdout.write(self.style.SUCCESS(f'🚀 Ingesting resumes from {path}'))
+        self.workers = max(1, options['workers'])
+        self.memory_limit_mb = options['memory_limit_mb']
+        parse_timeout = options['parse_timeout']
+        self.parser_version = get_parser_version()
+        self.stats = {'found': 0, 'parsed': 0, 'cache_hits': 0, 'duplicates': 0,
+                      'candidates_created': 0, 'candidates_matched': 0, 'resumes_created': 0}
+        self.failures = []
+        self.indexed_documents = []
+
+        # Files whose content is already stored as a resume are skipped, and
+        # files parsed before (by uploads or an earlier import) reuse that parse
+        known_resumes = set(Resume.objects.exclude(content_hash='').values_list('content_hash', flat=True))
+        cached_parses = set(
+            ResumeParseCache.objects.filter(parser_version=self.parser_version).values_list('content_hash', flat=True)
+        )
+        self.stdout.write(f'📚 {len(known_resumes)} resumes already stored, {len(cached_parses)} cached parses')
+
+        self.start_time = time.perf_counter()
+        executor = self._start_executor()
+        try:
+            sources = iter_resume_sources(path)
+            ready = []
+            in_flight = {}
+            started = {}
+            attempts = {}
+            max_in_flight = self.workers * 4
+            exhausted = False
+
+            while True:
+                while not exhausted and len(in_flight) < max_in_flight:
+                    try:
+                        name, data = next(sources)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    self.stats['found'] += 1
+                    content_hash = hashlib.sha256(data).hexdigest()
+                    if content_hash in known_resumes:
+                        self.stats['duplicates'] += 1
+                        continue
+                    known_resumes.add(content_hash)
+                    if content_hash in cached_parses:
+                        ready.append((name, data, content_hash, None))
+                    else:
+                        in_flight[executor.submit(parse_resume_file, name, data)] = (name, data, content_hash)
+
+                if in_flight:
+                    done, _ = wait(in_flight, timeout=STUCK_CHECK_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+                    resubmit = []
+                    for future in done:
+                        name, data, content_hash = in_flight.pop(future)
+                        started.pop(future, None)
+                        try:
+                            ready.append((name, data, content_hash, future.result()))
+                            self.stats['parsed'] += 1
+                        except BrokenProcessPool:
+                            # A worker died (crash or memory limit); every job it
+                            # shared the pool with is lost. Retry each once.
+                            self._retry_or_fail(name, data, content_hash, attempts, resubmit, 'Parser process crashed')
+                        except Exception as e:
+                            self.failures.append((name, str(e)))
+
+                    # A hung parser cannot be cancelled; its pool is replaced like a crashed one
+                    now = time.monotonic()
+                    for future in in_flight:
+                        if future.running() and not future.done():
+                            started.setdefault(future, now)
+                    stuck = [
+                        future for future, since in started.items()
+                        if now - since > parse_timeout and not future.done()
+                    ]
+                    for future in stuck:
+                        name, data, content_hash = in_flight.pop(future)
+                        started.pop(future)
+                        self._retry_or_fail(
+                            name, data, content_hash, attempts, resubmit, f'Parsing took over {parse_timeout:g}s'
+                        )
+
+                    if resubmit:
+                        self._stop_executor(executor)
+                        executor = self._start_executor()
+                        resubmit += list(in_flight.values())
+                        started = {}
+                        in_flight = {
+                            executor.submit(parse_resume_file, name, data): (name, data, content_hash)
+                            for name, data, content_hash in resubmit
+                        }
+
+                while len(ready) >= options['batch_size'] or (ready and exhausted and not in_flight):
+                    batch, ready = ready[:options['batch_size']], ready[options['batch_size']:]
+                    self._write_batch(batch)
+                    self._report_progress()
+
+                if exhausted and not in_flight and not ready:
+                    break
+        finally:
+            self._stop_executor(executor)
+
+        if self.indexed_documents and not options['skip_index']:
+            self.stdout.write(f'🔄 Adding {len(self.indexed_documents)} resumes to the TF-IDF index...')
+            tfidf_index.sync(self.indexed_documents)
+
+        self._report_summary(options.get('failures_file'))
+
+    def _start_executor(self):
+        # 'spawn' keeps the parent's database connections out of the workers
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=init_worker,
+            initargs=(self.memory_limit_mb,),
+        )
+
+    def _stop_executor(self, executor):
+        """Shut a pool down without waiting, killing workers stuck in a parse."""
+        processes = list((executor._processes or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _retry_or_fail(self, name, data, content_hash, attempts, resubmit, error):
+        """Queue a file lost with its parser process for one more try, or record it as failed."""
+        attempts[content_hash] = attempts.get(content_hash, 0) + 1
+        if attempts[content_hash] > 1:
+            self.failures.append((name, error))
+        else:
+            resubmit.append((name, data, content_hash))
+
+    def _write_batch(self, batch):
+        """Create the candidates, resumes and parse cache entries for one batch."""
+        cached_hashes = [content_hash for _, _, content_hash, fields in batch if fields is None]
+        cached = {
+            entry.content_hash: entry
+            for entry in ResumeParseCache.objects.filter(
+                content_hash__in=cached_hashes, parser_version=self.parser_version
+            )
+        }
+        self.stats['cache_hits'] += len(cached)
+
+        new_parses = []
+        items = []
+        for name, data, content_hash, fields in batch:
+            if fields is None:
+                entry = cached.get(content_hash)
+                if entry is None:
+                    self.failures.append((name, 'Cached parse disappeared during import'))
+                    continue
+                fields = {
+                    'parsed_text': entry.parsed_text,
+                    'processed_text': entry.processed_text,
+                    'extracted_skills': entry.extracted_skills,
+                    'parsed_data': entry.parsed_data,
+                }
+            else:
+                new_parses.append(ResumeParseCache(**fields))
+            contact = fields['parsed_data'].get('contact') or {}
+            email = (contact.get('email') or '').strip().lower()[:254]
+            if not email:
+                email = f'{content_hash[:16]}@{PLACEHOLDER_EMAIL_DOMAIN}'
+            items.append((name, data, content_hash, fields, email))
+
+        candidates = {
+            candidate.email: candidate
+            for candidate in Candidate.objects.filter(email__in={item[4] for item in items})
+        }
+        self.stats['candidates_matched'] += len(candidates)
+        new_candidates = {}
+        updated_candidates = {}
+        for name, data, content_hash, fields, email in items:
+            candidate = candidates.get(email)
+            if candidate is None:
+                candidate = self._new_candidate(name, email, fields['parsed_data'])
+                candidates[email] = new_candidates[email] = candidate
+            if merge_resume_skills(candidate, fields['extracted_skills']) and candidate.pk:
+                candidate.updated_at = timezone.now()
+                updated_candidates[candidate.pk] = candidate
+        self._assign_candidate_ids(new_candidates.values())
+
+        resume_field = Resume._meta.get_field('file')
+        resumes = []
+        processed_at = timezone.now()
+        for name, data, content_hash, fields, email in items:
+            file_name = os.path.basename(name)
+            stored_name = resume_field.storage.save(
+                resume_field.generate_filename(None, file_name), ContentFile(data)
+            )
+            resumes.append(Resume(
+                candidate=candidates[email],
+                file=stored_name,
+                file_name=file_name,
+                file_type=os.path.splitext(file_name)[1].lstrip('.').lower(),
+                content_hash=content_hash,
+                parsed_text=fields['parsed_text'],
+                processed_text=fields['processed_text'],
+                extracted_skills=fields['extracted_skills'],
+                processing_status='completed',
+                processed_at=processed_at,
+            ))
+
+        try:
+            with transaction.atomic():
+                # Bulk writes skip the pre_save receiver that fills the skill ID arrays
+                self._assign_skill_ids(list(new_candidates.values()) + list(updated_candidates.values()), 'skills')
+                self._assign_skill_ids(resumes, 'extracted_skills')
+                ResumeParseCache.objects.bulk_create(new_parses, ignore_conflicts=True)
+                Candidate.objects.bulk_create(new_candidates.values())
+                if updated_candidates:
+                    Candidate.objects.bulk_update(updated_candidates.values(), ['skills', 'skill_ids', 'updated_at'])
+                Resume.objects.bulk_create(resumes)
+        except Exception:
+            # The rows were rolled back; do not leave their files behind
+            for resume in resumes:
+                resume_field.storage.delete(resume.file.name)
+            raise
+
+        self.stats['candidates_created'] += len(new_candidates)
+        self.stats['resumes_created'] += len(resumes)
+        self.indexed_documents.extend(
+            (resume_key(resume.pk), resume.processed_text) for resume in resumes if resume.pk
+        )
+
+    def _assign_skill_ids(self, instances, skills_field):
+        """Set ``skill_ids`` from each instance's display list, interning new skills."""
+        skill_lists = [getattr(instance, skills_field) for instance in instances]
+        for instance, skill_ids in zip(instances, skill_vocabulary.ids_many(skill_lists)):
+            instance.skill_ids = skill_ids
+
+    def _new_candidate(self, name, email, parsed_data):
+        """Build an unsaved candidate from the parsed resume, named after the file as a fallback."""
+        candidate = Candidate(email=email, first_name='', last_name='', skills=[])
+        full_name = ((parsed_data.get('contact') or {}).get('name') or '').strip()
+        if not full_name:
+            stem = os.path.splitext(os.path.basename(name))[0]
+            full_name = re.sub(r'[_\-\s]+', ' ', stem).strip() or 'Unknown'
+        name_parts = full_name.split(' ', 1)
+        candidate.first_name = name_parts[0][:100]
+        candidate.last_name = name_parts[1][:100] if len(name_parts) > 1 else ''
+        update_candidate_profile(candidate, parsed_data)
+        candidate.total_experience_years = int(candidate.total_experience_years or 0)
+        # Parsed values are not length-checked; bulk inserts must not fail on one long value
+        for field_name in ('phone', 'city', 'state'):
+            value = getattr(candidate, field_name)
+            if value:
+                setattr(candidate, field_name, value[:Candidate._meta.get_field(field_name).max_length])
+        return candidate
+
+    def _assign_candidate_ids(self, candidates):
+        """Give each new candidate a candidate_id unused in the database and in this batch."""
+        candidates = list(candidates)
+        for candidate in candidates:
+            candidate.candidate_id = generate_candidate_id()
+        while True:
+            taken = set(Candidate.objects.filter(
+                candidate_id__in=[candidate.candidate_id for candidate in candidates]
+            ).values_list('candidate_id', flat=True))
+            seen = set()
+            clashes = []
+            for candidate in candidates:
+                if candidate.candidate_id in taken or candidate.candidate_id in seen:
+                    clashes.append(candidate)
+                seen.add(candidate.candidate_id)
+            if not clashes:
+                return
+            for candidate in clashes:
+                candidate.candidate_id = generate_candidate_id()
+
+    def _report_progress(self):
+        elapsed = time.perf_counter() - self.start_time
+        done = self.stats['resumes_created'] + len(self.failures)
+        rate = done / elapsed if elapsed else 0
+        self.stdout.write(
+            f'📦 {self.stats["resumes_created"]} resumes imported, {len(self.failures)} failed '
+            f'({rate:.1f} files/sec)'
+        )
+
+    def _report_summary(self, failures_file):
+        elapsed = time.perf_counter() - self.start_time
+        stats = self.stats
+        rate = (stats['found'] / elapsed) if elapsed else 0
+
+        self.stdout.write(
+            self.style.SUCCESS(f'🎉 Processed {stats["found"]} files in {elapsed:.2f}s ({rate:.1f} files/sec)')
+        )
+        self.stdout.write(f'📄 Resumes created: {stats["resumes_created"]}')
+        self.stdout.write(
+            f'👤 Candidates created: {stats["candidates_created"]}, matched by email: {stats["candidates_matched"]}'
+        )
+        self.stdout.write(f'⚙️ Parsed: {stats["parsed"]}, reused cached parses: {stats["cache_hits"]}')
+        self.stdout.write(f'🔁 Skipped duplicates: {stats["duplicates"]}')
+
+        if self.failures:
+            self.stdout.write(self.style.WARNING(f'⚠️ {len(self.failures)} files failed'))
+            for name, error in self.failures[:20]:
+                self.stdout.write(f'   • {name}: {error}')
+            if len(self.failures) > 20:
+                self.stdout.write(f'   ... and {len(self.failures) - 20} more')
+            if failures_file:
+                with open(failures_file, 'w', encoding='utf-8') as f:
+                    for name, error in self.failures:
+                        f.write(f'{name}\t{error}\n')
+                self.stdout.write(f'📝 Failures written to {failures_file}')
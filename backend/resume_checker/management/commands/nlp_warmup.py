@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+import time
+
+from resume_checker.nlp_models import model_registry
+
+
+class Command(BaseCommand):
+    help = 'Preload the NLP models used for resume parsing (spaCy, NLTK, sentence-transformers)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--models',
+            nargs='+',
+            choices=model_registry.names,
+            help='Only load these resources (default: all registered resources)'
+        )
+        parser.add_argument(
+            '--strict',
+            action='store_true',
+            help='Exit with an error if any resource fails to load'
+        )
+
+    def handle(self, *args, **options):
+        names = options['models'] or model_registry.names
+        self.stdout.write(self.style.SUCCESS(f'🚀 Warming up NLP models: {", ".join(names)}'))
+
+        start_time = time.perf_counter()
+        report = model_registry.load(names)
+        total_time = time.perf_counter() - start_time
+
+        failed = []
+        for name, status in report.items():
+            if status['loaded']:
+                self.stdout.write(
+                    self.style.SUCCESS(f'✅ {name} loaded in {status["load_time_seconds"]:.3f}s')
+                )
+            else:
+                failed.append(name)
+                self.stdout.write(
+                    self.style.WARNING(f'⚠️ {name} unavailable: {status["error"]}')
+                )
+
+        self.stdout.write(f'⏱️ Total warmup time: {total_time:.3f}s')
+
+        if failed and options['strict']:
+            raise CommandError(f'Failed to load: {", ".join(failed)}')
+
+        self.stdout.write(self.style.SUCCESS('🎉 NLP warmup complete!'))
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+import os
+import signal
+import socket
+import time
+
+from resume_checker.models import ResumeProcessingTask
+from resume_checker.resume_processing import ResumeWorkerPool, requeue_stale_tasks
+
+
+class Command(BaseCommand):
+    help = 'Run background workers that process queued resume uploads'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=2,
+            help='Number of worker threads (default: 2)'
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds between queue polls when idle (default: 2.0)'
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process everything currently queued and exit'
+        )
+
+    def handle(self, *args, **options):
+        queued = ResumeProcessingTask.objects.filter(status='queued').count()
+        self.stdout.write(self.style.SUCCESS(f'🚀 Resume processing workers starting ({queued} queued)'))
+
+        requeued = requeue_stale_tasks()
+        if requeued:
+            self.stdout.write(self.style.WARNING(f'⚠️ Requeued {requeued} stale tasks'))
+
+        pool = ResumeWorkerPool(size=options['workers'], poll_interval=options['poll_interval'])
+
+        if options['once']:
+            start_time = time.perf_counter()
+            processed = pool.drain(f'{socket.gethostname()}:{os.getpid()}:once')
+            elapsed = time.perf_counter() - start_time
+            self.stdout.write(self.style.SUCCESS(f'🎉 Processed {processed} resumes in {elapsed:.2f}s'))
+            return
+
+        pool.start()
+        self.stdout.write(f'👷 {options["workers"]} workers running. Press Ctrl+C to stop.')
+
+        def shutdown(signum, frame):
+            pool.stop()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        try:
+            while pool.is_running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pool.stop()
+
+        self.stdout.write(self.style.SUCCESS('👋 Resume processing workers stopped'))
@@ -0,0 +1,22 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resume_checker.job_search import job_search_index
+
+
+class Command(BaseCommand):
+    help = 'Create the job full-text search index if needed and reindex every job'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🚀 Rebuilding job search index'))
+        started = time.monotonic()
+        if not job_search_index.create_index(populate=False):
+            self.stdout.write(self.style.WARNING(
+                '⚠️ Full-text search is not available on this database; searches use icontains'
+            ))
+            return
+        indexed = job_search_index.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Indexed {indexed} jobs in {time.monotonic() - started:.1f}s'
+        ))
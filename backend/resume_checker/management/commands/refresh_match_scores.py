@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from resume_checker.match_scores import match_score_table
+from resume_checker.models import Candidate
+
+
+class Command(BaseCommand):
+    help = 'Fill or refresh the materialized candidate x job match score table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', nargs='+', type=int, metavar='ID',
+                            help='Only refresh these candidates (default: all)')
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Candidates loaded per database round trip')
+
+    def handle(self, *args, **options):
+        candidates = Candidate.objects.order_by('pk')
+        if options['candidates']:
+            candidates = candidates.filter(pk__in=options['candidates'])
+
+        total = candidates.count()
+        self.stdout.write(self.style.SUCCESS(f'🚀 Refreshing match scores for {total} candidates'))
+
+        started = time.monotonic()
+        processed = written = 0
+        for candidate in candidates.iterator(chunk_size=options['chunk_size']):
+            written += match_score_table.refresh_candidate(candidate)
+            processed += 1
+            if processed % 1000 == 0:
+                self.stdout.write(f'   {processed}/{total} candidates, {written} scores written')
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'✅ Wrote {written} scores for {processed} candidates in {elapsed:.1f}s (unchanged scores skipped)'
+        ))
@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+import json
+import time
+
+from resume_checker.benchmarks import (
+    BENCHMARKS, SCALES, compare_to_baseline, load_baseline, run_suite, save_baseline
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the resume parsing and matching hot paths and check for regressions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--benchmarks',
+            nargs='+',
+            choices=list(BENCHMARKS),
+            default=list(BENCHMARKS),
+            help='Benchmarks to run (default: all)'
+        )
+        parser.add_argument(
+            '--scales',
+            nargs='+',
+            choices=list(SCALES),
+            default=['1k'],
+            help='Synthetic corpus sizes for scaled benchmarks (default: 1k)'
+        )
+        parser.add_argument(
+            '--max-seconds',
+            type=float,
+            default=10.0,
+            help='Time budget per benchmark case (default: 10)'
+        )
+        parser.add_argument(
+            '--samples-dir',
+            default=str(settings.BASE_DIR.parent / 'sample_resumes'),
+            help='Directory of sample resumes (default: <repo>/sample_resumes)'
+        )
+        parser.add_argument(
+            '--jd-dir',
+            default=str(settings.BASE_DIR.parent / 'testJD'),
+            help='Directory containing the test job description (default: <repo>/testJD)'
+        )
+        parser.add_argument(
+            '--baseline',
+            default=str(settings.BENCHMARK_BASELINE_PATH),
+            help='Baseline JSON file (default: BENCHMARK_BASELINE_PATH)'
+        )
+        parser.add_argument(
+            '--save-baseline',
+            action='store_true',
+            help='Store this run as the new baseline instead of comparing against it'
+        )
+        parser.add_argument(
+            '--threshold',
+            type=float,
+            default=0.2,
+            help='Allowed regression as a fraction before failing (default: 0.2 = 20%%)'
+        )
+        parser.add_argument(
+            '--output',
+            help='Also write this run\'s results to a JSON file'
+        )
+        parser.add_argument(
+            '--no-isolate',
+            action='store_true',
+            help='Run all cases in this process (faster, but peak RSS is shared between cases)'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('🚀 Running benchmarks...'))
+        start_time = time.perf_counter()
+
+        def report(key, result):
+            self.stdout.write(
+                f'⏱️ {key:<42} {result["ops_per_sec"]:>10.1f} ops/s   '
+                f'p50 {result["p50_ms"]:>9.3f} ms   p99 {result["p99_ms"]:>9.3f} ms   '
+                f'peak RSS {result["peak_rss_mb"]:>7.1f} MB   ({result["ops"]} ops)'
+            )
+
+        results = run_suite(
+            options['benchmarks'],
+            options['scales'],
+            samples_dir=options['samples_dir'],
+            jd_dir=options['jd_dir'],
+            max_seconds=options['max_seconds'],
+            isolate=not options['no_isolate'],
+            on_result=report,
+        )
+        elapsed = time.perf_counter() - start_time
+        self.stdout.write(self.style.SUCCESS(f'🎉 Ran {len(results)} benchmark cases in {elapsed:.1f}s'))
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=2, sort_keys=True)
+            self.stdout.write(f'📝 Results written to {options["output"]}')
+
+        if options['save_baseline']:
+            save_baseline(options['baseline'], results)
+            self.stdout.write(self.style.SUCCESS(f'💾 Baseline saved to {options["baseline"]}'))
+            return
+
+        baseline = load_baseline(options['baseline'])
+        if not baseline:
+            self.stdout.write(self.style.WARNING(
+                f'⚠️ No baseline at {options["baseline"]}; run with --save-baseline to create one'
+            ))
+            return
+
+        regressions = compare_to_baseline(results, baseline, options['threshold'])
+        if regressions:
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f'❌ {regression}'))
+            raise CommandError(
+                f'{len(regressions)} metrics regressed by more than {options["threshold"]:.0%} against the baseline'
+            )
+        self.stdout.write(self.style.SUCCESS(f'✅ No regressions beyond {options["threshold"]:.0%} against the baseline'))
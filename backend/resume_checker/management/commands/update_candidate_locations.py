@@ -0,0 +1,79 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand
+from django.db.models import OuterRef, Q, Subquery
+
+from resume_checker.models import Candidate, Resume
+from resume_checker.nlp_utils import extract_locations_batch
+
+
+class Command(BaseCommand):
+    help = 'Re-extract candidate city/state from their latest resume with batched spaCy NER'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='spaCy worker processes (default: number of CPUs)')
+        parser.add_argument('--batch-size', type=int, default=64,
+                            help='Resumes per nlp.pipe batch')
+        parser.add_argument('--chunk-size', type=int, default=2000,
+                            help='Candidates loaded and saved per database round trip')
+        parser.add_argument('--overwrite', action='store_true',
+                            help='Replace locations that are already set')
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        chunk_size = max(1, options['chunk_size'])
+
+        latest_text = Resume.objects.filter(
+            candidate=OuterRef('pk'),
+        ).exclude(parsed_text__isnull=True).exclude(parsed_text='').order_by('-uploaded_at').values('parsed_text')[:1]
+        candidates = Candidate.objects.annotate(resume_text=Subquery(latest_text)).filter(resume_text__isnull=False)
+        if not options['overwrite']:
+            candidates = candidates.filter(Q(city__isnull=True) | Q(city=''))
+
+        total = candidates.count()
+        self.stdout.write(self.style.SUCCESS(f'🚀 Extracting locations for {total} candidates with {workers} worker(s)'))
+
+        started = time.monotonic()
+        processed = updated = 0
+        last_pk = 0
+        city_length = Candidate._meta.get_field('city').max_length
+        state_length = Candidate._meta.get_field('state').max_length
+
+        while True:
+            # Keyset pagination: only the header of each resume is used, but the
+            # whole text is loaded, so keep a bounded chunk in memory
+            chunk = list(candidates.filter(pk__gt=last_pk).order_by('pk').only('pk', 'city', 'state')[:chunk_size])
+            if not chunk:
+                break
+            last_pk = chunk[-1].pk
+
+            locations = extract_locations_batch(
+                [candidate.resume_text for candidate in chunk],
+                n_process=workers,
+                batch_size=options['batch_size'],
+            )
+
+            changed = []
+            for candidate, location in zip(chunk, locations):
+                if not location:
+                    continue
+                # Same split as update_candidate_profile
+                location_parts = location.split(', ', 1)
+                city = location_parts[0][:city_length]
+                state = location_parts[1][:state_length] if len(location_parts) > 1 else candidate.state
+                if (city, state) != (candidate.city, candidate.state):
+                    candidate.city, candidate.state = city, state
+                    changed.append(candidate)
+
+            if changed:
+                Candidate.objects.bulk_update(changed, ['city', 'state'])
+            processed += len(chunk)
+            updated += len(changed)
+
+            elapsed = time.monotonic() - started
+            rate = processed / elapsed if elapsed else 0.0
+            self.stdout.write(f'   {processed}/{total} candidates, {updated} updated ({rate:.1f} resumes/sec)')
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Updated locations for {updated} of {processed} candidates'))
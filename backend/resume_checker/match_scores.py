@@ -0,0 +1,144 @@
+"""
+Candidate x Job Match Scores
+============================
+
+Materialized ``calculate_detailed_match_score`` overall scores for the
+candidate portal, stored in ``CandidateJobScore``. ``browse_jobs`` filters, sorts and
+paginates on the stored score instead of serializing and scoring every
+active job on each page view.
+
+The table is maintained incrementally, one candidate at a time:
+``refresh_candidate`` finds with a single query the jobs whose row is
+missing, was computed from different candidate inputs (skills, experience,
+education, location), or is older than the job's last edit, and scores only
+those, all at once with the ``score_jobs`` kernel over the jobs' rows in
+``skill_index``. A new or edited job, or a changed profile, costs one score
+per affected pair; an unchanged candidate costs one query.
+
+Usage:
+    from .match_scores import match_score_table
+
+    match_score_table.refresh_candidate(candidate, jobs)
+    jobs = match_score_table.annotate(jobs, candidate)   # adds .match_score
+
+``python manage.py refresh_match_scores`` fills the table ahead of time.
+"""
+
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from django.db.models import Exists, OuterRef, QuerySet, Subquery
+from django.utils import timezone
+
+from .models import CandidateJobScore, JobDescription
+from .scoring_utils import build_job_features, score_jobs
+from .skill_index import skill_index
+from .skill_vocabulary import skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# JobDescription fields read by the scoring rules besides skills, which come from skill_index
+JOB_SCORE_FIELDS = ('min_experience_years', 'experience_level', 'location')
+
+
+def candidate_location(candidate) -> Optional[str]:
+    """Candidate location as shown to the scorer ("City, State, Country")."""
+    return f"{candidate.city or ''}, {candidate.state or ''}, {candidate.country or ''}".strip(', ') or None
+
+
+def candidate_skill_ids(candidate) -> List[int]:
+    """The candidate's skill IDs: stored ``skill_ids``, or its skills looked up read-only."""
+    return list(candidate.skill_ids or skill_vocabulary.ids(candidate.skills, create=False))
+
+
+def candidate_score_inputs(candidate) -> Dict[str, Any]:
+    """The candidate fields a match score depends on."""
+    return {
+        'skill_ids': sorted(set(candidate_skill_ids(candidate))),
+        'experience': candidate.total_experience_years or 0,
+        'education': candidate.highest_education or '',
+        'location': candidate_location(candidate),
+    }
+
+
+def score_fingerprint(inputs: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class MatchScoreTable:
+    """
+    Keeps ``CandidateJobScore`` rows in step with candidates and jobs.
+    """
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    def active_jobs(self) -> QuerySet:
+        return JobDescription.objects.filter(status='active')
+
+    def stale_jobs(self, candidate, fingerprint: str, jobs: Optional[QuerySet] = None) -> QuerySet:
+        """Jobs in ``jobs`` (default: active jobs) whose score for the candidate needs (re)computing."""
+        jobs = self.active_jobs() if jobs is None else jobs
+        fresh = CandidateJobScore.objects.filter(
+            candidate=candidate,
+            job_description=OuterRef('pk'),
+            candidate_fingerprint=fingerprint,
+            computed_at__gte=OuterRef('updated_at'),
+        )
+        return jobs.filter(~Exists(fresh))
+
+    def refresh_candidate(self, candidate, jobs: Optional[QuerySet] = None) -> int:
+        """
+        Score the candidate against every job in ``jobs`` (default: active jobs)
+        whose stored score is missing or stale.
+
+        Returns:
+            int: Number of scores written
+        """
+        inputs = candidate_score_inputs(candidate)
+        fingerprint = score_fingerprint(inputs)
+        stale = list(
+            self.stale_jobs(candidate, fingerprint, jobs).order_by().values('pk', 'updated_at', *JOB_SCORE_FIELDS)
+        )
+        if not stale:
+            return 0
+
+        skills = skill_index.job_skills((job['pk'], job['updated_at']) for job in stale)
+        scores = score_jobs(
+            build_job_features(stale, skills),
+            inputs['skill_ids'],
+            inputs['experience'],
+            inputs['education'],
+        )
+        computed_at = timezone.now()
+        rows = [
+            CandidateJobScore(
+                candidate=candidate,
+                job_description_id=job_id,
+                overall_score=overall_score,
+                candidate_fingerprint=fingerprint,
+                computed_at=computed_at,
+            )
+            for job_id, overall_score in zip(scores.ids.tolist(), scores.overall.tolist())
+        ]
+
+        CandidateJobScore.objects.bulk_create(
+            rows,
+            batch_size=self.batch_size,
+            update_conflicts=True,
+            unique_fields=['candidate', 'job_description'],
+            update_fields=['overall_score', 'candidate_fingerprint', 'computed_at'],
+        )
+        logger.debug(f"Refreshed {len(rows)} job scores for candidate {candidate.pk}")
+        return len(rows)
+
+    def annotate(self, jobs: QuerySet, candidate) -> QuerySet:
+        """Add the candidate's stored score to each job as ``match_score`` (None when not scored)."""
+        score = CandidateJobScore.objects.filter(candidate=candidate, job_description=OuterRef('pk'))
+        return jobs.annotate(match_score=Subquery(score.values('overall_score')[:1]))
+
+
+# Global instance
+match_score_table = MatchScoreTable()
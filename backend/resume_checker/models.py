@@ -3,6 +3,7 @@ import uuid
 from django.db import models
 from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
+from django.core.serializers.json import DjangoJSONEncoder
 
 def generate_job_id():
     """Generate a unique job ID in format: JOB-XXXXXX"""
@@ -79,6 +80,7 @@ class JobDescription(models.Model):
     # NLP Processing
     processed_text = models.TextField(blank=True, null=True, help_text="Preprocessed text for NLP operations")
     extracted_skills = models.JSONField(default=list, blank=True, help_text="Extracted skills from job description")
+    skill_ids = models.JSONField(default=list, blank=True, editable=False, help_text="Canonical Skill IDs of extracted_skills, sorted (kept in sync on save)")
     
     class Meta:
         ordering = ['-posted_date']
@@ -133,6 +135,7 @@ class Candidate(models.Model):
     
     # Skills (Essential for matching)
     skills = models.JSONField(default=list, blank=True, help_text="List of skills")
+    skill_ids = models.JSONField(default=list, blank=True, editable=False, help_text="Canonical Skill IDs of skills, sorted (kept in sync on save)")
     
     # Status
     status = models.CharField(
@@ -175,6 +178,7 @@ class Resume(models.Model):
     file = models.FileField(upload_to='resumes/', help_text="Upload resume file (PDF, DOCX, TXT)")
     file_name = models.CharField(max_length=255, blank=True, null=True)
     file_type = models.CharField(max_length=10, blank=True, null=True, help_text="File extension")
+    content_hash = models.CharField(max_length=64, blank=True, default='', db_index=True, help_text="SHA-256 of the file content")
     
     # Parsed Content (Essential for matching)
     parsed_text = models.TextField(blank=True, null=True, help_text="Extracted text from resume")
@@ -182,6 +186,7 @@ class Resume(models.Model):
     
     # Extracted Information (Essential for matching)
     extracted_skills = models.JSONField(default=list, blank=True, help_text="Skills extracted from resume")
+    skill_ids = models.JSONField(default=list, blank=True, editable=False, help_text="Canonical Skill IDs of extracted_skills, sorted (kept in sync on save)")
     extracted_experience = models.JSONField(default=list, blank=True, help_text="Work experience extracted")
     extracted_education = models.JSONField(default=list, blank=True, help_text="Education extracted")
     
@@ -216,6 +221,77 @@ class Resume(models.Model):
             self.file_type = self.file.name.split('.')[-1].lower()
         super().save(*args, **kwargs)
 
+class ResumeProcessingTask(models.Model):
+    """
+    DB-backed queue entry for background resume processing.
+    Claimed and run by the worker pool in resume_processing.py.
+    """
+    resume = models.OneToOneField(Resume, on_delete=models.CASCADE, related_name='processing_task')
+    update_profile = models.BooleanField(
+        default=True,
+        help_text="Fill empty candidate profile fields (contact, experience) from the parsed resume"
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=[
+            ('queued', 'Queued'),
+            ('running', 'Running'),
+            ('done', 'Done'),
+            ('failed', 'Failed'),
+        ],
+        default='queued'
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    worker_id = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(blank=True, null=True, help_text="When a worker claimed the task")
+    error_message = models.TextField(blank=True, default='')
+    result = models.JSONField(default=dict, blank=True, help_text="Summary of what processing changed")
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+        verbose_name = "Resume Processing Task"
+        verbose_name_plural = "Resume Processing Tasks"
+
+    def __str__(self):
+        return f"Resume {self.resume_id} - {self.status}"
+
+class ResumeParseCache(models.Model):
+    """
+    Parse results keyed by the SHA-256 of the uploaded file's bytes.
+    The same file uploaded again (by any candidate) reuses the stored parse;
+    entries from an older parser version are never read.
+    """
+    content_hash = models.CharField(max_length=64, help_text="SHA-256 of the file content")
+    parser_version = models.CharField(max_length=64, help_text="Version of the extraction pipeline that produced this entry")
+
+    parsed_text = models.TextField(blank=True, default='')
+    processed_text = models.TextField(blank=True, default='')
+    extracted_skills = models.JSONField(default=list, blank=True)
+    parsed_data = models.JSONField(
+        default=dict, blank=True, encoder=DjangoJSONEncoder,
+        help_text="Structured parse (contact, experience years, education, ...)"
+    )
+
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('content_hash', 'parser_version')
+        verbose_name = "Resume Parse Cache Entry"
+        verbose_name_plural = "Resume Parse Cache"
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} ({self.parser_version})"
+
 class Match(models.Model):
     """
     MVP model to store match results with comprehensive scoring for hiring decisions.
@@ -297,6 +373,65 @@ class Match(models.Model):
     def is_low_match(self):
         return self.overall_score < 60
 
+class Skill(models.Model):
+    """
+    Canonical skill vocabulary. IDs are stable and are what the ``skill_ids``
+    fields of skill-bearing models store (see skill_vocabulary.py).
+    """
+    name = models.CharField(max_length=100, unique=True, help_text="Canonical name (lowercase)")
+    display_name = models.CharField(max_length=100)
+    category = models.CharField(max_length=50, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['name']
+        verbose_name = "Skill"
+        verbose_name_plural = "Skills"
+
+    def __str__(self):
+        return self.display_name
+
+class SkillAlias(models.Model):
+    """
+    Alternative spelling of a skill (e.g. "k8s" for "kubernetes").
+    """
+    alias = models.CharField(max_length=100, unique=True, help_text="Alternative name (lowercase)")
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    class Meta:
+        verbose_name = "Skill Alias"
+        verbose_name_plural = "Skill Aliases"
+
+    def __str__(self):
+        return f"{self.alias} -> {self.skill.name}"
+
+class CandidateJobScore(models.Model):
+    """
+    Materialized candidate x job match score (calculate_detailed_match_score),
+    so the candidate portal can filter, sort and paginate jobs in the database.
+    Maintained by match_scores.match_score_table: a row is stale when the
+    candidate's scoring inputs no longer hash to candidate_fingerprint or the
+    job was edited after computed_at.
+    """
+    candidate = models.ForeignKey(Candidate, on_delete=models.CASCADE, related_name='job_scores')
+    job_description = models.ForeignKey(JobDescription, on_delete=models.CASCADE, related_name='candidate_scores')
+
+    overall_score = models.FloatField(help_text="Overall match score (0-100)")
+
+    candidate_fingerprint = models.CharField(max_length=40, help_text="Hash of the candidate's scoring inputs")
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('candidate', 'job_description')
+        indexes = [
+            models.Index(fields=['candidate', '-overall_score']),
+        ]
+        verbose_name = "Candidate Job Score"
+        verbose_name_plural = "Candidate Job Scores"
+
+    def __str__(self):
+        return f"{self.candidate_id} x {self.job_description_id}: {self.overall_score:.1f}%"
+
 class Application(models.Model):
     """
     Model to track candidate applications and their conversion from matches.
@@ -0,0 +1,204 @@
+"""
+NLP Model Registry
+==================
+
+Lazy, on-demand loading of the heavy NLP resources used by the resume
+checker (spaCy pipeline, WordNet lemmatizer, NLTK stop words and the
+sentence-transformer used for coding question matching).
+
+Nothing is loaded at import time. Each resource is loaded the first time it
+is requested, its load time is recorded, and it is then shared by every
+caller in the process. Models are never downloaded at runtime - install them
+ahead of time (see requirements.txt and the ``setup_nltk`` command) and use
+``python manage.py nlp_warmup`` to preload them in workers that need them.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SPACY_MODEL_NAME = 'en_core_web_md'
+SENTENCE_TRANSFORMER_MODEL_NAME = 'all-MiniLM-L6-v2'
+NLTK_DATA_DIR = os.path.expanduser('~/nltk_data')
+
+# Minimal stop word list used when the NLTK corpus is not installed
+BASIC_STOP_WORDS = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
+
+# Words that must survive stop word removal because they carry meaning for matching
+WORDS_TO_KEEP_ALWAYS = {
+    'years', 'year', 'experience', 'minimum', 'plus',
+    'api', 'apis', 'rest', 'django', 'docker', 'postgresql', 'aws',
+    'python', 'java', 'sql', 'backend', 'cloud', 'devops', 'agile',
+    'javascript', 'terraform', 'jenkins', 'kubernetes', 'git',
+    'flask', 'fastapi', 'drf', 'mysql', 'mongodb', 'linux', 'windows',
+    'microservices', 'automation', 'optimization', 'delivery', 'lead',
+    'technical', 'engineer', 'developer', 'architect', 'fullstack', 'full-stack',
+    'with', 'in', 'of', 'for', 'and', 'or', 'the', 'a', 'an'  # Important connecting words
+}
+
+
+class NLPModelRegistry:
+    """
+    Thread-safe registry that loads each named resource once, on first use.
+
+    A resource that fails to load is remembered as unavailable (``get``
+    returns ``None``) so callers can fall back to their non-NLP code paths
+    without paying the failed load again on every call.
+    """
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._models: Dict[str, Any] = {}
+        self._load_times: Dict[str, float] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    def register(self, name: str, loader: Callable[[], Any]) -> None:
+        """Register a zero-argument loader for ``name``."""
+        with self._lock:
+            self._loaders[name] = loader
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._loaders)
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._models
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Return the resource registered as ``name``, loading it if needed.
+
+        Returns:
+            The loaded resource, or None if it could not be loaded.
+        """
+        if name in self._models:
+            return self._models[name]
+        if name in self._errors:
+            return None
+
+        with self._lock:
+            # Another thread may have finished loading while we waited
+            if name in self._models:
+                return self._models[name]
+            if name in self._errors:
+                return None
+
+            try:
+                loader = self._loaders[name]
+            except KeyError:
+                raise KeyError(f"Unknown NLP resource '{name}'. Registered: {', '.join(self._loaders)}")
+
+            start_time = time.perf_counter()
+            try:
+                model = loader()
+            except Exception as e:
+                self._errors[name] = str(e)
+                self._load_times[name] = time.perf_counter() - start_time
+                logger.warning(f"NLP resource '{name}' unavailable: {e}")
+                return None
+
+            self._load_times[name] = time.perf_counter() - start_time
+            self._models[name] = model
+            logger.info(f"Loaded NLP resource '{name}' in {self._load_times[name]:.3f}s")
+            return model
+
+    def load(self, names: Optional[Iterable[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Eagerly load the given resources (all registered ones by default).
+
+        Returns:
+            The status report for the requested resources (see ``status``).
+        """
+        names = list(names) if names is not None else self.names
+        for name in names:
+            self.get(name)
+        report = self.status()
+        return {name: report[name] for name in names}
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Load state, load time and error (if any) of every registered resource."""
+        return {
+            name: {
+                'loaded': name in self._models,
+                'load_time_seconds': round(self._load_times[name], 3) if name in self._load_times else None,
+                'error': self._errors.get(name),
+            }
+            for name in self._loaders
+        }
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Forget a loaded (or failed) resource so the next ``get`` loads it again."""
+        with self._lock:
+            names = [name] if name else list(self._loaders)
+            for key in names:
+                self._models.pop(key, None)
+                self._errors.pop(key, None)
+                self._load_times.pop(key, None)
+
+        # Cached token normalizations were computed with the old resources
+        from .text_normalization import token_normalizer
+        token_normalizer.clear()
+
+
+def _configure_nltk_data_path():
+    """Point NLTK at the user data directory populated by ``setup_nltk``."""
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.append(NLTK_DATA_DIR)
+    return nltk
+
+
+def _load_spacy():
+    import spacy
+    try:
+        return spacy.load(SPACY_MODEL_NAME)
+    except OSError as e:
+        raise OSError(
+            f"spaCy model '{SPACY_MODEL_NAME}' is not installed. "
+            f"Run: python -m spacy download {SPACY_MODEL_NAME}"
+        ) from e
+
+
+def _load_lemmatizer():
+    _configure_nltk_data_path()
+    from nltk.stem import WordNetLemmatizer
+    lemmatizer = WordNetLemmatizer()
+    # WordNet is read lazily by NLTK; touch it now so a missing corpus
+    # surfaces here and the first real lemmatize() call is not slow.
+    lemmatizer.lemmatize('resources')
+    return lemmatizer
+
+
+def _load_stopwords():
+    _configure_nltk_data_path()
+    from nltk.corpus import stopwords
+    try:
+        stop_words = set(stopwords.words('english'))
+    except LookupError:
+        logger.warning("NLTK stopwords not available, using basic stop words")
+        stop_words = set(BASIC_STOP_WORDS)
+    return frozenset(stop_words - WORDS_TO_KEEP_ALWAYS)
+
+
+def _load_sentence_transformer():
+    from sentence_transformers import SentenceTransformer
+    # local_files_only: never reach out to the model hub from a web worker
+    return SentenceTransformer(SENTENCE_TRANSFORMER_MODEL_NAME, local_files_only=True)
+
+
+def _load_resume_parser():
+    from resume_parser import ResumeParser
+    return ResumeParser
+
+
+model_registry = NLPModelRegistry()
+model_registry.register('spacy', _load_spacy)
+model_registry.register('lemmatizer', _load_lemmatizer)
+model_registry.register('stopwords', _load_stopwords)
+model_registry.register('sentence_transformer', _load_sentence_transformer)
+model_registry.register('resume_parser', _load_resume_parser)
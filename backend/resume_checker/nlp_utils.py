@@ -1,77 +1,29 @@
 # hiring_app/nlp_utils.py
 import io
-from PyPDF2 import PdfReader # For PDF parsing
-from docx import Document # For DOCX parsing
-import nltk
-from nltk.corpus import stopwords # For stop word removal
-from nltk.stem import WordNetLemmatizer # For lemmatization
-import spacy # For advanced NLP, especially semantic similarity
-from sklearn.feature_extraction.text import TfidfVectorizer # For TF-IDF vectorization
-from sklearn.metrics.pairwise import cosine_similarity # For cosine similarity calculation
 import re # For regular expressions
-import ssl # Added for SSL certificate handling
 import os # For path handling
-
-# --- Set NLTK Data Path ---
-# Set the NLTK data path to the user's directory where data is already downloaded
-import os
-nltk_data_dir = os.path.expanduser('~/nltk_data')
-nltk.data.path.append(nltk_data_dir)
-print(f"NLTK data path set to: {nltk_data_dir}")
-
-# --- NLTK Downloads Error Handling ---
-# Skip NLTK downloads during startup to avoid blocking
-print("NLTK resources will be downloaded on-demand if needed.")
-
-
-
-try:
-    nlp = spacy.load("en_core_web_md") # Changed from sm to md for better semantic similarity
-except OSError:
-    print("SpaCy model 'en_core_web_md' not found. Attempting to download...")
-    from spacy.cli import download
-    download("en_core_web_md") # Changed from sm to md
-    nlp = spacy.load("en_core_web_md") # Load after successful download
+import logging
+from typing import List
+import numpy as np
 
 # --- NLP Global Resources ---
-try:
-    custom_stop_words = set(stopwords.words('english'))
-except LookupError:
-    print("NLTK stopwords not available, using basic stop words")
-    custom_stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-
-words_to_keep_always = {
-    'years', 'year', 'experience', 'minimum', 'plus',
-    'api', 'apis', 'rest', 'django', 'docker', 'postgresql', 'aws',
-    'python', 'java', 'sql', 'backend', 'cloud', 'devops', 'agile',
-    'javascript', 'terraform', 'jenkins', 'kubernetes', 'git',
-    'flask', 'fastapi', 'drf', 'mysql', 'mongodb', 'linux', 'windows',
-    'microservices', 'automation', 'optimization', 'delivery', 'lead',
-    'technical', 'engineer', 'developer', 'architect', 'fullstack', 'full-stack',
-    'with', 'in', 'of', 'for', 'and', 'or', 'the', 'a', 'an'  # Important connecting words
-}
-
-# Remove words from custom_stop_words if they are in words_to_keep_always
-custom_stop_words = custom_stop_words - words_to_keep_always
-
-# Initialize lemmatizer only if wordnet is available
-try:
-    lemmatizer = WordNetLemmatizer() # Lemmatizer for reducing words to their base form
-except LookupError:
-    print("WordNet not available, using basic lemmatization")
-    lemmatizer = None
-
-# --- Enhanced Resume Parsing with resume-parser library ---
-RESUME_PARSER_AVAILABLE = False
-try:
-    from resume_parser import ResumeParser
-    RESUME_PARSER_AVAILABLE = True
-except (ImportError, OSError) as e:
-    print(f"Warning: resume-parser library not available ({e}). Using basic parsing.")
+# spaCy, the WordNet lemmatizer, the stop word set and the optional resume-parser
+# library are loaded lazily through the model registry the first time they are
+# needed, so importing this module stays cheap (migrate, shell, ASGI workers).
+# Use `python manage.py nlp_warmup` to preload them in workers that parse resumes.
+from .nlp_models import model_registry
+from .skill_matcher import skill_matcher, TECHNICAL_CATEGORIES
+from .skill_vocabulary import skill_vocabulary
+from .tfidf_index import tfidf_index
+from .document_extraction import extraction_pool
+from .text_normalization import token_normalizer, iter_normalized_tokens
+from .experience_scanner import scan_experience
+
+logger = logging.getLogger(__name__)
 
 # --- Import lightweight_parser for enhanced functionality ---
 try:
-    from .lightweight_parser import LightweightResumeParser
+    from .lightweight_parser import resume_parser
     LIGHTWEIGHT_PARSER_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: lightweight_parser not available ({e}). Using basic parsing.")
@@ -87,7 +39,8 @@ def extract_structured_resume_data(file_path):
     Returns:
         dict: Structured resume data with contact, skills, experience, education
     """
-    if not RESUME_PARSER_AVAILABLE:
+    ResumeParser = model_registry.get('resume_parser')
+    if ResumeParser is None:
         # Fallback to basic text extraction
         return {"raw_text": extract_text_from_file(file_path)}
     
@@ -187,97 +140,58 @@ def extract_text_from_file(file_input):
 def extract_text_from_pdf(file_obj):
     """
     Extracts text content from a PDF file object with robust error handling.
+    Extraction runs in the document extraction pool under a time and memory
+    limit (see resume_checker/document_extraction.py); if some pages fail or
+    the limit is hit, the text of the pages that succeeded is returned.
     Args:
         file_obj: A file-like object (e.g., opened PDF file).
     Returns:
         str: Extracted text, or empty string if an error occurs.
     """
-    text = ""
     try:
         # Reset file pointer to beginning
         if hasattr(file_obj, 'seek'):
             file_obj.seek(0)
-        
-        # Try PyPDF2 first (more robust for some PDFs)
-        try:
-            reader = PdfReader(file_obj)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        except Exception as pdf_error:
-            print(f"PyPDF2 failed: {pdf_error}")
-            # Fallback to alternative method
-            try:
-                # Reset file pointer
-                file_obj.seek(0)
-                
-                # Try with different PDF reader settings
-                import io
-                from PyPDF2 import PdfReader as PyPDF2Reader
-                
-                # Read file content
-                file_content = file_obj.read()
-                file_obj.seek(0)
-                
-                # Create a new file-like object
-                pdf_file = io.BytesIO(file_content)
-                reader = PyPDF2Reader(pdf_file)
-                
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-                        
-            except Exception as fallback_error:
-                print(f"PDF fallback method failed: {fallback_error}")
-                return ""
-        
-        # If still no text, try with pdfplumber as last resort
-        if not text.strip():
-            try:
-                file_obj.seek(0)
-                import pdfplumber
-                
-                with pdfplumber.open(file_obj) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            text += page_text + "\n"
-                            
-            except Exception as plumber_error:
-                print(f"pdfplumber failed: {plumber_error}")
-                return ""
-        
-        return text.strip()
-        
+        result = extraction_pool.extract_pdf(file_obj.read())
     except Exception as e:
         print(f"Error reading PDF file: {e}")
         return ""
 
+    if result['errors']:
+        logger.warning(
+            f"PDF extraction recovered {result['pages_extracted']}/{result['page_count']} pages "
+            f"(timed out: {result['timed_out']}): {'; '.join(result['errors'][:5])}"
+        )
+    return result['text']
+
 def extract_text_from_docx(file_obj):
     """
     Extracts text content from a DOCX file object.
+    Runs in the document extraction pool under a time and memory limit.
     Args:
         file_obj: A file-like object (e.g., opened DOCX file).
     Returns:
         str: Extracted text, or None if an error occurs.
     """
-    text = ""
     try:
-        document = Document(file_obj)
-        for paragraph in document.paragraphs:
-            text += paragraph.text + "\n" # Add newline for paragraph separation
+        if hasattr(file_obj, 'seek'):
+            file_obj.seek(0)
+        result = extraction_pool.extract_docx(file_obj.read())
     except Exception as e:
         print(f"Error reading DOCX file: {e}")
         return None
-    return text
+
+    for error in result['errors']:
+        logger.warning(f"DOCX extraction: {error}")
+    return result['text']
 
 def preprocess_text(text):
     """
     Cleans and normalizes text by lowercasing, removing most punctuation,
     tokenizing, removing common stop words (except crucial ones), and lemmatizing.
     This version aims to preserve important technical terms and numbers.
+    Tokens are normalized through the shared LRU cache in text_normalization,
+    since the same words recur across every resume and job description.
     Args:
         text (str): The raw text to preprocess.
     Returns:
@@ -286,38 +200,23 @@ def preprocess_text(text):
     if not isinstance(text, str):
         return "" # Return empty string for non-string inputs
 
-    text = text.lower() # Convert to lowercase
-    # Keep alphanumeric characters, spaces, and hyphens (for terms like "full-stack")
-    # Removed dots and other punctuation that might break up technical terms.
-    # We want to keep the raw words as much as possible for N-grams.
-    text = re.sub(r'[^a-z0-9\s\-\.]', '', text) # Allow hyphens and dots for version numbers
-
-    tokens = text.split() # Tokenize into words
-
-    # Filter tokens: remove stopwords, but keep words in words_to_keep_always
-    # Then lemmatize the remaining tokens
-    if lemmatizer:
-        filtered_and_lemmatized_tokens = [
-            lemmatizer.lemmatize(word) for word in tokens
-            if word not in custom_stop_words # Now custom_stop_words already has important words removed
-        ]
-    else:
-        # Fallback to basic filtering without lemmatization
-        filtered_and_lemmatized_tokens = [
-            word for word in tokens
-            if word not in custom_stop_words
-        ]
-    
-    # Ensure we don't try to join an empty list of tokens
-    if not filtered_and_lemmatized_tokens:
-        return "" # Return empty string if no valid tokens remain
+    return " ".join(iter_normalized_tokens(text))
 
-    return " ".join(filtered_and_lemmatized_tokens) # Join tokens back into a single string
+def preprocess_text_stream(chunks):
+    """
+    Streaming variant of preprocess_text for large texts.
+    Args:
+        chunks: An iterable of text chunks (e.g. a file opened in text mode).
+    Returns:
+        Iterator[str]: The preprocessed tokens, produced chunk by chunk.
+    """
+    return iter_normalized_tokens(chunks)
 
 def calculate_similarity(text1, text2):
     """
     Calculates the cosine similarity between two preprocessed text strings
-    using TF-IDF vectorization with N-grams.
+    using TF-IDF vectors (unigrams and bigrams) weighted by the corpus-wide IDF
+    from the shared TF-IDF index, instead of fitting a vectorizer on the pair.
     Args:
         text1 (str): The first preprocessed text.
         text2 (str): The second preprocessed text.
@@ -328,20 +227,7 @@ def calculate_similarity(text1, text2):
     if not text1 or not text2:
         return 0.0 # Cannot calculate similarity with empty text
 
-    documents = [text1, text2]
-    # Initialize TF-IDF vectorizer with more lenient parameters for resume matching.
-    # ngram_range=(1, 2): Focus on unigrams and bigrams for better phrase matching.
-    # min_df=1: Consider all terms (important for small corpora).
-    # max_df=1.0: Don't filter out any terms based on frequency.
-    # norm='l2': Use L2 normalization for better cosine similarity.
-    tfidf_vectorizer = TfidfVectorizer(ngram_range=(1, 2), min_df=1, max_df=1.0, norm='l2')
-    # Fit and transform the documents into TF-IDF matrix
-    tfidf_matrix = tfidf_vectorizer.fit_transform(documents)
-
-    # Calculate cosine similarity. `cosine_similarity` returns a matrix,
-    # we need the element at [0][1] for the similarity between the two documents.
-    cosine_sim = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-    return cosine_sim
+    return tfidf_index.similarity(text1, text2)
 
 # --- Optional: Semantic Similarity using SpaCy (requires a larger model for best results) ---
 # This function is available, but you'll need to uncomment it in views.py
@@ -361,6 +247,10 @@ def calculate_semantic_similarity_spacy(text1, text2):
     if not text1 or not text2:
         return 0.0
 
+    nlp = model_registry.get('spacy')
+    if nlp is None:
+        return 0.0
+
     # Process texts with SpaCy to get Doc objects
     doc1 = nlp(text1)
     doc2 = nlp(text2)
@@ -375,209 +265,252 @@ def calculate_semantic_similarity_spacy(text1, text2):
         return 0.0
 
 # --- ATS-like Scoring System ---
-def calculate_ats_similarity(jd_text, resume_text):
-    """
-    ATS-like scoring system that combines multiple factors:
-    1. Keyword/Skill matching (weighted)
-    2. Experience level matching
-    3. Technical term overlap
-    4. Semantic similarity
-    5. Required vs preferred skills
+# --- ATS scoring ---
+# Component weights of the ATS-like score (must sum to 1.0)
+ATS_WEIGHTS = {
+    'skill': 0.35,       # Keyword overlap with the JD
+    'experience': 0.25,  # Years of experience plus seniority match
+    'technical': 0.25,   # Technical term overlap
+    'semantic': 0.10,    # Corpus TF-IDF similarity
+    'education': 0.05,   # Degrees and certifications
+}
+
+# One row per resume; every component and the overall score are in [0, 1]
+ATS_SCORE_DTYPE = np.dtype([
+    ('skill', 'f8'), ('experience', 'f8'), ('technical', 'f8'),
+    ('semantic', 'f8'), ('education', 'f8'), ('overall', 'f8'),
+])
+
+# Match model field for each ATS component
+ATS_MATCH_FIELDS = {
+    'overall': 'overall_score',
+    'skill': 'skill_score',
+    'experience': 'experience_score',
+    'technical': 'technical_score',
+    'semantic': 'semantic_score',
+    'education': 'education_score',
+}
+
+ATS_SENIOR_TERMS = ('senior', 'lead', 'principal', 'architect', 'manager', 'director', 'head of')
+
+# Comprehensive tech stack used for the technical overlap component
+ATS_TECHNICAL_TERMS = frozenset({
+    # Programming Languages
+    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'php', 'ruby', 'scala', 'kotlin', 'swift',
     
-    Args:
-        jd_text (str): Preprocessed job description text
-        resume_text (str): Preprocessed resume text
-    Returns:
-        float: ATS-like score between 0.0 and 1.0
-    """
-    if not jd_text or not resume_text:
-        return 0.0
+    # Web Frameworks & Libraries
+    'django', 'flask', 'fastapi', 'spring', 'spring boot', 'express', 'react', 'vue', 'angular', 'node.js', 'next.js', 'nuxt.js',
+    'laravel', 'rails', 'asp.net', 'dotnet', 'jquery', 'bootstrap', 'tailwind', 'material-ui', 'antd',
     
-    # Debug: Print input texts (first 200 chars)
-    print(f"DEBUG - JD Text (first 200 chars): {jd_text[:200]}")
-    print(f"DEBUG - Resume Text (first 200 chars): {resume_text[:200]}")
-    print(f"DEBUG - JD Text Length: {len(jd_text)}")
-    print(f"DEBUG - Resume Text Length: {len(resume_text)}")
+    # Databases & ORMs
+    'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb', 'sqlite', 'oracle', 'sql server',
+    'sqlalchemy', 'hibernate', 'prisma', 'sequelize', 'mongoose', 'django orm',
     
-    # Debug: Show sample words from each text
-    jd_sample = list(jd_words)[:20]
-    resume_sample = list(resume_words)[:20]
-    print(f"DEBUG - JD Sample Words: {jd_sample}")
-    print(f"DEBUG - Resume Sample Words: {resume_sample}")
+    # Cloud & DevOps
+    'aws', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'bitbucket',
+    'terraform', 'ansible', 'chef', 'puppet', 'prometheus', 'grafana', 'elk stack', 'splunk',
     
-    # Convert to sets for easier comparison
-    jd_words = set(jd_text.lower().split())
-    resume_words = set(resume_text.lower().split())
+    # APIs & Protocols
+    'rest', 'api', 'graphql', 'soap', 'grpc', 'websocket', 'http', 'https', 'oauth', 'jwt', 'openapi', 'swagger',
     
-    # Debug: Print word counts and some common words
-    print(f"DEBUG - JD Words: {len(jd_words)}")
-    print(f"DEBUG - Resume Words: {len(resume_words)}")
-    print(f"DEBUG - Common Words (first 10): {list(jd_words.intersection(resume_words))[:10]}")
+    # Architecture & Patterns
+    'microservices', 'monolith', 'serverless', 'event-driven', 'mvc', 'mvvm', 'clean architecture', 'ddd',
+    'soa', 'api gateway', 'load balancer', 'circuit breaker', 'caching', 'cdn',
     
-    # Debug: Print key technical words for inspection
-    technical_jd_words = [w for w in jd_words if w in ['python', 'django', 'fastapi', 'microservices', 'aws', 'docker', 'kubernetes', 'postgresql', 'rest', 'api']]
-    technical_resume_words = [w for w in resume_words if w in ['python', 'django', 'fastapi', 'microservices', 'aws', 'docker', 'kubernetes', 'postgresql', 'rest', 'api']]
-    print(f"DEBUG - Key Technical JD Words: {technical_jd_words}")
-    print(f"DEBUG - Key Technical Resume Words: {technical_resume_words}")
+    # Development Practices
+    'agile', 'scrum', 'kanban', 'devops', 'ci/cd', 'tdd', 'bdd', 'code review', 'pair programming',
+    'git', 'gitflow', 'branching', 'merging', 'version control',
     
-    # Debug: Check for specific skill matches
-    python_match = 'python' in jd_words and 'python' in resume_words
-    django_match = 'django' in jd_words and 'django' in resume_words
-    microservices_match = 'microservices' in jd_words and 'microservices' in resume_words
-    aws_match = 'aws' in jd_words and 'aws' in resume_words
-    docker_match = 'docker' in jd_words and 'docker' in resume_words
+    # Testing & Quality
+    'unit testing', 'integration testing', 'e2e testing', 'selenium', 'cypress', 'jest', 'pytest', 'junit',
+    'sonarqube', 'code coverage', 'static analysis', 'linting', 'eslint', 'pylint',
     
-    print(f"DEBUG - Specific Skill Matches:")
-    print(f"  Python: {python_match}")
-    print(f"  Django: {django_match}")
-    print(f"  Microservices: {microservices_match}")
-    print(f"  AWS: {aws_match}")
-    print(f"  Docker: {docker_match}")
+    # Security
+    'authentication', 'authorization', 'encryption', 'ssl', 'tls', 'oauth2', 'saml', 'ldap', 'rbac',
+    'penetration testing', 'vulnerability assessment', 'security audit',
     
-    # 1. Keyword/Skill Matching (40% weight)
-    common_skills = jd_words.intersection(resume_words)
-    skill_match_score = len(common_skills) / len(jd_words) if jd_words else 0.0
+    # Data & Analytics
+    'data science', 'machine learning', 'ai', 'artificial intelligence', 'deep learning', 'nlp', 'computer vision',
+    'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'spark', 'hadoop', 'kafka',
     
-    # Debug: Print skill matching details
-    print(f"DEBUG - Skill Match Details:")
-    print(f"  Common Skills: {list(common_skills)}")
-    print(f"  JD Total Words: {len(jd_words)}")
-    print(f"  Common Skills Count: {len(common_skills)}")
-    print(f"  Skill Match Score: {skill_match_score:.3f}")
+    # Mobile & Desktop
+    'react native', 'flutter', 'xamarin', 'ionic', 'electron', 'pwa', 'progressive web app',
     
-    # 2. Experience Level Matching (20% weight) - Enhanced with seniority levels
-    experience_score = 0.0
-    jd_years = extract_years_of_experience(jd_text)
-    resume_years = extract_years_of_experience(resume_text)
+    # Monitoring & Logging
+    'logging', 'monitoring', 'alerting', 'metrics', 'apm', 'new relic', 'datadog', 'sentry', 'logstash',
     
-    if jd_years and resume_years:
-        if resume_years >= jd_years:
-            experience_score = 1.0  # Meets or exceeds requirement
-        elif resume_years >= jd_years * 0.8:  # Within 20% of requirement
-            experience_score = 0.9
-        elif resume_years >= jd_years * 0.6:  # Within 40% of requirement
-            experience_score = 0.7
-        else:
-            experience_score = resume_years / jd_years  # Partial match
+    # Infrastructure
+    'docker swarm', 'mesos', 'nomad', 'istio', 'linkerd', 'helm', 'kustomize',
+    'vpc', 'subnet', 'auto scaling', 'elastic beanstalk', 'ecs', 'eks', 'fargate',
     
-    # Seniority level matching (bonus points)
-    seniority_bonus = 0.0
-    senior_terms = {'senior', 'lead', 'principal', 'architect', 'manager', 'director', 'head of'}
-    jd_senior = any(term in jd_text.lower() for term in senior_terms)
-    resume_senior = any(term in resume_text.lower() for term in senior_terms)
+    # Business & Domain
+    'ecommerce', 'fintech', 'healthcare', 'edtech', 'saas', 'b2b', 'b2c', 'marketplace', 'crm', 'erp',
+    'payment processing', 'stripe', 'paypal', 'square', 'blockchain', 'cryptocurrency'
+})
+
+ATS_EDUCATION_TERMS = frozenset({
+    'bachelor', 'master', 'phd', 'degree', 'certification', 'certified', 'aws certified',
+    'microsoft certified', 'google certified', 'pmp', 'scrum master', 'agile certified',
+    'computer science', 'software engineering', 'information technology', 'data science'
+})
+
+
+def _ats_tokens(text):
+    """Word tokens used for overlap scoring (lowercased, whitespace split)."""
+    return text.lower().split()
+
+
+def score_batch(jd_text, resume_texts, semantic_scores=None):
+    """
+    ATS-like scoring of many resumes against one job description.
     
-    if jd_senior and resume_senior:
-        seniority_bonus = 0.1  # 10% bonus for matching seniority
-    elif not jd_senior and not resume_senior:
-        seniority_bonus = 0.05  # 5% bonus for matching junior/mid level
+    The JD side (word set, technical and education terms, years of experience,
+    seniority) is computed once. Word overlaps for every resume come from one
+    binary term matrix, and the semantic component is one sparse product
+    against the corpus TF-IDF index.
     
-    experience_score = min(experience_score + seniority_bonus, 1.0)
+    Components:
+    1. Keyword/Skill matching
+    2. Experience level matching (with seniority bonus)
+    3. Technical term overlap
+    4. Semantic similarity
+    5. Education & certification matching
     
-    # 3. Technical Term Overlap (25% weight) - Enhanced with comprehensive tech stack
-    technical_terms = {
-        # Programming Languages
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go', 'rust', 'php', 'ruby', 'scala', 'kotlin', 'swift',
-        
-        # Web Frameworks & Libraries
-        'django', 'flask', 'fastapi', 'spring', 'spring boot', 'express', 'react', 'vue', 'angular', 'node.js', 'next.js', 'nuxt.js',
-        'laravel', 'rails', 'asp.net', 'dotnet', 'jquery', 'bootstrap', 'tailwind', 'material-ui', 'antd',
-        
-        # Databases & ORMs
-        'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb', 'sqlite', 'oracle', 'sql server',
-        'sqlalchemy', 'hibernate', 'prisma', 'sequelize', 'mongoose', 'django orm',
-        
-        # Cloud & DevOps
-        'aws', 'azure', 'gcp', 'google cloud', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'bitbucket',
-        'terraform', 'ansible', 'chef', 'puppet', 'prometheus', 'grafana', 'elk stack', 'splunk',
-        
-        # APIs & Protocols
-        'rest', 'api', 'graphql', 'soap', 'grpc', 'websocket', 'http', 'https', 'oauth', 'jwt', 'openapi', 'swagger',
-        
-        # Architecture & Patterns
-        'microservices', 'monolith', 'serverless', 'event-driven', 'mvc', 'mvvm', 'clean architecture', 'ddd',
-        'soa', 'api gateway', 'load balancer', 'circuit breaker', 'caching', 'cdn',
-        
-        # Development Practices
-        'agile', 'scrum', 'kanban', 'devops', 'ci/cd', 'tdd', 'bdd', 'code review', 'pair programming',
-        'git', 'gitflow', 'branching', 'merging', 'version control',
-        
-        # Testing & Quality
-        'unit testing', 'integration testing', 'e2e testing', 'selenium', 'cypress', 'jest', 'pytest', 'junit',
-        'sonarqube', 'code coverage', 'static analysis', 'linting', 'eslint', 'pylint',
-        
-        # Security
-        'authentication', 'authorization', 'encryption', 'ssl', 'tls', 'oauth2', 'saml', 'ldap', 'rbac',
-        'penetration testing', 'vulnerability assessment', 'security audit',
-        
-        # Data & Analytics
-        'data science', 'machine learning', 'ai', 'artificial intelligence', 'deep learning', 'nlp', 'computer vision',
-        'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'spark', 'hadoop', 'kafka',
-        
-        # Mobile & Desktop
-        'react native', 'flutter', 'xamarin', 'ionic', 'electron', 'pwa', 'progressive web app',
-        
-        # Monitoring & Logging
-        'logging', 'monitoring', 'alerting', 'metrics', 'apm', 'new relic', 'datadog', 'sentry', 'logstash',
-        
-        # Infrastructure
-        'kubernetes', 'docker swarm', 'mesos', 'nomad', 'istio', 'linkerd', 'helm', 'kustomize',
-        'vpc', 'subnet', 'load balancer', 'auto scaling', 'elastic beanstalk', 'ecs', 'eks', 'fargate',
-        
-        # Business & Domain
-        'ecommerce', 'fintech', 'healthcare', 'edtech', 'saas', 'b2b', 'b2c', 'marketplace', 'crm', 'erp',
-        'payment processing', 'stripe', 'paypal', 'square', 'blockchain', 'cryptocurrency'
-    }
+    Args:
+        jd_text (str): Preprocessed job description text
+        resume_texts (list): Preprocessed resume texts
+        semantic_scores (array-like, optional): Precomputed TF-IDF similarity per
+            resume (e.g. from ``tfidf_index.score``); computed here when omitted
+    Returns:
+        numpy.ndarray: Structured array of ``ATS_SCORE_DTYPE``, one row per resume.
+            Empty resume texts, and every resume of an empty or whitespace-only
+            job description, score 0 on every component.
+    """
+    resume_texts = [text or '' for text in resume_texts]
+    scores = np.zeros(len(resume_texts), dtype=ATS_SCORE_DTYPE)
+    if not jd_text or not resume_texts:
+        return scores
+    
+    from sklearn.feature_extraction.text import CountVectorizer
+    
+    # --- JD side, computed once ---
+    jd_lower = jd_text.lower()
+    jd_words = set(jd_lower.split())
+    if not jd_words:
+        # Whitespace-only job description: nothing to match against
+        return scores
+    jd_tech = jd_words & ATS_TECHNICAL_TERMS
+    jd_education = jd_words & ATS_EDUCATION_TERMS
+    jd_years = extract_years_of_experience(jd_text)
+    jd_senior = any(term in jd_lower for term in ATS_SENIOR_TERMS)
+    
+    # --- Word presence for every resume in one sparse matrix ---
+    vocabulary = {word: index for index, word in enumerate(sorted(jd_words | ATS_TECHNICAL_TERMS))}
+    presence = CountVectorizer(vocabulary=vocabulary, analyzer=_ats_tokens, binary=True).transform(resume_texts).tocsc()
+    
+    def overlap(words):
+        if not words:
+            return np.zeros(len(resume_texts))
+        columns = [vocabulary[word] for word in words]
+        return np.asarray(presence[:, columns].sum(axis=1)).ravel()
+    
+    # 1. Keyword/Skill Matching
+    skill = overlap(jd_words) / len(jd_words)
+    
+    # 2. Experience Level Matching - Enhanced with seniority levels
+    experience = np.zeros(len(resume_texts))
+    if jd_years:
+        # Stated years, else years from the resume's dated roles
+        resume_years = np.array([scan_experience(text).years for text in resume_texts], dtype=float)
+        experience = np.select(
+            [
+                resume_years >= jd_years,        # Meets or exceeds requirement
+                resume_years >= jd_years * 0.8,  # Within 20% of requirement
+                resume_years >= jd_years * 0.6,  # Within 40% of requirement
+            ],
+            [1.0, 0.9, 0.7],
+            default=resume_years / jd_years      # Partial match (0 when no years found)
+        )
     
-    # Enhanced technical scoring with weighted importance
-    jd_tech = jd_words.intersection(technical_terms)
-    resume_tech = resume_words.intersection(technical_terms)
-    tech_overlap = jd_tech.intersection(resume_tech)
+    # Seniority level matching (bonus points)
+    resume_senior = np.array([any(term in text.lower() for term in ATS_SENIOR_TERMS) for text in resume_texts])
+    if jd_senior:
+        seniority_bonus = np.where(resume_senior, 0.1, 0.0)   # 10% bonus for matching seniority
+    else:
+        seniority_bonus = np.where(resume_senior, 0.0, 0.05)  # 5% bonus for matching junior/mid level
+    experience = np.minimum(experience + seniority_bonus, 1.0)
     
-    # Calculate weighted tech score based on overlap
+    # 3. Technical Term Overlap, with a 10% bonus for covering more technologies than required
+    technical = np.zeros(len(resume_texts))
     if jd_tech:
-        tech_score = len(tech_overlap) / len(jd_tech)
-        # Bonus for having more matching skills than required
-        if len(resume_tech) > len(jd_tech):
-            tech_score = min(tech_score * 1.1, 1.0)  # 10% bonus cap
-    else:
-        tech_score = 0.0
+        technical = overlap(jd_tech) / len(jd_tech)
+        resume_tech_count = overlap(ATS_TECHNICAL_TERMS & vocabulary.keys())
+        technical = np.where(resume_tech_count > len(jd_tech), np.minimum(technical * 1.1, 1.0), technical)
     
-    # 4. Semantic Similarity (15% weight)
-    semantic_score = calculate_similarity(jd_text, resume_text)
+    # 4. Semantic Similarity
+    if semantic_scores is None:
+        semantic = tfidf_index.similarity_many(jd_text, resume_texts)
+    else:
+        semantic = np.asarray(semantic_scores, dtype=float)
+    
+    # 5. Education & Certification Matching
+    education = overlap(jd_education) / len(jd_education) if jd_education else np.zeros(len(resume_texts))
+    
+    scores['skill'] = skill
+    scores['experience'] = experience
+    scores['technical'] = technical
+    scores['semantic'] = semantic
+    scores['education'] = education
+    scores['overall'] = np.minimum(
+        sum(scores[component] * weight for component, weight in ATS_WEIGHTS.items()),
+        1.0
+    )
     
-    # 5. Education & Certification Matching (10% weight)
-    education_score = 0.0
-    education_terms = {
-        'bachelor', 'master', 'phd', 'degree', 'certification', 'certified', 'aws certified',
-        'microsoft certified', 'google certified', 'pmp', 'scrum master', 'agile certified',
-        'computer science', 'software engineering', 'information technology', 'data science'
-    }
+    empty = np.array([not text for text in resume_texts])
+    if empty.any():
+        scores[empty] = 0
     
-    jd_education = jd_words.intersection(education_terms)
-    resume_education = resume_words.intersection(education_terms)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"ATS batch: {len(resume_texts)} resumes, JD words={len(jd_words)}, "
+            f"JD tech terms={sorted(jd_tech)}, JD years={jd_years}, JD senior={jd_senior}"
+        )
+        for index, row in enumerate(scores):
+            logger.debug(
+                f"ATS resume #{index}: skill={row['skill']:.3f} experience={row['experience']:.3f} "
+                f"technical={row['technical']:.3f} semantic={row['semantic']:.3f} "
+                f"education={row['education']:.3f} overall={row['overall']:.3f}"
+            )
     
-    if jd_education:
-        education_score = len(jd_education.intersection(resume_education)) / len(jd_education)
+    return scores
+
+def ats_scores_as_match_fields(row):
+    """
+    Convert one ``score_batch`` row to ``Match`` score fields (percentages, 2 decimals).
     
-    # Calculate weighted ATS score with refined weights
-    ats_score = (
-        skill_match_score * 0.35 +      # Reduced from 0.40
-        experience_score * 0.25 +       # Increased from 0.20
-        tech_score * 0.25 +             # Same weight
-        semantic_score * 0.10 +         # Reduced from 0.15
-        education_score * 0.05          # New component
-    )
+    Example:
+        Match(job_description=jd, resume=resume, **ats_scores_as_match_fields(scores[i]))
+    """
+    return {field: round(float(row[component]) * 100, 2) for component, field in ATS_MATCH_FIELDS.items()}
+
+def calculate_ats_similarity(jd_text, resume_text, semantic_score=None):
+    """
+    ATS-like score of a single resume against a job description.
+    See ``score_batch`` for the components; use it directly when scoring many resumes.
     
-    # Debug logging (remove in production)
-    print(f"DEBUG - ATS Scoring Breakdown:")
-    print(f"  Skill Match: {skill_match_score:.3f} (35% weight)")
-    print(f"  Experience: {experience_score:.3f} (25% weight)")
-    print(f"  Technical: {tech_score:.3f} (25% weight)")
-    print(f"  Semantic: {semantic_score:.3f} (10% weight)")
-    print(f"  Education: {education_score:.3f} (5% weight)")
-    print(f"  Final Score: {ats_score:.3f}")
+    Args:
+        jd_text (str): Preprocessed job description text
+        resume_text (str): Preprocessed resume text
+        semantic_score (float, optional): TF-IDF similarity already looked up in
+            the corpus index (e.g. for a whole batch); computed here when omitted
+    Returns:
+        float: ATS-like score between 0.0 and 1.0
+    """
+    if not jd_text or not resume_text:
+        return 0.0
     
-    return min(ats_score, 1.0)  # Cap at 1.0
+    semantic_scores = [semantic_score] if semantic_score is not None else None
+    return float(score_batch(jd_text, [resume_text], semantic_scores)['overall'][0])
 
 def calculate_skill_based_similarity(jd_skills, resume_skills):
     """
@@ -592,9 +525,12 @@ def calculate_skill_based_similarity(jd_skills, resume_skills):
     if not jd_skills or not resume_skills:
         return 0.0
     
-    # Convert to sets for easier comparison
-    jd_skill_set = set(skill.lower() for skill in jd_skills)
-    resume_skill_set = set(skill.lower() for skill in resume_skills)
+    # Compare canonical skill IDs (aliases resolved) instead of strings; scoring never
+    # adds to the vocabulary, so names it does not know are left out
+    jd_skill_set = set(skill_vocabulary.ids(jd_skills, create=False))
+    resume_skill_set = set(skill_vocabulary.ids(resume_skills, create=False))
+    if not jd_skill_set:
+        return 0.0
     
     # Find common skills
     common_skills = jd_skill_set.intersection(resume_skill_set)
@@ -602,12 +538,11 @@ def calculate_skill_based_similarity(jd_skills, resume_skills):
     # Calculate skill match percentage
     skill_match_percentage = len(common_skills) / len(jd_skill_set) * 100
     
-    # Debug output
-    print(f"DEBUG - Skill-Based Matching:")
-    print(f"  JD Skills: {jd_skills}")
-    print(f"  Resume Skills: {resume_skills}")
-    print(f"  Common Skills: {list(common_skills)}")
-    print(f"  Skill Match Percentage: {skill_match_percentage:.2f}%")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            f"Skill-based matching: {len(common_skills)}/{len(jd_skill_set)} JD skills matched "
+            f"({skill_match_percentage:.2f}%), common={skill_vocabulary.names(sorted(common_skills))}"
+        )
     
     return skill_match_percentage
 
@@ -672,185 +607,192 @@ def calculate_enhanced_ats_similarity(jd_text, resume_data):
 
 def extract_skills_from_text(text):
     """
-    Extract technical skills from text using predefined skill lists.
+    Extract technical skills from text using the shared skill dictionary.
     
     Args:
         text (str): Text to extract skills from
     Returns:
-        list: List of extracted skills
+        list: List of extracted skills (display names, e.g. "Machine Learning")
     """
-    print(f"🔧 DEBUG: extract_skills_from_text called with text length: {len(text) if text else 0}")
-    
     if not text:
-        print("⚠️ DEBUG: Empty text provided, returning empty list")
         return []
     
-    # Convert to lowercase for matching
-    text_lower = text.lower()
-    print(f"📝 DEBUG: Text converted to lowercase, length: {len(text_lower)}")
-    
-    # Comprehensive skill lists
-    programming_languages = {
-        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go programming', 'go language', 'rust', 'php', 'ruby', 
-        'scala', 'kotlin', 'swift', 'r programming', 'r language', 'matlab', 'perl', 'bash', 'shell', 'powershell'
-    }
-    
-    web_frameworks = {
-        'django', 'flask', 'fastapi', 'spring', 'spring boot', 'express', 'react', 'vue', 'angular', 
-        'node.js', 'next.js', 'nuxt.js', 'laravel', 'rails', 'asp.net', 'dotnet', 'jquery', 
-        'bootstrap', 'tailwind', 'material-ui', 'antd', 'svelte', 'ember'
-    }
-    
-    databases = {
-        'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb', 
-        'sqlite', 'oracle', 'sql server', 'mariadb', 'neo4j', 'influxdb'
-    }
-    
-    cloud_platforms = {
-        'aws', 'azure', 'gcp', 'google cloud', 'digital ocean', 'heroku', 'vercel', 'netlify'
-    }
-    
-    devops_tools = {
-        'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'bitbucket', 'terraform', 'ansible', 
-        'chef', 'puppet', 'prometheus', 'grafana', 'elk stack', 'splunk', 'jira', 'confluence'
-    }
-    
-    apis_protocols = {
-        'rest', 'api', 'graphql', 'soap', 'grpc', 'websocket', 'http', 'https', 'oauth', 'jwt', 
-        'openapi', 'swagger', 'postman'
-    }
-    
-    architecture_patterns = {
-        'microservices', 'monolith', 'serverless', 'event-driven', 'mvc', 'mvvm', 'clean architecture', 
-        'ddd', 'soa', 'api gateway', 'load balancer', 'circuit breaker', 'caching', 'cdn'
-    }
-    
-    development_practices = {
-        'agile', 'scrum', 'kanban', 'devops', 'ci/cd', 'tdd', 'bdd', 'code review', 'pair programming',
-        'git', 'gitflow', 'branching', 'merging', 'version control'
-    }
-    
-    testing_tools = {
-        'unit testing', 'integration testing', 'e2e testing', 'selenium', 'cypress', 'jest', 'pytest', 
-        'junit', 'sonarqube', 'code coverage', 'static analysis', 'linting', 'eslint', 'pylint'
-    }
-    
-    security = {
-        'authentication', 'authorization', 'encryption', 'ssl', 'tls', 'oauth2', 'saml', 'ldap', 'rbac',
-        'penetration testing', 'vulnerability assessment', 'security audit'
-    }
-    
-    data_analytics = {
-        'data science', 'machine learning', 'ai', 'artificial intelligence', 'deep learning', 'nlp', 
-        'computer vision', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 
-        'spark', 'hadoop', 'kafka', 'tableau', 'power bi'
-    }
-    
-    mobile_desktop = {
-        'react native', 'flutter', 'xamarin', 'ionic', 'electron', 'pwa', 'progressive web app'
-    }
-    
-    monitoring_logging = {
-        'logging', 'monitoring', 'alerting', 'metrics', 'apm', 'new relic', 'datadog', 'sentry', 'logstash'
-    }
-    
-    # Combine all skill sets
-    all_skills = (
-        programming_languages | web_frameworks | databases | cloud_platforms | devops_tools |
-        apis_protocols | architecture_patterns | development_practices | testing_tools |
-        security | data_analytics | mobile_desktop | monitoring_logging
-    )
-    
-    print(f"📚 DEBUG: Total skills in dictionary: {len(all_skills)}")
-    
-    # Extract skills from text
-    extracted_skills = []
-    matched_skills_debug = []
-    
-    for skill in all_skills:
-        # Use word boundary regex for more precise matching
-        # This prevents "r" from matching "python" or "go" from matching "django"
-        import re
-        regex = re.compile(r'\b' + re.escape(skill) + r'\b', re.IGNORECASE)
-        
-        if regex.search(text_lower):
-            extracted_skills.append(skill.title())  # Capitalize for display
-            matched_skills_debug.append(skill)
-    
-    print(f"🎯 DEBUG: Found {len(extracted_skills)} skills in text")
-    print(f"🎯 DEBUG: Matched skills (lowercase): {matched_skills_debug}")
-    print(f"🎯 DEBUG: Final extracted skills (title case): {extracted_skills}")
-    
-    result = list(set(extracted_skills))  # Remove duplicates
-    print(f"✅ DEBUG: Returning {len(result)} unique skills: {result}")
-    
-    return result
+    skill_ids = skill_matcher.extract(text, categories=TECHNICAL_CATEGORIES)
+    return [skill_matcher.display_name(skill_id) for skill_id in skill_ids]
 
 def extract_years_of_experience(text):
     """
-    Extract years of experience from text using regex patterns.
+    Extract the stated years of experience ("5+ years of experience").
     Returns the highest number found or None.
-    """
-    import re
     
-    # Patterns to match years of experience (enhanced)
-    patterns = [
-        r'(\d+)\+?\s*years?\s*experience',
-        r'experience\s*of\s*(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*years?\s*in',
-        r'(\d+)\+?\s*years?\s*working',
-        r'minimum\s*(\d+)\+?\s*years?',
-        r'at\s*least\s*(\d+)\+?\s*years?',
-        r'(\d+)\+?\s*years?\s*of',  # "12+ years of experience"
-        r'(\d+)\+?\s*years?\s*expertise',  # "years expertise"
-        r'(\d+)\+?\s*years?\s*in\s*the\s*field',  # "years in the field"
-        r'(\d+)\+?\s*years?',  # Simple "12+ years" pattern
-    ]
-    
-    max_years = 0
-    for pattern in patterns:
-        matches = re.findall(pattern, text.lower())
-        for match in matches:
-            try:
-                years = int(match)
-                max_years = max(max_years, years)
-            except ValueError:
-                continue
-    
-    return max_years if max_years > 0 else None
+    See experience_scanner.scan_experience for years computed from employment dates.
+    """
+    return scan_experience(text).explicit_years or None
+
+
+# Common technology patterns that might be confused with locations
+TECHNOLOGY_REFERENCE_PATTERNS = [
+    # Programming languages and frameworks
+    r'servlet', r'java', r'spring', r'boot', r'aws', r'azure', r'gcp',
+    r'kubernetes', r'docker', r'jenkins', r'git', r'github', r'jira',
+    r'eclipse', r'intellij', r'vscode', r'postgresql', r'mysql', r'mongodb',
+    r'redis', r'elasticsearch', r'kafka', r'rabbitmq', r'nginx', r'apache',
+    r'tomcat', r'wildfly', r'jboss', r'weblogic', r'websphere', r'nodejs',
+    r'react', r'angular', r'vue', r'jquery', r'bootstrap', r'tailwind',
+    r'typescript', r'javascript', r'html', r'css', r'sass', r'less',
+    r'python', r'php', r'ruby', r'go', r'rust', r'scala', r'kotlin',
+    r'swift', r'objective-c', r'c#', r'c\+\+', r'c\b', r'assembly',
+    r'xml', r'fpml', r'json', r'yaml', r'toml', r'ini', r'csv',
+
+    # DevOps and cloud tools
+    r'terraform', r'ansible', r'puppet', r'chef', r'vagrant', r'virtualbox',
+    r'vmware', r'hyper-v', r'xen', r'kvm', r'openstack', r'cloudfoundry',
+    r'heroku', r'netlify', r'vercel', r'firebase', r'lambda', r'ec2',
+    r's3', r'rds', r'dynamodb', r'cloudfront', r'route53', r'vpc',
+    r'iam', r'cloudwatch', r'cloudtrail', r'config', r'guardduty',
+    r'waf', r'shield', r'certificate', r'acm', r'elb', r'alb', r'nlb',
+
+    # Testing frameworks and tools
+    r'fitnesse', r'junit', r'testng', r'mockito', r'powermock', r'cucumber',
+    r'selenium', r'cypress', r'playwright', r'puppeteer', r'jest', r'mocha',
+    r'chai', r'sinon', r'karma', r'protractor', r'nightwatch', r'webdriverio',
+    r'robot', r'behave', r'pytest', r'unittest', r'nose', r'tox',
+    r'coverage', r'jacoco', r'sonarqube', r'codecov', r'coveralls',
+
+    # Build tools and package managers
+    r'maven', r'gradle', r'ant', r'npm', r'yarn', r'pip', r'conda',
+    r'composer', r'bundler', r'cargo', r'go\s+mod', r'nuget', r'chocolatey',
+    r'homebrew', r'apt', r'yum', r'pacman', r'zypper', r'brew',
+
+    # IDEs and editors
+    r'vscode', r'visual\s+studio', r'code', r'sublime', r'atom', r'vim',
+    r'emacs', r'notepad\+\+', r'brackets', r'webstorm', r'pycharm',
+    r'intellij', r'eclipse', r'netbeans', r'android\s+studio', r'xcode',
+
+    # Version control and collaboration
+    r'git', r'svn', r'mercurial', r'bitbucket', r'gitlab', r'github',
+    r'gitlab', r'azure\s+devops', r'jira', r'confluence', r'trello',
+    r'asana', r'slack', r'discord', r'teams', r'zoom', r'webex',
+
+    # Monitoring and logging
+    r'prometheus', r'grafana', r'kibana', r'logstash', r'elasticsearch',
+    r'splunk', r'datadog', r'new\s+relic', r'appdynamics', r'dynatrace',
+    r'nagios', r'zabbix', r'icinga', r'check\s+mk', r'prtg',
+
+    # Databases and data tools
+    r'postgresql', r'mysql', r'mariadb', r'oracle', r'sql\s+server',
+    r'sqlite', r'mongodb', r'cassandra', r'redis', r'memcached',
+    r'elasticsearch', r'solr', r'kafka', r'rabbitmq', r'activemq',
+    r'apache\s+kafka', r'apache\s+pulsar', r'apache\s+storm',
+
+    # Web servers and application servers
+    r'apache', r'nginx', r'lighttpd', r'caddy', r'traefik', r'istio',
+    r'tomcat', r'jetty', r'undertow', r'wildfly', r'jboss', r'weblogic',
+    r'websphere', r'glassfish', r'geronimo', r'karaf', r'fuse',
+
+    # Operating systems and platforms
+    r'linux', r'unix', r'windows', r'macos', r'ubuntu', r'centos',
+    r'debian', r'fedora', r'redhat', r'suse', r'arch', r'gentoo',
+    r'freebsd', r'openbsd', r'netbsd', r'dragonfly', r'minix',
+
+    # Mobile and desktop frameworks
+    r'react\s+native', r'flutter', r'xamarin', r'ionic', r'cordova',
+    r'phonegap', r'electron', r'qt', r'gtk', r'wxwidgets', r'tkinter',
+    r'javafx', r'swing', r'awt', r'swt', r'rcp', r'osgi',
+
+    # AI and ML frameworks
+    r'tensorflow', r'pytorch', r'keras', r'scikit-learn', r'pandas',
+    r'numpy', r'matplotlib', r'seaborn', r'plotly', r'bokeh',
+    r'spark', r'hadoop', r'hive', r'pig', r'hbase', r'zookeeper',
+
+    # Security tools
+    r'owasp', r'burp', r'zap', r'nmap', r'wireshark', r'tcpdump',
+    r'nessus', r'qualys', r'rapid7', r'tenable', r'crowdstrike',
+    r'symantec', r'mcafee', r'trend\s+micro', r'kaspersky', r'bitdefender'
+]
+
+# Common company names that might be confused with locations
+COMPANY_REFERENCE_PATTERNS = [
+    r'capgemini', r'accenture', r'tcs', r'infosys', r'wipro', r'cognizant',
+    r'tech\s+mahindra', r'hcl', r'lti', r'mindtree', r'persistent',
+    r'zensar', r'cybage', r'quintiles', r'iqvia', r'cognizant',
+    r'ibm', r'microsoft', r'google', r'amazon', r'apple', r'facebook',
+    r'meta', r'netflix', r'uber', r'lyft', r'airbnb', r'spotify',
+    r'salesforce', r'oracle', r'sap', r'adobe', r'intel', r'amd',
+    r'nvidia', r'cisco', r'juniper', r'arista', r'vmware', r'citrix',
+    r'red\s+hat', r'canonical', r'suse', r'novell', r'borland',
+    r'symantec', r'mcafee', r'trend\s+micro', r'kaspersky', r'bitdefender',
+    r'crowdstrike', r'palo\s+alto', r'fortinet', r'check\s+point',
+    r'f5', r'riverbed', r'blue\s+coat', r'websense', r'forcepoint',
+    r'proofpoint', r'barracuda', r'sophos', r'eset', r'avast',
+    r'avira', r'kaspersky', r'bitdefender', r'norton', r'malwarebytes'
+]
+
+LOCATION_ENTITY_LABELS = ('GPE', 'LOC')
+# Location extraction reads the resume header: at most this many non-empty lines / characters
+LOCATION_HEADER_MAX_LINES = 15
+LOCATION_HEADER_MAX_CHARS = 1000
+
+# One alternation instead of ~300 separate searches; matches iff any pattern does
+TECHNOLOGY_REFERENCE_RE = re.compile(
+    '|'.join(f'(?:{pattern})' for pattern in TECHNOLOGY_REFERENCE_PATTERNS + COMPANY_REFERENCE_PATTERNS)
+)
+
+
+def resume_header(text: str) -> str:
+    """
+    The top of a resume (name and contact block), where the candidate's
+    location is written. Limits NER input to a few hundred characters.
+    """
+    lines = []
+    length = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        lines.append(line)
+        length += len(line) + 1
+        if len(lines) >= LOCATION_HEADER_MAX_LINES or length >= LOCATION_HEADER_MAX_CHARS:
+            break
+    return '\n'.join(lines)[:LOCATION_HEADER_MAX_CHARS]
+
+
+def _location_ner_disabled_pipes(nlp) -> List[str]:
+    """Pipeline components not needed to read GPE/LOC entities."""
+    needed = {'ner'}
+    if 'tok2vec' in nlp.pipe_names and 'ner' in getattr(nlp.get_pipe('tok2vec'), 'listening_components', []):
+        needed.add('tok2vec')
+    return [name for name in nlp.pipe_names if name not in needed]
+
+
+def _first_location_entity(doc) -> str:
+    """First GPE/LOC entity in the doc that is not a technology or company name."""
+    for ent in doc.ents:
+        if ent.label_ in LOCATION_ENTITY_LABELS and not is_technology_reference(ent.text):
+            return ent.text
+    return ""
 
 
-def extract_location_with_spacy(text: str) -> str:
+def extract_location_with_spacy(text: str, header_only: bool = True) -> str:
     """
     Extract location using spaCy NER with validation and fallback.
+    Only the NER component runs, by default over the resume header only.
     
     Args:
         text (str): Resume text
+        header_only (bool): Run NER over the header/contact block instead of the whole text
     Returns:
         str: Extracted location or empty string if not found
     """
+    nlp = model_registry.get('spacy')
+    if nlp is None:
+        return extract_location_with_regex_fallback(text)
+
     try:
         # Use spaCy NER to find GPE (Geo-Political Entity) and LOC (Location) entities
-        doc = nlp(text)
-        location_entities = []
-        
-        for ent in doc.ents:
-            if ent.label_ in ['GPE', 'LOC']:
-                # Filter out technology references
-                if not is_technology_reference(ent.text):
-                    location_entities.append({
-                        'text': ent.text,
-                        'label': ent.label_,
-                        'start': ent.start_char,
-                        'end': ent.end_char
-                    })
-        
-        # Return the first valid location found
-        if location_entities:
-            return location_entities[0]['text']
-        
+        doc = nlp(resume_header(text) if header_only else text, disable=_location_ner_disabled_pipes(nlp))
         # Fallback to improved regex patterns if spaCy finds nothing
-        return extract_location_with_regex_fallback(text)
+        return _first_location_entity(doc) or extract_location_with_regex_fallback(text)
         
     except Exception as e:
         print(f"Error in spaCy location extraction: {e}")
@@ -858,126 +800,46 @@ def extract_location_with_spacy(text: str) -> str:
         return extract_location_with_regex_fallback(text)
 
 
+def extract_locations_batch(texts: List[str], n_process: int = 1, batch_size: int = 64,
+                            header_only: bool = True) -> List[str]:
+    """
+    Extract the location of many resumes at once through ``nlp.pipe``.
+    
+    Args:
+        texts: Resume texts
+        n_process: Worker processes for spaCy (throughput scales with cores)
+        batch_size: Documents per batch sent to each process
+        header_only: Run NER over each header/contact block instead of the whole text
+    Returns:
+        list: One location (or empty string) per text, in input order
+    """
+    nlp = model_registry.get('spacy')
+    if nlp is None:
+        return [extract_location_with_regex_fallback(text) for text in texts]
+
+    inputs = (resume_header(text) if header_only else text for text in texts)
+    docs = nlp.pipe(inputs, disable=_location_ner_disabled_pipes(nlp), n_process=n_process, batch_size=batch_size)
+    return [_first_location_entity(doc) or extract_location_with_regex_fallback(text) for text, doc in zip(texts, docs)]
+
+
 def is_technology_reference(text: str) -> bool:
     """
     Check if text is likely a technology reference or company name rather than a location.
+    Verdicts are cached by lowercased text, as the same entities recur across resumes.
     
     Args:
         text (str): Text to check
     Returns:
         bool: True if text is likely a technology reference or company name
     """
-    # Common technology patterns that might be confused with locations
-    tech_patterns = [
-        # Programming languages and frameworks
-        r'servlet', r'java', r'spring', r'boot', r'aws', r'azure', r'gcp',
-        r'kubernetes', r'docker', r'jenkins', r'git', r'github', r'jira',
-        r'eclipse', r'intellij', r'vscode', r'postgresql', r'mysql', r'mongodb',
-        r'redis', r'elasticsearch', r'kafka', r'rabbitmq', r'nginx', r'apache',
-        r'tomcat', r'wildfly', r'jboss', r'weblogic', r'websphere', r'nodejs',
-        r'react', r'angular', r'vue', r'jquery', r'bootstrap', r'tailwind',
-        r'typescript', r'javascript', r'html', r'css', r'sass', r'less',
-        r'python', r'php', r'ruby', r'go', r'rust', r'scala', r'kotlin',
-        r'swift', r'objective-c', r'c#', r'c\+\+', r'c\b', r'assembly',
-        r'xml', r'fpml', r'json', r'yaml', r'toml', r'ini', r'csv',
-        
-        # DevOps and cloud tools
-        r'terraform', r'ansible', r'puppet', r'chef', r'vagrant', r'virtualbox',
-        r'vmware', r'hyper-v', r'xen', r'kvm', r'openstack', r'cloudfoundry',
-        r'heroku', r'netlify', r'vercel', r'firebase', r'lambda', r'ec2',
-        r's3', r'rds', r'dynamodb', r'cloudfront', r'route53', r'vpc',
-        r'iam', r'cloudwatch', r'cloudtrail', r'config', r'guardduty',
-        r'waf', r'shield', r'certificate', r'acm', r'elb', r'alb', r'nlb',
-        
-        # Testing frameworks and tools
-        r'fitnesse', r'junit', r'testng', r'mockito', r'powermock', r'cucumber',
-        r'selenium', r'cypress', r'playwright', r'puppeteer', r'jest', r'mocha',
-        r'chai', r'sinon', r'karma', r'protractor', r'nightwatch', r'webdriverio',
-        r'robot', r'behave', r'pytest', r'unittest', r'nose', r'tox',
-        r'coverage', r'jacoco', r'sonarqube', r'codecov', r'coveralls',
-        
-        # Build tools and package managers
-        r'maven', r'gradle', r'ant', r'npm', r'yarn', r'pip', r'conda',
-        r'composer', r'bundler', r'cargo', r'go\s+mod', r'nuget', r'chocolatey',
-        r'homebrew', r'apt', r'yum', r'pacman', r'zypper', r'brew',
-        
-        # IDEs and editors
-        r'vscode', r'visual\s+studio', r'code', r'sublime', r'atom', r'vim',
-        r'emacs', r'notepad\+\+', r'brackets', r'webstorm', r'pycharm',
-        r'intellij', r'eclipse', r'netbeans', r'android\s+studio', r'xcode',
-        
-        # Version control and collaboration
-        r'git', r'svn', r'mercurial', r'bitbucket', r'gitlab', r'github',
-        r'gitlab', r'azure\s+devops', r'jira', r'confluence', r'trello',
-        r'asana', r'slack', r'discord', r'teams', r'zoom', r'webex',
-        
-        # Monitoring and logging
-        r'prometheus', r'grafana', r'kibana', r'logstash', r'elasticsearch',
-        r'splunk', r'datadog', r'new\s+relic', r'appdynamics', r'dynatrace',
-        r'nagios', r'zabbix', r'icinga', r'check\s+mk', r'prtg',
-        
-        # Databases and data tools
-        r'postgresql', r'mysql', r'mariadb', r'oracle', r'sql\s+server',
-        r'sqlite', r'mongodb', r'cassandra', r'redis', r'memcached',
-        r'elasticsearch', r'solr', r'kafka', r'rabbitmq', r'activemq',
-        r'apache\s+kafka', r'apache\s+pulsar', r'apache\s+storm',
-        
-        # Web servers and application servers
-        r'apache', r'nginx', r'lighttpd', r'caddy', r'traefik', r'istio',
-        r'tomcat', r'jetty', r'undertow', r'wildfly', r'jboss', r'weblogic',
-        r'websphere', r'glassfish', r'geronimo', r'karaf', r'fuse',
-        
-        # Operating systems and platforms
-        r'linux', r'unix', r'windows', r'macos', r'ubuntu', r'centos',
-        r'debian', r'fedora', r'redhat', r'suse', r'arch', r'gentoo',
-        r'freebsd', r'openbsd', r'netbsd', r'dragonfly', r'minix',
-        
-        # Mobile and desktop frameworks
-        r'react\s+native', r'flutter', r'xamarin', r'ionic', r'cordova',
-        r'phonegap', r'electron', r'qt', r'gtk', r'wxwidgets', r'tkinter',
-        r'javafx', r'swing', r'awt', r'swt', r'rcp', r'osgi',
-        
-        # AI and ML frameworks
-        r'tensorflow', r'pytorch', r'keras', r'scikit-learn', r'pandas',
-        r'numpy', r'matplotlib', r'seaborn', r'plotly', r'bokeh',
-        r'spark', r'hadoop', r'hive', r'pig', r'hbase', r'zookeeper',
-        
-        # Security tools
-        r'owasp', r'burp', r'zap', r'nmap', r'wireshark', r'tcpdump',
-        r'nessus', r'qualys', r'rapid7', r'tenable', r'crowdstrike',
-        r'symantec', r'mcafee', r'trend\s+micro', r'kaspersky', r'bitdefender'
-    ]
-    
-    # Common company names that might be confused with locations
-    company_patterns = [
-        r'capgemini', r'accenture', r'tcs', r'infosys', r'wipro', r'cognizant',
-        r'tech\s+mahindra', r'hcl', r'lti', r'mindtree', r'persistent',
-        r'zensar', r'cybage', r'quintiles', r'iqvia', r'cognizant',
-        r'ibm', r'microsoft', r'google', r'amazon', r'apple', r'facebook',
-        r'meta', r'netflix', r'uber', r'lyft', r'airbnb', r'spotify',
-        r'salesforce', r'oracle', r'sap', r'adobe', r'intel', r'amd',
-        r'nvidia', r'cisco', r'juniper', r'arista', r'vmware', r'citrix',
-        r'red\s+hat', r'canonical', r'suse', r'novell', r'borland',
-        r'symantec', r'mcafee', r'trend\s+micro', r'kaspersky', r'bitdefender',
-        r'crowdstrike', r'palo\s+alto', r'fortinet', r'check\s+point',
-        r'f5', r'riverbed', r'blue\s+coat', r'websense', r'forcepoint',
-        r'proofpoint', r'barracuda', r'sophos', r'eset', r'avast',
-        r'avira', r'kaspersky', r'bitdefender', r'norton', r'malwarebytes'
-    ]
-    
-    text_lower = text.lower()
-    
-    # Check for technology patterns
-    for pattern in tech_patterns:
-        if re.search(pattern, text_lower):
-            return True
-    
-    # Check for company patterns
-    for pattern in company_patterns:
-        if re.search(pattern, text_lower):
-            return True
-    
-    return False
+    return _is_technology_reference(text.lower())
+
+
+def _match_technology_reference(text_lower: str) -> bool:
+    return TECHNOLOGY_REFERENCE_RE.search(text_lower) is not None
+
+
+_is_technology_reference = token_normalizer.register('technology_reference', _match_technology_reference)
 
 
 def extract_location_with_regex_fallback(text: str) -> str:
@@ -1018,10 +880,63 @@ def extract_location_with_regex_fallback(text: str) -> str:
     return ""
 
 
+def parse_resume_text(extracted_text, skills=None):
+    """
+    Structure resume text that has already been extracted from the file.
+    Combines the speed of lightweight_parser with the quality of nlp_utils skills.
+    
+    Args:
+        extracted_text (str): Raw resume text
+        skills (list, optional): Skills already extracted from the same text
+        
+    Returns:
+        dict: Enhanced structured resume data with contact, skills, experience, education
+    """
+    if skills is None:
+        skills = extract_skills_from_text(extracted_text)
+    
+    # Use lightweight_parser for structure (contact, experience, education)
+    if LIGHTWEIGHT_PARSER_AVAILABLE:
+        structured_data = resume_parser.parse_resume(extracted_text)
+        
+        # Return enhanced data
+        return {
+            'contact': structured_data.get('contact', {}),
+            'experience_years': structured_data.get('total_experience_years', 0),
+            'experience_scan': structured_data.get('experience_scan'),
+            'skills': skills,  # Use nlp_utils skills (better quality)
+            'summary': structured_data.get('summary', ''),
+            'experience_entries': structured_data.get('experience', []),
+            'education_entries': structured_data.get('education', []),
+            'projects': structured_data.get('projects', []),
+            'certifications': structured_data.get('certifications', []),
+            'languages': structured_data.get('languages', []),
+            'raw_text': extracted_text,
+            'processing_method': 'hybrid_lightweight_nlp'
+        }
+    
+    # Fallback to basic nlp_utils only
+    experience_scan = scan_experience(extracted_text)
+    
+    return {
+        'contact': {},
+        'experience_years': experience_scan.years,
+        'experience_scan': experience_scan.as_dict(),
+        'skills': skills,
+        'summary': '',
+        'experience_entries': [],
+        'education_entries': [],
+        'projects': [],
+        'certifications': [],
+        'languages': [],
+        'raw_text': extracted_text,
+        'processing_method': 'nlp_utils_only'
+    }
+
+
 def extract_enhanced_resume_data(file_path):
     """
     Enhanced resume parsing using both lightweight_parser and nlp_utils.
-    Combines the speed of lightweight_parser with the quality of nlp_utils skills.
     
     Args:
         file_path (str): Path to the resume file
@@ -1032,47 +947,7 @@ def extract_enhanced_resume_data(file_path):
     try:
         # Extract text from file
         extracted_text = extract_text_from_file(file_path)
-        
-        # Use lightweight_parser for structure (contact, experience, education)
-        if LIGHTWEIGHT_PARSER_AVAILABLE:
-            parser = LightweightResumeParser()
-            structured_data = parser.parse_resume(extracted_text)
-            
-            # Use nlp_utils for high-quality skills
-            skills = extract_skills_from_text(extracted_text)
-            
-            # Return enhanced data
-            return {
-                'contact': structured_data.get('contact', {}),
-                'experience_years': structured_data.get('total_experience_years', 0),
-                'skills': skills,  # Use nlp_utils skills (better quality)
-                'summary': structured_data.get('summary', ''),
-                'experience_entries': structured_data.get('experience', []),
-                'education_entries': structured_data.get('education', []),
-                'projects': structured_data.get('projects', []),
-                'certifications': structured_data.get('certifications', []),
-                'languages': structured_data.get('languages', []),
-                'raw_text': extracted_text,
-                'processing_method': 'hybrid_lightweight_nlp'
-            }
-        else:
-            # Fallback to basic nlp_utils only
-            skills = extract_skills_from_text(extracted_text)
-            experience_years = extract_years_of_experience(extracted_text)
-            
-            return {
-                'contact': {},
-                'experience_years': experience_years,
-                'skills': skills,
-                'summary': '',
-                'experience_entries': [],
-                'education_entries': [],
-                'projects': [],
-                'certifications': [],
-                'languages': [],
-                'raw_text': extracted_text,
-                'processing_method': 'nlp_utils_only'
-            }
+        return parse_resume_text(extracted_text)
             
     except Exception as e:
         print(f"Error in enhanced resume parsing: {e}")
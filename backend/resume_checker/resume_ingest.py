@@ -0,0 +1,72 @@
+"""
+Bulk Resume Ingestion
+=====================
+
+Worker-side helpers for ``python manage.py ingest_resumes``.
+
+Files are read from a directory tree or a ZIP archive by the parent process
+and parsed in a pool of spawned worker processes. Each worker extracts text
+and skills with the same pipeline as single uploads
+(``resume_processing.build_resume_parse``) and returns the parse to the
+parent, which writes the rows in bulk.
+
+Spawned workers import this module before Django is set up, so Django is
+only imported inside the functions that run in the worker.
+"""
+
+import os
+import zipfile
+from typing import Any, Dict, Iterator, Tuple
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+
+def iter_resume_sources(path: str) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (file name, content) for every resume file under a directory or
+    inside a ZIP archive, one file at a time.
+
+    Args:
+        path: Directory or .zip file
+    Raises:
+        ValueError: If the path is neither a directory nor a ZIP archive
+    """
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS) and not name.startswith('.'):
+                    file_path = os.path.join(root, name)
+                    with open(file_path, 'rb') as f:
+                        yield os.path.relpath(file_path, path), f.read()
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as archive:
+            for info in archive.infolist():
+                name = os.path.basename(info.filename)
+                if info.is_dir() or name.startswith('.') or not name.lower().endswith(RESUME_EXTENSIONS):
+                    continue
+                yield info.filename, archive.read(info)
+    else:
+        raise ValueError(f"{path} is not a directory or ZIP archive")
+
+
+def init_worker(memory_limit_mb: int):
+    """
+    Process initializer for ingestion workers.
+
+    Sets up Django and runs document extraction in-process: the worker is
+    already a separate process under the memory limit, and extraction time
+    limits still apply because workers run jobs on their main thread.
+    """
+    import django
+    django.setup()
+
+    from .document_extraction import apply_memory_limit, extraction_pool
+    extraction_pool.configure(workers=0)
+    apply_memory_limit(memory_limit_mb)
+
+
+def parse_resume_file(name: str, data: bytes) -> Dict[str, Any]:
+    """Parse one resume file in a worker; returns the ResumeParseCache fields."""
+    from .resume_processing import build_resume_parse
+    return build_resume_parse(data, name)
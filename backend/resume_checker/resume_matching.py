@@ -0,0 +1,210 @@
+"""
+Bulk Resume Matching
+====================
+
+Matches every processed resume against one job description and stores the
+results in ``Match``, for ``JobDescriptionViewSet.match_all_resumes_to_jd``.
+
+Resumes are streamed in primary key order, ``chunk_size`` at a time, reading
+only the columns scoring needs (the resume text and the candidate's skills,
+name and email). Each chunk is scored in one batch:
+
+- candidates with skills (when the job has skills) get the skill overlap
+  score of ``calculate_skill_based_similarity``, as integer ID set math
+  on ``Candidate.skill_ids``;
+- the rest get the text-based ATS components of ``score_batch``, with the
+  semantic component looked up in the corpus TF-IDF index.
+
+The chunk's existing scores are read with one query, and its new and
+changed ``Match`` rows are written with one bulk upsert on the
+(job_description, resume) unique key; unchanged rows are not rewritten.
+Database round trips grow with the number of chunks rather than the number
+of resumes (SQLite's bound-parameter limit splits each upsert further).
+
+Usage:
+    from .resume_matching import resume_matcher
+
+    results = resume_matcher.match_all(job_description)   # one dict per resume
+"""
+
+import logging
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from django.db.models import QuerySet
+
+from .models import Match, Resume
+from .nlp_utils import ats_scores_as_match_fields, score_batch
+from .skill_vocabulary import skill_vocabulary
+from .tfidf_index import CorpusTfidfIndex, job_key, resume_key, tfidf_index
+
+logger = logging.getLogger(__name__)
+
+SCORE_FIELDS = ('overall_score', 'skill_score', 'experience_score', 'technical_score', 'semantic_score', 'education_score')
+
+# Resume and candidate columns read per resume
+RESUME_COLUMNS = (
+    'id', 'processed_text',
+    'candidate__skills', 'candidate__skill_ids',
+    'candidate__first_name', 'candidate__last_name', 'candidate__email',
+)
+
+
+def _zero_scores() -> Dict[str, float]:
+    return dict.fromkeys(SCORE_FIELDS, 0)
+
+
+class ResumeMatcher:
+    """
+    Scores all processed resumes against a job and upserts their ``Match`` rows.
+    """
+
+    def __init__(self, chunk_size: int = 2000, text_index: Optional[CorpusTfidfIndex] = None):
+        self.chunk_size = chunk_size
+        self.text_index = text_index or tfidf_index
+
+    def processed_resumes(self) -> QuerySet:
+        """Resumes that have been processed (have processed_text), regardless of status."""
+        return Resume.objects.filter(processed_text__isnull=False).exclude(processed_text='').order_by('pk')
+
+    def _chunks(self, resumes: QuerySet, columns) -> Iterator[List[tuple]]:
+        chunk = []
+        for row in resumes.values_list(*columns).iterator(chunk_size=self.chunk_size):
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    def _sync_text_index(self, job_description, resumes: QuerySet) -> bool:
+        """
+        Bring the TF-IDF index up to date with the job and every resume before
+        anything is scored, so all chunks are scored with the same IDF weights.
+        """
+        try:
+            changed = self.text_index.sync([(job_key(job_description.id), job_description.processed_text)], save=False)
+            for chunk in self._chunks(resumes, ('id', 'processed_text')):
+                changed += self.text_index.sync(
+                    [(resume_key(resume_id), text) for resume_id, text in chunk], save=False
+                )
+            if changed:
+                self.text_index.save()
+            return True
+        except Exception as e:
+            logger.warning(f"TF-IDF index unavailable, scoring without corpus similarity: {e}")
+            return False
+
+    def _skill_scores(self, job_skill_ids: Set[int], chunk: List[tuple]) -> Dict[int, float]:
+        """calculate_skill_based_similarity for each resume whose candidate has skills."""
+        rows = [(resume_id, skills, skill_ids) for resume_id, _, skills, skill_ids, *_ in chunk if skills]
+        # Rows saved before skill IDs existed fall back to the vocabulary (backfill_skill_ids fixes them)
+        fallback = iter(skill_vocabulary.ids_many(
+            [skills for _, skills, skill_ids in rows if not skill_ids], create=False
+        ))
+        scores = {}
+        for resume_id, _, skill_ids in rows:
+            candidate_ids = skill_ids or next(fallback)
+            if not job_skill_ids or not candidate_ids:
+                scores[resume_id] = 0.0
+                continue
+            common = job_skill_ids.intersection(candidate_ids)
+            scores[resume_id] = round(len(common) / len(job_skill_ids) * 100, 2)
+        return scores
+
+    def _text_scores(self, job_description, chunk: List[tuple], use_index: bool) -> Dict[int, Dict[str, float]]:
+        """Text-based ATS score fields for each resume in ``chunk``."""
+        if not chunk:
+            return {}
+        try:
+            semantic_scores = None
+            if use_index:
+                similarities = self.text_index.score(job_key(job_description.id), [resume_key(row[0]) for row in chunk])
+                if similarities:
+                    semantic_scores = [similarities.get(resume_key(row[0]), 0.0) for row in chunk]
+            ats_scores = score_batch(job_description.processed_text, [row[1] for row in chunk], semantic_scores)
+            return {row[0]: ats_scores_as_match_fields(scores) for row, scores in zip(chunk, ats_scores)}
+        except Exception as e:
+            logger.error(f"Error scoring resumes against job {job_description.id}: {e}")
+            return {}
+
+    def _upsert(self, job_description, score_fields: Dict[int, Dict[str, float]]) -> Dict[int, int]:
+        """
+        Insert the chunk's new Match rows and update those whose scores changed,
+        in one upsert. Returns {resume id: match id}.
+        """
+        existing = Match.objects.filter(job_description=job_description, resume_id__in=list(score_fields))
+        match_ids = {}
+        changed = []
+        for resume_id, match_id, *stored in existing.values_list('resume_id', 'id', *SCORE_FIELDS):
+            match_ids[resume_id] = match_id
+            fields = score_fields[resume_id]
+            if any(round(float(value), 2) != round(float(fields[field]), 2) for field, value in zip(SCORE_FIELDS, stored)):
+                changed.append(resume_id)
+        new = [resume_id for resume_id in score_fields if resume_id not in match_ids]
+        if not changed and not new:
+            return match_ids
+
+        matches = Match.objects.bulk_create(
+            [
+                Match(job_description=job_description, resume_id=resume_id, **score_fields[resume_id])
+                for resume_id in changed + new
+            ],
+            update_conflicts=True,
+            unique_fields=['job_description', 'resume'],
+            update_fields=[*SCORE_FIELDS, 'updated_at'],
+        )
+        match_ids.update((match.resume_id, match.pk) for match in matches if match.pk is not None)
+        if len(match_ids) < len(score_fields):
+            # Backends that cannot return IDs from an upsert
+            match_ids.update(existing.filter(resume_id__in=new).values_list('resume_id', 'id'))
+        return match_ids
+
+    def match_all(self, job_description, resumes: Optional[QuerySet] = None) -> List[Dict[str, Any]]:
+        """
+        Score ``resumes`` (default: all processed resumes) against ``job_description``
+        and store the results as ``Match`` rows.
+
+        Returns:
+            One dict per resume (resume_id, candidate_name, candidate_email,
+            match_score, match_id), in resume id order.
+        """
+        resumes = self.processed_resumes() if resumes is None else resumes.order_by('pk')
+        use_index = self._sync_text_index(job_description, resumes)
+
+        jd_skills = job_description.extracted_skills or []
+        job_skill_ids = set(job_description.skill_ids or skill_vocabulary.ids(jd_skills, create=False)) if jd_skills else set()
+
+        results = []
+        for chunk in self._chunks(resumes, RESUME_COLUMNS):
+            skill_scores = self._skill_scores(job_skill_ids, chunk) if jd_skills else {}
+            text_scores = self._text_scores(
+                job_description, [row for row in chunk if row[0] not in skill_scores], use_index
+            )
+
+            score_fields = {}
+            for row in chunk:
+                resume_id = row[0]
+                if resume_id in skill_scores:
+                    fields = _zero_scores()
+                    fields['overall_score'] = fields['skill_score'] = skill_scores[resume_id]
+                else:
+                    fields = text_scores.get(resume_id) or _zero_scores()
+                score_fields[resume_id] = fields
+
+            match_ids = self._upsert(job_description, score_fields)
+
+            for resume_id, _, _, _, first_name, last_name, email in chunk:
+                results.append({
+                    'resume_id': resume_id,
+                    'candidate_name': f"{first_name} {last_name}",
+                    'candidate_email': email,
+                    'match_score': score_fields[resume_id]['overall_score'],
+                    'match_id': match_ids.get(resume_id),
+                })
+            logger.debug(f"Matched {len(results)} resumes against job {job_description.id}")
+
+        return results
+
+
+# Global instance
+resume_matcher = ResumeMatcher()
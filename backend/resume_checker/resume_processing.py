@@ -0,0 +1,533 @@
+"""
+Resume Processing Pipeline
+==========================
+
+Background processing of uploaded resumes, so uploads return as soon as
+the file is stored.
+
+Uploads create the Resume with ``processing_status='pending'`` and enqueue a
+``ResumeProcessingTask``. The tasks table is the queue, so no external broker
+is needed. Workers claim tasks with an atomic conditional UPDATE, which is
+safe across threads and processes on SQLite and PostgreSQL alike. Each worker
+moves the resume through ``processing`` to ``completed`` or ``failed``. A
+failed task is retried up to ``max_attempts`` times. While a resume is being
+processed, a heartbeat thread refreshes its task's lock, so only a task whose
+worker died mid-run lets its lock go stale and is requeued. A worker only
+records the outcome of a task it still owns, so a worker that was merely
+slow cannot overwrite the run of the worker that took its task over.
+
+Parsing reads each file once and caches the result by the SHA-256 of its
+bytes and the parser version (``ResumeParseCache``).
+
+Workers run either:
+- inside the web process: ``settings.RESUME_PROCESSING_WORKERS`` threads,
+  started on the first upload (set to 0 to disable), or
+- in a dedicated process: ``python manage.py process_resumes``.
+"""
+
+import hashlib
+import io
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Candidate, Resume, ResumeParseCache, ResumeProcessingTask
+from .nlp_models import model_registry
+from .nlp_utils import extract_text_from_file, preprocess_text, extract_skills_from_text, parse_resume_text
+from .skill_matcher import skill_matcher
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 2.0
+# A running task whose lock is older than this is assumed abandoned (worker died) and requeued
+STALE_TASK_SECONDS = 600
+STALE_CHECK_INTERVAL_SECONDS = 60
+# How often a worker refreshes the lock of the task it is running (well under STALE_TASK_SECONDS)
+HEARTBEAT_INTERVAL_SECONDS = 60
+
+# Bump when text extraction, preprocessing or resume structuring changes so cached parses are recomputed
+PARSE_PIPELINE_VERSION = 2
+
+# Experience is only copied to the profile when backed by more than a bare "N years" mention
+PROFILE_EXPERIENCE_MIN_CONFIDENCE = 0.5
+
+
+class ResumeProcessingError(Exception):
+    """A resume that can never be processed (retrying will not help)."""
+
+
+# ----------------------------------------------------------------------
+# Processing steps
+# ----------------------------------------------------------------------
+
+def merge_resume_skills(candidate, extracted_skills: List[str]) -> List[str]:
+    """
+    Add resume skills the candidate does not have yet (case-insensitive).
+    The candidate is not saved.
+
+    Returns:
+        The skills that were added.
+    """
+    if not extracted_skills:
+        return []
+
+    current_skills = list(candidate.skills or [])
+    current_skills_lower = set(skill.lower() for skill in current_skills)
+    new_skills = []
+    for skill in extracted_skills:
+        if skill.lower() not in current_skills_lower:
+            new_skills.append(skill)
+            current_skills_lower.add(skill.lower())
+
+    if new_skills:
+        candidate.skills = current_skills + new_skills
+    return new_skills
+
+
+def update_candidate_profile(candidate, enhanced_data: Dict[str, Any]) -> bool:
+    """
+    Fill empty candidate profile fields from hybrid-parsed resume data.
+    The candidate is not saved.
+
+    Returns:
+        True if any field was changed.
+    """
+    profile_updated = False
+    contact_info = enhanced_data.get('contact', {}) or {}
+    experience_years = enhanced_data.get('experience_years', 0)
+    experience_scan = enhanced_data.get('experience_scan') or {}
+    if experience_scan.get('confidence', 1.0) < PROFILE_EXPERIENCE_MIN_CONFIDENCE:
+        experience_years = 0
+
+    if contact_info:
+        if contact_info.get('name') and not candidate.full_name:
+            # Parse name into first and last name
+            name_parts = contact_info['name'].split(' ', 1)
+            if len(name_parts) >= 2:
+                candidate.first_name = name_parts[0]
+                candidate.last_name = name_parts[1]
+            else:
+                candidate.first_name = contact_info['name']
+            profile_updated = True
+
+        if contact_info.get('phone') and not candidate.phone:
+            candidate.phone = contact_info['phone']
+            profile_updated = True
+
+        if contact_info.get('location') and not candidate.city:
+            # Parse location into city and state
+            location_parts = contact_info['location'].split(', ', 1)
+            if len(location_parts) >= 2:
+                candidate.city = location_parts[0]
+                candidate.state = location_parts[1]
+            else:
+                candidate.city = contact_info['location']
+            profile_updated = True
+
+    # Update experience years if available
+    if experience_years and not candidate.total_experience_years:
+        candidate.total_experience_years = experience_years
+        profile_updated = True
+
+    return profile_updated
+
+
+def get_parser_version() -> str:
+    """
+    Version tag for parse cache entries.
+
+    Combines the pipeline version, the skill dictionary fingerprint and the
+    optional NLP resources that change the output (lemmatizer, spaCy).
+    """
+    optional_models = ''.join(
+        flag for flag, name in (('L', 'lemmatizer'), ('S', 'spacy'))
+        if model_registry.get(name) is not None
+    )
+    return f"v{PARSE_PIPELINE_VERSION}-{skill_matcher.fingerprint}-{optional_models or 'basic'}"
+
+
+def build_resume_parse(data: bytes, file_name: str) -> Dict[str, Any]:
+    """
+    Extract and parse resume file content without touching the database.
+
+    Used by parse_resume_content and by bulk ingestion workers.
+
+    Args:
+        data: Raw file content
+        file_name: Original file name (its extension selects the extractor)
+    Returns:
+        dict: The fields of a ResumeParseCache entry
+    Raises:
+        ResumeProcessingError: If no text can be extracted from the file
+    """
+    file_obj = io.BytesIO(data)
+    file_obj.name = file_name
+    parsed_text = extract_text_from_file(file_obj)
+    if not parsed_text or not parsed_text.strip():
+        raise ResumeProcessingError('No text could be extracted from the file')
+
+    # One pass each: skills are extracted once and reused by the structured parse
+    extracted_skills = extract_skills_from_text(parsed_text)
+    parsed_data = parse_resume_text(parsed_text, skills=extracted_skills)
+    for duplicate_key in ('raw_text', 'skills'):
+        parsed_data.pop(duplicate_key, None)
+
+    return {
+        'content_hash': hashlib.sha256(data).hexdigest(),
+        'parser_version': get_parser_version(),
+        'parsed_text': parsed_text,
+        'processed_text': preprocess_text(parsed_text),
+        'extracted_skills': extracted_skills,
+        'parsed_data': parsed_data,
+    }
+
+
+def parse_resume_content(data: bytes, file_name: str):
+    """
+    Parse resume file content once, reusing a cached parse of identical bytes.
+
+    Args:
+        data: Raw file content
+        file_name: Original file name (its extension selects the extractor)
+    Returns:
+        tuple: (ResumeParseCache entry, whether it came from the cache)
+    Raises:
+        ResumeProcessingError: If no text can be extracted from the file
+    """
+    content_hash = hashlib.sha256(data).hexdigest()
+    parser_version = get_parser_version()
+
+    entry = ResumeParseCache.objects.filter(content_hash=content_hash, parser_version=parser_version).first()
+    if entry:
+        ResumeParseCache.objects.filter(id=entry.id).update(hit_count=F('hit_count') + 1, last_used_at=timezone.now())
+        return entry, True
+
+    fields = build_resume_parse(data, file_name)
+    entry, _ = ResumeParseCache.objects.get_or_create(
+        content_hash=fields.pop('content_hash'),
+        parser_version=fields.pop('parser_version'),
+        defaults=fields
+    )
+    return entry, False
+
+
+def process_resume(resume: Resume, update_profile: bool = True) -> Dict[str, Any]:
+    """
+    Extract, preprocess and analyse a stored resume, then update its candidate.
+
+    The file is read once. Its SHA-256 is looked up in the parse cache, so
+    re-uploads of the same file (by any candidate) skip extraction entirely.
+
+    Args:
+        resume: Resume whose file has already been saved
+        update_profile: Also fill empty contact/experience fields on the candidate
+    Returns:
+        dict: Summary of the processing result (stored on the task)
+    Raises:
+        ResumeProcessingError: If no text can be extracted from the file
+    """
+    start_time = time.perf_counter()
+
+    with resume.file.open('rb') as file_obj:
+        data = file_obj.read()
+    parse, cache_hit = parse_resume_content(data, resume.file.name)
+
+    with transaction.atomic():
+        # Merge into the current row under a lock: other resumes of the candidate may be merging too
+        candidate = Candidate.objects.select_for_update().get(pk=resume.candidate_id)
+        resume.candidate = candidate
+        new_skills = merge_resume_skills(candidate, parse.extracted_skills)
+        profile_updated = update_candidate_profile(candidate, parse.parsed_data) if update_profile else False
+
+        resume.content_hash = parse.content_hash
+        resume.parsed_text = parse.parsed_text
+        resume.processed_text = parse.processed_text
+        resume.extracted_skills = parse.extracted_skills
+        resume.processing_status = 'completed'
+        resume.processed_at = timezone.now()
+        resume.save(update_fields=[
+            'content_hash', 'parsed_text', 'processed_text', 'extracted_skills',
+            'processing_status', 'processed_at'
+        ])
+        if new_skills or profile_updated:
+            candidate.save()
+
+    return {
+        'cache_hit': cache_hit,
+        'extracted_skills_count': len(parse.extracted_skills),
+        'skills_added_to_profile': new_skills,
+        'profile_updated': profile_updated,
+        'processing_time_seconds': round(time.perf_counter() - start_time, 3),
+    }
+
+
+# ----------------------------------------------------------------------
+# Queue
+# ----------------------------------------------------------------------
+
+def enqueue_resume_processing(resume: Resume, update_profile: bool = True) -> ResumeProcessingTask:
+    """
+    Queue a resume for background processing and mark it pending.
+    Embedded workers are woken once the surrounding transaction commits.
+    """
+    task, _ = ResumeProcessingTask.objects.update_or_create(
+        resume=resume,
+        defaults={
+            'update_profile': update_profile,
+            'status': 'queued',
+            'attempts': 0,
+            'worker_id': '',
+            'locked_at': None,
+            'error_message': '',
+            'result': {},
+        }
+    )
+    if resume.processing_status != 'pending':
+        resume.processing_status = 'pending'
+        resume.save(update_fields=['processing_status'])
+
+    transaction.on_commit(resume_worker_pool.notify)
+    return task
+
+
+def claim_next_task(worker_id: str) -> Optional[ResumeProcessingTask]:
+    """
+    Atomically claim the oldest queued task.
+
+    Returns:
+        The claimed task, or None if the queue is empty.
+    """
+    while True:
+        task_id = (
+            ResumeProcessingTask.objects.filter(status='queued')
+            .order_by('created_at')
+            .values_list('id', flat=True)
+            .first()
+        )
+        if task_id is None:
+            return None
+
+        # Only one worker can move the row out of 'queued'
+        claimed = ResumeProcessingTask.objects.filter(id=task_id, status='queued').update(
+            status='running',
+            worker_id=worker_id,
+            locked_at=timezone.now(),
+            attempts=F('attempts') + 1,
+            updated_at=timezone.now(),
+        )
+        if claimed:
+            return ResumeProcessingTask.objects.select_related('resume__candidate').get(id=task_id)
+        # Lost the race to another worker; try the next task
+
+
+def requeue_stale_tasks() -> int:
+    """Requeue running tasks whose worker stopped updating them."""
+    cutoff = timezone.now() - timedelta(seconds=STALE_TASK_SECONDS)
+    requeued = ResumeProcessingTask.objects.filter(
+        status='running', locked_at__lt=cutoff, attempts__lt=F('max_attempts')
+    ).update(status='queued', worker_id='', locked_at=None, updated_at=timezone.now())
+
+    abandoned = ResumeProcessingTask.objects.filter(status='running', locked_at__lt=cutoff)
+    for task in abandoned.select_related('resume'):
+        _fail_task(task, 'Worker stopped while processing the resume')
+
+    if requeued:
+        logger.warning(f"Requeued {requeued} stale resume processing tasks")
+    return requeued
+
+
+def _owned(task: ResumeProcessingTask):
+    """The task, as long as this worker still owns it (a stale task is requeued to another)."""
+    return ResumeProcessingTask.objects.filter(id=task.id, status='running', worker_id=task.worker_id)
+
+
+class TaskHeartbeat:
+    """
+    Context manager that refreshes a running task's lock from a side thread,
+    so a slow but live parse is not mistaken for a dead worker and requeued.
+    """
+
+    def __init__(self, task: ResumeProcessingTask, interval: float = HEARTBEAT_INTERVAL_SECONDS):
+        self.task = task
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> 'TaskHeartbeat':
+        self._thread = threading.Thread(
+            target=self._run, name=f"resume-heartbeat-{self.task.id}", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            while not self._stop.wait(self.interval):
+                try:
+                    _owned(self.task).update(locked_at=timezone.now())
+                except Exception:
+                    logger.exception(f"Could not refresh the lock of resume processing task {self.task.id}")
+        finally:
+            connection.close()
+
+
+def _fail_task(task: ResumeProcessingTask, error_message: str) -> None:
+    if _owned(task).update(status='failed', error_message=error_message, updated_at=timezone.now()):
+        Resume.objects.filter(id=task.resume_id).update(processing_status='failed', processed_at=timezone.now())
+
+
+def run_task(task: ResumeProcessingTask) -> bool:
+    """
+    Process a claimed task and record the outcome.
+
+    Returns:
+        True if the resume was processed successfully.
+    """
+    resume = task.resume
+    Resume.objects.filter(id=resume.id).update(processing_status='processing')
+
+    try:
+        with TaskHeartbeat(task):
+            result = process_resume(resume, update_profile=task.update_profile)
+    except ResumeProcessingError as e:
+        logger.warning(f"Resume {resume.id} cannot be processed: {e}")
+        _fail_task(task, str(e))
+        return False
+    except Exception as e:
+        logger.exception(f"Error processing resume {resume.id} (attempt {task.attempts}/{task.max_attempts})")
+        if task.attempts < task.max_attempts:
+            if _owned(task).update(
+                status='queued', error_message=str(e), worker_id='', locked_at=None, updated_at=timezone.now()
+            ):
+                Resume.objects.filter(id=resume.id).update(processing_status='pending')
+        else:
+            _fail_task(task, str(e))
+        return False
+
+    if not _owned(task).update(status='done', error_message='', result=result, updated_at=timezone.now()):
+        logger.warning(f"Resume processing task {task.id} was requeued while this worker processed it")
+        return False
+    logger.info(f"Processed resume {resume.id} in {result['processing_time_seconds']}s")
+    return True
+
+
+def get_processing_status(resume: Resume) -> Dict[str, Any]:
+    """Processing state of a resume for status endpoints."""
+    data = {
+        'resume_id': resume.id,
+        'processing_status': resume.processing_status,
+        'processed_at': resume.processed_at,
+        'extracted_skills': resume.extracted_skills if resume.processing_status == 'completed' else [],
+    }
+    task = ResumeProcessingTask.objects.filter(resume=resume).first()
+    if task:
+        data.update({
+            'attempts': task.attempts,
+            'max_attempts': task.max_attempts,
+            'error': task.error_message or None,
+            'skills_added_to_profile': task.result.get('skills_added_to_profile', []),
+        })
+    return data
+
+
+# ----------------------------------------------------------------------
+# Worker pool
+# ----------------------------------------------------------------------
+
+class ResumeWorkerPool:
+    """
+    Threads that drain the resume processing queue.
+
+    Idle workers poll the queue every ``poll_interval`` seconds and are woken
+    immediately by ``notify`` when an upload in this process enqueues work.
+    """
+
+    def __init__(self, size: int = 2, poll_interval: float = POLL_INTERVAL_SECONDS):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._threads: List[threading.Thread] = []
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._last_stale_check = 0.0
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def start(self) -> None:
+        with self._lock:
+            if self.is_running or self.size <= 0:
+                return
+            self._stop.clear()
+            prefix = f"{socket.gethostname()}:{os.getpid()}"
+            self._threads = [
+                threading.Thread(
+                    target=self._run, args=(f"{prefix}:{index}",),
+                    name=f"resume-worker-{index}", daemon=True
+                )
+                for index in range(self.size)
+            ]
+            for thread in self._threads:
+                thread.start()
+            logger.info(f"Started {self.size} resume processing workers")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake idle workers, starting the embedded pool on first use."""
+        if not self.is_running and getattr(settings, 'RESUME_PROCESSING_WORKERS', 0) > 0:
+            self.size = settings.RESUME_PROCESSING_WORKERS
+            self.start()
+        self._wakeup.set()
+
+    def drain(self, worker_id: str) -> int:
+        """Process tasks in the calling thread until the queue is empty."""
+        processed = 0
+        while not self._stop.is_set():
+            task = claim_next_task(worker_id)
+            if task is None:
+                break
+            run_task(task)
+            processed += 1
+        return processed
+
+    def _maybe_requeue_stale(self) -> None:
+        now = time.monotonic()
+        if now - self._last_stale_check >= STALE_CHECK_INTERVAL_SECONDS:
+            self._last_stale_check = now
+            requeue_stale_tasks()
+
+    def _run(self, worker_id: str) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    close_old_connections()
+                    self._maybe_requeue_stale()
+                    self.drain(worker_id)
+                except Exception:
+                    logger.exception(f"Resume worker {worker_id} error")
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+        finally:
+            connection.close()
+
+
+resume_worker_pool = ResumeWorkerPool(size=getattr(settings, 'RESUME_PROCESSING_WORKERS', 2))
@@ -1,18 +1,89 @@
 """
 Detailed Scoring Analysis Utilities
 Provides comprehensive breakdown of candidate-job matching scores
+
+Two entry points share the same scoring rules:
+
+- ``score_jobs``: numeric kernel. Scores one candidate against many jobs at
+  once (``JobFeatures``) and returns the component and overall scores as
+  NumPy arrays. Used wherever only the numbers are needed (browse_jobs'
+  materialized score table, job cards).
+- ``calculate_detailed_match_score``: explanation builder. Builds the full
+  breakdown with strengths, weaknesses and recommendations for one job, e.g.
+  the job a candidate opens in the detailed match analysis.
+
+Skills are compared by their ``Skill`` IDs (see skill_vocabulary.py), as in
+HR ranking, so aliases match ("k8s" and "Kubernetes"). The skill score is
+shared skills / distinct skills the job requires.
 """
 
-def calculate_detailed_match_score(job_data, candidate_skills, candidate_experience, candidate_education, candidate_location=None):
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .skill_vocabulary import skill_vocabulary
+
+# Component weights (percent of the overall score)
+SKILL_WEIGHT = 40
+EXPERIENCE_WEIGHT = 30
+EDUCATION_WEIGHT = 20
+LOCATION_WEIGHT = 10
+
+EDUCATION_SCORES = {
+    'high_school': 25,
+    'associate': 50,
+    'bachelor': 75,
+    'master': 90,
+    'phd': 100
+}
+
+# Job experience level -> (education score multiplier, minimum education score to be 'suitable')
+EDUCATION_LEVEL_RULES = {
+    'entry': (1, 0),
+    'junior': (1.1, 50),
+    'mid': (1.2, 60),
+    'senior': (1.3, 70),
+    'lead': (1.4, 80),
+}
+
+REMOTE_KEYWORDS = ('remote', 'work from home', 'wfh', 'virtual')
+
+# Score for a job that lists no skills, and for an on-site job's location
+NO_JOB_SKILLS_SCORE = 50
+ONSITE_LOCATION_SCORE = 80
+
+
+def is_remote_location(job_location):
+    return bool(job_location) and any(keyword in job_location.lower() for keyword in REMOTE_KEYWORDS)
+
+
+def job_skill_ids(job_data):
+    """The job's skill IDs: its stored ``skill_ids``, or its skills looked up read-only."""
+    return job_data.get('skill_ids') or skill_vocabulary.ids(job_data.get('extracted_skills'), create=False)
+
+
+def _skill_display(skill_ids, spellings):
+    """Names to show for ``skill_ids``: in the list's spelling and order, then any others."""
+    names = [name for skill_id, name in spellings.items() if skill_id in skill_ids]
+    others = sorted(set(skill_ids) - spellings.keys())
+    return names + skill_vocabulary.names(others)
+
+
+def calculate_detailed_match_score(job_data, candidate_skills, candidate_experience, candidate_education,
+                                   candidate_location=None, candidate_skill_ids=None):
     """
     Calculate detailed ATS match score with comprehensive breakdown.
     
+    Builds every explanation string, so call it for the job being looked at;
+    use score_jobs to score many jobs. Both give the same scores.
+    
     Args:
-        job_data (dict): Job description data
+        job_data (dict): Job description data (its ``skill_ids`` are used when present)
         candidate_skills (list): Candidate's skills
         candidate_experience (int): Candidate's years of experience
         candidate_education (str): Candidate's education level
         candidate_location (str): Candidate's location (optional)
+        candidate_skill_ids (list): Candidate's skill IDs (looked up from candidate_skills if None)
     
     Returns:
         dict: Detailed scoring breakdown with recommendations
@@ -22,7 +93,7 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         'overall_score': 0,
         'skill_analysis': {
             'score': 0,
-            'weight': 40,
+            'weight': SKILL_WEIGHT,
             'matched_skills': [],
             'missing_skills': [],
             'total_required': 0,
@@ -33,7 +104,7 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         },
         'experience_analysis': {
             'score': 0,
-            'weight': 30,
+            'weight': EXPERIENCE_WEIGHT,
             'required_years': 0,
             'candidate_years': candidate_experience,
             'gap': 0,
@@ -42,7 +113,7 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         },
         'education_analysis': {
             'score': 0,
-            'weight': 20,
+            'weight': EDUCATION_WEIGHT,
             'required_level': '',
             'candidate_level': candidate_education,
             'status': 'unknown',
@@ -50,7 +121,7 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         },
         'location_analysis': {
             'score': 0,
-            'weight': 10,
+            'weight': LOCATION_WEIGHT,
             'job_location': '',
             'candidate_location': candidate_location,
             'status': 'unknown',
@@ -64,9 +135,13 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
     try:
         # 1. SKILL ANALYSIS (40% weight)
         job_skills = job_data.get('extracted_skills', [])
+        job_ids = set(job_skill_ids(job_data))
+        if candidate_skill_ids is None:
+            candidate_skill_ids = skill_vocabulary.ids(candidate_skills, create=False)
+        candidate_ids = set(candidate_skill_ids)
         
         # Handle cases where skills are missing
-        if not candidate_skills:
+        if not candidate_ids:
             detailed_analysis['skill_analysis'].update({
                 'score': 0,
                 'matched_skills': [],
@@ -78,9 +153,9 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
                 'recommendations': ['Upload your resume to extract skills automatically', 'Manually add your skills to your profile']
             })
             detailed_analysis['improvement_areas'].append('Skills data missing')
-        elif not job_skills:
+        elif not job_ids:
             detailed_analysis['skill_analysis'].update({
-                'score': 50,  # Neutral score when job has no skills specified
+                'score': NO_JOB_SKILLS_SCORE,  # Neutral score when job has no skills specified
                 'matched_skills': candidate_skills,
                 'missing_skills': [],
                 'total_required': 0,
@@ -91,27 +166,23 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
             })
         else:
             # Both job and candidate have skills - perform normal analysis
-            # Convert to lowercase for comparison
-            job_skills_lower = [skill.lower() for skill in job_skills]
-            candidate_skills_lower = [skill.lower() for skill in candidate_skills]
-            
-            # Find matching and missing skills
-            matching_skills = set(job_skills_lower) & set(candidate_skills_lower)
-            missing_skills = set(job_skills_lower) - set(candidate_skills_lower)
+            # Find matching and missing skills by ID
+            matching_skills = job_ids & candidate_ids
+            missing_skills = job_ids - candidate_ids
             
             # Calculate skill score
-            skill_score = (len(matching_skills) / len(job_skills_lower)) * 100 if job_skills_lower else 0
+            skill_score = (len(matching_skills) / len(job_ids)) * 100
             
-            # Convert back to original case for display
-            matched_skills_display = [skill for skill in candidate_skills if skill.lower() in matching_skills]
-            missing_skills_display = [skill for skill in job_skills if skill.lower() in missing_skills]
+            # Show matches in the candidate's words and gaps in the job's
+            matched_skills_display = _skill_display(matching_skills, skill_vocabulary.spellings(candidate_skills))
+            missing_skills_display = _skill_display(missing_skills, skill_vocabulary.spellings(job_skills))
             
             detailed_analysis['skill_analysis'].update({
                 'score': round(skill_score, 1),
                 'matched_skills': matched_skills_display,
                 'missing_skills': missing_skills_display,
-                'total_required': len(job_skills),
-                'match_percentage': round((len(matching_skills) / len(job_skills_lower)) * 100, 1) if job_skills_lower else 0
+                'total_required': len(job_ids),
+                'match_percentage': round(skill_score, 1)
             })
             
             # Analyze skill strengths and weaknesses (only for normal case)
@@ -184,31 +255,13 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         education_score = 0
         
         if candidate_education:
-            education_mapping = {
-                'high_school': 25,
-                'associate': 50,
-                'bachelor': 75,
-                'master': 90,
-                'phd': 100
-            }
-            candidate_education_score = education_mapping.get(candidate_education.lower(), 0)
+            candidate_education_score = EDUCATION_SCORES.get(candidate_education.lower(), 0)
             
             # Adjust score based on job level
-            if job_education == 'entry':
-                education_score = min(100, candidate_education_score)
-                status = 'suitable'
-            elif job_education == 'junior':
-                education_score = min(100, candidate_education_score * 1.1)
-                status = 'suitable' if candidate_education_score >= 50 else 'below'
-            elif job_education == 'mid':
-                education_score = min(100, candidate_education_score * 1.2)
-                status = 'suitable' if candidate_education_score >= 60 else 'below'
-            elif job_education == 'senior':
-                education_score = min(100, candidate_education_score * 1.3)
-                status = 'suitable' if candidate_education_score >= 70 else 'below'
-            elif job_education == 'lead':
-                education_score = min(100, candidate_education_score * 1.4)
-                status = 'suitable' if candidate_education_score >= 80 else 'below'
+            if job_education in EDUCATION_LEVEL_RULES:
+                multiplier, suitable_score = EDUCATION_LEVEL_RULES[job_education]
+                education_score = min(100, candidate_education_score * multiplier)
+                status = 'suitable' if candidate_education_score >= suitable_score else 'below'
             else:
                 education_score = candidate_education_score
                 status = 'suitable'
@@ -243,7 +296,7 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         })
         
         # Check if job is remote
-        if job_location and any(keyword in job_location.lower() for keyword in ['remote', 'work from home', 'wfh', 'virtual']):
+        if is_remote_location(job_location):
             location_score = 100
             status = 'remote'
             detailed_analysis['location_analysis']['recommendations'].append(
@@ -252,7 +305,7 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
             detailed_analysis['strengths'].append("✅ Remote position")
         else:
             # Basic location matching (can be enhanced with geocoding)
-            location_score = 80  # Default score for non-remote jobs
+            location_score = ONSITE_LOCATION_SCORE  # Default score for non-remote jobs
             status = 'onsite'
             detailed_analysis['location_analysis']['recommendations'].append(
                 "This appears to be an on-site position. Consider location compatibility."
@@ -311,6 +364,141 @@ def calculate_detailed_match_score(job_data, candidate_skills, candidate_experie
         }
 
 
+def _round1(values):
+    """Round to one decimal exactly like round(value, 1), element-wise."""
+    scaled = values * 10
+    rounded = np.rint(scaled) / 10
+    # x * 10 can land on (or just off) a .5 tie that round() resolves on the exact value
+    near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+    if near_tie.any():
+        rounded[near_tie] = [round(value, 1) for value in values[near_tie].tolist()]
+    return rounded
+
+
+class JobFeatures(NamedTuple):
+    """Jobs in the array form score_jobs reads; build with build_job_features."""
+    ids: np.ndarray                 # Job ids (None where the job dict had none)
+    skills: Any                     # CSR matrix, job x Skill ID: 1 where the job requires the skill
+    skill_counts: np.ndarray        # Distinct skills per job
+    min_years: np.ndarray           # Required years of experience
+    education_multipliers: np.ndarray   # EDUCATION_LEVEL_RULES multiplier of the job's level
+    remote: np.ndarray              # Job location is remote
+
+    def __len__(self):
+        return len(self.ids)
+
+
+class MatchScores(NamedTuple):
+    """Component and overall scores of one candidate against each job of a JobFeatures."""
+    ids: np.ndarray
+    skill: np.ndarray
+    experience: np.ndarray
+    education: np.ndarray
+    location: np.ndarray
+    overall: np.ndarray
+
+
+def build_job_features(jobs, skills=None):
+    """
+    Convert job dicts (same keys as calculate_detailed_match_score's job_data,
+    plus an optional 'id' or 'pk') to JobFeatures.
+    
+    ``skills`` is a job x skill ID CSR matrix with a row per job (e.g. from
+    skill_index.job_skills). Without it the rows come from each job's
+    ``skill_ids``; jobs without them have their ``extracted_skills`` looked
+    up, read-only, in one batch. Columns are Skill IDs, so no per-call
+    vocabulary is needed.
+    """
+    from scipy import sparse
+
+    jobs = list(jobs)
+    if skills is None:
+        looked_up = iter(skill_vocabulary.ids_many(
+            [job.get('extracted_skills') for job in jobs if not job.get('skill_ids')], create=False
+        ))
+        indptr, indices = [0], []
+        for job in jobs:
+            indices.extend(sorted(set(job.get('skill_ids') or next(looked_up))))
+            indptr.append(len(indices))
+        indices = np.array(indices, dtype=np.int64)
+        skills = sparse.csr_matrix(
+            (np.ones(len(indices)), indices, np.array(indptr, dtype=np.int64)),
+            shape=(len(jobs), int(indices.max()) + 1 if len(indices) else 0),
+        )
+    ids, min_years, multipliers, remote = [], [], [], []
+    for job in jobs:
+        ids.append(job.get('id', job.get('pk')))
+        min_years.append(job.get('min_experience_years') or 0)
+        multipliers.append(EDUCATION_LEVEL_RULES.get(job.get('experience_level', ''), (1, 0))[0])
+        remote.append(is_remote_location(job.get('location', '')))
+    return JobFeatures(
+        ids=np.array(ids, dtype=object if None in ids else np.int64),
+        skills=skills,
+        skill_counts=np.diff(skills.indptr).astype(np.float64),
+        min_years=np.array(min_years, dtype=np.float64),
+        education_multipliers=np.array(multipliers, dtype=np.float64),
+        remote=np.array(remote, dtype=bool),
+    )
+
+
+def score_jobs(features, candidate_skill_ids, candidate_experience, candidate_education):
+    """
+    Score one candidate against every job in ``features`` at once.
+    
+    Args:
+        features (JobFeatures): Jobs to score, from build_job_features
+        candidate_skill_ids (list): Candidate's skill IDs
+        candidate_experience (int): Candidate's years of experience
+        candidate_education (str): Candidate's education level
+    
+    Returns:
+        MatchScores: Arrays aligned with features.ids, equal to the scores
+        calculate_detailed_match_score gives for each job
+    """
+    n_jobs = len(features)
+    
+    # 1. Skills: shared skill IDs / skill IDs the job requires
+    if not candidate_skill_ids:
+        skill = np.zeros(n_jobs)
+    else:
+        candidate_ids = np.array(candidate_skill_ids, dtype=np.int64)
+        candidate_vector = np.zeros(features.skills.shape[1])
+        candidate_vector[candidate_ids[candidate_ids < len(candidate_vector)]] = 1
+        shared = features.skills @ candidate_vector
+        with np.errstate(divide='ignore', invalid='ignore'):
+            skill = np.where(
+                features.skill_counts > 0,
+                _round1(shared / features.skill_counts * 100),
+                NO_JOB_SKILLS_SCORE,
+            )
+    
+    # 2. Experience
+    meets = candidate_experience >= features.min_years
+    if candidate_experience > 0:
+        with np.errstate(divide='ignore'):
+            experience = np.where(meets, 100, _round1(np.minimum(100, candidate_experience / features.min_years * 100)))
+    else:
+        experience = np.where(meets, 100.0, 0.0)
+    
+    # 3. Education
+    if candidate_education:
+        candidate_education_score = EDUCATION_SCORES.get(candidate_education.lower(), 0)
+        education = _round1(np.minimum(100, candidate_education_score * features.education_multipliers))
+    else:
+        education = np.zeros(n_jobs)
+    
+    # 4. Location
+    location = np.where(features.remote, 100.0, ONSITE_LOCATION_SCORE)
+    
+    overall = _round1(
+        (skill * (SKILL_WEIGHT / 100)) +
+        (experience * (EXPERIENCE_WEIGHT / 100)) +
+        (education * (EDUCATION_WEIGHT / 100)) +
+        (location * (LOCATION_WEIGHT / 100))
+    )
+    return MatchScores(features.ids, skill, experience, education, location, overall)
+
+
 def get_match_level(score):
     """Get match level based on score."""
     if score is None:
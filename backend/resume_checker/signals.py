@@ -0,0 +1,106 @@
+"""
+Keep search indexes and derived skill ID fields in step with model changes.
+"""
+
+import logging
+
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models.signals import post_delete, post_migrate, post_save, pre_save
+from django.dispatch import receiver
+
+from .job_search import job_search_index
+from .models import Candidate, JobDescription, Resume
+from .skill_index import skill_index
+from .skill_vocabulary import SKILL_ID_FIELDS, skill_vocabulary
+from .tfidf_index import job_key, resume_key, tfidf_index
+
+logger = logging.getLogger(__name__)
+
+
+def sync_skill_ids(sender, instance, update_fields=None, **kwargs):
+    """Fill the skill ID array from the display list before saving."""
+    skills_field, ids_field = SKILL_ID_FIELDS[sender._meta.label]
+    if update_fields is None or skills_field in update_fields:
+        skill_vocabulary.sync_instance(instance, skills_field, ids_field)
+
+
+def save_skill_ids(sender, instance, update_fields=None, **kwargs):
+    """
+    ``save(update_fields=[<skills>])`` skips the ID array sync_skill_ids set; write it too.
+    Job and candidate IDs also go to the skill index once the transaction commits.
+    """
+    skills_field, ids_field = SKILL_ID_FIELDS[sender._meta.label]
+    if update_fields is not None and skills_field in update_fields and ids_field not in update_fields:
+        sender._base_manager.filter(pk=instance.pk).update(**{ids_field: getattr(instance, ids_field)})
+    if update_fields is None or skills_field in update_fields:
+        update = SKILL_INDEX_UPDATES.get(sender)
+        if update:
+            pk, skill_ids, version = instance.pk, getattr(instance, ids_field), instance.updated_at
+            transaction.on_commit(lambda: update(pk, skill_ids, version))
+
+
+# Models whose skill IDs the skill index holds
+SKILL_INDEX_UPDATES = {
+    JobDescription: skill_index.update_job,
+    Candidate: skill_index.update_candidate,
+}
+
+
+for label in SKILL_ID_FIELDS:
+    pre_save.connect(sync_skill_ids, sender=label, dispatch_uid=f'sync_skill_ids:{label}')
+    post_save.connect(save_skill_ids, sender=label, dispatch_uid=f'save_skill_ids:{label}')
+
+
+@receiver(post_delete, sender=JobDescription)
+def unindex_job_skills(sender, instance, **kwargs):
+    job_id = instance.pk   # Django clears pk after the delete
+    transaction.on_commit(lambda: skill_index.remove_job(job_id))
+
+
+@receiver(post_delete, sender=Candidate)
+def unindex_candidate_skills(sender, instance, **kwargs):
+    candidate_id = instance.pk
+    transaction.on_commit(lambda: skill_index.remove_candidate(candidate_id))
+
+
+@receiver(post_save, sender=JobDescription)
+def index_job_text(sender, instance, **kwargs):
+    job_search_index.update_jobs([instance])
+
+
+@receiver(post_delete, sender=JobDescription)
+def unindex_job_text(sender, instance, **kwargs):
+    job_search_index.remove_jobs([instance.pk])
+
+
+def sync_corpus_text(key: str, text: str) -> None:
+    """Index (or with an empty text, remove) a document in the TF-IDF index once the transaction commits."""
+    def sync():
+        try:
+            tfidf_index.sync([(key, text)])
+        except Exception as e:
+            # Matching syncs the document again before scoring
+            logger.warning(f"Could not update {key} in the TF-IDF index: {e}")
+
+    transaction.on_commit(sync)
+
+
+@receiver(post_save, sender=JobDescription)
+@receiver(post_save, sender=Resume)
+def index_corpus_text(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or 'processed_text' in update_fields:
+        key = job_key(instance.pk) if sender is JobDescription else resume_key(instance.pk)
+        sync_corpus_text(key, instance.processed_text or '')
+
+
+@receiver(post_delete, sender=JobDescription)
+@receiver(post_delete, sender=Resume)
+def unindex_corpus_text(sender, instance, **kwargs):
+    sync_corpus_text(job_key(instance.pk) if sender is JobDescription else resume_key(instance.pk), '')
+
+
+@receiver(post_migrate)
+def create_job_search_index(sender, app_config, using=DEFAULT_DB_ALIAS, **kwargs):
+    """Create and fill the job search side table once the app's tables exist."""
+    if app_config.name == 'resume_checker' and using == DEFAULT_DB_ALIAS:
+        job_search_index.create_index()
@@ -0,0 +1,222 @@
+"""
+Skill Index
+===========
+
+In-memory job x skill and candidate x skill incidence matrices built from the
+``skill_ids`` arrays (see skill_vocabulary.py). The scoring paths read skill
+rows from here as ready-made CSR rows instead of loading and converting each
+row's skill list, so every overlap is sparse integer math:
+
+- ``match_score_table.refresh_candidate`` scores a candidate against the job
+  rows (one sparse product, see scoring_utils.score_jobs).
+- HR ranking slices the candidate rows to the job's skill columns, which
+  gives every applicant's matched skills at once.
+
+Columns are ``Skill`` IDs. Each row remembers the ``updated_at`` it was read
+at, and callers pass the ``updated_at`` they read with the row's other
+fields: rows that are missing or read at another time are re-read first (jobs
+from the database in one query, candidates from the objects passed in). A
+read therefore never mixes skills with other fields of a different version,
+whatever other processes changed. Rows saved in this process are updated by
+the ``save_skill_ids`` and ``post_delete`` receivers in ``signals.py`` once
+their transaction commits.
+
+Usage:
+    from .skill_index import skill_index
+
+    skills = skill_index.job_skills([(job_id, updated_at), ...])   # CSR, one row per job
+    matched = skill_index.matched_skill_ids(candidates, job_skill_ids)   # [[skill ID, ...], ...]
+"""
+
+import logging
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .skill_vocabulary import skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+# Rebuild a side's matrix without replaced/removed rows once they make up this share of it
+COMPACT_DEAD_RATIO = 0.25
+
+# Jobs re-read from the database per query
+FETCH_CHUNK_SIZE = 5000
+
+
+def skill_row(skill_ids, skills=None) -> List[int]:
+    """Sorted, distinct skill IDs of a row; rows saved without IDs have their skills looked up read-only."""
+    return sorted(set(skill_ids or skill_vocabulary.ids(skills, create=False)))
+
+
+class _SkillRows:
+    """
+    Skill rows of one side of the index (jobs or candidates).
+
+    New and changed rows wait in a pending list and are stacked into the
+    matrix on the next read. A replaced or removed owner's old row is only
+    left unreferenced; such rows are dropped by compaction.
+    """
+
+    def __init__(self):
+        self._matrix = None              # CSR incidence matrix of stacked rows
+        self._pending: List[List[int]] = []   # Skill IDs of rows not stacked yet
+        self._rows: Dict[int, int] = {}  # Owner id -> row (rows past the matrix are pending)
+        self._versions: Dict[int, Any] = {}   # Owner id -> updated_at the row was read at
+        self._n_skills = 0               # Matrix width: highest skill ID + 1
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def _n_stacked(self) -> int:
+        return self._matrix.shape[0] if self._matrix is not None else 0
+
+    def is_current(self, owner_id: int, version) -> bool:
+        return version is not None and owner_id in self._rows and self._versions[owner_id] == version
+
+    def put(self, owner_id: int, skill_ids: List[int], version) -> None:
+        self._rows[owner_id] = self._n_stacked + len(self._pending)
+        self._versions[owner_id] = version
+        self._pending.append(skill_ids)
+        if skill_ids:
+            self._n_skills = max(self._n_skills, skill_ids[-1] + 1)
+
+    def discard(self, owner_id: int) -> None:
+        self._rows.pop(owner_id, None)
+        self._versions.pop(owner_id, None)
+
+    def _stack(self) -> None:
+        """Move pending rows into the matrix."""
+        from scipy import sparse
+
+        if self._matrix is None:
+            self._matrix = sparse.csr_matrix((0, self._n_skills), dtype=np.float64)
+        if self._pending:
+            indptr = np.zeros(len(self._pending) + 1, dtype=np.int64)
+            np.cumsum([len(skill_ids) for skill_ids in self._pending], out=indptr[1:])
+            indices = np.fromiter(
+                (skill_id for skill_ids in self._pending for skill_id in skill_ids),
+                dtype=np.int64, count=int(indptr[-1]),
+            )
+            block = sparse.csr_matrix(
+                (np.ones(len(indices)), indices, indptr), shape=(len(self._pending), self._n_skills),
+            )
+            self._matrix.resize((self._matrix.shape[0], self._n_skills))
+            self._matrix = sparse.vstack([self._matrix, block], format='csr')
+            self._pending = []
+
+    def _compact(self) -> None:
+        total = self._n_stacked
+        if total and (total - len(self._rows)) / total > COMPACT_DEAD_RATIO:
+            owners = list(self._rows)
+            self._matrix = self._matrix[[self._rows[owner_id] for owner_id in owners]]
+            self._rows = {owner_id: row for row, owner_id in enumerate(owners)}
+
+    def rows(self, owner_ids: List[int]):
+        """CSR matrix with the row of each owner in ``owner_ids``, in order (empty for owners not indexed)."""
+        from scipy import sparse
+
+        self._stack()
+        self._compact()
+        index = np.fromiter((self._rows.get(owner_id, -1) for owner_id in owner_ids), dtype=np.int64, count=len(owner_ids))
+        if not self._n_stacked:
+            return sparse.csr_matrix((len(owner_ids), self._n_skills), dtype=np.float64)
+        rows = self._matrix[np.maximum(index, 0)]
+        missing = index < 0
+        if missing.any():
+            rows = sparse.diags((~missing).astype(np.float64)) @ rows
+            rows.eliminate_zeros()
+        return rows
+
+
+class SkillIndex:
+    """
+    Job and candidate skill rows, checked against the caller's ``updated_at``.
+
+    All public methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._jobs = _SkillRows()
+        self._candidates = _SkillRows()
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def update_job(self, job_id: int, skill_ids, version) -> None:
+        """Index a job's skill IDs as read at ``version`` (its updated_at)."""
+        with self._lock:
+            self._jobs.put(job_id, skill_row(skill_ids), version)
+
+    def remove_job(self, job_id: int) -> None:
+        with self._lock:
+            self._jobs.discard(job_id)
+
+    def update_candidate(self, candidate_id: int, skill_ids, version) -> None:
+        """Index a candidate's skill IDs as read at ``version`` (its updated_at)."""
+        with self._lock:
+            self._candidates.put(candidate_id, skill_row(skill_ids), version)
+
+    def remove_candidate(self, candidate_id: int) -> None:
+        with self._lock:
+            self._candidates.discard(candidate_id)
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def job_skills(self, jobs: Iterable[Tuple[int, Any]]):
+        """
+        CSR matrix (job x skill ID) with a row for each ``(job id, updated_at)``
+        in ``jobs``, in order. Jobs not indexed at that ``updated_at`` are read
+        from the database first; jobs that no longer exist get an empty row.
+        """
+        from .models import JobDescription
+
+        jobs = list(jobs)
+        with self._lock:
+            stale = [job_id for job_id, version in jobs if not self._jobs.is_current(job_id, version)]
+        for start in range(0, len(stale), FETCH_CHUNK_SIZE):
+            rows = JobDescription.objects.filter(pk__in=stale[start:start + FETCH_CHUNK_SIZE]).values_list(
+                'pk', 'skill_ids', 'extracted_skills', 'updated_at'
+            )
+            found = [(job_id, skill_row(skill_ids, skills), version) for job_id, skill_ids, skills, version in rows]
+            with self._lock:
+                for job_id, skill_ids, version in found:
+                    self._jobs.put(job_id, skill_ids, version)
+        if stale:
+            logger.debug(f"Skill index re-read {len(stale)} jobs")
+        with self._lock:
+            return self._jobs.rows([job_id for job_id, _ in jobs])
+
+    def candidate_skills(self, candidates):
+        """
+        CSR matrix (candidate x skill ID) with a row for each saved candidate,
+        in order. Candidates not indexed at their ``updated_at`` are indexed
+        from the objects passed in.
+        """
+        with self._lock:
+            for candidate in candidates:
+                if not self._candidates.is_current(candidate.pk, candidate.updated_at):
+                    self._candidates.put(
+                        candidate.pk, skill_row(candidate.skill_ids, candidate.skills), candidate.updated_at
+                    )
+            return self._candidates.rows([candidate.pk for candidate in candidates])
+
+    def matched_skill_ids(self, candidates, skill_ids) -> List[List[int]]:
+        """Sorted skill IDs each candidate shares with ``skill_ids`` (e.g. a job's), in candidate order."""
+        skills = self.candidate_skills(candidates)
+        columns = np.array(sorted(set(skill_ids)), dtype=np.int64)
+        columns = columns[columns < skills.shape[1]]
+        shared = skills[:, columns].tocsr()
+        shared.sort_indices()
+        matched = columns[shared.indices]
+        return [matched[start:end].tolist() for start, end in zip(shared.indptr[:-1], shared.indptr[1:])]
+
+
+# Global instance
+skill_index = SkillIndex()
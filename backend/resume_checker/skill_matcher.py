@@ -0,0 +1,255 @@
+"""
+Skill Matcher
+=============
+
+The single skill dictionary used across the platform, compiled once into an
+Aho-Corasick automaton.
+
+A scan walks the text exactly once, so its cost grows with the length of the
+text and not with the size of the dictionary. Matches only count on word
+boundaries: "go" does not match inside "django" and "ai" does not match
+inside "maintain". Each match reports the canonical skill ID (aliases such
+as "golang" or "k8s" map to their canonical skill) and its character offsets
+in the original text.
+
+Usage:
+    from resume_checker.skill_matcher import skill_matcher
+
+    skill_matcher.extract("Python and Django on AWS")
+    # ['python', 'django', 'aws']
+"""
+
+import hashlib
+import json
+from collections import deque
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Canonical skills grouped by category. Keys are lowercase canonical IDs.
+SKILL_CATEGORIES: Dict[str, Set[str]] = {
+    'programming_languages': {
+        'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'go programming', 'rust', 'php', 'ruby',
+        'scala', 'kotlin', 'swift', 'r programming', 'matlab', 'perl', 'bash', 'shell', 'powershell',
+        'sql', 'html', 'css'
+    },
+    'web_frameworks': {
+        'django', 'flask', 'fastapi', 'spring', 'spring boot', 'express', 'react', 'vue', 'angular',
+        'node.js', 'next.js', 'nuxt.js', 'laravel', 'rails', 'asp.net', 'dotnet', 'jquery',
+        'bootstrap', 'tailwind', 'material-ui', 'antd', 'svelte', 'ember', 'redux', 'vuex'
+    },
+    'databases': {
+        'postgresql', 'mysql', 'mongodb', 'redis', 'elasticsearch', 'cassandra', 'dynamodb',
+        'sqlite', 'oracle', 'sql server', 'mariadb', 'neo4j', 'influxdb'
+    },
+    'cloud_platforms': {
+        'aws', 'azure', 'gcp', 'google cloud', 'digital ocean', 'heroku', 'vercel', 'netlify'
+    },
+    'devops_tools': {
+        'docker', 'kubernetes', 'jenkins', 'gitlab', 'github', 'bitbucket', 'terraform', 'ansible',
+        'chef', 'puppet', 'prometheus', 'grafana', 'elk stack', 'splunk', 'jira', 'confluence',
+        'travis', 'circleci', 'github actions', 'rabbitmq', 'nginx', 'apache', 'linux', 'unix'
+    },
+    'apis_protocols': {
+        'rest', 'api', 'graphql', 'soap', 'grpc', 'websocket', 'http', 'https', 'oauth', 'jwt',
+        'openapi', 'swagger', 'postman'
+    },
+    'architecture_patterns': {
+        'microservices', 'monolith', 'serverless', 'event-driven', 'mvc', 'mvvm', 'clean architecture',
+        'ddd', 'soa', 'api gateway', 'load balancer', 'circuit breaker', 'caching', 'cdn'
+    },
+    'development_practices': {
+        'agile', 'scrum', 'kanban', 'devops', 'ci/cd', 'tdd', 'bdd', 'code review', 'pair programming',
+        'git', 'gitflow', 'branching', 'merging', 'version control'
+    },
+    'testing_tools': {
+        'unit testing', 'integration testing', 'e2e testing', 'selenium', 'cypress', 'jest', 'pytest',
+        'junit', 'sonarqube', 'code coverage', 'static analysis', 'linting', 'eslint', 'pylint'
+    },
+    'security': {
+        'authentication', 'authorization', 'encryption', 'ssl', 'tls', 'oauth2', 'saml', 'ldap', 'rbac',
+        'penetration testing', 'vulnerability assessment', 'security audit'
+    },
+    'data_analytics': {
+        'data science', 'machine learning', 'ai', 'deep learning', 'nlp',
+        'computer vision', 'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras',
+        'spark', 'hadoop', 'kafka', 'tableau', 'power bi'
+    },
+    'mobile_desktop': {
+        'react native', 'flutter', 'xamarin', 'ionic', 'electron', 'pwa'
+    },
+    'monitoring_logging': {
+        'logging', 'monitoring', 'alerting', 'metrics', 'apm', 'new relic', 'datadog', 'sentry', 'logstash'
+    },
+    'soft_skills': {
+        'communication', 'leadership', 'teamwork', 'problem solving',
+        'critical thinking', 'adaptability', 'time management', 'collaboration',
+        'mentoring', 'project management', 'stakeholder management'
+    },
+}
+
+# Alternative spellings that resolve to a canonical skill ID
+SKILL_ALIASES: Dict[str, str] = {
+    'go language': 'go programming',
+    'golang': 'go programming',
+    'r language': 'r programming',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'vue.js': 'vue',
+    'vuejs': 'vue',
+    'angularjs': 'angular',
+    'nextjs': 'next.js',
+    'nuxtjs': 'nuxt.js',
+    '.net': 'dotnet',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'amazon web services': 'aws',
+    'google cloud platform': 'gcp',
+    'microsoft azure': 'azure',
+    'sklearn': 'scikit-learn',
+    'artificial intelligence': 'ai',
+    'natural language processing': 'nlp',
+    'ml': 'machine learning',
+    'progressive web app': 'pwa',
+    'restful': 'rest',
+    'ci-cd': 'ci/cd',
+}
+
+TECHNICAL_CATEGORIES = tuple(category for category in SKILL_CATEGORIES if category != 'soft_skills')
+
+
+class SkillMatch(NamedTuple):
+    """A skill found in a text: canonical ID plus the matched span."""
+    skill_id: str
+    category: str
+    start: int
+    end: int
+    surface: str
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == '_'
+
+
+class SkillMatcher:
+    """
+    Aho-Corasick automaton over a skill dictionary.
+
+    The automaton is immutable once built, so one instance can be shared by
+    every request thread.
+    """
+
+    def __init__(self, categories: Dict[str, Iterable[str]], aliases: Optional[Dict[str, str]] = None):
+        self.skill_categories: Dict[str, str] = {}
+        for category, skills in categories.items():
+            for skill in skills:
+                self.skill_categories[skill.lower()] = category
+
+        # Surface form -> canonical ID
+        terms: Dict[str, str] = {skill: skill for skill in self.skill_categories}
+        for alias, skill_id in (aliases or {}).items():
+            skill_id = skill_id.lower()
+            if skill_id not in self.skill_categories:
+                raise ValueError(f"Alias '{alias}' points to unknown skill '{skill_id}'")
+            terms[alias.lower()] = skill_id
+
+        # Changes whenever the dictionary does, so cached extraction results can be invalidated
+        self.fingerprint = hashlib.sha256(
+            json.dumps(sorted(terms.items())).encode('utf-8')
+        ).hexdigest()[:12]
+
+        self._build(terms)
+
+    def _build(self, terms: Dict[str, str]) -> None:
+        """Build the trie, failure links and a dense transition table."""
+        goto: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, int]]] = [[]]
+
+        for term, skill_id in terms.items():
+            state = 0
+            for ch in term:
+                next_state = goto[state].get(ch)
+                if next_state is None:
+                    next_state = len(goto)
+                    goto[state][ch] = next_state
+                    goto.append({})
+                    outputs.append([])
+                state = next_state
+            outputs[state].append((skill_id, len(term)))
+
+        # Breadth-first pass: failure links, merged outputs and full
+        # transitions so scanning never has to follow failure links.
+        fail = [0] * len(goto)
+        transitions: List[Dict[str, int]] = [dict(goto[0])]
+        transitions.extend({} for _ in range(len(goto) - 1))
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            fallback = transitions[fail[state]]
+            transitions[state] = dict(fallback)
+            for ch, next_state in goto[state].items():
+                fail[next_state] = fallback.get(ch, 0)
+                transitions[state][ch] = next_state
+                queue.append(next_state)
+            if outputs[fail[state]]:
+                outputs[state] = outputs[state] + outputs[fail[state]]
+
+        self._transitions = transitions
+        self._outputs = [tuple(out) for out in outputs]
+        self.term_count = len(terms)
+
+    def find_all(self, text: str, categories: Optional[Iterable[str]] = None) -> List[SkillMatch]:
+        """
+        Find every dictionary term in ``text`` that sits on word boundaries.
+
+        Args:
+            text: Text to scan (any case)
+            categories: Only report skills from these categories (default: all)
+
+        Returns:
+            Matches ordered by end offset; offsets index into ``text``.
+        """
+        if not text:
+            return []
+
+        lowered = text.lower()
+        if len(lowered) != len(text):
+            # A few characters change length when lowercased; keep offsets aligned
+            lowered = ''.join(c if len(c) == 1 else ch for ch, c in zip(text, map(str.lower, text)))
+
+        allowed = set(categories) if categories is not None else None
+        transitions = self._transitions
+        outputs = self._outputs
+        skill_categories = self.skill_categories
+        length = len(lowered)
+
+        matches = []
+        state = 0
+        for index, ch in enumerate(lowered):
+            state = transitions[state].get(ch, 0)
+            if not outputs[state]:
+                continue
+            end = index + 1
+            if end < length and _is_word_char(lowered[end]):
+                continue
+            for skill_id, term_length in outputs[state]:
+                start = end - term_length
+                if start > 0 and _is_word_char(lowered[start - 1]):
+                    continue
+                category = skill_categories[skill_id]
+                if allowed is not None and category not in allowed:
+                    continue
+                matches.append(SkillMatch(skill_id, category, start, end, text[start:end]))
+        return matches
+
+    def extract(self, text: str, categories: Optional[Iterable[str]] = None) -> List[str]:
+        """Canonical IDs of the skills in ``text``, unique, in order of first appearance."""
+        return list(dict.fromkeys(match.skill_id for match in self.find_all(text, categories)))
+
+    @staticmethod
+    def display_name(skill_id: str) -> str:
+        """Name used when storing or showing a skill (e.g. 'machine learning' -> 'Machine Learning')."""
+        return skill_id.title()
+
+
+skill_matcher = SkillMatcher(SKILL_CATEGORIES, SKILL_ALIASES)
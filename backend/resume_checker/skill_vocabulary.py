@@ -0,0 +1,275 @@
+"""
+Skill Vocabulary
+================
+
+Interns skill names into stable integer IDs from the ``Skill`` table.
+
+A name is canonicalized (trimmed, lowercased, inner whitespace collapsed)
+and resolved through aliases ("k8s" -> "kubernetes"), both the built-in
+``SKILL_ALIASES`` and ``SkillAlias`` rows. Names not in the vocabulary yet
+are added to it when rows are saved; scoring and other read paths pass
+``create=False`` and leave them out. Skill-bearing models keep a sorted ID
+array next to their display list, filled on save by the ``pre_save``
+receiver in ``signals.py``:
+
+    JobDescription.extracted_skills   -> skill_ids
+    Resume.extracted_skills           -> skill_ids
+    Candidate.skills                  -> skill_ids
+    Interviewer.technical_skills      -> technical_skill_ids
+    CandidateRanking.matched_skills   -> matched_skill_ids
+
+so skill overlap is integer set (or bitset) math instead of string
+comparison. ``python manage.py backfill_skill_ids`` seeds the vocabulary
+from the skill dictionary and fills the ID arrays of existing rows.
+
+Usage:
+    from .skill_vocabulary import skill_vocabulary, to_bitset, bitset_overlap
+
+    ids = skill_vocabulary.ids(['Python', 'K8s'])     # [12, 40]
+    skill_vocabulary.names(ids)                       # ['python', 'kubernetes']
+    bitset_overlap(to_bitset(job.skill_ids), to_bitset(candidate.skill_ids))
+"""
+
+import logging
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+from .skill_matcher import SKILL_ALIASES, SKILL_CATEGORIES, skill_matcher
+
+logger = logging.getLogger(__name__)
+
+# Model label -> (display list field, skill ID array field)
+SKILL_ID_FIELDS = {
+    'resume_checker.JobDescription': ('extracted_skills', 'skill_ids'),
+    'resume_checker.Resume': ('extracted_skills', 'skill_ids'),
+    'resume_checker.Candidate': ('skills', 'skill_ids'),
+    'interviewer.Interviewer': ('technical_skills', 'technical_skill_ids'),
+    'candidate_ranking.CandidateRanking': ('matched_skills', 'matched_skill_ids'),
+}
+
+SKILL_NAME_MAX_LENGTH = 100
+
+# A name a read-only lookup did not find is not looked up in the database again for this long
+UNKNOWN_RECHECK_SECONDS = 60
+
+_SKILL_CATEGORY = {name: category for category, names in SKILL_CATEGORIES.items() for name in names}
+
+
+def canonical_skill(skill) -> Optional[str]:
+    """The form skills are compared in, or None for empty/non-string entries."""
+    if not isinstance(skill, str):
+        return None
+    return ' '.join(skill.lower().split())[:SKILL_NAME_MAX_LENGTH] or None
+
+
+def to_bitset(skill_ids: Iterable[int]) -> int:
+    """Skill IDs as a bitset (bit ``id`` set for each ID)."""
+    bits = 0
+    for skill_id in skill_ids:
+        bits |= 1 << skill_id
+    return bits
+
+
+def bitset_overlap(a: int, b: int) -> int:
+    """Number of skills two bitsets share."""
+    return (a & b).bit_count()
+
+
+def skill_id_overlap(required_ids: Iterable[int], candidate_ids: Iterable[int]) -> List[int]:
+    """Sorted IDs present in both arrays."""
+    return sorted(set(required_ids).intersection(candidate_ids))
+
+
+class SkillVocabulary:
+    """
+    In-process cache of the ``Skill`` table: canonical name or alias -> ID.
+
+    IDs never change once assigned, so the cache only grows. A name the cache
+    does not know is looked up in (and if needed added to) the database.
+    All public methods are thread-safe.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids: Dict[str, int] = {}       # Canonical name or alias -> skill ID
+        self._names: Dict[int, str] = {}     # Skill ID -> canonical name
+        self._spellings: Dict[str, int] = {}   # Name as written -> skill ID
+        self._unknown: Dict[str, float] = {}   # Canonical name not in the table -> when it was checked
+        self._loaded = False
+
+    def load(self) -> None:
+        """Read the whole vocabulary and its aliases."""
+        from .models import Skill, SkillAlias
+
+        with self._lock:
+            self._names = dict(Skill.objects.values_list('id', 'name'))
+            self._ids = {name: skill_id for skill_id, name in self._names.items()}
+            for alias, skill_id in SkillAlias.objects.values_list('alias', 'skill_id'):
+                self._ids.setdefault(alias, skill_id)
+            self._spellings = {}
+            self._unknown = {}
+            self._loaded = True
+            logger.debug(f"Loaded skill vocabulary: {len(self._names)} skills")
+
+    def _ensure_loaded(self) -> None:
+        if not self._loaded:
+            self.load()
+
+    @staticmethod
+    def resolve(name: str) -> str:
+        """Built-in alias resolution of a canonical name."""
+        return SKILL_ALIASES.get(name, name)
+
+    def _fetch(self, names: List[str], create: bool, spellings: Optional[Dict[str, List[str]]] = None) -> Dict[str, int]:
+        """
+        IDs of ``names`` from the database, adding the missing ones to the table if ``create``.
+
+        They are cached once the current transaction commits, so a rollback
+        cannot leave IDs of rows that were never committed in the cache.
+        """
+        from django.db import transaction
+        from .models import Skill, SkillAlias
+
+        skills = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+        found = dict(SkillAlias.objects.filter(alias__in=names).values_list('alias', 'skill_id'))
+        found.update(skills)
+        missing = [name for name in names if name not in found]
+        if missing and create:
+            Skill.objects.bulk_create(
+                [
+                    Skill(
+                        name=name,
+                        display_name=skill_matcher.display_name(name)[:SKILL_NAME_MAX_LENGTH],
+                        category=_SKILL_CATEGORY.get(name, ''),
+                    )
+                    for name in missing
+                ],
+                ignore_conflicts=True,
+            )
+            # ignore_conflicts does not return IDs; another process may also have added some
+            skills.update(Skill.objects.filter(name__in=missing).values_list('name', 'id'))
+            found.update(skills)
+
+        def remember():
+            with self._lock:
+                self._ids.update(found)
+                self._names.update((skill_id, name) for name, skill_id in skills.items())
+                for name, written in (spellings or {}).items():
+                    if name in found:
+                        self._spellings.update(dict.fromkeys(written, found[name]))
+
+        transaction.on_commit(remember)
+        return found
+
+    def ids(self, skills, create: bool = True) -> List[int]:
+        """
+        Sorted, distinct skill IDs of ``skills``.
+
+        Args:
+            skills: Skill names as written (any case, aliases allowed)
+            create: Add unknown skills to the vocabulary; when False they are left out
+        """
+        return self.ids_many([skills], create)[0]
+
+    def ids_many(self, skill_lists: Iterable, create: bool = True) -> List[List[int]]:
+        """``ids`` of each list, looking up the names none of the caches know in one go."""
+        with self._lock:
+            self._ensure_loaded()
+            now = time.monotonic()
+            resolved = []
+            unknown = {}
+            for skills in skill_lists:
+                ids = set()
+                names = []
+                for skill in skills or ():
+                    if not isinstance(skill, str):
+                        continue
+                    # Most skill strings repeat verbatim, so look them up before canonicalizing
+                    skill_id = self._spellings.get(skill)
+                    if skill_id is None:
+                        name = canonical_skill(skill)
+                        if name is None:
+                            continue
+                        name = self.resolve(name)
+                        skill_id = self._ids.get(name)
+                        if skill_id is None:
+                            checked = self._unknown.get(name)
+                            if not create and checked is not None and now - checked < UNKNOWN_RECHECK_SECONDS:
+                                continue
+                            unknown.setdefault(name, []).append(skill)
+                            names.append(name)
+                            continue
+                        self._spellings[skill] = skill_id
+                    ids.add(skill_id)
+                resolved.append((ids, names))
+
+            found = self._fetch(list(unknown), create, unknown) if unknown else {}
+            if not create:
+                self._unknown.update((name, now) for name in unknown if name not in found)
+            return [
+                sorted(ids.union(found[name] for name in names if name in found))
+                for ids, names in resolved
+            ]
+
+    def spellings(self, skills) -> Dict[int, str]:
+        """
+        Skill ID -> the first spelling of that skill in ``skills``, in list order, for
+        showing ID matches in the words of the list. Read-only: unknown names are left out.
+        """
+        skills = [skill for skill in skills or () if isinstance(skill, str)]
+        with self._lock:
+            cached = [self._spellings.get(skill) for skill in skills]
+        uncached = iter(self.ids_many([[skill] for skill, skill_id in zip(skills, cached) if skill_id is None], create=False))
+        found = {}
+        for skill, skill_id in zip(skills, cached):
+            if skill_id is None:
+                skill_ids = next(uncached)
+                if not skill_ids:
+                    continue
+                skill_id = skill_ids[0]
+            found.setdefault(skill_id, skill)
+        return found
+
+    def names(self, skill_ids: Iterable[int]) -> List[str]:
+        """Canonical names of ``skill_ids`` (unknown IDs are skipped)."""
+        from .models import Skill
+
+        with self._lock:
+            self._ensure_loaded()
+            skill_ids = list(skill_ids)
+            missing = [skill_id for skill_id in skill_ids if skill_id not in self._names]
+            if missing:
+                self._names.update(Skill.objects.filter(id__in=missing).values_list('id', 'name'))
+            return [self._names[skill_id] for skill_id in skill_ids if skill_id in self._names]
+
+    def seed(self) -> int:
+        """
+        Add every skill of the skill dictionary and its built-in aliases to the tables.
+
+        Returns:
+            Number of skills in the dictionary
+        """
+        from .models import Skill, SkillAlias
+
+        with self._lock:
+            names = sorted(_SKILL_CATEGORY)
+            found = self._fetch(names, create=True)
+            SkillAlias.objects.bulk_create(
+                [
+                    SkillAlias(alias=alias, skill_id=found[target])
+                    for alias, target in SKILL_ALIASES.items()
+                    if target in found
+                ],
+                ignore_conflicts=True,
+            )
+            self._loaded = False
+            return len(names)
+
+    def sync_instance(self, instance, skills_field: str, ids_field: str) -> None:
+        """Set ``instance.<ids_field>`` from its display list."""
+        setattr(instance, ids_field, self.ids(getattr(instance, skills_field, None)))
+
+
+# Global instance
+skill_vocabulary = SkillVocabulary()
@@ -0,0 +1,129 @@
+"""
+Token Normalization Cache
+=========================
+
+Resume and job texts share a small, highly repetitive vocabulary, so the same
+few thousand words are lowercased, cleaned, stop-word checked and lemmatized
+over and over. ``token_normalizer`` memoizes these per-token steps in bounded
+LRU caches with hit-rate counters, shared by ``preprocess_text``, the location
+extractor (technology/company checks on candidate locations) and the skill
+section parser.
+
+Usage:
+    from .text_normalization import token_normalizer, iter_normalized_tokens
+
+    " ".join(iter_normalized_tokens(text))      # same output as preprocess_text
+    token_normalizer.stats()                    # {'lemma': {'hits': ..., 'hit_rate': ...}, ...}
+
+Cached results depend on the loaded NLP resources (stop words, lemmatizer);
+``NLPModelRegistry.reset`` clears the caches.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Iterator, Union
+
+from .nlp_models import model_registry
+
+DEFAULT_CACHE_SIZE = 50_000
+
+# Characters preprocess_text keeps: letters, digits, whitespace, hyphens (for
+# terms like "full-stack") and dots (for version numbers)
+_DISALLOWED_CHARS = re.compile(r'[^a-z0-9\s\-\.]')
+_SKILL_DISALLOWED_CHARS = re.compile(r'[^\w\s-]')
+
+
+class TokenNormalizer:
+    """
+    Named, bounded LRU caches for per-token normalization functions.
+
+    Each registered function gets its own ``functools.lru_cache`` (thread-safe)
+    of ``maxsize`` entries; ``stats()`` reports hits, misses and hit rate per cache.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._caches: Dict[str, Callable] = {}
+
+    def register(self, name: str, fn: Callable[[str], Any]) -> Callable[[str], Any]:
+        """Return a memoized version of ``fn`` tracked under ``name``."""
+        cached = lru_cache(maxsize=self.maxsize)(fn)
+        self._caches[name] = cached
+        return cached
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters and current size of every cache."""
+        stats = {}
+        for name, cached in self._caches.items():
+            info = cached.cache_info()
+            lookups = info.hits + info.misses
+            stats[name] = {
+                'hits': info.hits,
+                'misses': info.misses,
+                'hit_rate': round(info.hits / lookups, 4) if lookups else 0.0,
+                'size': info.currsize,
+                'maxsize': info.maxsize,
+            }
+        return stats
+
+    def clear(self) -> None:
+        """Empty all caches and reset their counters."""
+        for cached in self._caches.values():
+            cached.cache_clear()
+
+
+# Global instance
+token_normalizer = TokenNormalizer()
+
+
+def _lemmatize_token(token: str) -> str:
+    """
+    preprocess_text's per-token pipeline: lowercase, strip punctuation, drop
+    stop words, lemmatize. Returns '' for tokens that are dropped.
+    """
+    token = _DISALLOWED_CHARS.sub('', token.lower())
+    if not token or token in (model_registry.get('stopwords') or frozenset()):
+        return ''
+    lemmatizer = model_registry.get('lemmatizer')
+    return lemmatizer.lemmatize(token) if lemmatizer else token
+
+
+def _clean_skill_token(token: str) -> str:
+    """Skill section entries: strip punctuation other than hyphens."""
+    return _SKILL_DISALLOWED_CHARS.sub('', token).strip()
+
+
+normalize_token = token_normalizer.register('lemma', _lemmatize_token)
+clean_skill_token = token_normalizer.register('skill_token', _clean_skill_token)
+
+
+def iter_normalized_tokens(text: Union[str, Iterable[str]]) -> Iterator[str]:
+    """
+    Yield preprocess_text's tokens one at a time.
+
+    Accepts a whole string or an iterable of string chunks (e.g. a file opened
+    in text mode, or pages of extracted text). Tokens split across chunk
+    boundaries are rejoined. No lowercased or cleaned copy of the full text is
+    built, so memory stays proportional to the chunk size.
+    """
+    chunks = (text,) if isinstance(text, str) else text
+    pending = ''
+    for chunk in chunks:
+        if not chunk:
+            continue
+        tokens = chunk.split()
+        if pending:
+            if tokens and not chunk[0].isspace():
+                tokens[0] = pending + tokens[0]
+            else:
+                tokens.insert(0, pending)
+            pending = ''
+        if tokens and not chunk[-1].isspace():
+            # May continue in the next chunk
+            pending = tokens.pop()
+        yield from filter(None, map(normalize_token, tokens))
+
+    if pending:
+        normalized = normalize_token(pending)
+        if normalized:
+            yield normalized
@@ -0,0 +1,558 @@
+"""
+Corpus TF-IDF Index
+===================
+
+One TF-IDF index over every resume and job description, stored on disk,
+used for text similarity instead of fitting a new vectorizer per pair.
+
+Documents are turned into unigram and bigram counts with a hashing vectorizer.
+The hashed feature space plays the role of a fitted vocabulary, so adding a
+document never means refitting. Raw counts are kept in a CSR matrix.
+Document frequencies are updated as documents are added or removed. IDF
+weights are derived from them on the first query after a change and cached
+until the corpus changes again. This gives the same
+weighting as ``TfidfVectorizer(ngram_range=(1, 2))`` fitted on the whole
+corpus (smooth IDF, L2 norm), apart from rare hash collisions.
+
+Scoring one job description against every resume is a single sparse
+matrix-vector product.
+
+The index is saved under ``settings.TFIDF_INDEX_DIR``. Documents are keyed
+as ``"resume:<id>"`` and ``"job:<id>"``. ``sync`` re-indexes only the
+documents whose text changed. Resumes are indexed when their processing
+completes and jobs when they are saved. ``python manage.py build_tfidf_index``
+rebuilds the whole index from the database.
+
+Web workers, resume workers and management commands share the saved index:
+- A save appends the rows added since the last one as a new segment file
+  and rewrites ``meta.json`` (document keys and segment list). Segments are
+  merged now and then.
+- Saves hold a file lock. Before writing, they load what other processes
+  saved since and apply their own changes on top, so no writer's documents
+  are lost.
+- Every use checks ``meta.json`` (one ``stat``). When another process saved
+  since, only the new segments are read.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+N_FEATURES = 2 ** 20
+NGRAM_RANGE = (1, 2)
+INDEX_FORMAT_VERSION = 2
+
+# Rebuild the matrix without replaced/removed rows once they make up this share of it
+COMPACT_DEAD_RATIO = 0.25
+
+META_FILE = 'meta.json'
+LOCK_FILE = '.lock'
+# Segment files a save may leave before they are merged
+MAX_SEGMENTS = 16
+# Unlisted segment files are kept this long for processes still loading the previous metadata
+SEGMENT_GRACE_SECONDS = 60
+
+
+def resume_key(resume_id) -> str:
+    return f'resume:{resume_id}'
+
+
+def job_key(job_id) -> str:
+    return f'job:{job_id}'
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class CorpusTfidfIndex:
+    """
+    Incrementally maintained TF-IDF index over the resume/job corpus.
+
+    All public methods are thread-safe. Heavy dependencies (scipy, scikit-learn)
+    are imported the first time the index is used.
+    """
+
+    def __init__(self, index_dir: Optional[str] = None, n_features: int = N_FEATURES):
+        self._index_dir = index_dir
+        self.n_features = n_features
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._vectorizer = None
+
+        self._counts = None              # CSR matrix of raw term counts, one row per document
+        self._pending: List = []         # Rows added since the matrix was last stacked
+        self._keys: List[Optional[str]] = []   # Row -> document key (None for dead rows)
+        self._rows: Dict[str, int] = {}  # Document key -> row
+        self._digests: Dict[str, str] = {}
+        self._doc_freq = np.zeros(n_features, dtype=np.int32)
+        self._idf_weights = None         # Cached IDF vector
+        self._weighted = None            # Cached L2-normalised TF-IDF matrix
+
+        # Saved state
+        self._segments: List[List] = []  # [file name, rows] of the saved matrix, in row order
+        self._saved_rows = 0             # Rows of the matrix covered by those segments
+        self._rewrite = False            # Rows were renumbered since the last save
+        self._unsaved: Dict[str, str] = {}   # Documents changed since the last save ('' = removed)
+        self._stamp = None               # Identity of the meta.json last loaded or written
+
+    @property
+    def index_dir(self) -> Optional[str]:
+        """Explicit directory, or ``settings.TFIDF_INDEX_DIR`` (None disables persistence)."""
+        if self._index_dir is not None:
+            return self._index_dir
+        from django.conf import settings
+        return str(getattr(settings, 'TFIDF_INDEX_DIR', '') or '') or None
+
+    # ------------------------------------------------------------------
+    # Vectorization
+    # ------------------------------------------------------------------
+
+    def _get_vectorizer(self):
+        if self._vectorizer is None:
+            from sklearn.feature_extraction.text import HashingVectorizer
+            self._vectorizer = HashingVectorizer(
+                n_features=self.n_features,
+                ngram_range=NGRAM_RANGE,
+                alternate_sign=False,
+                norm=None,
+            )
+        return self._vectorizer
+
+    def _count(self, texts: List[str]):
+        counts = self._get_vectorizer().transform(texts)
+        counts.sum_duplicates()
+        return counts.tocsr()
+
+    def _idf(self) -> np.ndarray:
+        """IDF weights of the current corpus, cached until the corpus changes."""
+        if self._idf_weights is None:
+            n_docs = len(self._rows)
+            self._idf_weights = np.log((1.0 + n_docs) / (1.0 + self._doc_freq)) + 1.0
+        return self._idf_weights
+
+    def _invalidate(self) -> None:
+        """Drop the weights derived from the corpus after it changed."""
+        self._idf_weights = None
+        self._weighted = None
+
+    def _weigh(self, counts, idf: np.ndarray):
+        """Apply IDF weights and L2-normalise each row."""
+        from sklearn.preprocessing import normalize
+        weighted = counts.astype(np.float64)
+        # Scale the stored entries in place instead of multiplying by a diagonal matrix
+        weighted.data *= idf[weighted.indices]
+        return normalize(weighted, norm='l2', copy=False)
+
+    # ------------------------------------------------------------------
+    # Corpus maintenance
+    # ------------------------------------------------------------------
+
+    def _ensure_loaded(self) -> None:
+        """Load the index on first use, and again whenever another process has saved it since."""
+        stamp = self._disk_stamp()
+        if self._loaded and stamp == self._stamp:
+            return
+        self._loaded = True
+        unsaved = self._unsaved
+        if stamp is None or not self.load():
+            # Nothing (usable) on disk: keep the index in memory; a newer save is retried
+            self._stamp = stamp
+        elif unsaved:
+            # Changes not saved yet go on top of the other process's index
+            self._unsaved = self._apply(unsaved)
+
+    def _matrix(self):
+        """The count matrix with any pending rows stacked in."""
+        from scipy import sparse
+        if self._pending:
+            blocks = ([self._counts] if self._counts is not None else []) + self._pending
+            self._counts = sparse.vstack(blocks, format='csr')
+            self._pending = []
+        if self._counts is None:
+            self._counts = sparse.csr_matrix((0, self.n_features), dtype=np.float64)
+        return self._counts
+
+    def _drop_row(self, key: str) -> None:
+        row = self._rows.pop(key)
+        self._digests.pop(key, None)
+        self._keys[row] = None
+        old = self._matrix().getrow(row)
+        self._doc_freq[old.indices] -= 1
+
+    def _add_rows(self, items: List[Tuple[str, str]]) -> None:
+        counts = self._count([text for _, text in items])
+        for key, text in items:
+            self._rows[key] = len(self._keys)
+            self._keys.append(key)
+            self._digests[key] = _digest(text)
+        # Each present term counts once per document
+        self._doc_freq += np.bincount(counts.indices, minlength=self.n_features).astype(np.int32)
+        self._pending.append(counts)
+
+    def _maybe_compact(self) -> None:
+        dead = len(self._keys) - len(self._rows)
+        if self._keys and dead / len(self._keys) > COMPACT_DEAD_RATIO:
+            live = [row for row, key in enumerate(self._keys) if key is not None]
+            self._counts = self._matrix()[live]
+            self._keys = [self._keys[row] for row in live]
+            self._rows = {key: row for row, key in enumerate(self._keys)}
+            # Rows were renumbered, so the next save writes the whole matrix
+            self._rewrite = True
+
+    def _apply(self, documents: Dict[str, str]) -> Dict[str, str]:
+        """
+        Add, refresh or remove (empty text) documents in memory.
+
+        Returns:
+            The documents that changed the index.
+        """
+        to_add = []
+        changed = {}
+        for key, text in documents.items():
+            text = text or ''
+            if key in self._rows:
+                if text and self._digests.get(key) == _digest(text):
+                    continue
+                self._drop_row(key)
+            elif not text:
+                continue
+            changed[key] = text
+            if text:
+                to_add.append((key, text))
+
+        if to_add:
+            self._add_rows(to_add)
+        if changed:
+            self._maybe_compact()
+            self._invalidate()
+        return changed
+
+    def sync(self, documents: Iterable[Tuple[str, str]], save: bool = True) -> int:
+        """
+        Add or refresh documents whose text is new or changed.
+
+        Args:
+            documents: (key, text) pairs; empty texts are removed from the index
+            save: Persist the index to disk if anything changed
+
+        Returns:
+            Number of documents added, updated or removed.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            changed = self._apply(dict(documents))
+            if changed:
+                self._unsaved.update(changed)
+                if save:
+                    self.save()
+            return len(changed)
+
+    def remove(self, keys: Iterable[str], save: bool = True) -> None:
+        self.sync([(key, '') for key in keys], save=save)
+
+    def rebuild(self, documents: Iterable[Tuple[str, str]]) -> int:
+        """Replace the whole index with ``documents`` and save it."""
+        with self._lock:
+            self._loaded = True
+            self._counts = None
+            self._pending = []
+            self._keys = []
+            self._rows = {}
+            self._digests = {}
+            self._doc_freq = np.zeros(self.n_features, dtype=np.int32)
+            self._unsaved = {}
+            self._rewrite = True
+            self._invalidate()
+            items = [(key, text) for key, text in documents if text]
+            if items:
+                self._add_rows(items)
+            if self.index_dir:
+                with self._file_lock():
+                    self._write()
+            return len(items)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            self._ensure_loaded()
+            return key in self._rows
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._rows)
+
+    # ------------------------------------------------------------------
+    # Scoring
+    # ------------------------------------------------------------------
+
+    def _weighted_matrix(self):
+        if self._weighted is None:
+            self._weighted = self._weigh(self._matrix(), self._idf())
+        return self._weighted
+
+    def _query_vector(self, query: str):
+        """Weighted vector for an indexed document key, or for raw text."""
+        if query in self._rows:
+            return self._weighted_matrix().getrow(self._rows[query])
+        return self._weigh(self._count([query]), self._idf())
+
+    def score(self, query: str, keys: Optional[Iterable[str]] = None) -> Dict[str, float]:
+        """
+        Cosine similarity between ``query`` and indexed documents.
+
+        Args:
+            query: A document key (e.g. ``job_key(5)``) or raw preprocessed text
+            keys: Documents to score (default: every indexed document)
+
+        Returns:
+            {document key: similarity in [0, 1]} for the requested keys that are indexed.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if not self._rows:
+                return {}
+            vector = self._query_vector(query)
+            matrix = self._weighted_matrix()
+            if keys is None:
+                rows = [row for row, key in enumerate(self._keys) if key is not None]
+            else:
+                rows = [self._rows[key] for key in keys if key in self._rows]
+            if not rows:
+                return {}
+            scores = (matrix[rows] @ vector.T).toarray().ravel()
+            return {self._keys[row]: min(float(score), 1.0) for row, score in zip(rows, scores)}
+
+    def similarity(self, text1: str, text2: str) -> float:
+        """Cosine similarity of two texts weighted by the corpus IDF."""
+        if not text1 or not text2:
+            return 0.0
+        with self._lock:
+            self._ensure_loaded()
+            idf = self._idf()
+            vectors = self._weigh(self._count([text1, text2]), idf)
+            return min(float((vectors[0] @ vectors[1].T).toarray()[0, 0]), 1.0)
+
+    def similarity_many(self, text: str, texts: List[str]) -> np.ndarray:
+        """Cosine similarity of ``text`` to each of ``texts`` (one sparse product)."""
+        if not text or not texts:
+            return np.zeros(len(texts))
+        with self._lock:
+            self._ensure_loaded()
+            vectors = self._weigh(self._count([text] + [t or '' for t in texts]), self._idf())
+            scores = (vectors[1:] @ vectors[0].T).toarray().ravel()
+            return np.minimum(scores, 1.0)
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    @staticmethod
+    def _stamp_of(stat: os.stat_result) -> Tuple[int, int, int]:
+        # Saves replace meta.json, so its inode changes even within the mtime resolution
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _disk_stamp(self) -> Optional[Tuple[int, int, int]]:
+        """Identity of the saved index (None if there is none)."""
+        if not self.index_dir:
+            return None
+        try:
+            return self._stamp_of(os.stat(self._path(META_FILE)))
+        except OSError:
+            return None
+
+    @contextmanager
+    def _file_lock(self):
+        """Serialize saves across processes (within the process only where fcntl is unavailable)."""
+        os.makedirs(self.index_dir, exist_ok=True)
+        with open(self._path(LOCK_FILE), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def save(self) -> None:
+        """
+        Write the changes made since the last save to ``index_dir``.
+
+        Under the file lock, an index another process saved since is loaded
+        first and the changes are applied on top of it, so concurrent writers
+        merge instead of overwriting each other.
+        """
+        with self._lock:
+            if not self.index_dir:
+                self._unsaved = {}
+                return
+            with self._file_lock():
+                self._ensure_loaded()
+                if self._unsaved or self._rewrite:
+                    self._write()
+                self._unsaved = {}
+
+    def _write(self) -> None:
+        """
+        Write the rows added since the last write as a new segment file, then the
+        metadata. Segments are merged once there are ``MAX_SEGMENTS`` of them.
+        """
+        from scipy import sparse
+        matrix = self._matrix()
+        segments = [] if self._rewrite else list(self._segments)
+        start = sum(rows for _, rows in segments)
+        if len(segments) >= MAX_SEGMENTS:
+            # Merge every segment after the first, or all of them once they outgrow it
+            base_rows = segments[0][1]
+            segments = [segments[0]] if start - base_rows < base_rows else []
+            start = sum(rows for _, rows in segments)
+        if start < matrix.shape[0]:
+            name = f'counts-{uuid.uuid4().hex[:12]}.npz'
+            # Readers only look at segments listed in meta.json, so a half-written one is never read
+            sparse.save_npz(self._path(name), matrix[start:], compressed=False)
+            segments.append([name, matrix.shape[0] - start])
+
+        meta = {
+            'format_version': INDEX_FORMAT_VERSION,
+            'n_features': self.n_features,
+            'ngram_range': list(NGRAM_RANGE),
+            'segments': segments,
+            'keys': self._keys,
+            'digests': self._digests,
+        }
+        # Write to a temporary file first so a crash never leaves a half-written index
+        meta_path = self._path(META_FILE)
+        tmp_meta = meta_path + '.tmp'
+        with open(tmp_meta, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_meta, meta_path)
+
+        self._segments = segments
+        self._saved_rows = matrix.shape[0]
+        self._rewrite = False
+        self._stamp = self._disk_stamp()
+        self._remove_old_segments({name for name, _ in segments})
+
+    def _remove_old_segments(self, keep: set) -> None:
+        """Delete segment files no longer listed, once readers of the previous metadata are done with them."""
+        cutoff = time.time() - SEGMENT_GRACE_SECONDS
+        for name in os.listdir(self.index_dir):
+            if name.startswith('counts') and name.endswith('.npz') and name not in keep:
+                path = self._path(name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+    def load(self) -> bool:
+        """
+        Load the index from ``index_dir``. If the index in memory is a saved
+        state of it, only the segments written since are read.
+
+        Returns:
+            True if an index was loaded, False if there was none (or it was unusable).
+        """
+        if not self.index_dir:
+            return False
+
+        from scipy import sparse
+        with self._lock:
+            try:
+                with open(self._path(META_FILE)) as f:
+                    stamp = self._stamp_of(os.fstat(f.fileno()))
+                    meta = json.load(f)
+            except FileNotFoundError:
+                return False
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load TF-IDF index from {self.index_dir}: {e}")
+                return False
+            if (meta.get('format_version') != INDEX_FORMAT_VERSION
+                    or meta.get('n_features') != self.n_features
+                    or tuple(meta.get('ngram_range', ())) != NGRAM_RANGE):
+                logger.warning("TF-IDF index on disk has a different format; ignoring it")
+                return False
+
+            segments = meta['segments']
+            keys = meta['keys']
+            # Segments this process already holds (a clean, saved state only)
+            common = 0
+            if self._loaded and not self._unsaved and not self._rewrite and self._saved_rows == len(self._keys):
+                while (common < min(len(segments), len(self._segments))
+                       and segments[common] == self._segments[common]):
+                    common += 1
+            kept_rows = sum(rows for _, rows in segments[:common])
+            try:
+                blocks = [sparse.load_npz(self._path(name)).tocsr() for name, _ in segments[common:]]
+            except (OSError, ValueError) as e:
+                # Most likely replaced by a save since meta.json was read; retried on next use
+                logger.warning(f"Could not load TF-IDF index from {self.index_dir}: {e}")
+                return False
+
+            if common:
+                old = self._matrix()
+                old_live = np.array([key is not None for key in self._keys[:kept_rows]], dtype=bool)
+                counts = old[:kept_rows] if kept_rows < old.shape[0] else old
+                # Document frequencies: drop the rows no longer live, then add the new ones
+                new_live = np.array([key is not None for key in keys], dtype=bool)
+                dropped = np.flatnonzero(
+                    np.concatenate([old_live & ~new_live[:kept_rows],
+                                    [key is not None for key in self._keys[kept_rows:]]])
+                )
+                doc_freq = self._doc_freq - self._row_doc_freq(old, dropped)
+                if blocks:
+                    added = sparse.vstack(blocks, format='csr')
+                    counts = sparse.vstack([counts, added], format='csr')
+                    doc_freq += self._row_doc_freq(added, np.flatnonzero(new_live[kept_rows:]))
+            else:
+                counts = (
+                    sparse.vstack(blocks, format='csr') if blocks
+                    else sparse.csr_matrix((0, self.n_features), dtype=np.float64)
+                )
+                doc_freq = self._row_doc_freq(counts, [row for row, key in enumerate(keys) if key is not None])
+            if counts.shape[0] != len(keys):
+                logger.warning(f"TF-IDF index in {self.index_dir} is inconsistent; ignoring it")
+                return False
+
+            self._counts = counts
+            self._pending = []
+            self._keys = keys
+            self._rows = {key: row for row, key in enumerate(self._keys) if key is not None}
+            self._digests = meta['digests']
+            self._doc_freq = doc_freq
+            self._segments = segments
+            self._saved_rows = len(keys)
+            self._rewrite = False
+            self._unsaved = {}
+            self._stamp = stamp
+            self._invalidate()
+            self._loaded = True
+            logger.log(
+                logging.DEBUG if common else logging.INFO,
+                f"Loaded TF-IDF index with {len(self._rows)} documents from {self.index_dir} "
+                f"({len(segments) - common} of {len(segments)} segments read)"
+            )
+            return True
+
+    def _row_doc_freq(self, counts, rows) -> np.ndarray:
+        """Document frequencies contributed by ``rows`` of a count matrix."""
+        if not len(rows):
+            return np.zeros(self.n_features, dtype=np.int32)
+        return np.bincount(counts[rows].indices, minlength=self.n_features).astype(np.int32)
+
+
+tfidf_index = CorpusTfidfIndex()
@@ -4,7 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
 from django.shortcuts import get_object_or_404
-from django.db.models import Count, Q, Avg
+from django.db.models import Count, Q, Avg, F
 from django.utils import timezone
 from datetime import timedelta
 import os
@@ -13,6 +13,11 @@ from .models import JobDescription, Resume, Candidate, Match, Application
 from .serializers import JobDescriptionSerializer, ResumeSerializer, CandidateSerializer, MatchSerializer, ApplicationSerializer
 from .nlp_utils import extract_text_from_file, preprocess_text, extract_skills_from_text, calculate_ats_similarity, calculate_skill_based_similarity, parse_resume_hybrid
 from .scoring_utils import calculate_detailed_match_score, get_match_level, generate_improvement_plan
+from .match_scores import match_score_table
+from .resume_matching import resume_matcher
+from .job_search import job_search_index
+from .candidate_context import CandidateContext
+from .resume_processing import enqueue_resume_processing, get_processing_status
 from .ai_utils import ai_analyzer
 from .enhanced_coding_questions import generate_enhanced_personalized_questions, enhanced_coding_questions_manager
 import pandas as pd
@@ -47,6 +52,14 @@ class JobDescriptionViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
     pagination_class = JobDescriptionPagination
 
+    def get_queryset(self):
+        """Job list filtered by ``?search=`` (full-text, ranked by relevance) when given."""
+        queryset = super().get_queryset()
+        search = self.request.query_params.get('search', '').strip()
+        if self.action in ('list', 'get_all_jobs', 'search_jobs') and search:
+            queryset = job_search_index.filter(queryset, search).order_by('-search_rank', '-created_at')
+        return queryset
+
     def perform_create(self, serializer):
         """Override to automatically process text and extract skills."""
         instance = serializer.save()
@@ -141,12 +154,36 @@ class JobDescriptionViewSet(viewsets.ModelViewSet):
             'note': 'These are existing matches. Use POST /match-all-resumes/ to recalculate.'
         })
 
+    @action(detail=False, methods=['get'], url_path='search')
+    def search_jobs(self, request):
+        """
+        Typeahead search over job title, company, department, description and
+        requirements. The last word matches as a prefix.
+        
+        Query params: search, status (optional), limit (default 10, max 50)
+        """
+        search = request.query_params.get('search', '').strip()
+        if not search:
+            return Response({'results': []})
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            limit = 10
+        jobs = self.get_queryset()
+        job_status = request.query_params.get('status')
+        if job_status:
+            jobs = jobs.filter(status=job_status)
+        results = jobs.values('id', 'job_id', 'title', 'company', 'department', 'location', 'status')[:limit]
+        return Response({'results': list(results)})
+
     @action(detail=False, methods=['get'], url_path='all')
     def get_all_jobs(self, request):
         """
         Get all job descriptions without pagination
         """
-        jobs = JobDescription.objects.all().order_by('-created_at')
+        jobs = self.get_queryset()
+        if not self.request.query_params.get('search', '').strip():
+            jobs = jobs.order_by('-created_at')
         serializer = self.get_serializer(jobs, many=True)
         return Response({
             'count': jobs.count(),
@@ -160,62 +197,14 @@ class JobDescriptionViewSet(viewsets.ModelViewSet):
         Returns detailed match results with scores.
         """
         job_description = self.get_object()
-        # Include resumes that have been processed (have processed_text) regardless of status
-        resumes = Resume.objects.filter(processed_text__isnull=False).exclude(processed_text='')
         
-        matches = []
-        for resume in resumes:
-            # Use candidate skills for matching
-            candidate_skills = resume.candidate.skills or []
-            jd_skills = job_description.extracted_skills or []
-            
-            # Initialize similarity_score with a default value
-            similarity_score = 0.0
-            
-            try:
-                if candidate_skills and jd_skills:
-                    similarity_score = calculate_skill_based_similarity(jd_skills, candidate_skills) / 100.0
-                else:
-                    # Fallback to text-based matching if skills not available
-                    resume_processed = resume.processed_text if resume.processed_text else preprocess_text(resume.parsed_text)
-                    similarity_score = calculate_ats_similarity(resume_processed, job_description.processed_text)
-            except Exception as e:
-                # If any error occurs during matching, use default score
-                print(f"Error matching resume {resume.id}: {e}")
-                similarity_score = 0.0
-            
-            # Convert to percentage
-            overall_score = round(similarity_score * 100, 2)
-            
-            # Create or update match
-            match, created = Match.objects.get_or_create(
-                job_description=job_description,
-                resume=resume,
-                defaults={
-                    'overall_score': overall_score,
-                    'skill_score': overall_score,  # For now, use overall score for skill score
-                    'experience_score': 0,
-                    'technical_score': 0,
-                    'semantic_score': 0,
-                    'education_score': 0,
-                }
-            )
-            
-            if not created:
-                match.overall_score = overall_score
-                match.skill_score = overall_score
-                match.save()
-            
-            matches.append({
-                'resume_id': resume.id,
-                'candidate_name': resume.candidate.full_name,
-                'candidate_email': resume.candidate.email,
-                'match_score': overall_score,
-                'match_id': match.id,
-                'is_high_match': overall_score >= 80,
-                'is_medium_match': 60 <= overall_score < 80,
-                'is_low_match': overall_score < 60,
-            })
+        # Scores are computed per chunk of resumes and written with one bulk upsert per chunk
+        matches = resume_matcher.match_all(job_description)
+        for match in matches:
+            overall_score = match['match_score']
+            match['is_high_match'] = overall_score >= 80
+            match['is_medium_match'] = 60 <= overall_score < 80
+            match['is_low_match'] = overall_score < 60
         
         # Sort by score (highest first)
         matches.sort(key=lambda x: x['match_score'], reverse=True)
@@ -292,52 +281,28 @@ class ResumeViewSet(viewsets.ModelViewSet):
     ordering = ['-uploaded_at']
 
     def create(self, request, *args, **kwargs):
-        """Override to handle file upload and text extraction."""
+        """Override to store the upload and queue text extraction in the background."""
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
-        # Extract text from uploaded file
         file_obj = request.FILES.get('file')
         if not file_obj:
             return Response({'error': 'No file provided'}, status=status.HTTP_400_BAD_REQUEST)
         
-        try:
-            parsed_text = extract_text_from_file(file_obj)
-            processed_text = preprocess_text(parsed_text)
-            extracted_skills = extract_skills_from_text(parsed_text)
-            
-            # Save resume with extracted information
-            resume_instance = serializer.save(
-                parsed_text=parsed_text,
-                processed_text=processed_text,
-                extracted_skills=extracted_skills,
-                processing_status='completed',
-                processed_at=timezone.now()
-            )
-            
-            # Auto-populate candidate skills from resume
-            candidate = resume_instance.candidate
-            if extracted_skills:
-                current_skills = set(candidate.skills or [])
-                resume_skills_lower = set(skill.lower() for skill in extracted_skills)
-                current_skills_lower = set(skill.lower() for skill in current_skills)
-                new_skills = []
-                for skill in extracted_skills:
-                    if skill.lower() not in current_skills_lower:
-                        new_skills.append(skill)
-                
-                # Update candidate skills with new skills from resume
-                if new_skills:
-                    updated_skills = list(current_skills) + new_skills
-                    candidate.skills = updated_skills
-                    candidate.save()
-            
-            # Return the created resume
-            response_serializer = self.get_serializer(resume_instance)
-            return Response(response_serializer.data, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
-            return Response({'error': f'Error processing file: {str(e)}'}, status=status.HTTP_400_BAD_REQUEST)
+        # Store the file and hand text extraction and skill updates to the worker pool
+        resume_instance = serializer.save(processing_status='pending')
+        enqueue_resume_processing(resume_instance, update_profile=False)
+        
+        response_serializer = self.get_serializer(resume_instance)
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+    @action(detail=True, methods=['get'], url_path='processing-status')
+    def processing_status(self, request, pk=None):
+        """
+        Background processing status of a resume (pending, processing, completed or failed).
+        """
+        resume = self.get_object()
+        return Response(get_processing_status(resume))
 
     @action(detail=True, methods=['get'], url_path='matches')
     def get_matches_for_resume(self, request, pk=None):
@@ -414,7 +379,7 @@ class ResumeViewSet(viewsets.ModelViewSet):
         else:
             # Fallback to text-based matching if skills not available
             resume_processed = resume.processed_text if resume.processed_text else preprocess_text(resume.parsed_text)
-            similarity_score = calculate_ats_similarity(resume_processed, job_description.processed_text)
+            similarity_score = calculate_ats_similarity(job_description.processed_text, resume_processed)
         
         # Convert to percentage
         overall_score = round(similarity_score * 100, 2)
@@ -811,14 +776,9 @@ class CandidatePortalViewSet(viewsets.ViewSet):
         # Start with active jobs only
         queryset = JobDescription.objects.filter(status='active')
         
-        # Apply search filter
+        # Apply search filter (full-text index, last word matched as a prefix)
         if search:
-            queryset = queryset.filter(
-                Q(title__icontains=search) |
-                Q(company__icontains=search) |
-                Q(department__icontains=search) |
-                Q(description__icontains=search)
-            )
+            queryset = job_search_index.filter(queryset, search)
         
         # Apply location filter
         if location:
@@ -838,165 +798,68 @@ class CandidatePortalViewSet(viewsets.ViewSet):
             for skill in skill_list:
                 queryset = queryset.filter(extracted_skills__contains=[skill])
         
-        # Serialize jobs
-        serializer = JobDescriptionSerializer(queryset, many=True)
-        jobs_data = serializer.data
+        # Find the candidate to score jobs for (candidate_id or the logged-in candidate)
+        context = CandidateContext.for_request(request, candidate_id)
+        candidate = context.candidate if context else None
         
-        # Calculate match scores if candidate_id is provided or user is authenticated
-        candidate = None
-        if candidate_id:
-            try:
-                # First try to get by ID (for backward compatibility)
-                try:
-                    candidate = Candidate.objects.get(id=candidate_id)
-                except Candidate.DoesNotExist:
-                    # If not found by ID, try to find by email (for authenticated users)
-                    # This handles the case where the frontend sends a hardcoded ID
-                    # but we need to find the actual candidate record for the logged-in user
-                    if request.user and request.user.is_authenticated:
-                        candidate = Candidate.objects.get(email=request.user.email)
-                    else:
-                        raise Candidate.DoesNotExist
-            except Candidate.DoesNotExist:
-                pass
-        elif request.user and request.user.is_authenticated and request.user.role == 'candidate':
-            # If no candidate_id provided but user is authenticated as candidate
-            try:
-                candidate = Candidate.objects.get(email=request.user.email)
-            except Candidate.DoesNotExist:
-                pass
-        # Calculate match scores and check application status if we found a candidate
+        # Scores come from the materialized candidate x job table; only missing or
+        # stale pairs among the filtered jobs are scored here
+        total_available = queryset.count()
+        scored = False
         if candidate:
             try:
-                # Get candidate's latest resume
-                try:
-                    resume = candidate.resumes.latest('uploaded_at')
-                    candidate_skills = candidate.skills or []
-                    candidate_experience = candidate.total_experience_years or 0
-                    candidate_education = candidate.highest_education or ''
-                    candidate_location = f"{candidate.city or ''}, {candidate.state or ''}, {candidate.country or ''}".strip(', ') or None
-                    
-                    for job_data in jobs_data:
-                        # Calculate match score using the same function as modal
-                        from .scoring_utils import calculate_detailed_match_score
-                        detailed_analysis = calculate_detailed_match_score(
-                            job_data, 
-                            candidate_skills, 
-                            candidate_experience, 
-                            candidate_education,
-                            candidate_location
-                        )
-                        match_score = detailed_analysis['overall_score']
-                        print(f"🔍 JOB CARD DEBUG - Job: {job_data.get('title', 'Unknown')} | Score: {match_score}% | Skills: {candidate_skills} | Experience: {candidate_experience} | Education: {candidate_education} | Location: {candidate_location}")
-                        job_data['match_score'] = match_score
-                        job_data['match_level'] = self._get_match_level(match_score)
-                        
-                        # Check if candidate has already applied to this job
-                        job_id = job_data.get('id')
-                        if job_id:
-                            existing_application = Application.objects.filter(
-                                job_description_id=job_id,
-                                candidate=candidate
-                            ).first()
-                            
-                            if existing_application:
-                                job_data['has_applied'] = True
-                                job_data['application_status'] = existing_application.status
-                                job_data['application_id'] = existing_application.application_id
-                                job_data['applied_at'] = existing_application.applied_at
-                            else:
-                                job_data['has_applied'] = False
-                                job_data['application_status'] = None
-                                job_data['application_id'] = None
-                                job_data['applied_at'] = None
-                        
-                except Resume.DoesNotExist:
-                    # No resume, use candidate skills only
-                    candidate_skills = candidate.skills or []
-                    candidate_experience = candidate.total_experience_years or 0
-                    candidate_education = candidate.highest_education or ''
-                    candidate_location = f"{candidate.city or ''}, {candidate.state or ''}, {candidate.country or ''}".strip(', ') or None
-                    
-                    for job_data in jobs_data:
-                        # Calculate match score using the same function as modal
-                        from .scoring_utils import calculate_detailed_match_score
-                        detailed_analysis = calculate_detailed_match_score(
-                            job_data, 
-                            candidate_skills, 
-                            candidate_experience, 
-                            candidate_education,
-                            candidate_location
-                        )
-                        match_score = detailed_analysis['overall_score']
-                        print(f"🔍 JOB CARD DEBUG (No Resume) - Job: {job_data.get('title', 'Unknown')} | Score: {match_score}% | Skills: {candidate_skills} | Experience: {candidate_experience} | Education: {candidate_education} | Location: {candidate_location}")
-                        job_data['match_score'] = match_score
-                        job_data['match_level'] = self._get_match_level(match_score)
-                        
-                        # Check if candidate has already applied to this job
-                        job_id = job_data.get('id')
-                        if job_id:
-                            existing_application = Application.objects.filter(
-                                job_description_id=job_id,
-                                candidate=candidate
-                            ).first()
-                            
-                            if existing_application:
-                                job_data['has_applied'] = True
-                                job_data['application_status'] = existing_application.status
-                                job_data['application_id'] = existing_application.application_id
-                                job_data['applied_at'] = existing_application.applied_at
-                            else:
-                                job_data['has_applied'] = False
-                                job_data['application_status'] = None
-                                job_data['application_id'] = None
-                                job_data['applied_at'] = None
-                        
+                match_score_table.refresh_candidate(candidate, queryset)
+                queryset = match_score_table.annotate(queryset, candidate)
+                scored = True
             except Exception as e:
-                print(f"Error calculating match scores: {e}")
-                # Return jobs without match scores on error
-                for job_data in jobs_data:
-                    job_data['match_score'] = None
-                    job_data['match_level'] = None
-                    job_data['has_applied'] = False
-                    job_data['application_status'] = None
-        else:
-            # No candidate found, return jobs without match scores
-            for job_data in jobs_data:
-                job_data['match_score'] = None
-                job_data['match_level'] = None
-                job_data['has_applied'] = False
-                job_data['application_status'] = None
+                logger.error(f"Error calculating match scores: {e}")
         
         # Filter jobs by minimum match score if enabled and we have a candidate
         if show_only_matches and candidate and min_match_score:
             try:
                 min_score = float(min_match_score)
-                filtered_jobs = []
-                for job_data in jobs_data:
-                    if job_data.get('match_score') is not None and job_data['match_score'] >= min_score:
-                        filtered_jobs.append(job_data)
-                jobs_data = filtered_jobs
+                queryset = queryset.filter(match_score__gte=min_score) if scored else queryset.none()
             except ValueError:
                 # Invalid min_match_score, return all jobs
                 pass
         
         # Sort jobs by match score (high to low) if we have match scores
-        if candidate:
-            jobs_data.sort(key=lambda x: (x.get('match_score') is None, -(x.get('match_score') or 0)))
+        if scored:
+            ordering = [F('match_score').desc(nulls_last=True), '-posted_date', '-pk']
         else:
             # If no candidate, sort by creation date (newest first)
-            jobs_data.sort(key=lambda x: x.get('created_at', ''), reverse=True)
+            ordering = ['-created_at', '-pk']
+        if search:
+            # Search relevance decides first without a score, breaks score ties with one
+            ordering.insert(1 if scored else 0, '-search_rank')
+        queryset = queryset.order_by(*ordering)
         
-        # Apply pagination
-        total_count = len(jobs_data)
+        # Apply pagination in the database; only the returned page is serialized
+        total_count = queryset.count()
         start_index = (page - 1) * page_size
         end_index = start_index + page_size
-        paginated_jobs = jobs_data[start_index:end_index]
+        page_jobs = list(queryset[start_index:end_index]) if 0 <= start_index < end_index else []
+        paginated_jobs = JobDescriptionSerializer(page_jobs, many=True).data
+        
+        if candidate:
+            for job, job_data in zip(page_jobs, paginated_jobs):
+                match_score = getattr(job, 'match_score', None)
+                job_data['match_score'] = match_score
+                job_data['match_level'] = self._get_match_level(match_score)
+                # Application status from the candidate's applications, loaded in one query
+                job_data.update(context.application_fields(job.pk))
+        else:
+            # No candidate found, return jobs without match scores
+            for job_data in paginated_jobs:
+                job_data['match_score'] = None
+                job_data['match_level'] = None
+                job_data['has_applied'] = False
+                job_data['application_status'] = None
         
         return Response({
             'jobs': paginated_jobs,
             'total_count': total_count,
-            'total_available': queryset.count(),
+            'total_available': total_available,
             'page': page,
             'page_size': page_size,
             'total_pages': (total_count + page_size - 1) // page_size,
@@ -1185,23 +1048,18 @@ class CandidatePortalViewSet(viewsets.ViewSet):
         except Resume.DoesNotExist:
             pass
         
-        # Auto-generate rankings for this job after new application
+        # Insert the new applicant into the job's ranking (only this candidate is scored)
         try:
             from candidate_ranking.services import CandidateRankingService
             
-            # Get all candidates who have applied to this job
-            all_applications = Application.objects.filter(job_description=job)
-            all_candidates = [app.candidate for app in all_applications]
-            
-            # Generate rankings for all candidates (including the new one)
             ranking_service = CandidateRankingService()
-            batch = ranking_service.rank_candidates_for_job(
+            ranking = ranking_service.rank_candidate_incrementally(
                 job_description=job,
-                candidates=all_candidates,
-                created_by=None  # System generated
+                candidate=candidate,
+                application=application
             )
             
-            print(f"✅ Auto-generated rankings for {job.title}: {batch.ranked_candidates} candidates ranked")
+            print(f"✅ Ranked {candidate.full_name} #{ranking.rank_position} for {job.title}")
             
         except Exception as e:
             print(f"⚠️ Auto-ranking failed for {job.title}: {e}")
@@ -1221,34 +1079,23 @@ class CandidatePortalViewSet(viewsets.ViewSet):
         candidate_id = request.query_params.get('candidate_id')
         
         # Find candidate by ID or by authenticated user's email
-        candidate = None
-        if candidate_id:
-            try:
-                candidate = Candidate.objects.get(id=candidate_id)
-            except Candidate.DoesNotExist:
-                pass
-        
-        # If no candidate found by ID or no ID provided, try to find by authenticated user's email
-        if not candidate and request.user and request.user.is_authenticated:
-            try:
-                candidate = Candidate.objects.get(email=request.user.email)
-            except Candidate.DoesNotExist:
+        context = CandidateContext.for_request(request, candidate_id)
+        if not context:
+            if request.user and request.user.is_authenticated:
                 return Response({
                     'error': 'Candidate profile not found. Please complete your profile first.'
                 }, status=status.HTTP_404_NOT_FOUND)
-        
-        if not candidate:
             return Response({
                 'error': 'Candidate not found. Please provide candidate_id or ensure you are logged in.'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        applications = Application.objects.filter(candidate=candidate).select_related(
-            'job_description'
-        ).order_by('-applied_at')
+        # Latest resume and skills are looked up once, not per application
+        resume = context.latest_resume
+        candidate_skills = (resume.extracted_skills if resume else None) or context.skills
         
         # Format applications for frontend
         formatted_applications = []
-        for app in applications:
+        for app in context.applications:
             # Create timeline based on status
             timeline = [
                 {
@@ -1308,13 +1155,10 @@ class CandidatePortalViewSet(viewsets.ViewSet):
                 })
             
             # Calculate match score dynamically (same logic as browse_jobs)
-            match_score = 0  # Default to 0
+            match_score = 0  # Default to 0 (also when the candidate has no resume)
             try:
-                # Get candidate's latest resume and skills
-                resume = candidate.resumes.latest('uploaded_at')
-                candidate_skills = resume.extracted_skills or candidate.skills or []
-                candidate_experience = candidate.total_experience_years or 0
-                candidate_education = candidate.highest_education or ''
+                if not resume:
+                    raise Resume.DoesNotExist
                 
                 # Prepare job data for match calculation
                 job_data = {
@@ -1328,9 +1172,11 @@ class CandidatePortalViewSet(viewsets.ViewSet):
                 match_score = self._calculate_match_score(
                     job_data, 
                     candidate_skills, 
-                    candidate_experience, 
-                    candidate_education
+                    context.experience, 
+                    context.education
                 )
+            except Resume.DoesNotExist:
+                match_score = 0
             except Exception as e:
                 print(f"Error calculating match score for application {app.id}: {e}")
                 match_score = 0
@@ -1391,7 +1237,16 @@ class CandidatePortalViewSet(viewsets.ViewSet):
             }, status=status.HTTP_404_NOT_FOUND)
         
         serializer = JobDescriptionSerializer(job)
-        return Response(serializer.data)
+        job_data = serializer.data
+        
+        # Match score and application status for the candidate viewing the job, if known
+        context = CandidateContext.for_request(request, request.query_params.get('candidate_id'))
+        if context:
+            match_score = context.match_score(job)
+            job_data['match_score'] = match_score
+            job_data['match_level'] = self._get_match_level(match_score)
+            job_data.update(context.application_fields(job.pk))
+        return Response(job_data)
     
     @action(detail=False, methods=['get'], url_path='candidate-profile')
     def candidate_profile(self, request):
@@ -1481,105 +1336,57 @@ class CandidatePortalViewSet(viewsets.ViewSet):
                 status='active'
             )
         
-        try:
-            # Use enhanced hybrid parser for better extraction
-            # Extract text from uploaded file
-            parsed_text = extract_text_from_file(file_obj)
-            processed_text = preprocess_text(parsed_text)
-            extracted_skills = extract_skills_from_text(parsed_text)
-            
-            # Use enhanced parser for contact info and experience
-            enhanced_data = parse_resume_hybrid(file_obj)
-            contact_info = enhanced_data.get('contact', {})
-            experience_years = enhanced_data.get('experience_years', 0)
-            
-            # Create resume instance
-            resume_data = {
-                'candidate': candidate,
-                'file': file_obj,
-                'file_name': file_obj.name,
-                'file_type': file_extension[1:],  # Remove the dot
-                'parsed_text': parsed_text,
-                'processed_text': processed_text,
-                'extracted_skills': extracted_skills,
-                'processing_status': 'completed',
-                'processed_at': timezone.now()
+        # Store the file and return immediately; text extraction, skills and
+        # profile updates run in the background worker pool
+        resume = Resume.objects.create(
+            candidate=candidate,
+            file=file_obj,
+            file_name=file_obj.name,
+            file_type=file_extension[1:],  # Remove the dot
+            processing_status='pending'
+        )
+        enqueue_resume_processing(resume, update_profile=True)
+        
+        return Response({
+            'message': 'Resume uploaded successfully and queued for processing',
+            'resume': {
+                'id': resume.id,
+                'file_name': resume.file_name,
+                'file_type': resume.file_type,
+                'uploaded_at': resume.uploaded_at,
+                'processing_status': resume.processing_status,
+                'extracted_skills': [],
+                'skills_added_to_profile': [],
+                'status_url': f'/api/candidate-portal/resume-status/?resume_id={resume.id}'
             }
-            
-            resume = Resume.objects.create(**resume_data)
-            
-            # Auto-populate candidate profile from enhanced resume data
-            profile_updated = False
-            
-            # Update contact information if available
-            if contact_info:
-                if contact_info.get('name') and not candidate.full_name:
-                    # Parse name into first and last name
-                    name_parts = contact_info['name'].split(' ', 1)
-                    if len(name_parts) >= 2:
-                        candidate.first_name = name_parts[0]
-                        candidate.last_name = name_parts[1]
-                    else:
-                        candidate.first_name = contact_info['name']
-                    profile_updated = True
-                
-                if contact_info.get('phone') and not candidate.phone:
-                    candidate.phone = contact_info['phone']
-                    profile_updated = True
-                
-                if contact_info.get('location') and not candidate.city:
-                    # Parse location into city and state
-                    location_parts = contact_info['location'].split(', ', 1)
-                    if len(location_parts) >= 2:
-                        candidate.city = location_parts[0]
-                        candidate.state = location_parts[1]
-                    else:
-                        candidate.city = contact_info['location']
-                    profile_updated = True
-            
-            # Update experience years if available
-            if experience_years and not candidate.total_experience_years:
-                candidate.total_experience_years = experience_years
-                profile_updated = True
-            
-            # Auto-populate candidate skills from resume
-            if extracted_skills:
-                current_skills = set(candidate.skills or [])
-                resume_skills_lower = set(skill.lower() for skill in extracted_skills)
-                current_skills_lower = set(skill.lower() for skill in current_skills)
-                new_skills = []
-                for skill in extracted_skills:
-                    if skill.lower() not in current_skills_lower:
-                        new_skills.append(skill)
-                
-                # Update candidate skills with new skills from resume
-                if new_skills:
-                    updated_skills = list(current_skills) + new_skills
-                    candidate.skills = updated_skills
-                    profile_updated = True
-            
-            # Save candidate if profile was updated
-            if profile_updated:
-                candidate.save()
-            
-            # Return success response
-            return Response({
-                'message': 'Resume uploaded successfully',
-                'resume': {
-                    'id': resume.id,
-                    'file_name': resume.file_name,
-                    'file_type': resume.file_type,
-                    'uploaded_at': resume.uploaded_at,
-                    'processing_status': resume.processing_status,
-                    'extracted_skills': resume.extracted_skills,
-                    'skills_added_to_profile': new_skills if 'new_skills' in locals() else []
-                }
-            }, status=status.HTTP_201_CREATED)
-            
-        except Exception as e:
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], url_path='resume-status')
+    def resume_status(self, request):
+        """
+        Background processing status of one of the authenticated candidate's resumes.
+        Poll this after upload until processing_status is 'completed' or 'failed'.
+        """
+        resume_id = request.query_params.get('resume_id')
+        if not resume_id:
             return Response({
-                'error': f'Error processing resume: {str(e)}'
+                'error': 'resume_id is required'
             }, status=status.HTTP_400_BAD_REQUEST)
+        
+        user = request.user
+        if not user.is_authenticated:
+            return Response({
+                'error': 'Authentication required'
+            }, status=status.HTTP_401_UNAUTHORIZED)
+        
+        try:
+            resume = Resume.objects.get(id=resume_id, candidate__email=user.email)
+        except (Resume.DoesNotExist, ValueError):
+            return Response({
+                'error': 'Resume not found or does not belong to you'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        return Response(get_processing_status(resume))
 
     @action(detail=False, methods=['get'], url_path='my-resumes')
     def my_resumes(self, request):
@@ -1677,12 +1484,12 @@ class CandidatePortalViewSet(viewsets.ViewSet):
             }, status=status.HTTP_400_BAD_REQUEST)
         
         # Find candidate by authenticated user's email
-        try:
-            candidate = Candidate.objects.get(email=request.user.email)
-        except Candidate.DoesNotExist:
+        context = CandidateContext.for_request(request)
+        if not context:
             return Response({
                 'error': 'Candidate profile not found. Please complete your profile first.'
             }, status=status.HTTP_404_NOT_FOUND)
+        candidate = context.candidate
         
         # Get job details
         try:
@@ -1692,34 +1499,8 @@ class CandidatePortalViewSet(viewsets.ViewSet):
                 'error': 'Job not found'
             }, status=status.HTTP_404_NOT_FOUND)
         
-        # Get candidate data
-        candidate_skills = candidate.skills or []
-        candidate_experience = candidate.total_experience_years or 0
-        candidate_education = candidate.highest_education or ''
-        candidate_location = f"{candidate.city or ''}, {candidate.state or ''}, {candidate.country or ''}".strip(', ') or None
-        
-        # Get job data
-        job_data = {
-            'id': job.id,
-            'title': job.title,
-            'company': job.company,
-            'location': job.location,
-            'extracted_skills': job.extracted_skills or [],
-            'min_experience_years': job.min_experience_years or 0,
-            'experience_level': job.experience_level or '',
-            'description': job.description,
-            'requirements': job.requirements
-        }
-        
         # Calculate detailed match score
-        detailed_analysis = calculate_detailed_match_score(
-            job_data, 
-            candidate_skills, 
-            candidate_experience, 
-            candidate_education, 
-            candidate_location
-        )
-        print(f"🔍 MODAL DEBUG - Job: {job.title} | Score: {detailed_analysis['overall_score']}% | Skills: {candidate_skills} | Experience: {candidate_experience} | Education: {candidate_education} | Location: {candidate_location}")
+        detailed_analysis = context.match_analysis(job)
         
         # Generate improvement plan
         improvement_plan = generate_improvement_plan(detailed_analysis)
@@ -1736,12 +1517,7 @@ class CandidatePortalViewSet(viewsets.ViewSet):
             'requirements': job.requirements
         }
         
-        candidate_data = {
-            'skills': candidate_skills,
-            'experience_years': candidate_experience,
-            'education': candidate_education,
-            'location': candidate_location
-        }
+        candidate_data = context.as_candidate_data()
         
         # TEMPORARILY DISABLE AI ENHANCEMENT TO FIX VIEW ANALYSIS
         # Enhance with AI insights
@@ -1795,10 +1571,10 @@ class CandidatePortalViewSet(viewsets.ViewSet):
             'candidate_info': {
                 'name': candidate.full_name,
                 'email': candidate.email,
-                'location': candidate_location,
-                'total_skills': len(candidate_skills),
-                'experience_years': candidate_experience,
-                'education': candidate_education
+                'location': context.location,
+                'total_skills': len(context.skills),
+                'experience_years': context.experience,
+                'education': context.education
             },
             'detailed_analysis': detailed_analysis,
             'improvement_plan': improvement_plan,
@@ -2248,51 +2024,53 @@ def bulk_upload_jobs(request):
         failed_count = 0
         failed_jobs = []
 
-        for index, row in df.iterrows():
-            logger.info(f"Processing row {index + 1}: {row.get('title', 'No title')}")
-            try:
-                # Log row data for debugging
-                logger.debug(f"Row {index + 1} data: {row.to_dict()}")
+        # Jobs created below are added to the search index in one batch when the loop ends
+        with job_search_index.deferred():
+            for index, row in df.iterrows():
+                logger.info(f"Processing row {index + 1}: {row.get('title', 'No title')}")
+                try:
+                    # Log row data for debugging
+                    logger.debug(f"Row {index + 1} data: {row.to_dict()}")
                 
-                # Prepare job data
-                job_data = {
-                    'job_id': f"JOB-{uuid.uuid4().hex[:8].upper()}",
-                    'title': str(row['title']).strip(),
-                    'company': str(row['company']).strip(),
-                    'department': str(row['department']).strip(),
-                    'location': str(row.get('location', '')).strip(),
-                    'description': str(row['description']).strip(),
-                    'requirements': str(row['requirements']).strip(),
-                    'experience_level': str(row.get('experience_level', 'mid')).strip(),
-                    'employment_type': str(row.get('employment_type', 'full_time')).strip(),
-                    'min_experience_years': int(row.get('min_experience_years', 3)),
-                    'status': str(row.get('status', 'active')).strip(),
-                    'posted_date': timezone.now(),
-                }
+                    # Prepare job data
+                    job_data = {
+                        'job_id': f"JOB-{uuid.uuid4().hex[:8].upper()}",
+                        'title': str(row['title']).strip(),
+                        'company': str(row['company']).strip(),
+                        'department': str(row['department']).strip(),
+                        'location': str(row.get('location', '')).strip(),
+                        'description': str(row['description']).strip(),
+                        'requirements': str(row['requirements']).strip(),
+                        'experience_level': str(row.get('experience_level', 'mid')).strip(),
+                        'employment_type': str(row.get('employment_type', 'full_time')).strip(),
+                        'min_experience_years': int(row.get('min_experience_years', 3)),
+                        'status': str(row.get('status', 'active')).strip(),
+                        'posted_date': timezone.now(),
+                    }
 
-                logger.debug(f"Prepared job data for row {index + 1}: {job_data}")
+                    logger.debug(f"Prepared job data for row {index + 1}: {job_data}")
 
-                # Validate data
-                if not job_data['title'] or not job_data['company'] or not job_data['description']:
-                    logger.error(f"Validation failed for row {index + 1}: Missing required fields")
-                    logger.error(f"Title: '{job_data['title']}', Company: '{job_data['company']}', Description: '{job_data['description'][:50]}...'")
-                    raise ValidationError('Title, company, and description are required')
+                    # Validate data
+                    if not job_data['title'] or not job_data['company'] or not job_data['description']:
+                        logger.error(f"Validation failed for row {index + 1}: Missing required fields")
+                        logger.error(f"Title: '{job_data['title']}', Company: '{job_data['company']}', Description: '{job_data['description'][:50]}...'")
+                        raise ValidationError('Title, company, and description are required')
 
-                # Create job description
-                logger.info(f"Creating job description for row {index + 1}: {job_data['title']}")
-                job = JobDescription.objects.create(**job_data)
-                logger.info(f"Successfully created job with ID: {job.id}")
+                    # Create job description
+                    logger.info(f"Creating job description for row {index + 1}: {job_data['title']}")
+                    job = JobDescription.objects.create(**job_data)
+                    logger.info(f"Successfully created job with ID: {job.id}")
                 
-                success_count += 1
+                    success_count += 1
 
-            except Exception as e:
-                logger.error(f"Failed to process row {index + 1}: {str(e)}")
-                logger.error(f"Exception type: {type(e).__name__}")
-                failed_count += 1
-                failed_jobs.append({
-                    'row': index + 2,  # +2 because of 0-based index and header row
-                    'error': str(e)
-                })
+                except Exception as e:
+                    logger.error(f"Failed to process row {index + 1}: {str(e)}")
+                    logger.error(f"Exception type: {type(e).__name__}")
+                    failed_count += 1
+                    failed_jobs.append({
+                        'row': index + 2,  # +2 because of 0-based index and header row
+                        'error': str(e)
+                    })
 
         logger.info(f"Bulk upload processing completed. Success: {success_count}, Failed: {failed_count}")
         
@@ -11,7 +11,6 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import os
-import nltk
 import ssl
 from pathlib import Path
 from dotenv import load_dotenv
@@ -222,6 +221,38 @@ MEDIA_URL = '/media/'
 BASE_DIR = Path(__file__).resolve().parent.parent
 MEDIA_ROOT = BASE_DIR
 
+# Corpus TF-IDF index used for resume/job text similarity (see resume_checker/tfidf_index.py)
+TFIDF_INDEX_DIR = BASE_DIR / 'var' / 'tfidf_index'
+
+# Background resume processing (see resume_checker/resume_processing.py).
+# Worker threads started inside the web process on the first upload; set to 0
+# and run `python manage.py process_resumes` to process resumes in a separate process.
+RESUME_PROCESSING_WORKERS = int(os.getenv('RESUME_PROCESSING_WORKERS', '2'))
+
+# Background candidate ranking (see candidate_ranking/ranking_queue.py).
+# Worker threads started inside the web process on the first ranking request; set to 0
+# and run `python manage.py process_rankings` to rank in a separate process.
+RANKING_WORKERS = int(os.getenv('RANKING_WORKERS', '1'))
+
+# Seconds the per-job ranking analytics stay in the cache (see candidate_ranking/analytics.py).
+# Ranking changes drop the entry; the timeout bounds staleness with per-process caches.
+RANKING_ANALYTICS_CACHE_SECONDS = int(os.getenv('RANKING_ANALYTICS_CACHE_SECONDS', '300'))
+
+# PDF/DOCX text extraction runs in a pool of worker processes with per-document
+# limits (see resume_checker/document_extraction.py). Set the worker count to 0 to
+# extract in-process without limits.
+DOCUMENT_EXTRACTION_WORKERS = int(os.getenv('DOCUMENT_EXTRACTION_WORKERS', '2'))
+DOCUMENT_EXTRACTION_TIMEOUT_SECONDS = int(os.getenv('DOCUMENT_EXTRACTION_TIMEOUT_SECONDS', '30'))
+DOCUMENT_EXTRACTION_MEMORY_LIMIT_MB = int(os.getenv('DOCUMENT_EXTRACTION_MEMORY_LIMIT_MB', '1024'))
+# Recycle each worker process after this many documents to contain library leaks
+DOCUMENT_EXTRACTION_MAX_JOBS_PER_WORKER = 50
+# Long PDFs are split into chunks of this many pages, extracted in parallel
+DOCUMENT_EXTRACTION_PAGES_PER_CHUNK = 20
+
+# Stored results of `python manage.py run_benchmarks --save-baseline`; later runs
+# fail if they regress against it (see resume_checker/benchmarks.py)
+BENCHMARK_BASELINE_PATH = BASE_DIR / 'var' / 'benchmarks' / 'baseline.json'
+
 # CORS settings for API documentation
 CORS_ALLOW_ALL_ORIGINS = True  # Only for development
 CORS_ALLOW_CREDENTIALS = True
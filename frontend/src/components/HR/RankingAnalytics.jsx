@@ -37,44 +37,11 @@ const RankingAnalytics = ({ jobId }) => {
       setLoading(true);
       setError('');
       
-      // TODO: Replace with actual API call
-      const mockAnalytics = {
-        job_id: jobId,
-        job_title: 'Senior Python Developer',
-        total_candidates: 4,
-        analytics: {
-          score_stats: {
-            average_score: 70.36,
-            max_score: 93.0,
-            min_score: 43.93,
-            score_range: 49.07
-          },
-          score_distribution: {
-            high_matches: 2,
-            medium_matches: 1,
-            low_matches: 1,
-            high_match_percentage: 50.0,
-            medium_match_percentage: 25.0,
-            low_match_percentage: 25.0
-          },
-          candidate_status: {
-            top_candidates: 2,
-            shortlisted: 0,
-            rejected: 0,
-            pending_review: 4
-          },
-          experience_analysis: {
-            overqualified: 1,
-            well_matched: 2,
-            underqualified: 1,
-            overqualified_percentage: 25.0,
-            well_matched_percentage: 50.0,
-            underqualified_percentage: 25.0
-          }
-        }
-      };
-      
-      setAnalytics(mockAnalytics);
+      const data = await rankingService.getRankingAnalytics(jobId);
+      if (!data.success) {
+        throw new Error(data.error);
+      }
+      setAnalytics(data);
     } catch (err) {
       setError('Failed to load analytics');
     } finally {
@@ -102,7 +69,9 @@ const RankingAnalytics = ({ jobId }) => {
     return null;
   }
 
-  const { score_stats, score_distribution, candidate_status, experience_analysis } = analytics.analytics;
+  const { score_stats, score_distribution, candidate_status, experience_analysis, histograms } = analytics.analytics;
+  const scoreHistogram = histograms.overall_score;
+  const largestBucket = Math.max(1, ...scoreHistogram.map(bucket => bucket.count));
 
   return (
     <Box sx={{ p: 3 }}>
@@ -329,6 +298,32 @@ const RankingAnalytics = ({ jobId }) => {
           </Card>
         </Grid>
 
+        {/* Score Histogram */}
+        <Grid item xs={12} md={6}>
+          <Card>
+            <CardContent>
+              <Typography variant="h6" gutterBottom>
+                Score Histogram
+              </Typography>
+              {scoreHistogram.map(bucket => (
+                <Box key={bucket.min} sx={{ display: 'flex', alignItems: 'center', gap: 1, mb: 0.5 }}>
+                  <Typography variant="body2" sx={{ width: 64 }}>
+                    {bucket.min}-{bucket.max}%
+                  </Typography>
+                  <LinearProgress
+                    variant="determinate"
+                    value={(bucket.count / largestBucket) * 100}
+                    sx={{ flexGrow: 1, height: 8, borderRadius: 4 }}
+                  />
+                  <Typography variant="body2" color="textSecondary" sx={{ width: 40, textAlign: 'right' }}>
+                    {bucket.count}
+                  </Typography>
+                </Box>
+              ))}
+            </CardContent>
+          </Card>
+        </Grid>
+
         {/* Summary Stats */}
         <Grid item xs={12}>
           <Card>
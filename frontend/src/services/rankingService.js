@@ -22,7 +22,8 @@ api.interceptors.request.use((config) => {
 
 class RankingService {
   /**
-   * Rank candidates for a specific job
+   * Queue the ranking of candidates for a specific job.
+   * Returns the batch_id at once; poll getRankingBatch for progress.
    */
   async rankCandidatesForJob(jobId, candidateIds, criteriaId = null) {
     try {
@@ -38,6 +39,33 @@ class RankingService {
     }
   }
 
+  /**
+   * Progress of a ranking batch queued by rankCandidatesForJob
+   * (status, percent, eta_seconds; top_candidates once completed)
+   */
+  async getRankingBatch(batchId) {
+    try {
+      const response = await api.get(`/api/candidate-ranking/batches/${batchId}/`);
+      return response.data;
+    } catch (error) {
+      console.error('Error getting ranking batch:', error);
+      throw error;
+    }
+  }
+
+  /**
+   * Cancel a queued or running ranking batch
+   */
+  async cancelRankingBatch(batchId) {
+    try {
+      const response = await api.post(`/api/candidate-ranking/batches/${batchId}/cancel/`);
+      return response.data;
+    } catch (error) {
+      console.error('Error cancelling ranking batch:', error);
+      throw error;
+    }
+  }
+
   /**
    * Get rankings for a specific job
    */